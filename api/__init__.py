@@ -16,6 +16,12 @@ def create_app():
     db.init_app(app)
     register_blueprints(app)
 
+    # Worker threads serve many requests; an LLM duration recorded for
+    # log_llm_usage must not leak into the next one
+    from .services import tracing
+
+    app.before_request(tracing.clear_llm_duration)
+
     # Register agent tools with the tool registry
     from .services.analyze_tools import ANALYZE_TOOLS
     from .services.campaign_tools import CAMPAIGN_TOOLS
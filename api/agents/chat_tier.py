@@ -19,7 +19,10 @@ from typing import Generator
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
+from ..models import db
+from .data_lookups import QUERY_TYPES, run_lookup
 from .graph import SSEEvent
+from .orm_guard import limit_orm_loads
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +32,10 @@ _MAX_TOKENS = 512
 # Model for chat tier
 _CHAT_MODEL = "claude-haiku-4-5-20251001"
 
+# ORM instances a chat tool call may load; lookups are aggregates, so any
+# sizeable ORM load is a full-table scan slipping in
+_MAX_TOOL_ORM_ROWS = 100
+
 
 def execute_chat_turn(
     message: str,
@@ -259,26 +266,24 @@ def build_chat_tools(tool_context: dict) -> list:
         {
             "name": "data_lookup",
             "description": (
-                "Look up data from the database. Can query: contact count, "
-                "company count, batch list, message count, ICP tier summary."
+                "Look up data from the database. Can query: contact, company, "
+                "message and campaign counts, batch list, ICP tier summary, "
+                "companies by pipeline stage, companies/contacts by owner, "
+                "contacts by ICP fit, messages and campaigns by status."
             ),
             "input_schema": {
                 "type": "object",
                 "properties": {
                     "query_type": {
                         "type": "string",
-                        "enum": [
-                            "contact_count",
-                            "company_count",
-                            "batch_list",
-                            "message_count",
-                            "icp_summary",
-                        ],
+                        "enum": list(QUERY_TYPES),
                     },
                     "filters": {
                         "type": "object",
                         "description": (
-                            'Optional filters (e.g., {"status": "enriched"})'
+                            "Optional equality filters on the counted table "
+                            '(e.g., {"status": "triage_passed"}, '
+                            '{"channel": "email"}, {"tier": "Tier 1"})'
                         ),
                     },
                 },
@@ -325,11 +330,12 @@ def _execute_tool(tool_name: str, tool_args: dict, tool_context: dict) -> dict:
     Routes to the appropriate handler based on tool name.
     """
     if tool_name == "data_lookup":
-        return execute_data_lookup(
-            query_type=tool_args.get("query_type", ""),
-            filters=tool_args.get("filters", {}),
-            tool_context=tool_context,
-        )
+        with limit_orm_loads(tool_name, _MAX_TOOL_ORM_ROWS):
+            return execute_data_lookup(
+                query_type=tool_args.get("query_type", ""),
+                filters=tool_args.get("filters", {}),
+                tool_context=tool_context,
+            )
     elif tool_name == "navigate_suggestion":
         return {
             "suggestion": "navigate",
@@ -343,11 +349,14 @@ def _execute_tool(tool_name: str, tool_args: dict, tool_context: dict) -> dict:
 def execute_data_lookup(query_type: str, filters: dict, tool_context: dict) -> dict:
     """Execute a data lookup query against the database.
 
-    Uses the existing SQLAlchemy models. Requires Flask app context.
+    Answered with SQL aggregates and limited projections
+    (``data_lookups.run_lookup``); no ORM objects are loaded. Requires
+    Flask app context.
 
     Args:
-        query_type: Type of lookup (contact_count, company_count, etc.).
-        filters: Optional filter dict.
+        query_type: Type of lookup (see ``data_lookups.QUERY_TYPES``).
+        filters: Optional equality filter dict; values that do not fit
+            their column are reported as ``ignored_filters``.
         tool_context: Must contain tenant_id.
 
     Returns:
@@ -357,43 +366,15 @@ def execute_data_lookup(query_type: str, filters: dict, tool_context: dict) -> d
     if not tenant_id:
         return {"error": "No tenant context available"}
 
-    try:
-        from api.models import Company, Contact, Message
-
-        if query_type == "contact_count":
-            count = Contact.query.filter_by(tenant_id=tenant_id).count()
-            return {"count": count, "type": "contacts"}
-
-        elif query_type == "company_count":
-            count = Company.query.filter_by(tenant_id=tenant_id).count()
-            return {"count": count, "type": "companies"}
-
-        elif query_type == "message_count":
-            count = Message.query.filter_by(tenant_id=tenant_id).count()
-            return {"count": count, "type": "messages"}
-
-        elif query_type == "icp_summary":
-            # Count companies by ICP tier
-            companies = Company.query.filter_by(tenant_id=tenant_id).all()
-            tier_counts: dict[str, int] = {}
-            for c in companies:
-                tier = getattr(c, "icp_tier", None) or "Unclassified"
-                tier_counts[tier] = tier_counts.get(tier, 0) + 1
-            return {"tiers": tier_counts, "total": len(companies)}
-
-        elif query_type == "batch_list":
-            from api.models import Tag
-
-            tags = Tag.query.filter_by(tenant_id=tenant_id).all()
-            return {
-                "tags": [{"name": t.name, "id": str(t.id)} for t in tags[:20]],
-                "total": len(tags),
-            }
-
-        else:
-            return {"error": "Unknown query type: {}".format(query_type)}
+    if query_type not in QUERY_TYPES:
+        return {"error": "Unknown query type: {}".format(query_type)}
 
+    try:
+        return run_lookup(query_type, tenant_id, filters)
     except Exception as exc:
+        # A failed statement aborts the transaction on PostgreSQL; roll back
+        # so the rest of the request can still use the session
+        db.session.rollback()
         logger.exception("Data lookup failed: %s", exc)
         return {"error": "Data lookup failed: {}".format(str(exc))}
 
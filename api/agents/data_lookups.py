@@ -0,0 +1,283 @@
+"""Aggregate data lookups for the chat tier's ``data_lookup`` tool.
+
+Every lookup is answered in the database: totals come from the maintained
+``tenant_counters`` row (``services.tenant_counters``), breakdowns from one
+``GROUP BY`` statement that returns at most ``GROUP_LIMIT`` groups plus the
+overall total (window ``SUM``), and lists from a ``LIMIT``-ed column
+projection. No lookup materialises ORM objects, so the cost of a chat
+question does not grow with the tenant's table sizes.
+
+Grouped lookups share ``GROUPED_LOOKUPS``; adding a breakdown is one entry.
+Filters are equality matches on a per-table allow-list (``FILTERS``).
+Filter values come from the model, so each is coerced to its column's type
+first; unknown keys and values that do not fit the column (a malformed
+UUID, a non-numeric step) are reported back as ``ignored_filters`` instead
+of failing the statement.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from ..models import db
+
+# Groups returned per breakdown (largest first)
+GROUP_LIMIT = 25
+
+# Tags returned by batch_list
+BATCH_LIST_LIMIT = 20
+
+# Allowed equality filters per table: filter key -> (column, value type).
+# "text" columns are compared as text so that values outside a PostgreSQL
+# enum simply match nothing
+FILTERS = {
+    "contacts": {
+        "owner_id": ("owner_id", "uuid"),
+        "tag_id": ("tag_id", "uuid"),
+        "company_id": ("company_id", "uuid"),
+        "icp_fit": ("icp_fit", "text"),
+        "message_status": ("message_status", "text"),
+        "seniority_level": ("seniority_level", "text"),
+        "department": ("department", "text"),
+        "processed_enrich": ("processed_enrich", "bool"),
+    },
+    "companies": {
+        "owner_id": ("owner_id", "uuid"),
+        "tag_id": ("tag_id", "uuid"),
+        "status": ("status", "text"),
+        "tier": ("tier", "text"),
+        "industry": ("industry", "text"),
+        "geo_region": ("geo_region", "text"),
+    },
+    "messages": {
+        "owner_id": ("owner_id", "uuid"),
+        "status": ("status", "text"),
+        "tag_id": ("tag_id", "uuid"),
+        "channel": ("channel", "text"),
+        "sequence_step": ("sequence_step", "smallint"),
+    },
+    "campaigns": {
+        "owner_id": ("owner_id", "uuid"),
+        "status": ("status", "text"),
+    },
+}
+
+# Range of a PostgreSQL smallint column
+_SMALLINT_RANGE = (-32768, 32767)
+
+_TRUE = ("true", "1", "yes")
+_FALSE = ("false", "0", "no")
+
+# query_type -> (table, tenant_counters field) for plain counts
+COUNT_LOOKUPS = {
+    "contact_count": ("contacts", "contacts"),
+    "company_count": ("companies", "companies"),
+    "message_count": ("messages", "messages"),
+    "campaign_count": ("campaigns", "campaigns"),
+}
+
+# query_type -> breakdown spec. "column" is grouped on directly; "owner"
+# groups on the owner's name. "key" names the result dict, "empty" labels
+# NULL groups.
+GROUPED_LOOKUPS = {
+    "icp_summary": {
+        "table": "companies",
+        "column": "tier",
+        "key": "tiers",
+        "empty": "Unclassified",
+    },
+    "companies_by_stage": {
+        "table": "companies",
+        "column": "status",
+        "key": "stages",
+        "empty": "unknown",
+    },
+    "companies_by_owner": {
+        "table": "companies",
+        "owner": True,
+        "key": "owners",
+        "empty": "Unassigned",
+    },
+    "contacts_by_owner": {
+        "table": "contacts",
+        "owner": True,
+        "key": "owners",
+        "empty": "Unassigned",
+    },
+    "contacts_by_icp_fit": {
+        "table": "contacts",
+        "column": "icp_fit",
+        "key": "icp_fit",
+        "empty": "unknown",
+    },
+    "messages_by_status": {
+        "table": "messages",
+        "column": "status",
+        "key": "statuses",
+        "empty": "unknown",
+    },
+    "campaigns_by_status": {
+        "table": "campaigns",
+        "column": "status",
+        "key": "statuses",
+        "empty": "unknown",
+    },
+}
+
+QUERY_TYPES = tuple(COUNT_LOOKUPS) + ("batch_list",) + tuple(GROUPED_LOOKUPS)
+
+
+def _coerce(kind: str, value):
+    """Convert a filter value to its column type.
+
+    Raises:
+        ValueError: If ``value`` does not fit the column.
+    """
+    if isinstance(value, (dict, list)):
+        raise ValueError("not a scalar")
+    if kind == "uuid":
+        return str(uuid.UUID(str(value)))
+    if kind == "smallint":
+        if isinstance(value, bool) or (
+            isinstance(value, float) and not value.is_integer()
+        ):
+            raise ValueError("not an integer")
+        number = int(value)
+        if not _SMALLINT_RANGE[0] <= number <= _SMALLINT_RANGE[1]:
+            raise ValueError("out of range")
+        return number
+    if kind == "bool":
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+        raise ValueError("not a boolean")
+    return str(value)
+
+
+def _where(table: str, filters: dict) -> tuple[list, dict, list]:
+    """Build ``WHERE`` conditions for the allowed filters of ``table``.
+
+    Returns:
+        ``(clauses, params, ignored_keys)``; the tenant condition is added
+        by the caller. Unknown keys and values that do not fit their column
+        are ignored.
+    """
+    allowed = FILTERS.get(table, {})
+    clauses = []
+    params = {}
+    ignored = []
+    for i, (key, value) in enumerate(sorted((filters or {}).items())):
+        if key not in allowed:
+            ignored.append(key)
+            continue
+        column, kind = allowed[key]
+        if value is None:
+            clauses.append("x.{} IS NULL".format(column))
+            continue
+        try:
+            params["f{}".format(i)] = _coerce(kind, value)
+        except (TypeError, ValueError, AttributeError):
+            ignored.append(key)
+            continue
+        if kind == "text":
+            clauses.append("CAST(x.{} AS TEXT) = :f{}".format(column, i))
+        else:
+            clauses.append("x.{} = :f{}".format(column, i))
+    return clauses, params, ignored
+
+
+def _count(query_type: str, tenant_id: str, filters: dict) -> dict:
+    table, counter = COUNT_LOOKUPS[query_type]
+    clauses, params, ignored = _where(table, filters)
+    if not clauses:
+        from ..services.tenant_counters import get_counters
+
+        count = get_counters(tenant_id)[counter]
+    else:
+        where = " AND ".join(["x.tenant_id = :tenant_id"] + clauses)
+        count = db.session.execute(
+            db.text("SELECT COUNT(*) FROM {} x WHERE {}".format(table, where)),
+            dict(params, tenant_id=tenant_id),
+        ).scalar()
+    result = {"count": int(count or 0), "type": table}
+    if ignored:
+        result["ignored_filters"] = ignored
+    return result
+
+
+def _grouped(query_type: str, tenant_id: str, filters: dict) -> dict:
+    spec = GROUPED_LOOKUPS[query_type]
+    table = spec["table"]
+    clauses, params, ignored = _where(table, filters)
+    where = " AND ".join(["x.tenant_id = :tenant_id"] + clauses)
+    if spec.get("owner"):
+        label = "o.name"
+        join = "LEFT JOIN owners o ON o.id = x.owner_id"
+    else:
+        label = "x.{}".format(spec["column"])
+        join = ""
+    rows = db.session.execute(
+        db.text(
+            "SELECT {label} AS label, COUNT(*) AS n, SUM(COUNT(*)) OVER () AS total "
+            "FROM {table} x {join} WHERE {where} "
+            "GROUP BY {label} ORDER BY n DESC, label LIMIT :limit".format(
+                label=label, table=table, join=join, where=where
+            )
+        ),
+        dict(params, tenant_id=tenant_id, limit=GROUP_LIMIT + 1),
+    ).fetchall()
+
+    groups: dict[str, int] = {}
+    for row in rows[:GROUP_LIMIT]:
+        name = row[0] if row[0] not in (None, "") else spec["empty"]
+        groups[name] = groups.get(name, 0) + int(row[1])
+    result = {
+        spec["key"]: groups,
+        "total": int(rows[0][2]) if rows else 0,
+        "type": table,
+    }
+    if len(rows) > GROUP_LIMIT:
+        result["truncated"] = True
+    if ignored:
+        result["ignored_filters"] = ignored
+    return result
+
+
+def _batch_list(tenant_id: str) -> dict:
+    rows = db.session.execute(
+        db.text(
+            "SELECT id, name, COUNT(*) OVER () FROM tags "
+            "WHERE tenant_id = :tenant_id ORDER BY name LIMIT :limit"
+        ),
+        {"tenant_id": tenant_id, "limit": BATCH_LIST_LIMIT},
+    ).fetchall()
+    return {
+        "tags": [{"name": r[1], "id": str(r[0])} for r in rows],
+        "total": int(rows[0][2]) if rows else 0,
+    }
+
+
+def run_lookup(query_type: str, tenant_id: str, filters: dict | None = None) -> dict:
+    """Answer a ``data_lookup`` tool call.
+
+    Args:
+        query_type: One of ``QUERY_TYPES``.
+        tenant_id: Tenant to scope every query to.
+        filters: Optional equality filters (see ``FILTERS``).
+
+    Returns:
+        Result dict, or ``{"error": ...}`` for an unknown query type.
+    """
+    tenant_id = str(tenant_id)
+    filters = filters if isinstance(filters, dict) else {}
+    if query_type in COUNT_LOOKUPS:
+        return _count(query_type, tenant_id, filters)
+    if query_type in GROUPED_LOOKUPS:
+        return _grouped(query_type, tenant_id, filters)
+    if query_type == "batch_list":
+        return _batch_list(tenant_id)
+    return {"error": "Unknown query type: {}".format(query_type)}
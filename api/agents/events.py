@@ -374,6 +374,12 @@ def sse_to_agui(sse_type: str, sse_data: dict, run_id: str = "") -> list[AGUIEve
                     "model": sse_data.get("model", ""),
                     "total_input_tokens": sse_data.get("total_input_tokens", 0),
                     "total_output_tokens": sse_data.get("total_output_tokens", 0),
+                    "total_cache_read_tokens": sse_data.get(
+                        "total_cache_read_tokens", 0
+                    ),
+                    "total_cache_creation_tokens": sse_data.get(
+                        "total_cache_creation_tokens", 0
+                    ),
                     "total_cost_usd": sse_data.get("total_cost_usd", "0"),
                 },
             )
@@ -14,6 +14,9 @@ from typing import Generator
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
+from ..services.anthropic_client import build_cached_system
+from ..services.llm_logger import CACHE_READ_MULTIPLIER, CACHE_WRITE_MULTIPLIER
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,7 +42,34 @@ def _summarize_output(tool_name: str, output) -> str:
     return "Completed {}".format(tool_name)
 
 
-def _estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+def _usage_tokens(response) -> tuple[int, int, int, int]:
+    """Split a chat model response's usage into billable token counts.
+
+    LangChain's ``input_tokens`` includes prompt-cache reads and writes
+    (itemized in ``input_token_details``); they are taken out so the first
+    count is uncached input, as ``log_llm_usage`` expects.
+
+    Returns:
+        ``(input_tokens, output_tokens, cache_read_tokens,
+        cache_creation_tokens)``.
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    cache_read = details.get("cache_read") or 0
+    cache_creation = details.get("cache_creation") or 0
+    input_tokens = max(
+        (usage.get("input_tokens") or 0) - cache_read - cache_creation, 0
+    )
+    return input_tokens, usage.get("output_tokens") or 0, cache_read, cache_creation
+
+
+def _estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_read_tokens: int = 0,
+    cache_creation_tokens: int = 0,
+) -> float:
     MODEL_PRICING = {
         "claude-haiku-4-5-20251001": {"input_per_m": 0.80, "output_per_m": 4.0},
         "claude-sonnet-4-5-20241022": {"input_per_m": 3.0, "output_per_m": 15.0},
@@ -48,7 +78,15 @@ def _estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
     pricing = MODEL_PRICING.get(model, MODEL_PRICING["claude-haiku-4-5-20251001"])
     input_cost = (input_tokens / 1_000_000) * pricing["input_per_m"]
     output_cost = (output_tokens / 1_000_000) * pricing["output_per_m"]
-    return round(input_cost + output_cost, 6)
+    cache_cost = (
+        (
+            cache_creation_tokens * float(CACHE_WRITE_MULTIPLIER)
+            + cache_read_tokens * float(CACHE_READ_MULTIPLIER)
+        )
+        / 1_000_000
+        * pricing["input_per_m"]
+    )
+    return round(input_cost + output_cost + cache_cost, 6)
 
 
 # ---------------------------------------------------------------------------
@@ -102,8 +140,11 @@ def execute_graph_turn(
     """
     from .pipeline import build_pipeline_graph
 
-    # Convert messages to LangChain format and prepend system prompt
-    lc_messages = [SystemMessage(content=system_prompt)]
+    # Convert messages to LangChain format and prepend system prompt.
+    # The system prompt is identical on every iteration of the subgraph tool
+    # loops, so it is sent as a cache-marked block (read at 0.1x after the
+    # first call).
+    lc_messages = [SystemMessage(content=build_cached_system(system_prompt))]
     lc_messages.extend(_anthropic_to_langchain(messages))
 
     # Inject Flask app reference so tool handlers can get an app context
@@ -117,6 +158,8 @@ def execute_graph_turn(
         "iteration": 0,
         "total_input_tokens": 0,
         "total_output_tokens": 0,
+        "total_cache_read_tokens": 0,
+        "total_cache_creation_tokens": 0,
         "total_cost_usd": "0",
         "model": "",
         "intent": None,
@@ -153,6 +196,10 @@ def execute_graph_turn(
             "model": model,
             "total_input_tokens": total_input,
             "total_output_tokens": total_output,
+            "total_cache_read_tokens": final_state.get("total_cache_read_tokens", 0),
+            "total_cache_creation_tokens": final_state.get(
+                "total_cache_creation_tokens", 0
+            ),
             "total_cost_usd": str(total_cost),
         },
     )
@@ -3,6 +3,8 @@
 Uses Haiku for fast (<500ms) classification of user messages into
 intent categories. The classifier uses a minimal prompt and structured
 output parsing. Copilot is the default fallback for simple queries.
+Keyword matches, cached decisions and confident local-classifier
+predictions (``local_classifier``) skip the Haiku call.
 
 Intent categories:
   - strategy_edit: Strategy document editing
@@ -21,6 +23,8 @@ import time
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from . import local_classifier
+
 logger = logging.getLogger(__name__)
 
 # Valid intent categories
@@ -158,8 +162,32 @@ def classify_intent(message: str) -> tuple[str, float]:
     # Try fast path first
     fast_result = classify_intent_fast(message)
     if fast_result is not None:
+        local_classifier.record_decision("intent", message, fast_result, "keyword")
         return fast_result, 0.0
 
+    # Earlier decision for the same normalized message, then local model
+    start = time.monotonic()
+    cached = local_classifier.get_cached("intent", message)
+    if cached is not None:
+        return cached, (time.monotonic() - start) * 1000
+
+    local = local_classifier.classify_local("intent", message)
+    if local is not None and local[0] in VALID_INTENTS:
+        intent, confidence = local
+        elapsed_ms = (time.monotonic() - start) * 1000
+        logger.info(
+            "Intent classified locally: '%s' -> %s (%.2f, %.1fms)",
+            message[:80],
+            intent,
+            confidence,
+            elapsed_ms,
+        )
+        local_classifier.store_cached("intent", message, None, intent)
+        local_classifier.record_decision(
+            "intent", message, intent, "local", confidence=confidence
+        )
+        return intent, elapsed_ms
+
     # LLM-based classification
     start = time.monotonic()
 
@@ -190,6 +218,10 @@ def classify_intent(message: str) -> tuple[str, float]:
 
         if raw in VALID_INTENTS:
             intent = raw
+            local_classifier.store_cached("intent", message, None, intent)
+            local_classifier.record_decision(
+                "intent", message, intent, "haiku", latency_ms=elapsed_ms
+            )
         else:
             logger.warning(
                 "Intent classifier returned invalid category '%s', defaulting to '%s'",
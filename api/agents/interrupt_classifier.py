@@ -1,7 +1,9 @@
 """Classify user interruptions during plan execution (BL-1018).
 
 Two-stage classification: keyword fast path for clear cases,
-Haiku LLM fallback for ambiguous messages. The classifier returns
+Haiku LLM fallback for ambiguous messages. Cached decisions and confident
+local-classifier predictions (``local_classifier``) skip the Haiku call
+in between. The classifier returns
 a structured InterruptClassification with type, confidence, and
 extracted info specific to the interrupt type.
 """
@@ -17,6 +19,8 @@ from typing import Literal
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from . import local_classifier
+
 logger = logging.getLogger(__name__)
 
 InterruptType = Literal["correction", "stop", "question", "redirect"]
@@ -187,6 +191,14 @@ def _keyword_classify(message: str) -> InterruptClassification | None:
 
 _VALID_TYPES = frozenset(["correction", "stop", "question", "redirect"])
 
+# extracted_info key holding the raw message when no LLM extraction ran
+_DEFAULT_INFO_KEYS = {
+    "correction": "correction",
+    "stop": "reason",
+    "question": "question",
+    "redirect": "new_focus",
+}
+
 
 def _haiku_classify(
     message: str, current_phase: str, plan_context: dict
@@ -282,7 +294,8 @@ def classify_interrupt(
 ) -> InterruptClassification:
     """Classify a user message that arrived during plan execution.
 
-    Two-stage: keyword fast path + Haiku LLM for ambiguous.
+    Keyword fast path, then cached or confident local-classifier results,
+    then Haiku LLM for the remaining ambiguous messages.
 
     Args:
         message: The user's interrupt message.
@@ -300,7 +313,63 @@ def classify_interrupt(
             result.type,
             result.confidence,
         )
+        local_classifier.record_decision(
+            "interrupt",
+            message,
+            result.type,
+            "keyword",
+            {"phase": current_phase or ""},
+            confidence=result.confidence,
+        )
         return result
 
+    context = {"phase": current_phase or ""}
+
+    # Earlier decision for the same normalized message, then local model.
+    # Only the type is cached: messages differing in numbers or punctuation
+    # share a key, so extracted info always comes from this message
+    cached = local_classifier.get_cached("interrupt", message, context)
+    if cached is not None:
+        itype, confidence = cached
+        return InterruptClassification(
+            type=itype,
+            confidence=confidence,
+            extracted_info={_DEFAULT_INFO_KEYS[itype]: message},
+        )
+
+    local = local_classifier.classify_local("interrupt", message, context)
+    if local is not None and local[0] in _VALID_TYPES:
+        itype, confidence = local
+        logger.info(
+            "Interrupt classified locally: type=%s, confidence=%.2f",
+            itype,
+            confidence,
+        )
+        local_classifier.record_decision(
+            "interrupt", message, itype, "local", context, confidence=confidence
+        )
+        return InterruptClassification(
+            type=itype,
+            confidence=confidence,
+            extracted_info={_DEFAULT_INFO_KEYS[itype]: message},
+        )
+
     # Stage 2: Haiku classification (for ambiguous messages)
-    return _haiku_classify(message, current_phase, plan_context)
+    start = time.monotonic()
+    result = _haiku_classify(message, current_phase, plan_context)
+    if result.confidence >= 0.75:  # below that Haiku failed or was unparseable
+        local_classifier.store_cached(
+            "interrupt",
+            message,
+            context,
+            (result.type, result.confidence),
+        )
+        local_classifier.record_decision(
+            "interrupt",
+            message,
+            result.type,
+            "haiku",
+            context,
+            latency_ms=(time.monotonic() - start) * 1000,
+        )
+    return result
@@ -0,0 +1,623 @@
+"""Local CPU-only message classifier with a result cache.
+
+Sits between the keyword fast paths and the Haiku fallbacks of the router
+(chat vs planner), the intent classifier and the interrupt classifier:
+
+  1. ``ResultCache`` — normalized message + context -> earlier decision.
+  2. ``LocalClassifier`` — multinomial logistic regression over hashed
+     word, bigram and character-trigram features. A prediction is only
+     used when its probability clears the model's confidence threshold.
+  3. Haiku, whose answer is cached and, with ``ROUTE_DECISION_LOG`` on,
+     logged to ``route_decisions`` (migration 058) as training data for
+     the next model.
+
+The cache only holds labels (and confidence): messages that differ in
+numbers or punctuation share a key, so nothing read from the message
+itself may be cached.
+
+Models are plain JSON files (``<task>.json``) in ``LOCAL_CLASSIFIER_DIR``,
+produced by ``scripts/train_route_classifier.py`` and evaluated against
+the logged Haiku decisions by ``scripts/eval_route_classifier.py``. When
+no model file exists the classifier is skipped and behaviour is unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+TASKS = ("route", "intent", "interrupt")
+
+MODEL_FORMAT = "hashed-lr-v1"
+
+# Hashed feature space per model
+FEATURE_DIM = 1 << 16
+
+# Relative weight of character trigrams vs. whole words
+_TRIGRAM_WEIGHT = 0.35
+
+# Cached decisions per process (shared by all tasks)
+CACHE_MAX_ENTRIES = 4096
+
+# Stored message text is truncated to this many characters
+LOG_MESSAGE_MAX_CHARS = 500
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_DIGITS_RE = re.compile(r"\d+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+# ---------------------------------------------------------------------------
+# Features
+# ---------------------------------------------------------------------------
+
+
+def normalize_message(text: str) -> str:
+    """Canonical form used for cache keys, features and the decision log.
+
+    Lowercases, collapses whitespace, maps digit runs to ``0`` and drops
+    trailing ``.``/``!`` so trivial variants share one cache entry.
+    """
+    text = _SPACE_RE.sub(" ", (text or "").lower()).strip()
+    text = _DIGITS_RE.sub("0", text)
+    return text.rstrip(".! ")
+
+
+def _bucket(feature: str) -> int:
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % FEATURE_DIM
+
+
+def extract_features(text: str, context: dict | None = None) -> dict[int, float]:
+    """Hash a message (and its routing context) into a sparse vector.
+
+    Features: word unigrams and bigrams, the first two words, character
+    trigrams, a question flag, a length bucket and one ``key=value`` token
+    per context entry. The vector is L2-normalised.
+    """
+    norm = normalize_message(text)
+    words = _WORD_RE.findall(norm)
+    raw: dict[str, float] = {}
+
+    def add(feature, weight=1.0):
+        raw[feature] = raw.get(feature, 0.0) + weight
+
+    for word in words:
+        add("w:" + word)
+    for a, b in zip(words, words[1:]):
+        add("b:" + a + "_" + b)
+    if words:
+        add("first:" + words[0])
+        add("first2:" + "_".join(words[:2]))
+    padded = " " + norm + " "
+    for i in range(len(padded) - 2):
+        add("c:" + padded[i : i + 3], _TRIGRAM_WEIGHT)
+    if norm.endswith("?"):
+        add("q:1")
+    add("len:{}".format(min(len(words), 24) // 4))
+    for key, value in sorted((context or {}).items()):
+        add("ctx:{}={}".format(key, str(value).lower()))
+
+    vec: dict[int, float] = {}
+    for feature, weight in raw.items():
+        b = _bucket(feature)
+        # Sublinear term frequency: repeated words add log-weight
+        vec[b] = vec.get(b, 0.0) + (1.0 + math.log(weight) if weight > 1 else weight)
+    norm_l2 = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+    return {b: v / norm_l2 for b, v in vec.items()}
+
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+
+
+def _softmax(scores: list[float]) -> list[float]:
+    top = max(scores)
+    exps = [math.exp(s - top) for s in scores]
+    total = sum(exps)
+    return [e / total for e in exps]
+
+
+class LocalClassifier:
+    """Multinomial logistic regression over hashed sparse features."""
+
+    def __init__(
+        self,
+        task: str,
+        labels: list[str],
+        weights: dict[int, list[float]] | None = None,
+        bias: list[float] | None = None,
+        threshold: float = 0.9,
+        meta: dict | None = None,
+    ):
+        self.task = task
+        self.labels = list(labels)
+        self.weights = weights or {}
+        self.bias = bias or [0.0] * len(self.labels)
+        self.threshold = threshold
+        self.meta = meta or {}
+
+    def probabilities(self, text: str, context: dict | None = None) -> list[float]:
+        scores = list(self.bias)
+        for b, x in extract_features(text, context).items():
+            row = self.weights.get(b)
+            if row is not None:
+                for k, w in enumerate(row):
+                    scores[k] += w * x
+        return _softmax(scores)
+
+    def predict(self, text: str, context: dict | None = None) -> tuple[str, float]:
+        """Return ``(label, probability)`` of the most likely label."""
+        probs = self.probabilities(text, context)
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return self.labels[best], probs[best]
+
+    # -- persistence --------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        return {
+            "format": MODEL_FORMAT,
+            "task": self.task,
+            "labels": self.labels,
+            "threshold": self.threshold,
+            "bias": [round(b, 6) for b in self.bias],
+            "weights": {
+                str(b): [round(w, 6) for w in row] for b, row in self.weights.items()
+            },
+            "meta": self.meta,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LocalClassifier":
+        if data.get("format") != MODEL_FORMAT:
+            raise ValueError("Unsupported model format: {}".format(data.get("format")))
+        return cls(
+            task=data["task"],
+            labels=data["labels"],
+            weights={int(b): row for b, row in data["weights"].items()},
+            bias=data["bias"],
+            threshold=float(data.get("threshold", 0.9)),
+            meta=data.get("meta") or {},
+        )
+
+    def save(self, path: str) -> None:
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "LocalClassifier":
+        with open(path, encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
+
+
+def _fit(task, labels, vectors, targets, epochs, learning_rate, l2, seed):
+    index = {label: k for k, label in enumerate(labels)}
+    weights: dict[int, list[float]] = {}
+    bias = [0.0] * len(labels)
+    order = list(range(len(vectors)))
+    rng = random.Random(seed)
+    for epoch in range(epochs):
+        rng.shuffle(order)
+        rate = learning_rate / (1.0 + epoch * 0.2)
+        for i in order:
+            vec = vectors[i]
+            scores = list(bias)
+            for b, x in vec.items():
+                row = weights.get(b)
+                if row is not None:
+                    for k, w in enumerate(row):
+                        scores[k] += w * x
+            probs = _softmax(scores)
+            probs[index[targets[i]]] -= 1.0  # gradient of the log-loss
+            for k, g in enumerate(probs):
+                bias[k] -= rate * g
+            for b, x in vec.items():
+                row = weights.setdefault(b, [0.0] * len(labels))
+                for k, g in enumerate(probs):
+                    row[k] -= rate * (g * x + l2 * row[k])
+    return LocalClassifier(task, labels, weights, bias)
+
+
+def choose_threshold(
+    model: LocalClassifier, examples: list[tuple], target_accuracy: float
+) -> float:
+    """Lowest confidence threshold whose covered predictions reach
+    ``target_accuracy`` on ``examples``; 1.0 (never answer) if none does."""
+    scored = sorted(
+        ((model.predict(text, context), label) for text, context, label in examples),
+        key=lambda item: -item[0][1],
+    )
+    best = 1.0
+    correct = 0
+    for n, ((predicted, confidence), label) in enumerate(scored, start=1):
+        correct += predicted == label
+        if correct / n >= target_accuracy:
+            best = confidence
+    return round(min(best, 1.0), 4)
+
+
+def train(
+    task: str,
+    examples: list[tuple],
+    target_accuracy: float = 0.95,
+    holdout: float = 0.2,
+    epochs: int = 15,
+    learning_rate: float = 0.5,
+    l2: float = 1e-5,
+    seed: int = 7,
+) -> LocalClassifier:
+    """Train a classifier from ``(text, context, label)`` examples.
+
+    The confidence threshold is picked on a held-out split so that the
+    predictions the model answers itself reach ``target_accuracy``; the
+    final model is then refit on all examples.
+    """
+    if not examples:
+        raise ValueError("No training examples")
+    labels = sorted({label for _, _, label in examples})
+    if len(labels) < 2:
+        raise ValueError("Need at least two labels, got {}".format(labels))
+
+    shuffled = list(examples)
+    random.Random(seed).shuffle(shuffled)
+    split = int(len(shuffled) * (1 - holdout)) if holdout else len(shuffled)
+    train_part, test_part = shuffled[:split], shuffled[split:]
+
+    def fit(part):
+        return _fit(
+            task,
+            labels,
+            [extract_features(text, context) for text, context, _ in part],
+            [label for _, _, label in part],
+            epochs,
+            learning_rate,
+            l2,
+            seed,
+        )
+
+    threshold = 0.9
+    if test_part:
+        threshold = choose_threshold(fit(train_part), test_part, target_accuracy)
+    model = fit(shuffled)
+    model.threshold = threshold
+    model.meta = {
+        "examples": len(examples),
+        "holdout": len(test_part),
+        "target_accuracy": target_accuracy,
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+    }
+    return model
+
+
+def evaluate(
+    model: LocalClassifier, examples: list[tuple], threshold: float | None = None
+) -> dict:
+    """Score ``model`` against labelled ``(text, context, label)`` examples.
+
+    Returns:
+        Dict with overall ``accuracy``, ``coverage`` (share of examples at
+        or above the threshold), ``accuracy_at_threshold``, per-label
+        precision/recall and prediction latency percentiles (ms).
+    """
+    threshold = model.threshold if threshold is None else threshold
+    latencies = []
+    correct = covered = covered_correct = 0
+    per_label = {
+        label: {"tp": 0, "predicted": 0, "actual": 0} for label in model.labels
+    }
+    for text, context, label in examples:
+        start = time.perf_counter()
+        predicted, confidence = model.predict(text, context)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hit = predicted == label
+        correct += hit
+        if confidence >= threshold:
+            covered += 1
+            covered_correct += hit
+        per_label[predicted]["predicted"] += 1
+        if label in per_label:
+            per_label[label]["actual"] += 1
+            per_label[label]["tp"] += hit
+
+    latencies.sort()
+    total = len(examples)
+
+    def pct(p):
+        if not latencies:
+            return 0.0
+        return round(latencies[min(total - 1, int(p * total))], 3)
+
+    return {
+        "examples": total,
+        "threshold": threshold,
+        "accuracy": round(correct / total, 4) if total else 0.0,
+        "coverage": round(covered / total, 4) if total else 0.0,
+        "accuracy_at_threshold": (
+            round(covered_correct / covered, 4) if covered else 0.0
+        ),
+        "latency_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": pct(1.0)},
+        "labels": {
+            label: {
+                "precision": round(s["tp"] / s["predicted"], 4)
+                if s["predicted"]
+                else 0.0,
+                "recall": round(s["tp"] / s["actual"], 4) if s["actual"] else 0.0,
+                "support": s["actual"],
+            }
+            for label, s in per_label.items()
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Result cache
+# ---------------------------------------------------------------------------
+
+
+class ResultCache:
+    """Thread-safe LRU of classification results."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+_cache = ResultCache()
+
+
+def cache_key(task: str, text: str, context: dict | None = None) -> tuple:
+    return (task, normalize_message(text), tuple(sorted((context or {}).items())))
+
+
+def get_cached(task: str, text: str, context: dict | None = None):
+    return _cache.get(cache_key(task, text, context))
+
+
+def store_cached(task: str, text: str, context: dict | None, value) -> None:
+    _cache.put(cache_key(task, text, context), value)
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+def cache_stats() -> dict:
+    return {"entries": len(_cache), "hits": _cache.hits, "misses": _cache.misses}
+
+
+# ---------------------------------------------------------------------------
+# Model loading and classification
+# ---------------------------------------------------------------------------
+
+_models_lock = threading.Lock()
+_models: dict[str, tuple[float, LocalClassifier | None]] = {}  # path -> (mtime, model)
+
+
+def _setting(name: str, default=None):
+    try:
+        from flask import current_app, has_app_context
+
+        if has_app_context():
+            return current_app.config.get(name, default)
+    except ImportError:
+        pass
+    return os.environ.get(name, default)
+
+
+def model_path(task: str) -> str | None:
+    directory = _setting("LOCAL_CLASSIFIER_DIR") or ""
+    if not directory:
+        return None
+    return os.path.join(directory, "{}.json".format(task))
+
+
+def get_model(task: str) -> LocalClassifier | None:
+    """Return the trained model for ``task``, or None if there is none.
+
+    Files are reloaded when their mtime changes, so a retrained model is
+    picked up without a restart.
+    """
+    path = model_path(task)
+    if not path:
+        return None
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    with _models_lock:
+        cached = _models.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    try:
+        model = LocalClassifier.load(path)
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("Could not load local classifier %s: %s", path, exc)
+        model = None
+    with _models_lock:
+        _models[path] = (mtime, model)
+    return model
+
+
+def reset_models() -> None:
+    with _models_lock:
+        _models.clear()
+
+
+def classify_local(
+    task: str, text: str, context: dict | None = None
+) -> tuple[str, float] | None:
+    """Predict with the local model for ``task``.
+
+    Returns:
+        ``(label, confidence)`` when a model exists and its confidence
+        clears the threshold (``LOCAL_CLASSIFIER_THRESHOLD`` overrides the
+        one chosen at training time), otherwise None.
+    """
+    model = get_model(task)
+    if model is None:
+        return None
+    threshold = _setting("LOCAL_CLASSIFIER_THRESHOLD")
+    threshold = float(threshold) if threshold else model.threshold
+    label, confidence = model.predict(text, context)
+    if confidence < threshold:
+        return None
+    return label, confidence
+
+
+# ---------------------------------------------------------------------------
+# Decision log (training data)
+# ---------------------------------------------------------------------------
+
+
+def record_decision(
+    task: str,
+    message: str,
+    label: str,
+    source: str,
+    context: dict | None = None,
+    confidence: float | None = None,
+    latency_ms: float | None = None,
+    tenant_id: str | None = None,
+) -> None:
+    """Add a ``route_decisions`` row to the current session.
+
+    Best-effort and only inside an app context with ``ROUTE_DECISION_LOG``
+    enabled (off by default: rows hold normalized user message text); the
+    caller's commit persists it (like ``log_llm_usage``).
+    """
+    try:
+        from flask import current_app, has_app_context
+
+        if not has_app_context() or not current_app.config.get("ROUTE_DECISION_LOG"):
+            return
+        from ..models import RouteDecisionLog, db
+
+        db.session.add(
+            RouteDecisionLog(
+                tenant_id=tenant_id or None,
+                task=task,
+                message=normalize_message(message)[:LOG_MESSAGE_MAX_CHARS],
+                context=context or {},
+                label=label,
+                source=source,
+                confidence=confidence,
+                latency_ms=int(latency_ms) if latency_ms is not None else None,
+            )
+        )
+    except Exception:
+        logger.debug("Could not record route decision", exc_info=True)
+
+
+def _parse_context(value) -> dict:
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return {}
+    return value if isinstance(value, dict) else {}
+
+
+def _majority(rows) -> list[tuple]:
+    """Collapse repeated (message, context) pairs to their most common label."""
+    votes: dict[tuple, dict[str, int]] = {}
+    contexts: dict[tuple, dict] = {}
+    for message, context, label in rows:
+        key = (message, json.dumps(context, sort_keys=True))
+        contexts[key] = context
+        counts = votes.setdefault(key, {})
+        counts[label] = counts.get(label, 0) + 1
+    return [
+        (key[0], contexts[key], max(counts, key=counts.get))
+        for key, counts in votes.items()
+    ]
+
+
+def load_logged_examples(
+    task: str, sources=("keyword", "haiku"), since=None
+) -> list[tuple]:
+    """Training/evaluation examples from ``route_decisions``.
+
+    Rows labelled by the local model itself are excluded by default so a
+    model never learns from its own output.
+
+    Returns:
+        ``(message, context, label)`` tuples, one per distinct message and
+        context (majority label).
+    """
+    from sqlalchemy import bindparam
+
+    from ..models import db
+
+    sql = (
+        "SELECT message, context, label FROM route_decisions "
+        "WHERE task = :task AND source IN :sources"
+    )
+    params = {"task": task, "sources": list(sources)}
+    if since is not None:
+        sql += " AND created_at >= :since"
+        params["since"] = since
+    stmt = db.text(sql).bindparams(bindparam("sources", expanding=True))
+    rows = db.session.execute(stmt, params).fetchall()
+    return _majority((r[0], _parse_context(r[1]), r[2]) for r in rows)
+
+
+def read_jsonl_examples(path: str, task: str) -> list[tuple]:
+    """Examples from a JSONL export (``task``, ``message``, ``context``,
+    ``label`` per line); lines for other tasks are skipped."""
+    rows = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if item.get("task", task) != task:
+                continue
+            rows.append(
+                (
+                    normalize_message(item["message"]),
+                    _parse_context(item.get("context")),
+                    item["label"],
+                )
+            )
+    return _majority(rows)
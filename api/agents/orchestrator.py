@@ -92,6 +92,10 @@ def copilot_node(state: AgentState) -> dict:
         "messages": result_state.get("messages", []),
         "total_input_tokens": result_state.get("total_input_tokens", 0),
         "total_output_tokens": result_state.get("total_output_tokens", 0),
+        "total_cache_read_tokens": result_state.get("total_cache_read_tokens", 0),
+        "total_cache_creation_tokens": result_state.get(
+            "total_cache_creation_tokens", 0
+        ),
         "total_cost_usd": result_state.get("total_cost_usd", "0"),
         "active_agent": "copilot",
     }
@@ -127,6 +131,10 @@ def strategy_node(state: AgentState) -> dict:
         "messages": result_state.get("messages", []),
         "total_input_tokens": result_state.get("total_input_tokens", 0),
         "total_output_tokens": result_state.get("total_output_tokens", 0),
+        "total_cache_read_tokens": result_state.get("total_cache_read_tokens", 0),
+        "total_cache_creation_tokens": result_state.get(
+            "total_cache_creation_tokens", 0
+        ),
         "total_cost_usd": result_state.get("total_cost_usd", "0"),
         "active_agent": "strategy",
         "section_completeness": result_state.get("section_completeness"),
@@ -159,6 +167,10 @@ def research_node(state: AgentState) -> dict:
         "messages": result_state.get("messages", []),
         "total_input_tokens": result_state.get("total_input_tokens", 0),
         "total_output_tokens": result_state.get("total_output_tokens", 0),
+        "total_cache_read_tokens": result_state.get("total_cache_read_tokens", 0),
+        "total_cache_creation_tokens": result_state.get(
+            "total_cache_creation_tokens", 0
+        ),
         "total_cost_usd": result_state.get("total_cost_usd", "0"),
         "active_agent": "research",
         "research_results": result_state.get("research_results"),
@@ -191,6 +203,10 @@ def enrichment_node(state: AgentState) -> dict:
         "messages": result_state.get("messages", []),
         "total_input_tokens": result_state.get("total_input_tokens", 0),
         "total_output_tokens": result_state.get("total_output_tokens", 0),
+        "total_cache_read_tokens": result_state.get("total_cache_read_tokens", 0),
+        "total_cache_creation_tokens": result_state.get(
+            "total_cache_creation_tokens", 0
+        ),
         "total_cost_usd": result_state.get("total_cost_usd", "0"),
         "active_agent": "enrichment",
     }
@@ -222,6 +238,10 @@ def outreach_node(state: AgentState) -> dict:
         "messages": result_state.get("messages", []),
         "total_input_tokens": result_state.get("total_input_tokens", 0),
         "total_output_tokens": result_state.get("total_output_tokens", 0),
+        "total_cache_read_tokens": result_state.get("total_cache_read_tokens", 0),
+        "total_cache_creation_tokens": result_state.get(
+            "total_cache_creation_tokens", 0
+        ),
         "total_cost_usd": result_state.get("total_cost_usd", "0"),
         "active_agent": "outreach",
     }
@@ -0,0 +1,95 @@
+"""Guard against unbounded ORM loads in agent tool handlers.
+
+A tool handler that does ``Model.query.filter_by(tenant_id=...).all()``
+materialises every row of the tenant as an ORM object; on a 100k-company
+tenant one chat question allocates hundreds of MB. Handlers run inside
+``limit_orm_loads``, which counts instances loaded into any session and
+raises ``OrmLoadLimitExceeded`` once the budget is spent, so the load is
+aborted part-way instead of completing. Aggregates, column projections
+(``db.text`` / ``session.query(Model.col)``) and ``LIMIT``-ed queries are
+not affected.
+"""
+
+from __future__ import annotations
+
+import contextvars
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# ORM instances a single tool call may load (TOOL_MAX_ORM_ROWS overrides)
+DEFAULT_MAX_ROWS = 1000
+
+
+class OrmLoadLimitExceeded(RuntimeError):
+    """A tool handler loaded more ORM rows than its budget allows."""
+
+
+class _Budget:
+    __slots__ = ("label", "limit", "loaded")
+
+    def __init__(self, label: str, limit: int):
+        self.label = label
+        self.limit = limit
+        self.loaded = 0
+
+
+_budget: contextvars.ContextVar[_Budget | None] = contextvars.ContextVar(
+    "orm_load_budget", default=None
+)
+
+
+@event.listens_for(Session, "loaded_as_persistent")
+def _count_load(session, instance):
+    budget = _budget.get()
+    if budget is None:
+        return
+    budget.loaded += 1
+    if budget.loaded > budget.limit:
+        raise OrmLoadLimitExceeded(
+            "Tool '{}' loaded more than {} {} rows through the ORM; use an "
+            "aggregate query, a column projection or a LIMIT".format(
+                budget.label, budget.limit, type(instance).__name__
+            )
+        )
+
+
+def _configured_limit(app=None) -> int:
+    if app is not None:
+        return int(app.config.get("TOOL_MAX_ORM_ROWS", DEFAULT_MAX_ROWS))
+    try:
+        from flask import current_app, has_app_context
+
+        if has_app_context():
+            return int(current_app.config.get("TOOL_MAX_ORM_ROWS", DEFAULT_MAX_ROWS))
+    except ImportError:
+        pass
+    return DEFAULT_MAX_ROWS
+
+
+@contextmanager
+def limit_orm_loads(label: str, max_rows: int | None = None, app=None):
+    """Cap the ORM instances loaded while the block runs.
+
+    Args:
+        label: Tool name, used in the error message.
+        max_rows: Budget; defaults to ``TOOL_MAX_ORM_ROWS``. 0 disables
+            the guard.
+        app: Flask app whose config holds ``TOOL_MAX_ORM_ROWS``, for
+            callers that enter the guard before pushing its app context
+            (default: the current app, if any).
+
+    Raises:
+        OrmLoadLimitExceeded: From inside the block, on the first row over
+            the budget.
+    """
+    limit = _configured_limit(app) if max_rows is None else max_rows
+    if limit <= 0:
+        yield
+        return
+    token = _budget.set(_Budget(label, limit))
+    try:
+        yield
+    finally:
+        _budget.reset(token)
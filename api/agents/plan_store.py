@@ -0,0 +1,432 @@
+"""Shared persistence for in-flight planner state.
+
+Planner turns can be resumed by a later request (``planner_interrupt``),
+which may land on a different gunicorn worker. Plan state therefore lives
+behind a small store interface with two backends:
+
+- ``DbPlanStore``: ``planner_states`` table (migration 049), shared by all
+  workers. Writes use a version column for optimistic concurrency so two
+  requests resuming the same plan cannot silently overwrite each other.
+  Statements run on their own connection so checkpoints never commit or
+  roll back the request session, and every row is scoped to its tenant.
+- ``MemoryPlanStore``: process-local LRU, used for tests and as the
+  fallback outside an app context.
+
+Both evict entries after a TTL so abandoned plans do not accumulate.
+State is serialized compactly: LangChain messages via ``messages_to_dict``,
+private keys (``_app`` etc.) dropped, JSON without whitespace, zlib-compressed.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from langchain_core.messages import messages_from_dict, messages_to_dict
+
+logger = logging.getLogger(__name__)
+
+# Abandoned plans are evicted after this long without a write
+DEFAULT_TTL_SECONDS = 6 * 3600
+
+# Maximum plans held by the in-memory backend before LRU eviction
+DEFAULT_MAX_ENTRIES = 512
+
+
+class PlanConflictError(Exception):
+    """Raised when a plan was modified by another request since it was loaded."""
+
+
+@dataclass
+class StoredPlan:
+    """A plan state snapshot together with its concurrency version."""
+
+    state: dict
+    version: int
+
+
+# ---------------------------------------------------------------------------
+# Serialization
+# ---------------------------------------------------------------------------
+
+
+def _strip_private(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            k: _strip_private(v)
+            for k, v in value.items()
+            if not (isinstance(k, str) and k.startswith("_"))
+        }
+    return value
+
+
+def serialize_state(state: dict) -> bytes:
+    """Serialize a PlannerState dict to compressed bytes."""
+    payload = {}
+    for key, value in state.items():
+        if key.startswith("_"):
+            continue
+        if key == "messages":
+            payload[key] = messages_to_dict(list(value or []))
+        else:
+            payload[key] = _strip_private(value)
+    raw = json.dumps(payload, separators=(",", ":"), default=str)
+    return zlib.compress(raw.encode("utf-8"), 6)
+
+
+def _state_tenant(state: dict) -> Optional[str]:
+    """Tenant owning a plan, taken from its ``tool_context``."""
+    tenant_id = (state.get("tool_context") or {}).get("tenant_id")
+    return str(tenant_id) if tenant_id is not None else None
+
+
+def deserialize_state(blob: bytes) -> dict:
+    """Inverse of ``serialize_state``."""
+    if isinstance(blob, memoryview):
+        blob = blob.tobytes()
+    state = json.loads(zlib.decompress(blob).decode("utf-8"))
+    if "messages" in state:
+        state["messages"] = messages_from_dict(state["messages"])
+    return state
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+
+class PlanStateStore:
+    """Interface for planner state backends."""
+
+    backend = "base"
+
+    def load(
+        self, thread_id: str, tenant_id: Optional[str] = None
+    ) -> Optional[StoredPlan]:
+        """Return the tenant's live plan for a thread, if any."""
+        raise NotImplementedError
+
+    def save(
+        self,
+        thread_id: str,
+        state: dict,
+        expected_version: Optional[int] = None,
+    ) -> int:
+        """Persist state and return the new version.
+
+        With ``expected_version`` set, the write only succeeds if the stored
+        version still matches; otherwise ``PlanConflictError`` is raised.
+        ``None`` writes unconditionally (starting a fresh plan). The plan
+        belongs to the tenant of ``state["tool_context"]``; a thread held
+        by another tenant raises ``PlanConflictError``.
+        """
+        raise NotImplementedError
+
+    def delete(self, thread_id: str, tenant_id: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def list_active(self) -> dict[str, str]:
+        """Return a mapping of thread_id -> plan_id for live plans."""
+        raise NotImplementedError
+
+    def evict_expired(self) -> int:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        """Return active plan count and serialized state sizes."""
+        raise NotImplementedError
+
+
+class MemoryPlanStore(PlanStateStore):
+    """Process-local LRU store with TTL eviction."""
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # thread_id -> (blob, version, plan_id, written_at, tenant_id)
+        self._entries: OrderedDict[
+            str, tuple[bytes, int, str, float, Optional[str]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expired(self, written_at: float) -> bool:
+        return time.monotonic() - written_at > self.ttl_seconds
+
+    def load(self, thread_id, tenant_id=None):
+        with self._lock:
+            entry = self._entries.get(thread_id)
+            if entry is None or entry[4] != tenant_id:
+                return None
+            blob, version, _plan_id, written_at, _tenant = entry
+            if self._expired(written_at):
+                del self._entries[thread_id]
+                return None
+            self._entries.move_to_end(thread_id)
+        return StoredPlan(state=deserialize_state(blob), version=version)
+
+    def save(self, thread_id, state, expected_version=None):
+        blob = serialize_state(state)
+        tenant_id = _state_tenant(state)
+        with self._lock:
+            current = self._entries.get(thread_id)
+            if current is not None and self._expired(current[3]):
+                current = None
+            if current is not None and current[4] != tenant_id:
+                raise PlanConflictError(
+                    "Thread {} holds a plan of another tenant".format(thread_id)
+                )
+            current_version = current[1] if current else 0
+            if expected_version is not None and current_version != expected_version:
+                raise PlanConflictError(
+                    "Plan for thread {} is at version {}, expected {}".format(
+                        thread_id, current_version, expected_version
+                    )
+                )
+            version = current_version + 1
+            self._entries[thread_id] = (
+                blob,
+                version,
+                state.get("plan_id", "unknown"),
+                time.monotonic(),
+                tenant_id,
+            )
+            self._entries.move_to_end(thread_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return version
+
+    def delete(self, thread_id, tenant_id=None):
+        with self._lock:
+            entry = self._entries.get(thread_id)
+            if entry is not None and entry[4] == tenant_id:
+                del self._entries[thread_id]
+
+    def list_active(self):
+        self.evict_expired()
+        with self._lock:
+            return {tid: entry[2] for tid, entry in self._entries.items()}
+
+    def evict_expired(self):
+        with self._lock:
+            stale = [
+                tid for tid, entry in self._entries.items() if self._expired(entry[3])
+            ]
+            for tid in stale:
+                del self._entries[tid]
+        return len(stale)
+
+    def stats(self):
+        self.evict_expired()
+        with self._lock:
+            sizes = [len(entry[0]) for entry in self._entries.values()]
+        return {
+            "backend": self.backend,
+            "active_plans": len(sizes),
+            "state_bytes_total": sum(sizes),
+            "state_bytes_max": max(sizes, default=0),
+        }
+
+
+class DbPlanStore(PlanStateStore):
+    """``planner_states`` table backend shared across workers.
+
+    Every statement runs on its own connection and transaction, so saving
+    a checkpoint never commits or rolls back the caller's request session.
+    Rows are scoped to the tenant of the plan's ``tool_context``.
+    """
+
+    backend = "db"
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    @staticmethod
+    def _tenant_clause(tenant_id, column="tenant_id"):
+        if tenant_id is None:
+            return column + " IS NULL"
+        return column + " = :tenant"
+
+    def load(self, thread_id, tenant_id=None):
+        from ..models import db
+
+        with db.engine.begin() as conn:
+            row = conn.execute(
+                db.text(
+                    "SELECT state, version FROM planner_states "
+                    "WHERE thread_id = :tid AND expires_at > :now AND "
+                    + self._tenant_clause(tenant_id)
+                ),
+                {"tid": thread_id, "tenant": tenant_id, "now": self._now()},
+            ).fetchone()
+        if row is None:
+            return None
+        return StoredPlan(state=deserialize_state(row[0]), version=row[1])
+
+    def save(self, thread_id, state, expected_version=None):
+        from ..models import db
+
+        blob = serialize_state(state)
+        now = self._now()
+        tenant_id = _state_tenant(state)
+        params = {
+            "tid": thread_id,
+            "tenant": tenant_id,
+            "plan": state.get("plan_id", ""),
+            "state": blob,
+            "size": len(blob),
+            "now": now,
+            "exp": now + timedelta(seconds=self.ttl_seconds),
+        }
+
+        with db.engine.begin() as conn:
+            if expected_version is not None:
+                result = conn.execute(
+                    db.text(
+                        "UPDATE planner_states SET state = :state, "
+                        "state_bytes = :size, plan_id = :plan, "
+                        "version = version + 1, updated_at = :now, expires_at = :exp "
+                        "WHERE thread_id = :tid AND version = :ver AND "
+                        + self._tenant_clause(tenant_id)
+                    ),
+                    dict(params, ver=expected_version),
+                )
+                if result.rowcount == 0:
+                    raise PlanConflictError(
+                        "Plan for thread {} changed since version {}".format(
+                            thread_id, expected_version
+                        )
+                    )
+                return expected_version + 1
+
+            # Fresh plan: replace whatever the tenant had there and bump the
+            # version so a request still holding the old version gets a
+            # conflict. A thread owned by another tenant is left untouched.
+            self._evict_expired(conn, now)
+            row = conn.execute(
+                db.text(
+                    "INSERT INTO planner_states "
+                    "(thread_id, tenant_id, plan_id, state, state_bytes, version, "
+                    "updated_at, expires_at) "
+                    "VALUES (:tid, :tenant, :plan, :state, :size, 1, :now, :exp) "
+                    "ON CONFLICT (thread_id) DO UPDATE SET "
+                    "plan_id = excluded.plan_id, state = excluded.state, "
+                    "state_bytes = excluded.state_bytes, "
+                    "version = planner_states.version + 1, "
+                    "updated_at = excluded.updated_at, "
+                    "expires_at = excluded.expires_at "
+                    "WHERE "
+                    + self._tenant_clause(tenant_id, "planner_states.tenant_id")
+                    + " RETURNING version"
+                ),
+                params,
+            ).fetchone()
+        if row is None:
+            raise PlanConflictError(
+                "Thread {} holds a plan of another tenant".format(thread_id)
+            )
+        return row[0]
+
+    def delete(self, thread_id, tenant_id=None):
+        from ..models import db
+
+        with db.engine.begin() as conn:
+            conn.execute(
+                db.text(
+                    "DELETE FROM planner_states WHERE thread_id = :tid AND "
+                    + self._tenant_clause(tenant_id)
+                ),
+                {"tid": thread_id, "tenant": tenant_id},
+            )
+
+    def list_active(self):
+        from ..models import db
+
+        rows = db.session.execute(
+            db.text(
+                "SELECT thread_id, plan_id FROM planner_states WHERE expires_at > :now"
+            ),
+            {"now": self._now()},
+        ).fetchall()
+        return {r[0]: r[1] or "unknown" for r in rows}
+
+    @staticmethod
+    def _evict_expired(conn, now) -> int:
+        from ..models import db
+
+        result = conn.execute(
+            db.text("DELETE FROM planner_states WHERE expires_at <= :now"),
+            {"now": now},
+        )
+        return result.rowcount or 0
+
+    def evict_expired(self):
+        from ..models import db
+
+        with db.engine.begin() as conn:
+            return self._evict_expired(conn, self._now())
+
+    def stats(self):
+        from ..models import db
+
+        row = db.session.execute(
+            db.text(
+                "SELECT COUNT(*), COALESCE(SUM(state_bytes), 0), "
+                "COALESCE(MAX(state_bytes), 0) "
+                "FROM planner_states WHERE expires_at > :now"
+            ),
+            {"now": self._now()},
+        ).fetchone()
+        return {
+            "backend": self.backend,
+            "active_plans": row[0],
+            "state_bytes_total": int(row[1]),
+            "state_bytes_max": int(row[2]),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Backend selection
+# ---------------------------------------------------------------------------
+
+_memory_store = MemoryPlanStore()
+_db_store: Optional[DbPlanStore] = None
+
+
+def get_plan_store() -> PlanStateStore:
+    """Return the configured plan store.
+
+    ``PLAN_STATE_BACKEND`` selects ``db`` (default) or ``memory``. The DB
+    backend needs an app context; without one the process-local store is
+    used.
+    """
+    global _db_store
+    from flask import current_app, has_app_context
+
+    if not has_app_context():
+        return _memory_store
+
+    backend = current_app.config.get("PLAN_STATE_BACKEND", "db")
+    if backend != "db":
+        return _memory_store
+
+    ttl = int(current_app.config.get("PLAN_STATE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+    if _db_store is None or _db_store.ttl_seconds != ttl:
+        _db_store = DbPlanStore(ttl_seconds=ttl)
+    return _db_store
@@ -1,7 +1,7 @@
 """Bridge between route handlers and the deterministic planner graph.
 
 Provides the entry point for starting and resuming plan execution,
-plus in-memory plan state persistence (upgradeable to Redis/DB later).
+plus plan state persistence through the shared store in ``plan_store``.
 """
 
 from __future__ import annotations
@@ -12,38 +12,62 @@ from typing import Generator, Optional
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from .graph import SSEEvent
+from .plan_store import PlanConflictError, StoredPlan, get_plan_store
 from .planner import build_planner_graph
 
 logger = logging.getLogger(__name__)
 
 
 # ---------------------------------------------------------------------------
-# Plan state persistence (in-memory for now)
+# Plan state persistence (see plan_store for backends)
 # ---------------------------------------------------------------------------
 
-_active_plans: dict[str, dict] = {}  # keyed by thread_id
 
+def _tenant_key(tenant_id) -> Optional[str]:
+    return str(tenant_id) if tenant_id is not None else None
 
-def get_active_plan(thread_id: str) -> Optional[dict]:
-    """Retrieve the active plan state for a thread."""
-    return _active_plans.get(thread_id)
 
+def load_active_plan(thread_id: str, tenant_id=None) -> Optional[StoredPlan]:
+    """Retrieve the tenant's active plan state and its version for a thread."""
+    if not thread_id:
+        return None
+    return get_plan_store().load(thread_id, _tenant_key(tenant_id))
 
-def save_active_plan(thread_id: str, state: dict) -> None:
-    """Persist the active plan state for a thread."""
-    _active_plans[thread_id] = state
 
+def get_active_plan(thread_id: str, tenant_id=None) -> Optional[dict]:
+    """Retrieve the tenant's active plan state for a thread."""
+    stored = load_active_plan(thread_id, tenant_id)
+    return stored.state if stored else None
 
-def clear_active_plan(thread_id: str) -> None:
-    """Remove the active plan state for a thread."""
-    _active_plans.pop(thread_id, None)
+
+def save_active_plan(
+    thread_id: str, state: dict, expected_version: Optional[int] = None
+) -> int:
+    """Persist the active plan state for a thread and return its new version.
+
+    Raises:
+        PlanConflictError: If ``expected_version`` no longer matches.
+    """
+    return get_plan_store().save(thread_id, state, expected_version=expected_version)
+
+
+def clear_active_plan(thread_id: str, tenant_id=None) -> None:
+    """Remove the tenant's active plan state for a thread."""
+    get_plan_store().delete(thread_id, _tenant_key(tenant_id))
 
 
 def list_active_plans() -> dict[str, str]:
     """Return a mapping of thread_id -> plan_id for all active plans."""
-    return {
-        tid: state.get("plan_id", "unknown") for tid, state in _active_plans.items()
-    }
+    return get_plan_store().list_active()
+
+
+def plan_store_stats() -> dict:
+    """Return active plan count and state size metrics for the store."""
+    return get_plan_store().stats()
+
+
+def _plan_finished(state: dict) -> bool:
+    return not state.get("current_phase") or state.get("interrupt_type") == "stop"
 
 
 # ---------------------------------------------------------------------------
@@ -57,18 +81,29 @@ def execute_planner_turn(
     tool_context: dict,
     existing_state: Optional[dict] = None,
     system_prompt: str = "",
+    thread_id: str = "",
+    state_version: Optional[int] = None,
 ) -> Generator[SSEEvent, None, None]:
     """Execute a planner turn, yielding SSEEvent objects for streaming.
 
     If existing_state is provided, resume an active plan by injecting
     the new message as an interrupt. Otherwise, start a new plan.
 
+    When ``thread_id`` is given, the state is checkpointed to the plan
+    store after every node so a concurrent request (possibly on another
+    worker) can resume it, and removed once the plan finishes. Each
+    checkpoint is a versioned write: if another request resumed the plan
+    in the meantime, this turn emits ``plan_superseded`` and stops.
+
     Args:
         message: The user message triggering/resuming the plan.
         plan_config: Serialized Plan dict.
         tool_context: ToolContext-like dict with tenant_id, user_id, etc.
         existing_state: Previously saved planner state for resumption.
         system_prompt: Optional system prompt to prepend.
+        thread_id: Conversation thread to persist plan state under.
+        state_version: Store version of ``existing_state`` (from
+            ``load_active_plan``) used for optimistic concurrency.
 
     Yields:
         SSEEvent objects for streaming to the client.
@@ -78,6 +113,7 @@ def execute_planner_turn(
     if existing_state is not None:
         # Resume: inject the new message as an interrupt
         initial_state = dict(existing_state)
+        initial_state["tool_context"] = tool_context
         initial_state["is_interrupted"] = True
         initial_state["interrupt_message"] = message
         # Add the new message to conversation history
@@ -115,12 +151,30 @@ def execute_planner_turn(
         }
 
     final_state = None
+    version = state_version if existing_state is not None else None
 
     for mode, event in graph.stream(initial_state, stream_mode=["custom", "values"]):
         if mode == "custom" and isinstance(event, SSEEvent):
             yield event
         elif mode == "values":
             final_state = event
+            if thread_id:
+                try:
+                    version = save_active_plan(
+                        thread_id, event, expected_version=version
+                    )
+                except PlanConflictError:
+                    logger.info(
+                        "Plan for thread %s was resumed elsewhere; stopping", thread_id
+                    )
+                    yield SSEEvent(
+                        type="plan_superseded",
+                        data={"plan_id": event.get("plan_id", "")},
+                    )
+                    return
+
+    if thread_id and final_state is not None and _plan_finished(final_state):
+        clear_active_plan(thread_id, (tool_context or {}).get("tenant_id"))
 
     # Build and yield the done event
     if final_state is None:
@@ -8,7 +8,8 @@ Routes incoming messages to the appropriate tier:
 Routing priority:
   1. Active planner check (always wins)
   2. Keyword fast path (~60% of messages, no LLM call)
-  3. Haiku classification (~40% of messages, <500ms)
+  3. Cached decision or confident local classifier (no LLM call)
+  4. Haiku classification (remaining messages, <500ms)
 """
 
 from __future__ import annotations
@@ -22,6 +23,8 @@ from typing import Literal
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from . import local_classifier
+
 logger = logging.getLogger(__name__)
 
 
@@ -100,7 +103,8 @@ def route_message(
     Priority:
       1. If planner is active -> planner_interrupt (always)
       2. Keyword fast path -> deterministic routing (~60%)
-      3. Haiku classification -> chat vs planner (~40%)
+      3. Cached decision / local classifier -> chat vs planner
+      4. Haiku classification -> chat vs planner
 
     Args:
         message: User message text.
@@ -112,11 +116,13 @@ def route_message(
     Returns:
         RouteDecision with target tier and reason.
     """
+    tenant_id = (tenant_context or {}).get("tenant_id")
+
     # 1. Check if planner is active for this thread
     try:
         from .planner_bridge import get_active_plan
 
-        active = get_active_plan(thread_id)
+        active = get_active_plan(thread_id, tenant_id)
         if active is not None:
             return RouteDecision(
                 target="planner_interrupt",
@@ -127,6 +133,11 @@ def route_message(
         # planner_bridge not yet available (BL-1009 in progress)
         pass
 
+    context = {
+        "page": page_context or "unknown",
+        "strategy": bool((state or {}).get("has_strategy", False)),
+    }
+
     # 2. Keyword fast path
     decision = _keyword_route(message, page_context)
     if decision is not None:
@@ -136,9 +147,39 @@ def route_message(
             decision.target,
             decision.reason,
         )
+        local_classifier.record_decision(
+            "route", message, decision.target, "keyword", context, tenant_id=tenant_id
+        )
         return decision
 
-    # 3. Haiku classification for ambiguous messages
+    # 3. Earlier decision for the same normalized message, then local model
+    cached = local_classifier.get_cached("route", message, context)
+    if cached is not None:
+        return RouteDecision(target=cached, reason="cached_classification")
+
+    local = local_classifier.classify_local("route", message, context)
+    if local is not None:
+        target, confidence = local
+        logger.info(
+            "Router local classified: '%s' -> %s (%.2f)",
+            message[:60],
+            target,
+            confidence,
+        )
+        local_classifier.store_cached("route", message, context, target)
+        local_classifier.record_decision(
+            "route",
+            message,
+            target,
+            "local",
+            context,
+            confidence=confidence,
+            tenant_id=tenant_id,
+        )
+        return RouteDecision(target=target, reason="local_classification")
+
+    # 4. Haiku classification for ambiguous messages
+    start = time.monotonic()
     decision = _haiku_classify(message, page_context, tenant_context, state)
     logger.info(
         "Router Haiku classified: '%s' -> %s (%s)",
@@ -146,6 +187,17 @@ def route_message(
         decision.target,
         decision.reason,
     )
+    if decision.reason == "haiku_classification":
+        local_classifier.store_cached("route", message, context, decision.target)
+        local_classifier.record_decision(
+            "route",
+            message,
+            decision.target,
+            "haiku",
+            context,
+            latency_ms=(time.monotonic() - start) * 1000,
+            tenant_id=tenant_id,
+        )
     return decision
 
 
@@ -20,8 +20,10 @@ class AgentState(TypedDict):
         messages: Conversation history (LangChain message objects).
         tool_context: Execution context for tool handlers (tenant_id, etc.).
         iteration: Current loop iteration (for rate limiting / timeout).
-        total_input_tokens: Accumulated input tokens across all LLM calls.
+        total_input_tokens: Accumulated uncached input tokens across all LLM calls.
         total_output_tokens: Accumulated output tokens across all LLM calls.
+        total_cache_read_tokens: Accumulated prompt-cache read tokens.
+        total_cache_creation_tokens: Accumulated prompt-cache write tokens.
         total_cost_usd: Accumulated cost in USD across all LLM calls.
         model: Model name used for the turn.
         intent: Classified intent from the orchestrator.
@@ -38,6 +40,8 @@ class AgentState(TypedDict):
     iteration: int
     total_input_tokens: int
     total_output_tokens: int
+    total_cache_read_tokens: int
+    total_cache_creation_tokens: int
     total_cost_usd: str
     model: str
     # Multi-agent orchestration fields
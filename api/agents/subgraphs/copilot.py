@@ -23,8 +23,16 @@ from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
 from langgraph.config import get_stream_writer
 from langgraph.graph import END, StateGraph
 
+from ...services.anthropic_client import build_cached_tools
 from ...tools.copilot_tools import COPILOT_TOOL_DEFINITIONS, COPILOT_TOOL_NAMES
-from ..graph import SSEEvent, _estimate_cost, _summarize_output, _truncate
+from ..graph import (
+    SSEEvent,
+    _estimate_cost,
+    _summarize_output,
+    _truncate,
+    _usage_tokens,
+)
+from ..orm_guard import limit_orm_loads
 from ..state import AgentState
 
 logger = logging.getLogger(__name__)
@@ -83,7 +91,7 @@ def copilot_agent_node(state: AgentState) -> dict:
 
     tool_defs = _get_copilot_tool_defs()
     if tool_defs:
-        model = model.bind_tools(tool_defs)
+        model = model.bind_tools(build_cached_tools(tool_defs))
 
     messages = list(state["messages"])
     if not messages or not isinstance(messages[0], SystemMessage):
@@ -92,13 +100,17 @@ def copilot_agent_node(state: AgentState) -> dict:
     response = model.invoke(messages)
 
     # Track usage
-    usage = getattr(response, "usage_metadata", None) or {}
-    input_tokens = usage.get("input_tokens", 0)
-    output_tokens = usage.get("output_tokens", 0)
-    cost = _estimate_cost(model_name, input_tokens, output_tokens)
+    input_tokens, output_tokens, cache_read, cache_creation = _usage_tokens(response)
+    cost = _estimate_cost(
+        model_name, input_tokens, output_tokens, cache_read, cache_creation
+    )
 
     new_total_input = state.get("total_input_tokens", 0) + input_tokens
     new_total_output = state.get("total_output_tokens", 0) + output_tokens
+    new_total_cache_read = state.get("total_cache_read_tokens", 0) + cache_read
+    new_total_cache_creation = (
+        state.get("total_cache_creation_tokens", 0) + cache_creation
+    )
     new_total_cost = str(Decimal(state.get("total_cost_usd", "0")) + Decimal(str(cost)))
 
     # Emit text chunks
@@ -120,6 +132,8 @@ def copilot_agent_node(state: AgentState) -> dict:
         "iteration": state.get("iteration", 0) + 1,
         "total_input_tokens": new_total_input,
         "total_output_tokens": new_total_output,
+        "total_cache_read_tokens": new_total_cache_read,
+        "total_cache_creation_tokens": new_total_cache_creation,
         "total_cost_usd": new_total_cost,
         "active_agent": "copilot",
     }
@@ -205,11 +219,12 @@ def copilot_tools_node(state: AgentState) -> dict:
 
         try:
             app = tool_context_dict.get("_app")
-            if app is not None:
-                with app.app_context():
+            with limit_orm_loads(tool_name, app=app):
+                if app is not None:
+                    with app.app_context():
+                        result = handler(tool_input, tool_ctx)
+                else:
                     result = handler(tool_input, tool_ctx)
-            else:
-                result = handler(tool_input, tool_ctx)
 
             elapsed_ms = int((time.monotonic() - start) * 1000)
             result_str = json.dumps(result) if result else ""
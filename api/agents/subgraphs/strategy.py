@@ -24,8 +24,16 @@ from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
 from langgraph.config import get_stream_writer
 from langgraph.graph import END, StateGraph
 
+from ...services.anthropic_client import build_cached_tools
 from ...services.tool_registry import ToolContext, get_tool
-from ..graph import SSEEvent, _estimate_cost, _summarize_output, _truncate
+from ..graph import (
+    SSEEvent,
+    _estimate_cost,
+    _summarize_output,
+    _truncate,
+    _usage_tokens,
+)
+from ..orm_guard import limit_orm_loads
 from ..state import AgentState
 
 logger = logging.getLogger(__name__)
@@ -65,7 +73,9 @@ SECTIONS: Executive Summary, Value Proposition & Messaging, Competitive Position
 def _get_strategy_tool_defs() -> list[dict]:
     """Get Claude API format tool definitions for strategy tools only."""
     defs = []
-    for name in STRATEGY_TOOL_NAMES:
+    # Sorted so the tool block is byte-identical across calls and workers,
+    # which keeps it eligible for prompt caching.
+    for name in sorted(STRATEGY_TOOL_NAMES):
         tool = get_tool(name)
         if tool is not None:
             defs.append(
@@ -91,7 +101,7 @@ def strategy_agent_node(state: AgentState) -> dict:
 
     tool_defs = _get_strategy_tool_defs()
     if tool_defs:
-        model = model.bind_tools(tool_defs)
+        model = model.bind_tools(build_cached_tools(tool_defs))
 
     # Build system message with research context if available
     system_parts = [STRATEGY_AGENT_PROMPT]
@@ -120,13 +130,17 @@ def strategy_agent_node(state: AgentState) -> dict:
     response = model.invoke(messages)
 
     # Track usage
-    usage = getattr(response, "usage_metadata", None) or {}
-    input_tokens = usage.get("input_tokens", 0)
-    output_tokens = usage.get("output_tokens", 0)
-    cost = _estimate_cost(model_name, input_tokens, output_tokens)
+    input_tokens, output_tokens, cache_read, cache_creation = _usage_tokens(response)
+    cost = _estimate_cost(
+        model_name, input_tokens, output_tokens, cache_read, cache_creation
+    )
 
     new_total_input = state.get("total_input_tokens", 0) + input_tokens
     new_total_output = state.get("total_output_tokens", 0) + output_tokens
+    new_total_cache_read = state.get("total_cache_read_tokens", 0) + cache_read
+    new_total_cache_creation = (
+        state.get("total_cache_creation_tokens", 0) + cache_creation
+    )
     new_total_cost = str(Decimal(state.get("total_cost_usd", "0")) + Decimal(str(cost)))
 
     # Emit text chunks
@@ -148,6 +162,8 @@ def strategy_agent_node(state: AgentState) -> dict:
         "iteration": state.get("iteration", 0) + 1,
         "total_input_tokens": new_total_input,
         "total_output_tokens": new_total_output,
+        "total_cache_read_tokens": new_total_cache_read,
+        "total_cache_creation_tokens": new_total_cache_creation,
         "total_cost_usd": new_total_cost,
         "active_agent": "strategy",
     }
@@ -231,11 +247,12 @@ def strategy_tools_node(state: AgentState) -> dict:
 
         try:
             app = tool_context_dict.get("_app")
-            if app is not None:
-                with app.app_context():
+            with limit_orm_loads(tool_name, app=app):
+                if app is not None:
+                    with app.app_context():
+                        result = tool_def.handler(tool_input, tool_ctx)
+                else:
                     result = tool_def.handler(tool_input, tool_ctx)
-            else:
-                result = tool_def.handler(tool_input, tool_ctx)
 
             elapsed_ms = int((time.monotonic() - start) * 1000)
             result_str = json.dumps(result) if result else ""
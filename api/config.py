@@ -34,3 +34,28 @@ class Config:
         + "/.well-known/jwks.json",
     )
     IAM_AUDIENCE = os.environ.get("IAM_AUDIENCE", "leadgen")
+
+    # Planner state store: "db" (shared across workers) or "memory"
+    PLAN_STATE_BACKEND = os.environ.get("PLAN_STATE_BACKEND", "db")
+    PLAN_STATE_TTL_SECONDS = int(os.environ.get("PLAN_STATE_TTL_SECONDS", 6 * 3600))
+
+    # Long-term memory: fuse local-embedding similarity with keyword scores
+    MEMORY_SEMANTIC_RECALL = os.environ.get(
+        "MEMORY_SEMANTIC_RECALL", "false"
+    ).lower() in ("1", "true", "yes")
+
+    # Local message classifier in front of the Haiku router/intent/interrupt
+    # calls: directory of trained <task>.json models (empty = disabled), an
+    # optional confidence threshold override, and decision logging (opt-in:
+    # it stores normalized user message text)
+    LOCAL_CLASSIFIER_DIR = os.environ.get("LOCAL_CLASSIFIER_DIR", "")
+    LOCAL_CLASSIFIER_THRESHOLD = os.environ.get("LOCAL_CLASSIFIER_THRESHOLD", "")
+    ROUTE_DECISION_LOG = os.environ.get("ROUTE_DECISION_LOG", "false").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
+    # ORM instances one agent tool call may load before it is aborted
+    # (agents.orm_guard); 0 disables the guard
+    TOOL_MAX_ORM_ROWS = int(os.environ.get("TOOL_MAX_ORM_ROWS", 1000))
@@ -619,6 +619,23 @@ class ContactEnrichment(db.Model):
     updated_at = db.Column(db.DateTime(timezone=True), server_default=db.text("now()"))
 
 
+class EnrichmentContextBundle(db.Model):
+    """Precomputed message-generation context for a company or contact (migration 057)."""
+
+    __tablename__ = "enrichment_context_bundles"
+
+    entity_type = db.Column(db.Text, primary_key=True)  # company | contact
+    entity_id = db.Column(UUID(as_uuid=False), primary_key=True)
+    tenant_id = db.Column(
+        UUID(as_uuid=False),
+        db.ForeignKey("tenants.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    version = db.Column(db.SmallInteger, nullable=False)
+    bundle = db.Column(JSONB, nullable=False, server_default=db.text("'{}'::jsonb"))
+    built_at = db.Column(db.DateTime(timezone=True), server_default=db.text("now()"))
+
+
 class Contact(db.Model):
     __tablename__ = "contacts"
 
@@ -884,6 +901,8 @@ class LlmUsageLog(db.Model):
     model = db.Column(db.Text, nullable=False)
     input_tokens = db.Column(db.Integer, nullable=False, default=0)
     output_tokens = db.Column(db.Integer, nullable=False, default=0)
+    cache_creation_tokens = db.Column(db.Integer, nullable=False, default=0)
+    cache_read_tokens = db.Column(db.Integer, nullable=False, default=0)
     cost_usd = db.Column(db.Numeric(10, 6), nullable=False, default=0)
     duration_ms = db.Column(db.Integer)
     extra = db.Column("metadata", JSONB, server_default=db.text("'{}'::jsonb"))
@@ -900,6 +919,8 @@ class LlmUsageLog(db.Model):
             "model": self.model,
             "input_tokens": self.input_tokens,
             "output_tokens": self.output_tokens,
+            "cache_creation_tokens": self.cache_creation_tokens or 0,
+            "cache_read_tokens": self.cache_read_tokens or 0,
             "cost_usd": float(self.cost_usd) if self.cost_usd else 0,
             "credits_consumed": self.credits_consumed,
             "duration_ms": self.duration_ms,
@@ -908,6 +929,70 @@ class LlmUsageLog(db.Model):
         }
 
 
+class LlmUsageRollup(db.Model):
+    """Pre-aggregated ``llm_usage_log`` totals per period and dimension key.
+
+    Written by ``services.llm_usage_rollups.compact_usage_rollups``; holds
+    every log row created before ``LlmUsageRollupState.compacted_until``.
+    """
+
+    __tablename__ = "llm_usage_rollups"
+
+    granularity = db.Column(db.String(4), primary_key=True)  # 'hour' | 'day'
+    period_start = db.Column(db.DateTime(timezone=True), primary_key=True)
+    tenant_id = db.Column(UUID(as_uuid=False), primary_key=True)
+    operation = db.Column(db.Text, primary_key=True)
+    provider = db.Column(db.Text, primary_key=True)
+    model = db.Column(db.Text, primary_key=True)
+    calls = db.Column(db.Integer, nullable=False, default=0)
+    cost_usd = db.Column(db.Numeric(14, 6), nullable=False, default=0)
+    input_tokens = db.Column(db.BigInteger, nullable=False, default=0)
+    output_tokens = db.Column(db.BigInteger, nullable=False, default=0)
+    cache_creation_tokens = db.Column(db.BigInteger, nullable=False, default=0)
+    cache_read_tokens = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class LlmUsageRollupState(db.Model):
+    """Single-row watermark: log rows before ``compacted_until`` are rolled up."""
+
+    __tablename__ = "llm_usage_rollup_state"
+
+    id = db.Column(db.Integer, primary_key=True, default=1)
+    compacted_until = db.Column(db.DateTime(timezone=True))
+    updated_at = db.Column(db.DateTime(timezone=True), server_default=db.text("now()"))
+
+
+class TenantCounters(db.Model):
+    """Live per-tenant entity counts, maintained by triggers (migration 054)."""
+
+    __tablename__ = "tenant_counters"
+
+    tenant_id = db.Column(
+        UUID(as_uuid=False),
+        db.ForeignKey("tenants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    contacts = db.Column(db.Integer, nullable=False, server_default=db.text("0"))
+    enriched_contacts = db.Column(
+        db.Integer, nullable=False, server_default=db.text("0")
+    )
+    companies = db.Column(db.Integer, nullable=False, server_default=db.text("0"))
+    l1_enriched_companies = db.Column(
+        db.Integer, nullable=False, server_default=db.text("0")
+    )
+    triage_passed = db.Column(db.Integer, nullable=False, server_default=db.text("0"))
+    triage_disqualified = db.Column(
+        db.Integer, nullable=False, server_default=db.text("0")
+    )
+    messages = db.Column(db.Integer, nullable=False, server_default=db.text("0"))
+    campaigns = db.Column(db.Integer, nullable=False, server_default=db.text("0"))
+    active_campaigns = db.Column(
+        db.Integer, nullable=False, server_default=db.text("0")
+    )
+    updated_at = db.Column(db.DateTime(timezone=True), server_default=db.text("now()"))
+    repaired_at = db.Column(db.DateTime(timezone=True))
+
+
 class NamespaceTokenBudget(db.Model):
     __tablename__ = "namespace_token_budgets"
 
@@ -1017,6 +1102,34 @@ class OAuthConnection(db.Model):
         }
 
 
+class GmailScanCheckpoint(db.Model):
+    """Incremental Gmail scan state, one row per OAuth connection (migration 055)."""
+
+    __tablename__ = "gmail_scan_checkpoints"
+
+    oauth_connection_id = db.Column(
+        UUID(as_uuid=False),
+        db.ForeignKey("oauth_connections.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    tenant_id = db.Column(
+        UUID(as_uuid=False),
+        db.ForeignKey("tenants.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    history_id = db.Column(db.Text, nullable=False)
+    last_internal_date = db.Column(
+        db.BigInteger, nullable=False, server_default=db.text("0")
+    )
+    config_key = db.Column(db.Text, nullable=False, server_default=db.text("''"))
+    contacts = db.Column(JSONB, nullable=False, server_default=db.text("'{}'::jsonb"))
+    messages_scanned = db.Column(
+        db.Integer, nullable=False, server_default=db.text("0")
+    )
+    last_scan_mode = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime(timezone=True), server_default=db.text("now()"))
+
+
 class ResearchAsset(db.Model):
     __tablename__ = "research_assets"
 
@@ -1232,11 +1345,30 @@ class EntityStageCompletion(db.Model):
     status = db.Column(db.Text, nullable=False, default="completed")
     cost_usd = db.Column(db.Numeric(10, 4), default=0)
     error = db.Column(db.Text)
+    duration_ms = db.Column(db.Integer)
     completed_at = db.Column(
         db.DateTime(timezone=True), server_default=db.text("now()")
     )
 
 
+class StageCostModel(db.Model):
+    """Recent per-entity cost/duration samples and their percentiles.
+
+    One row per (scope, stage), where scope is a tenant id or ``global``.
+    Maintained incrementally by ``services.stage_estimates``.
+    """
+
+    __tablename__ = "stage_cost_models"
+
+    scope = db.Column(db.Text, primary_key=True)
+    stage = db.Column(db.Text, primary_key=True)
+    samples = db.Column(JSONB, server_default=db.text("'{}'::jsonb"))
+    stats = db.Column(JSONB, server_default=db.text("'{}'::jsonb"))
+    completions_until = db.Column(db.DateTime(timezone=True))
+    usage_until = db.Column(db.DateTime(timezone=True))
+    updated_at = db.Column(db.DateTime(timezone=True), server_default=db.text("now()"))
+
+
 class EnrichmentConfig(db.Model):
     __tablename__ = "enrichment_configs"
 
@@ -1444,12 +1576,51 @@ class StrategyChatMessage(db.Model):
         }
 
 
+class ConversationSummary(db.Model):
+    """Rolling summary of a strategy chat thread.
+
+    Covers every message up to ``covered_until`` / ``last_message_id``;
+    newer messages are loaded verbatim and folded in incrementally.
+    ``thread_key`` is the thread_start message id, or the document id for
+    a document without thread markers.
+    """
+
+    __tablename__ = "conversation_summaries"
+    __table_args__ = (db.UniqueConstraint("document_id", "thread_key"),)
+
+    id = db.Column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        server_default=db.text("uuid_generate_v4()"),
+    )
+    tenant_id = db.Column(
+        UUID(as_uuid=False), db.ForeignKey("tenants.id"), nullable=False
+    )
+    document_id = db.Column(
+        UUID(as_uuid=False),
+        db.ForeignKey("strategy_documents.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    thread_key = db.Column(db.String(36), nullable=False)
+    summary = db.Column(db.Text, nullable=False)
+    last_message_id = db.Column(UUID(as_uuid=False), nullable=False)
+    covered_until = db.Column(db.DateTime(timezone=True), nullable=False)
+    message_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime(timezone=True), server_default=db.text("now()"))
+
+
 class StrategyVersion(db.Model):
     """Snapshot of a strategy document before an AI edit.
 
-    Enables undo for AI edits. Each snapshot stores the full content and
+    Enables undo for AI edits. Each snapshot holds the content and
     extracted_data at the version *before* the edit was applied.
 
+    Content is stored compactly by ``services.version_store``: ``storage``
+    is ``keyframe`` (compressed text in ``payload``), ``delta`` (compressed
+    diff against the keyframe ``base_id``) or ``full`` (plain text in the
+    ``content`` column). The ``content`` property reconstructs the text;
+    assigning it stores plain text, so only set it on new rows.
+
     Snapshots from the same AI turn share a ``turn_id`` (the assistant
     message UUID), enabling batch undo of multi-tool turns.
     """
@@ -1470,14 +1641,38 @@ class StrategyVersion(db.Model):
         UUID(as_uuid=False), db.ForeignKey("tenants.id"), nullable=False
     )
     version = db.Column(db.Integer, nullable=False)
-    content = db.Column(db.Text)
+    content_text = db.Column("content", db.Text)
     extracted_data = db.Column(JSONB, server_default=db.text("'{}'::jsonb"))
     edit_source = db.Column(db.String(20), nullable=False, default="ai_tool")
     turn_id = db.Column(UUID(as_uuid=False), nullable=True)
     description = db.Column(db.String(255), nullable=True)
     metadata_ = db.Column("metadata", JSONB, server_default=db.text("'{}'::jsonb"))
+    storage = db.Column(db.String(10), nullable=False, default="full")
+    base_id = db.Column(
+        UUID(as_uuid=False), db.ForeignKey("strategy_versions.id"), nullable=True
+    )
+    payload = db.Column(db.LargeBinary, nullable=True)
+    content_hash = db.Column(db.String(64), nullable=True)
+    content_size = db.Column(db.Integer, nullable=True)
     created_at = db.Column(db.DateTime(timezone=True), server_default=db.text("now()"))
 
+    @property
+    def content(self):
+        if self.storage in ("keyframe", "delta"):
+            from .services.version_store import read_content
+
+            return read_content(self)
+        return self.content_text
+
+    @content.setter
+    def content(self, value):
+        self.content_text = value
+        self.storage = "full"
+        self.base_id = None
+        self.payload = None
+        self.content_hash = None
+        self.content_size = None
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -1579,6 +1774,29 @@ class ToolExecution(db.Model):
     )
 
 
+class RouteDecisionLog(db.Model):
+    """Router / intent / interrupt classification decisions (migration 058)."""
+
+    __tablename__ = "route_decisions"
+
+    id = db.Column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        server_default=db.text("uuid_generate_v4()"),
+    )
+    tenant_id = db.Column(
+        UUID(as_uuid=False), db.ForeignKey("tenants.id", ondelete="CASCADE")
+    )
+    task = db.Column(db.Text, nullable=False)  # route | intent | interrupt
+    message = db.Column(db.Text, nullable=False)  # normalized, truncated
+    context = db.Column(JSONB, server_default=db.text("'{}'::jsonb"))
+    label = db.Column(db.Text, nullable=False)
+    source = db.Column(db.Text, nullable=False)  # keyword | haiku | local
+    confidence = db.Column(db.Float)
+    latency_ms = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=db.text("now()"))
+
+
 class PlaybookLog(db.Model):
     __tablename__ = "playbook_logs"
 
@@ -1624,6 +1842,7 @@ class EmailSendLog(db.Model):
     clicked_at = db.Column(db.DateTime(timezone=True))
     click_count = db.Column(db.Integer, default=0)
     error = db.Column(db.Text)
+    idempotency_key = db.Column(db.Text)  # Resend batch key (migration 056)
     created_at = db.Column(db.DateTime(timezone=True), server_default=db.text("now()"))
 
     def to_dict(self):
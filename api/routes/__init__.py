@@ -16,6 +16,7 @@ from .message_routes import messages_bp
 from .oauth_routes import oauth_bp
 from .pipeline_routes import pipeline_bp
 from .playbook_routes import playbook_bp
+from .profiling_routes import profiling_bp
 from .strategy_template_routes import strategy_templates_bp
 from .tenant_routes import tenants_bp
 from .token_routes import token_bp
@@ -40,6 +41,7 @@ def register_blueprints(app):
     app.register_blueprint(imports_bp)
     app.register_blueprint(custom_fields_bp)
     app.register_blueprint(llm_usage_bp)
+    app.register_blueprint(profiling_bp)
     app.register_blueprint(oauth_bp)
     app.register_blueprint(gmail_bp)
     app.register_blueprint(extension_bp)
@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-import uuid
-
 from flask import Blueprint, jsonify, request
 
 from ..auth import require_role, resolve_tenant
 from ..models import db
+from ..services.bulk_assignments import link_entities, unlink_entities
 
 bulk_bp = Blueprint("bulk", __name__)
 
@@ -32,11 +31,15 @@ def _build_entity_query(
     params: dict = {"tenant_id": tenant_id}
 
     if ids:
-        # Explicit IDs mode
-        placeholders = ", ".join(f":id_{i}" for i in range(len(ids)))
-        where.append(f"{alias}.id IN ({placeholders})")
-        for i, eid in enumerate(ids):
-            params[f"id_{i}"] = eid
+        # Explicit IDs mode — one array bind on PostgreSQL
+        if db.engine.dialect.name == "postgresql":
+            where.append(f"{alias}.id = ANY(CAST(:ids AS uuid[]))")
+            params["ids"] = [str(eid) for eid in ids]
+        else:
+            placeholders = ", ".join(f":id_{i}" for i in range(len(ids)))
+            where.append(f"{alias}.id IN ({placeholders})")
+            for i, eid in enumerate(ids):
+                params[f"id_{i}"] = eid
     elif filters:
         # Filter mode — replicate list endpoint filter logic
         if filters.get("tag_name"):
@@ -144,36 +147,14 @@ def bulk_add_tags():
             {"affected": 0, "new_assignments": 0, "already_tagged": 0, "errors": []}
         )
 
-    # Insert into junction table
     junction_table = (
         "contact_tag_assignments"
         if entity_type == "contact"
         else "company_tag_assignments"
     )
-    fk_col = "contact_id" if entity_type == "contact" else "company_id"
-
-    new_count = 0
-    for tag_id in valid_tag_ids:
-        for eid in entity_ids:
-            try:
-                db.session.execute(
-                    db.text(f"""
-                        INSERT INTO {junction_table} (id, tenant_id, {fk_col}, tag_id)
-                        VALUES (:id, :tenant_id, :entity_id, :tag_id)
-                        ON CONFLICT DO NOTHING
-                    """),
-                    {
-                        "id": str(uuid.uuid4()),
-                        "tenant_id": str(tenant_id),
-                        "entity_id": eid,
-                        "tag_id": tag_id,
-                    },
-                )
-                new_count += 1
-            except Exception:
-                pass  # skip conflicts
-
+    new_count = link_entities(junction_table, str(tenant_id), entity_ids, valid_tag_ids)
     db.session.commit()
+
     total = len(entity_ids) * len(valid_tag_ids)
     return jsonify(
         {
@@ -223,27 +204,7 @@ def bulk_remove_tags():
         if entity_type == "contact"
         else "company_tag_assignments"
     )
-    fk_col = "contact_id" if entity_type == "contact" else "company_id"
-
-    # Build DELETE with IN clauses
-    eid_ph = ", ".join(f":eid_{i}" for i in range(len(entity_ids)))
-    tid_ph = ", ".join(f":tid_{i}" for i in range(len(tag_ids)))
-    del_params = {"tenant_id": str(tenant_id)}
-    for i, eid in enumerate(entity_ids):
-        del_params[f"eid_{i}"] = eid
-    for i, tid in enumerate(tag_ids):
-        del_params[f"tid_{i}"] = tid
-
-    result = db.session.execute(
-        db.text(f"""
-            DELETE FROM {junction_table}
-            WHERE tenant_id = :tenant_id
-              AND {fk_col} IN ({eid_ph})
-              AND tag_id IN ({tid_ph})
-        """),
-        del_params,
-    )
-    removed = result.rowcount
+    removed = unlink_entities(junction_table, str(tenant_id), entity_ids, tag_ids)
     db.session.commit()
 
     total = len(entity_ids) * len(tag_ids)
@@ -296,27 +257,11 @@ def bulk_assign_campaign():
     contact_ids = [str(r[0]) for r in entity_rows]
 
     if not contact_ids:
-        return jsonify({"affected": 0, "errors": []})
-
-    new_count = 0
-    for cid in contact_ids:
-        try:
-            db.session.execute(
-                db.text("""
-                    INSERT INTO campaign_contacts (id, campaign_id, contact_id, tenant_id)
-                    VALUES (:id, :campaign_id, :contact_id, :tenant_id)
-                    ON CONFLICT DO NOTHING
-                """),
-                {
-                    "id": str(uuid.uuid4()),
-                    "campaign_id": campaign_id,
-                    "contact_id": cid,
-                    "tenant_id": str(tenant_id),
-                },
-            )
-            new_count += 1
-        except Exception:
-            pass
+        return jsonify({"affected": 0, "already_assigned": 0, "errors": []})
+
+    new_count = link_entities(
+        "campaign_contacts", str(tenant_id), contact_ids, [campaign_id]
+    )
 
     # Update campaign total_contacts count
     db.session.execute(
@@ -329,7 +274,13 @@ def bulk_assign_campaign():
     )
 
     db.session.commit()
-    return jsonify({"affected": new_count, "errors": []})
+    return jsonify(
+        {
+            "affected": new_count,
+            "already_assigned": len(contact_ids) - new_count,
+            "errors": [],
+        }
+    )
 
 
 @bulk_bp.route("/api/contacts/matching-count", methods=["POST"])
@@ -1,9 +1,7 @@
-import csv
-import io
 import json
 import logging
 
-from flask import Blueprint, Response, current_app, g, jsonify, request
+from flask import Blueprint, current_app, g, jsonify, request
 
 from ..auth import require_auth, require_role, resolve_tenant
 from ..display import display_campaign_status, display_tier, display_status
@@ -15,6 +13,14 @@ from ..models import (
     StrategyDocument,
     db,
 )
+from ..services.campaign_analytics import (
+    compute_campaign_analytics,
+    get_cached_analytics,
+    invalidate_campaign_analytics,
+    store_analytics,
+)
+from ..services.csv_export import csv_response, stream_partitions, wants_gzip
+from ..services.csv_export import sanitize_csv_cell as _sanitize_csv_cell
 from ..services.message_generator import estimate_generation_cost, start_generation
 from ..services.send_service import get_send_status, send_campaign_emails
 
@@ -22,6 +28,17 @@ logger = logging.getLogger(__name__)
 
 campaigns_bp = Blueprint("campaigns", __name__)
 
+
+@campaigns_bp.after_request
+def _invalidate_analytics_on_write(response):
+    """Any successful write under a campaign (contacts, generation, review
+    actions, sends) can change its analytics."""
+    campaign_id = (request.view_args or {}).get("campaign_id")
+    if campaign_id and request.method != "GET" and response.status_code < 400:
+        invalidate_campaign_analytics(campaign_id)
+    return response
+
+
 # Valid status transitions
 VALID_TRANSITIONS = {
     "draft": {"ready", "archived"},
@@ -2339,12 +2356,18 @@ def queue_linkedin(campaign_id):
 def campaign_analytics(campaign_id):
     """Return aggregated campaign metrics for the OutreachTab / CampaignAnalytics component.
 
-    Aggregates message counts, sending stats, contact stats, cost, and timeline.
+    Aggregates message counts, sending stats, contact stats, cost, and timeline
+    in a single query; the payload is cached briefly per campaign because the
+    review UI polls this endpoint.
     """
     tenant_id = resolve_tenant()
     if not tenant_id:
         return jsonify({"error": "Tenant not found"}), 404
 
+    cached = get_cached_analytics(tenant_id, campaign_id)
+    if cached is not None:
+        return jsonify(cached)
+
     # Verify campaign exists and belongs to tenant
     campaign_row = db.session.execute(
         db.text("""
@@ -2360,272 +2383,32 @@ def campaign_analytics(campaign_id):
         return jsonify({"error": "Campaign not found"}), 404
 
     gen_config = _parse_jsonb(campaign_row[1]) or {}
-    campaign_created_at = campaign_row[2]
-    generation_started_at = campaign_row[3]
-    generation_completed_at = campaign_row[4]
-
-    # ── Messages aggregation ─────────────────────────────────
-    # By status
-    msg_by_status_rows = db.session.execute(
-        db.text("""
-            SELECT m.status, COUNT(*)
-            FROM messages m
-            JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id
-            WHERE cc.campaign_id = :cid AND cc.tenant_id = :t
-            GROUP BY m.status
-        """),
-        {"cid": campaign_id, "t": tenant_id},
-    ).fetchall()
-    msg_by_status = {r[0]: r[1] for r in msg_by_status_rows}
-    msg_total = sum(msg_by_status.values())
-
-    # By channel
-    msg_by_channel_rows = db.session.execute(
-        db.text("""
-            SELECT m.channel, COUNT(*)
-            FROM messages m
-            JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id
-            WHERE cc.campaign_id = :cid AND cc.tenant_id = :t
-            GROUP BY m.channel
-        """),
-        {"cid": campaign_id, "t": tenant_id},
-    ).fetchall()
-    msg_by_channel = {r[0]: r[1] for r in msg_by_channel_rows}
-
-    # By step
-    msg_by_step_rows = db.session.execute(
-        db.text("""
-            SELECT m.sequence_step, COUNT(*)
-            FROM messages m
-            JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id
-            WHERE cc.campaign_id = :cid AND cc.tenant_id = :t
-            GROUP BY m.sequence_step
-        """),
-        {"cid": campaign_id, "t": tenant_id},
-    ).fetchall()
-    msg_by_step = {str(r[0]): r[1] for r in msg_by_step_rows}
-
-    # ── Email sending stats ──────────────────────────────────
-    email_send_rows = db.session.execute(
-        db.text("""
-            SELECT esl.status, COUNT(*)
-            FROM email_send_log esl
-            JOIN messages m ON esl.message_id = m.id
-            JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id
-            WHERE cc.campaign_id = :cid AND cc.tenant_id = :t
-            GROUP BY esl.status
-        """),
-        {"cid": campaign_id, "t": tenant_id},
-    ).fetchall()
-    email_counts = {r[0]: r[1] for r in email_send_rows}
-    email_total = sum(email_counts.values())
-
-    # ── LinkedIn sending stats ───────────────────────────────
-    li_send_rows = db.session.execute(
-        db.text("""
-            SELECT lsq.status, COUNT(*)
-            FROM linkedin_send_queue lsq
-            JOIN messages m ON lsq.message_id = m.id
-            JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id
-            WHERE cc.campaign_id = :cid AND cc.tenant_id = :t
-            GROUP BY lsq.status
-        """),
-        {"cid": campaign_id, "t": tenant_id},
-    ).fetchall()
-    li_counts = {r[0]: r[1] for r in li_send_rows}
-    li_total = sum(li_counts.values())
-
-    # ── Contact stats ────────────────────────────────────────
-    contact_stats_row = db.session.execute(
-        db.text("""
-            SELECT
-                COUNT(DISTINCT cc.contact_id) AS total,
-                COUNT(DISTINCT CASE WHEN ct.email_address IS NOT NULL AND ct.email_address != '' THEN cc.contact_id END) AS with_email,
-                COUNT(DISTINCT CASE WHEN ct.linkedin_url IS NOT NULL AND ct.linkedin_url != '' THEN cc.contact_id END) AS with_linkedin,
-                COUNT(DISTINCT CASE WHEN
-                    (ct.email_address IS NOT NULL AND ct.email_address != '')
-                    AND (ct.linkedin_url IS NOT NULL AND ct.linkedin_url != '')
-                THEN cc.contact_id END) AS both_channels
-            FROM campaign_contacts cc
-            JOIN contacts ct ON cc.contact_id = ct.id
-            WHERE cc.campaign_id = :cid AND cc.tenant_id = :t
-        """),
-        {"cid": campaign_id, "t": tenant_id},
-    ).fetchone()
-
-    contacts_total = contact_stats_row[0] if contact_stats_row else 0
-    contacts_with_email = contact_stats_row[1] if contact_stats_row else 0
-    contacts_with_linkedin = contact_stats_row[2] if contact_stats_row else 0
-    contacts_both = contact_stats_row[3] if contact_stats_row else 0
-
-    # ── Cost ─────────────────────────────────────────────────
     cost_data = gen_config.get("cost", {})
     generation_cost_usd = (
         float(cost_data.get("generation_usd", 0)) if isinstance(cost_data, dict) else 0
     )
 
-    # Also sum generation_cost_usd from messages as a fallback
-    if generation_cost_usd == 0:
-        cost_row = db.session.execute(
-            db.text("""
-                SELECT COALESCE(SUM(m.generation_cost_usd), 0)
-                FROM messages m
-                JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id
-                WHERE cc.campaign_id = :cid AND cc.tenant_id = :t
-            """),
-            {"cid": campaign_id, "t": tenant_id},
-        ).fetchone()
-        generation_cost_usd = float(cost_row[0]) if cost_row else 0
-
-    # ── Timeline ─────────────────────────────────────────────
-    # First/last send timestamps from email_send_log
-    send_times = db.session.execute(
-        db.text("""
-            SELECT MIN(esl.sent_at), MAX(esl.sent_at)
-            FROM email_send_log esl
-            JOIN messages m ON esl.message_id = m.id
-            JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id
-            WHERE cc.campaign_id = :cid AND cc.tenant_id = :t
-                AND esl.sent_at IS NOT NULL
-        """),
-        {"cid": campaign_id, "t": tenant_id},
-    ).fetchone()
-
-    first_send_at = send_times[0] if send_times else None
-    last_send_at = send_times[1] if send_times else None
-
-    # Also check linkedin_send_queue for first/last send
-    li_send_times = db.session.execute(
-        db.text("""
-            SELECT MIN(lsq.sent_at), MAX(lsq.sent_at)
-            FROM linkedin_send_queue lsq
-            JOIN messages m ON lsq.message_id = m.id
-            JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id
-            WHERE cc.campaign_id = :cid AND cc.tenant_id = :t
-                AND lsq.sent_at IS NOT NULL
-        """),
-        {"cid": campaign_id, "t": tenant_id},
-    ).fetchone()
-
-    if li_send_times and li_send_times[0]:
-        if first_send_at is None or li_send_times[0] < first_send_at:
-            first_send_at = li_send_times[0]
-        if last_send_at is None or li_send_times[1] > last_send_at:
-            last_send_at = li_send_times[1]
-
-    # ── Engagement tracking (opens, replies, bounces, clicks) ──
-    engagement_row = db.session.execute(
-        db.text("""
-            SELECT
-                COUNT(CASE WHEN esl.opened_at IS NOT NULL THEN 1 END) AS opened,
-                COUNT(CASE WHEN esl.replied_at IS NOT NULL THEN 1 END) AS replied,
-                COUNT(CASE WHEN esl.bounced_at IS NOT NULL THEN 1 END) AS bounced,
-                COUNT(CASE WHEN esl.clicked_at IS NOT NULL THEN 1 END) AS clicked,
-                COALESCE(SUM(esl.open_count), 0) AS total_opens,
-                COALESCE(SUM(esl.click_count), 0) AS total_clicks,
-                COUNT(CASE WHEN esl.bounce_type = 'hard' THEN 1 END) AS hard_bounces,
-                COUNT(CASE WHEN esl.bounce_type = 'soft' THEN 1 END) AS soft_bounces
-            FROM email_send_log esl
-            JOIN messages m ON esl.message_id = m.id
-            JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id
-            WHERE cc.campaign_id = :cid AND cc.tenant_id = :t
-        """),
-        {"cid": campaign_id, "t": tenant_id},
-    ).fetchone()
-
-    emails_delivered = email_counts.get("delivered", 0) + email_counts.get("sent", 0)
-    opened_count = int(engagement_row[0]) if engagement_row else 0
-    replied_count = int(engagement_row[1]) if engagement_row else 0
-    bounced_count = int(engagement_row[2]) if engagement_row else 0
-    clicked_count = int(engagement_row[3]) if engagement_row else 0
-    total_opens = int(engagement_row[4]) if engagement_row else 0
-    total_clicks = int(engagement_row[5]) if engagement_row else 0
-    hard_bounces = int(engagement_row[6]) if engagement_row else 0
-    soft_bounces = int(engagement_row[7]) if engagement_row else 0
-
-    def _rate(num, den):
-        if den == 0:
-            return 0
-        return round((num / den) * 100, 1)
-
-    return jsonify(
-        {
-            "messages": {
-                "total": msg_total,
-                "by_status": msg_by_status,
-                "by_channel": msg_by_channel,
-                "by_step": msg_by_step,
-            },
-            "sending": {
-                "email": {
-                    "total": email_total,
-                    "queued": email_counts.get("queued", 0),
-                    "sent": email_counts.get("sent", 0),
-                    "delivered": email_counts.get("delivered", 0),
-                    "bounced": email_counts.get("bounced", 0),
-                    "failed": email_counts.get("failed", 0),
-                },
-                "linkedin": {
-                    "total": li_total,
-                    "queued": li_counts.get("queued", 0),
-                    "sent": li_counts.get("sent", 0),
-                    "delivered": li_counts.get("delivered", 0),
-                    "failed": li_counts.get("failed", 0),
-                },
-            },
-            "contacts": {
-                "total": contacts_total,
-                "with_email": contacts_with_email,
-                "with_linkedin": contacts_with_linkedin,
-                "both_channels": contacts_both,
-            },
-            "cost": {
-                "generation_usd": generation_cost_usd,
-                "email_sends": email_total,
-            },
-            "engagement": {
-                "opened": opened_count,
-                "replied": replied_count,
-                "bounced": bounced_count,
-                "clicked": clicked_count,
-                "total_opens": total_opens,
-                "total_clicks": total_clicks,
-                "hard_bounces": hard_bounces,
-                "soft_bounces": soft_bounces,
-                "open_rate": _rate(opened_count, emails_delivered),
-                "reply_rate": _rate(replied_count, emails_delivered),
-                "bounce_rate": _rate(bounced_count, email_total),
-                "click_rate": _rate(clicked_count, emails_delivered),
-            },
-            "timeline": {
-                "created_at": _format_ts(campaign_created_at),
-                "generation_started_at": _format_ts(generation_started_at),
-                "generation_completed_at": _format_ts(generation_completed_at),
-                "first_send_at": _format_ts(first_send_at),
-                "last_send_at": _format_ts(last_send_at),
-            },
-        }
-    )
-
-
-def _sanitize_csv_cell(value):
-    """Sanitize a cell value to prevent CSV formula injection.
-
-    Dangerous prefixes (=, +, -, @, \\t, \\r) at the start of a cell
-    can trigger formula execution in spreadsheet applications.
-    """
-    if value is None:
-        return ""
-    s = str(value)
-    if s and s[0] in ("=", "+", "-", "@", "\t", "\r"):
-        return "'" + s
-    return s
+    stats = compute_campaign_analytics(campaign_id, tenant_id, generation_cost_usd)
+    first_send_at = stats.pop("first_send_at")
+    last_send_at = stats.pop("last_send_at")
+    stats["timeline"] = {
+        "created_at": _format_ts(campaign_row[2]),
+        "generation_started_at": _format_ts(campaign_row[3]),
+        "generation_completed_at": _format_ts(campaign_row[4]),
+        "first_send_at": _format_ts(first_send_at),
+        "last_send_at": _format_ts(last_send_at),
+    }
+    store_analytics(tenant_id, campaign_id, stats)
+    return jsonify(stats)
 
 
 @campaigns_bp.route("/api/campaigns/<campaign_id>/messages/export-csv", methods=["GET"])
 @require_auth
 def export_messages_csv(campaign_id):
-    """Export approved campaign messages as CSV with formula injection sanitization."""
+    """Export campaign messages as streaming CSV with formula injection sanitization.
+
+    Query: status (default approved, or "all"), gzip=1 for a .csv.gz download.
+    """
     tenant_id = resolve_tenant()
     if not tenant_id:
         return jsonify({"error": "Tenant not found"}), 404
@@ -2651,28 +2434,21 @@ def export_messages_csv(campaign_id):
 
     where_clause = " AND ".join(where)
 
-    rows = db.session.execute(
-        db.text(f"""
-            SELECT
-                ct.first_name, ct.last_name, ct.email_address,
-                ct.linkedin_url, ct.job_title,
-                co.name AS company_name, co.domain,
-                m.channel, m.sequence_step, m.label,
-                m.subject, m.body, m.status, m.tone,
-                m.generation_cost_usd, m.approved_at
-            FROM messages m
-            JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id
-            JOIN contacts ct ON m.contact_id = ct.id
-            LEFT JOIN companies co ON ct.company_id = co.id
-            WHERE {where_clause}
-            ORDER BY ct.last_name, ct.first_name, m.sequence_step
-        """),
-        params,
-    ).fetchall()
-
-    # Build CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
+    sql = f"""
+        SELECT
+            ct.first_name, ct.last_name, ct.email_address,
+            ct.linkedin_url, ct.job_title,
+            co.name AS company_name, co.domain,
+            m.channel, m.sequence_step, m.label,
+            m.subject, m.body, m.status, m.tone,
+            m.generation_cost_usd, m.approved_at
+        FROM messages m
+        JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id
+        JOIN contacts ct ON m.contact_id = ct.id
+        LEFT JOIN companies co ON ct.company_id = co.id
+        WHERE {where_clause}
+        ORDER BY ct.last_name, ct.first_name, m.sequence_step
+    """
 
     headers = [
         "First Name",
@@ -2692,41 +2468,33 @@ def export_messages_csv(campaign_id):
         "Cost (USD)",
         "Approved At",
     ]
-    writer.writerow(headers)
 
-    for r in rows:
-        writer.writerow(
-            [
-                _sanitize_csv_cell(r[0]),  # first_name
-                _sanitize_csv_cell(r[1]),  # last_name
-                _sanitize_csv_cell(r[2]),  # email_address
-                _sanitize_csv_cell(r[3]),  # linkedin_url
-                _sanitize_csv_cell(r[4]),  # job_title
-                _sanitize_csv_cell(r[5]),  # company_name
-                _sanitize_csv_cell(r[6]),  # domain
-                _sanitize_csv_cell(r[7]),  # channel
-                r[8],  # sequence_step
-                _sanitize_csv_cell(r[9]),  # label
-                _sanitize_csv_cell(r[10]),  # subject
-                _sanitize_csv_cell(r[11]),  # body
-                _sanitize_csv_cell(r[12]),  # status
-                _sanitize_csv_cell(r[13]),  # tone
-                f"{r[14]:.4f}" if r[14] else "",  # cost
-                _format_ts(r[15]),  # approved_at
-            ]
-        )
-
-    csv_content = output.getvalue()
-    output.close()
+    def _rows():
+        for partition in stream_partitions(sql, params):
+            for r in partition:
+                yield [
+                    _sanitize_csv_cell(r[0]),  # first_name
+                    _sanitize_csv_cell(r[1]),  # last_name
+                    _sanitize_csv_cell(r[2]),  # email_address
+                    _sanitize_csv_cell(r[3]),  # linkedin_url
+                    _sanitize_csv_cell(r[4]),  # job_title
+                    _sanitize_csv_cell(r[5]),  # company_name
+                    _sanitize_csv_cell(r[6]),  # domain
+                    _sanitize_csv_cell(r[7]),  # channel
+                    r[8],  # sequence_step
+                    _sanitize_csv_cell(r[9]),  # label
+                    _sanitize_csv_cell(r[10]),  # subject
+                    _sanitize_csv_cell(r[11]),  # body
+                    _sanitize_csv_cell(r[12]),  # status
+                    _sanitize_csv_cell(r[13]),  # tone
+                    f"{r[14]:.4f}" if r[14] else "",  # cost
+                    _format_ts(r[15]),  # approved_at
+                ]
 
     safe_name = "".join(c for c in campaign_name if c.isalnum() or c in " -_").strip()
     filename = f"{safe_name}-messages.csv" if safe_name else "messages.csv"
 
-    return Response(
-        csv_content,
-        mimetype="text/csv",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
+    return csv_response(filename, headers, _rows(), compress=wants_gzip(request))
 
 
 # ── Conflict Check ──────────────────────────────────
@@ -3,6 +3,7 @@ import math
 import re
 
 from flask import Blueprint, jsonify, request
+from sqlalchemy import bindparam
 
 from ..auth import require_auth, require_role, resolve_tenant
 from ..display import (
@@ -25,6 +26,12 @@ from ..display import (
     display_tier,
 )
 from ..models import db
+from ..services.csv_export import (
+    csv_response,
+    sanitize_csv_cell,
+    stream_partitions,
+    wants_gzip,
+)
 
 companies_bp = Blueprint("companies", __name__)
 
@@ -137,25 +144,14 @@ ALLOWED_SORT = {
 }
 
 
-@companies_bp.route("/api/companies", methods=["GET"])
-@require_auth
-def list_companies():
-    tenant_id = resolve_tenant()
-    if not tenant_id:
-        return jsonify({"error": "Tenant not found"}), 404
-
-    page = max(1, request.args.get("page", 1, type=int))
-    page_size = min(100, max(1, request.args.get("page_size", 25, type=int)))
-    search = request.args.get("search", "").strip()
-    tag_name = request.args.get("tag_name", "").strip()
-    owner_name = request.args.get("owner_name", "").strip()
-    sort = request.args.get("sort", "name").strip()
-    sort_dir = request.args.get("sort_dir", "asc").strip().lower()
+def _company_list_filters(tenant_id, request_obj):
+    """WHERE clause and params for the companies list filters.
 
-    if sort not in ALLOWED_SORT:
-        sort = "name"
-    if sort_dir not in ("asc", "desc"):
-        sort_dir = "asc"
+    Shared by the paginated list and the streaming CSV export.
+    """
+    search = request_obj.args.get("search", "").strip()
+    tag_name = request_obj.args.get("tag_name", "").strip()
+    owner_name = request_obj.args.get("owner_name", "").strip()
 
     where = ["c.tenant_id = :tenant_id"]
     params = {"tenant_id": tenant_id}
@@ -177,24 +173,24 @@ def list_companies():
         params["owner_name"] = owner_name
 
     # --- Multi-value ICP filters ---
-    _add_multi_filter(where, params, "status", "c.status", request)
-    _add_multi_filter(where, params, "tier", "c.tier", request)
-    _add_multi_filter(where, params, "industry", "c.industry", request)
-    _add_multi_filter(where, params, "company_size", "c.company_size", request)
-    _add_multi_filter(where, params, "geo_region", "c.geo_region", request)
-    _add_multi_filter(where, params, "revenue_range", "c.revenue_range", request)
+    _add_multi_filter(where, params, "status", "c.status", request_obj)
+    _add_multi_filter(where, params, "tier", "c.tier", request_obj)
+    _add_multi_filter(where, params, "industry", "c.industry", request_obj)
+    _add_multi_filter(where, params, "company_size", "c.company_size", request_obj)
+    _add_multi_filter(where, params, "geo_region", "c.geo_region", request_obj)
+    _add_multi_filter(where, params, "revenue_range", "c.revenue_range", request_obj)
 
     # --- enrichment_stage filter (computed from status + enrichment tables) ---
     # Must match _compute_enrichment_stage() logic exactly.
     # The function checks conditions in priority order, so each SQL clause must
     # replicate the same precedence: failed > disqualified > contacts_ready >
     # enriched > qualified > researched > imported.
-    es_raw = request.args.get("enrichment_stage", "").strip()
+    es_raw = request_obj.args.get("enrichment_stage", "").strip()
     if es_raw:
         es_values = [v.strip().lower() for v in es_raw.split(",") if v.strip()]
         if es_values:
             es_exclude = (
-                request.args.get("enrichment_stage_exclude", "").strip().lower()
+                request_obj.args.get("enrichment_stage_exclude", "").strip().lower()
                 == "true"
             )
             # Each clause mirrors _compute_enrichment_stage() priority order:
@@ -278,7 +274,7 @@ def list_companies():
 
     # Custom field filters: cf_{key}=value
     cf_idx = 0
-    for param_key, param_val in request.args.items():
+    for param_key, param_val in request_obj.args.items():
         if param_key.startswith("cf_") and param_val.strip():
             field_key = param_key[3:]
             # SECURITY: field_key is interpolated into SQLite json_extract path below.
@@ -299,23 +295,11 @@ def list_companies():
 
     where_clause = " AND ".join(where)
 
-    # Count query
-    total = (
-        db.session.execute(
-            db.text(f"""
-            SELECT COUNT(*)
-            FROM companies c
-            LEFT JOIN owners o ON c.owner_id = o.id
-            WHERE {where_clause}
-        """),
-            params,
-        ).scalar()
-        or 0
-    )
+    return where_clause, params
 
-    pages = max(1, math.ceil(total / page_size))
-    offset = (page - 1) * page_size
 
+def _company_list_order(sort, sort_dir):
+    """ORDER BY expression for a validated sort column and direction."""
     # Sort mapping for computed columns
     if sort == "contact_count":
         sort_col = "contact_count"
@@ -335,7 +319,46 @@ def list_companies():
             ELSE 3 END"""
     else:
         sort_col = f"c.{sort}"
-    order = f"{sort_col} {'ASC' if sort_dir == 'asc' else 'DESC'} NULLS LAST"
+    return f"{sort_col} {'ASC' if sort_dir == 'asc' else 'DESC'} NULLS LAST"
+
+
+@companies_bp.route("/api/companies", methods=["GET"])
+@require_auth
+def list_companies():
+    tenant_id = resolve_tenant()
+    if not tenant_id:
+        return jsonify({"error": "Tenant not found"}), 404
+
+    page = max(1, request.args.get("page", 1, type=int))
+    page_size = min(100, max(1, request.args.get("page_size", 25, type=int)))
+    sort = request.args.get("sort", "name").strip()
+    sort_dir = request.args.get("sort_dir", "asc").strip().lower()
+
+    if sort not in ALLOWED_SORT:
+        sort = "name"
+    if sort_dir not in ("asc", "desc"):
+        sort_dir = "asc"
+
+    where_clause, params = _company_list_filters(tenant_id, request)
+
+    # Count query
+    total = (
+        db.session.execute(
+            db.text(f"""
+            SELECT COUNT(*)
+            FROM companies c
+            LEFT JOIN owners o ON c.owner_id = o.id
+            WHERE {where_clause}
+        """),
+            params,
+        ).scalar()
+        or 0
+    )
+
+    pages = max(1, math.ceil(total / page_size))
+    offset = (page - 1) * page_size
+
+    order = _company_list_order(sort, sort_dir)
 
     rows = db.session.execute(
         db.text(f"""
@@ -463,6 +486,121 @@ def list_companies():
     )
 
 
+@companies_bp.route("/api/companies/export-csv", methods=["GET"])
+@require_auth
+def export_companies_csv():
+    """Stream the filtered companies list as CSV.
+
+    Accepts the same filter and sort params as ``GET /api/companies`` (no
+    pagination) plus gzip=1 for a .csv.gz download.
+    """
+    tenant_id = resolve_tenant()
+    if not tenant_id:
+        return jsonify({"error": "Tenant not found"}), 404
+
+    sort = request.args.get("sort", "name").strip()
+    sort_dir = request.args.get("sort_dir", "asc").strip().lower()
+    if sort not in ALLOWED_SORT:
+        sort = "name"
+    if sort_dir not in ("asc", "desc"):
+        sort_dir = "asc"
+
+    where_clause, params = _company_list_filters(tenant_id, request)
+    order = _company_list_order(sort, sort_dir) + ", c.id"
+
+    sql = f"""
+        SELECT
+            c.id, c.name, c.domain, c.status, c.tier,
+            o.name AS owner_name,
+            c.industry, c.hq_country, c.triage_score,
+            (SELECT COUNT(*) FROM contacts ct WHERE ct.company_id = c.id) AS contact_count,
+            c.company_size, c.geo_region, c.revenue_range,
+            c.linkedin_url, c.website_url, c.created_at,
+            CASE WHEN l1.company_id IS NOT NULL THEN 1 ELSE 0 END AS has_l1,
+            CASE WHEN l2p.company_id IS NOT NULL THEN 1 ELSE 0 END AS has_l2,
+            CASE WHEN EXISTS (
+                SELECT 1 FROM contacts ct2
+                JOIN contact_enrichment ce ON ce.contact_id = ct2.id
+                WHERE ct2.company_id = c.id
+            ) THEN 1 ELSE 0 END AS has_person_enrichment
+        FROM companies c
+        LEFT JOIN owners o ON c.owner_id = o.id
+        LEFT JOIN company_enrichment_l1 l1 ON l1.company_id = c.id
+        LEFT JOIN company_enrichment_profile l2p ON l2p.company_id = c.id
+        WHERE {where_clause}
+        ORDER BY {order}
+    """
+
+    headers = [
+        "Name",
+        "Domain",
+        "Status",
+        "Enrichment Stage",
+        "Tier",
+        "Owner",
+        "Industry",
+        "HQ Country",
+        "Triage Score",
+        "Contacts",
+        "Company Size",
+        "Geo Region",
+        "Revenue Range",
+        "LinkedIn URL",
+        "Website",
+        "Tags",
+        "Created At",
+    ]
+
+    def _rows():
+        for partition in stream_partitions(sql, params):
+            tag_map = _tag_names_for([str(r[0]) for r in partition])
+            for r in partition:
+                stage = _compute_enrichment_stage(
+                    r[3], bool(r[16]), bool(r[17]), bool(r[18])
+                )
+                yield [
+                    sanitize_csv_cell(r[1]),
+                    sanitize_csv_cell(r[2]),
+                    sanitize_csv_cell(display_status(r[3])),
+                    sanitize_csv_cell(display_enrichment_stage(stage)),
+                    sanitize_csv_cell(display_tier(r[4])),
+                    sanitize_csv_cell(r[5]),
+                    sanitize_csv_cell(display_industry(r[6])),
+                    sanitize_csv_cell(r[7]),
+                    "" if r[8] is None else float(r[8]),
+                    r[9] or 0,
+                    sanitize_csv_cell(display_company_size(r[10])),
+                    sanitize_csv_cell(display_geo_region(r[11])),
+                    sanitize_csv_cell(display_revenue_range(r[12])),
+                    sanitize_csv_cell(r[13]),
+                    sanitize_csv_cell(r[14]),
+                    sanitize_csv_cell(", ".join(tag_map.get(str(r[0]), []))),
+                    _iso(r[15]) or "",
+                ]
+
+    return csv_response("companies.csv", headers, _rows(), compress=wants_gzip(request))
+
+
+def _tag_names_for(company_ids):
+    """Tag names per company ID for one export partition."""
+    tag_map: dict[str, list[str]] = {}
+    if not company_ids:
+        return tag_map
+    rows = db.session.execute(
+        db.text("""
+            SELECT cota.company_id, t.name
+            FROM company_tag_assignments cota
+            JOIN tags t ON t.id = cota.tag_id
+            WHERE cota.company_id IN :ids
+            ORDER BY t.name
+        """).bindparams(bindparam("ids", expanding=True)),
+        {"ids": company_ids},
+    ).fetchall()
+    for cid, name in rows:
+        tag_map.setdefault(str(cid), []).append(name)
+    return tag_map
+
+
 @companies_bp.route("/api/companies/filter-counts", methods=["POST"])
 @require_auth
 def company_filter_counts():
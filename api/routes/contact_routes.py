@@ -3,6 +3,7 @@ import math
 import re
 
 from flask import Blueprint, jsonify, request
+from sqlalchemy import bindparam
 
 from ..auth import require_auth, require_role, resolve_tenant
 from ..display import (
@@ -17,6 +18,12 @@ from ..display import (
     display_tier,
 )
 from ..models import db
+from ..services.csv_export import (
+    csv_response,
+    sanitize_csv_cell,
+    stream_partitions,
+    wants_gzip,
+)
 
 contacts_bp = Blueprint("contacts", __name__)
 
@@ -100,28 +107,17 @@ ALLOWED_SORT = {
 }
 
 
-@contacts_bp.route("/api/contacts", methods=["GET"])
-@require_auth
-def list_contacts():
-    tenant_id = resolve_tenant()
-    if not tenant_id:
-        return jsonify({"error": "Tenant not found"}), 404
-
-    page = max(1, request.args.get("page", 1, type=int))
-    page_size = min(100, max(1, request.args.get("page_size", 25, type=int)))
-    search = request.args.get("search", "").strip()
-    tag_name = request.args.get("tag_name", "").strip()
-    owner_name = request.args.get("owner_name", "").strip()
-    icp_fit = request.args.get("icp_fit", "").strip()
-    message_status = request.args.get("message_status", "").strip()
-    company_id = request.args.get("company_id", "").strip()
-    sort = request.args.get("sort", "last_name").strip()
-    sort_dir = request.args.get("sort_dir", "asc").strip().lower()
+def _contact_list_filters(tenant_id, request_obj):
+    """JOINs, WHERE clause and params for the contacts list filters.
 
-    if sort not in ALLOWED_SORT:
-        sort = "last_name"
-    if sort_dir not in ("asc", "desc"):
-        sort_dir = "asc"
+    Shared by the paginated list and the streaming CSV export.
+    """
+    search = request_obj.args.get("search", "").strip()
+    tag_name = request_obj.args.get("tag_name", "").strip()
+    owner_name = request_obj.args.get("owner_name", "").strip()
+    icp_fit = request_obj.args.get("icp_fit", "").strip()
+    message_status = request_obj.args.get("message_status", "").strip()
+    company_id = request_obj.args.get("company_id", "").strip()
 
     where = ["ct.tenant_id = :tenant_id"]
     params = {"tenant_id": tenant_id}
@@ -155,7 +151,7 @@ def list_contacts():
 
     # Custom field filters: cf_{key}=value
     cf_idx = 0
-    for param_key, param_val in request.args.items():
+    for param_key, param_val in request_obj.args.items():
         if param_key.startswith("cf_") and param_val.strip():
             field_key = param_key[3:]
             # SECURITY: field_key is interpolated into SQLite json_extract path below.
@@ -178,25 +174,27 @@ def list_contacts():
             cf_idx += 1
 
     # --- Multi-value ICP filters ---
-    _add_multi_filter(where, params, "company_status", "co.status", request)
-    _add_multi_filter(where, params, "company_tier", "co.tier", request)
-    _add_multi_filter(where, params, "industry", "co.industry", request)
-    _add_multi_filter(where, params, "company_size", "co.company_size", request)
-    _add_multi_filter(where, params, "geo_region", "co.geo_region", request)
-    _add_multi_filter(where, params, "revenue_range", "co.revenue_range", request)
-    _add_multi_filter(where, params, "seniority_level", "ct.seniority_level", request)
-    _add_multi_filter(where, params, "department", "ct.department", request)
+    _add_multi_filter(where, params, "company_status", "co.status", request_obj)
+    _add_multi_filter(where, params, "company_tier", "co.tier", request_obj)
+    _add_multi_filter(where, params, "industry", "co.industry", request_obj)
+    _add_multi_filter(where, params, "company_size", "co.company_size", request_obj)
+    _add_multi_filter(where, params, "geo_region", "co.geo_region", request_obj)
+    _add_multi_filter(where, params, "revenue_range", "co.revenue_range", request_obj)
+    _add_multi_filter(
+        where, params, "seniority_level", "ct.seniority_level", request_obj
+    )
+    _add_multi_filter(where, params, "department", "ct.department", request_obj)
     _add_multi_filter(
-        where, params, "linkedin_activity", "ct.linkedin_activity_level", request
+        where, params, "linkedin_activity", "ct.linkedin_activity_level", request_obj
     )
 
     # Job titles filter (ILIKE match)
-    job_titles_raw = request.args.get("job_titles", "").strip()
+    job_titles_raw = request_obj.args.get("job_titles", "").strip()
     if job_titles_raw:
         titles = [t.strip() for t in job_titles_raw.split(",") if t.strip()]
         if titles:
             job_exclude = (
-                request.args.get("job_titles_exclude", "").strip().lower() == "true"
+                request_obj.args.get("job_titles_exclude", "").strip().lower() == "true"
             )
             title_clauses = []
             for i, t in enumerate(titles):
@@ -209,7 +207,7 @@ def list_contacts():
                 where.append(f"({combined})")
 
     # Campaign exclusion
-    exclude_campaign_id = request.args.get("exclude_campaign_id", "").strip()
+    exclude_campaign_id = request_obj.args.get("exclude_campaign_id", "").strip()
 
     where_clause = " AND ".join(where)
 
@@ -229,6 +227,28 @@ def list_contacts():
         params["excl_campaign_id"] = exclude_campaign_id
         where_clause = " AND ".join(where)
 
+    return joins, where_clause, params
+
+
+@contacts_bp.route("/api/contacts", methods=["GET"])
+@require_auth
+def list_contacts():
+    tenant_id = resolve_tenant()
+    if not tenant_id:
+        return jsonify({"error": "Tenant not found"}), 404
+
+    page = max(1, request.args.get("page", 1, type=int))
+    page_size = min(100, max(1, request.args.get("page_size", 25, type=int)))
+    sort = request.args.get("sort", "last_name").strip()
+    sort_dir = request.args.get("sort_dir", "asc").strip().lower()
+
+    if sort not in ALLOWED_SORT:
+        sort = "last_name"
+    if sort_dir not in ("asc", "desc"):
+        sort_dir = "asc"
+
+    joins, where_clause, params = _contact_list_filters(tenant_id, request)
+
     # Count
     total = (
         db.session.execute(
@@ -386,6 +406,118 @@ def list_contacts():
     )
 
 
+@contacts_bp.route("/api/contacts/export-csv", methods=["GET"])
+@require_auth
+def export_contacts_csv():
+    """Stream the filtered contacts list as CSV.
+
+    Accepts the same filter and sort params as ``GET /api/contacts`` (no
+    pagination) plus gzip=1 for a .csv.gz download.
+    """
+    tenant_id = resolve_tenant()
+    if not tenant_id:
+        return jsonify({"error": "Tenant not found"}), 404
+
+    sort = request.args.get("sort", "last_name").strip()
+    sort_dir = request.args.get("sort_dir", "asc").strip().lower()
+    if sort not in ALLOWED_SORT:
+        sort = "last_name"
+    if sort_dir not in ("asc", "desc"):
+        sort_dir = "asc"
+
+    joins, where_clause, params = _contact_list_filters(tenant_id, request)
+    order = f"ct.{sort} {'ASC' if sort_dir == 'asc' else 'DESC'} NULLS LAST, ct.id"
+
+    sql = f"""
+        SELECT
+            ct.id, ct.first_name, ct.last_name, ct.email_address,
+            ct.job_title, co.name AS company_name, co.domain,
+            ct.linkedin_url, ct.phone_number,
+            ct.seniority_level, ct.department,
+            ct.location_city, ct.location_country,
+            ct.icp_fit, ct.message_status, o.name AS owner_name,
+            ct.contact_score, ct.ai_champion_score, ct.authority_score,
+            ct.contact_source
+        FROM contacts ct
+        {joins}
+        WHERE {where_clause}
+        ORDER BY {order}
+    """
+
+    headers = [
+        "First Name",
+        "Last Name",
+        "Email",
+        "Job Title",
+        "Company",
+        "Domain",
+        "LinkedIn URL",
+        "Phone",
+        "Seniority",
+        "Department",
+        "City",
+        "Country",
+        "ICP Fit",
+        "Message Status",
+        "Owner",
+        "Score",
+        "Tags",
+        "Source",
+    ]
+
+    def _rows():
+        for partition in stream_partitions(sql, params):
+            tag_map = _tag_names_for([str(r[0]) for r in partition])
+            for r in partition:
+                score = _compute_contact_score(
+                    r[16],
+                    int(r[17]) if r[17] is not None else None,
+                    int(r[18]) if r[18] is not None else None,
+                )
+                yield [
+                    sanitize_csv_cell(r[1]),
+                    sanitize_csv_cell(r[2]),
+                    sanitize_csv_cell(r[3]),
+                    sanitize_csv_cell(r[4]),
+                    sanitize_csv_cell(r[5]),
+                    sanitize_csv_cell(r[6]),
+                    sanitize_csv_cell(r[7]),
+                    sanitize_csv_cell(r[8]),
+                    sanitize_csv_cell(display_seniority(r[9])),
+                    sanitize_csv_cell(display_department(r[10])),
+                    sanitize_csv_cell(r[11]),
+                    sanitize_csv_cell(r[12]),
+                    sanitize_csv_cell(display_icp_fit(r[13])),
+                    sanitize_csv_cell(r[14]),
+                    sanitize_csv_cell(r[15]),
+                    "" if score is None else score,
+                    sanitize_csv_cell(", ".join(tag_map.get(str(r[0]), []))),
+                    sanitize_csv_cell(display_contact_source(r[19])),
+                ]
+
+    return csv_response("contacts.csv", headers, _rows(), compress=wants_gzip(request))
+
+
+def _tag_names_for(contact_ids):
+    """Tag names per contact ID for one export partition."""
+    tag_map: dict[str, list[str]] = {}
+    if not contact_ids:
+        return tag_map
+    rows = db.session.execute(
+        db.text("""
+            SELECT cta.contact_id, t.name
+            FROM contact_tag_assignments cta
+            JOIN tags t ON t.id = cta.tag_id
+            WHERE cta.contact_id IN :ids
+            ORDER BY t.name
+        """).bindparams(bindparam("ids", expanding=True)),
+        {"ids": contact_ids},
+    ).fetchall()
+    for cid, name in rows:
+        tag_map.setdefault(str(cid), []).append(name)
+    return tag_map
+
+
 @contacts_bp.route("/api/contacts/<contact_id>", methods=["GET"])
 @require_auth
 def get_contact(contact_id):
@@ -14,6 +14,7 @@ from ..services.pipeline_engine import (
     _process_entity,
 )
 from ..services.dag_executor import count_eligible_for_estimate
+from ..services.stage_estimates import estimate_stage, pipeline_eta
 from ..services.stage_registry import get_stage_labels
 
 enrich_bp = Blueprint("enrich", __name__)
@@ -32,21 +33,6 @@ ENRICHMENT_STAGES = [
     "qc",
 ]
 
-# Static cost defaults (USD per item) — used when no historical data exists
-STATIC_COST_DEFAULTS = {
-    "l1": 0.02,
-    "triage": 0.00,
-    "l2": 0.08,
-    "signals": 0.05,
-    "registry": 0.00,
-    "news": 0.04,
-    "person": 0.04,
-    "social": 0.03,
-    "career": 0.03,
-    "contact_details": 0.01,
-    "qc": 0.00,
-}
-
 
 def _resolve_tag(tenant_id, tag_name):
     """Look up tag by name, return (tag_id, error_response)."""
@@ -70,26 +56,6 @@ def _resolve_owner(tenant_id, owner_name):
     return row[0] if row else None
 
 
-def _get_cost_per_item(tenant_id, stage):
-    """Get average cost per item from historical stage_runs, falling back to static default.
-
-    Requires at least 5 completed runs before trusting the historical average,
-    to avoid unreliable estimates from early test runs.
-    """
-    row = db.session.execute(
-        text("""
-            SELECT AVG(cost_usd / NULLIF(done, 0)), COUNT(*)
-            FROM stage_runs
-            WHERE tenant_id = :t AND stage = :s
-              AND status = 'completed' AND done > 0 AND cost_usd > 0
-        """),
-        {"t": str(tenant_id), "s": stage},
-    ).fetchone()
-    if row and row[0] is not None and row[1] >= 5:
-        return round(float(row[0]), 4)
-    return STATIC_COST_DEFAULTS.get(stage, 0.05)
-
-
 @enrich_bp.route("/api/enrich/estimate", methods=["POST"])
 @require_auth
 def enrich_estimate():
@@ -145,6 +111,7 @@ def enrich_estimate():
 
     result = {}
     total_cost = 0.0
+    total_cost_p90 = 0.0
 
     for stage in stages:
         # Determine re-enrich horizon for this stage
@@ -169,20 +136,23 @@ def enrich_estimate():
             eligible = count_eligible(tenant_id, tag_id, stage, owner_id, tier_filter)
         if limit is not None:
             eligible = min(eligible, limit)
-        cost_per_item = _get_cost_per_item(tenant_id, stage)
-        estimated_cost = round(eligible * cost_per_item, 2)
-        total_cost += estimated_cost
+        estimate = estimate_stage(tenant_id, stage, eligible)
+        total_cost += estimate["estimated_cost"]
+        total_cost_p90 += estimate["cost_range"][1]
         result[stage] = {
             "eligible_count": eligible,
-            "cost_per_item": cost_per_item,
-            "estimated_cost": estimated_cost,
+            **estimate,
             "fields": get_stage_labels(stage),
         }
 
+    eta, eta_p90 = pipeline_eta(result)
     return jsonify(
         {
             "stages": result,
             "total_estimated_cost": round(total_cost, 2),
+            "total_cost_range": [round(total_cost, 2), round(total_cost_p90, 2)],
+            "eta_seconds": eta,
+            "eta_p90_seconds": eta_p90,
         }
     )
 
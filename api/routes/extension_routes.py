@@ -6,6 +6,12 @@ from flask import Blueprint, g, jsonify, request
 
 from ..auth import require_auth, resolve_tenant
 from ..models import Activity, Company, Contact, Tag, db
+from ..services.campaign_analytics import invalidate_tenant_analytics
+from ..services.dedup import (
+    find_existing_companies_by_name,
+    find_existing_contacts_by_linkedin,
+    normalize_linkedin_url,
+)
 
 extension_bp = Blueprint("extension", __name__)
 
@@ -41,26 +47,34 @@ def upload_leads():
             db.session.add(tag)
             db.session.flush()
 
+    # Resolve the whole page up front: one query for LinkedIn URLs, one for
+    # company names, then a single flush per table.
+    existing_urls = find_existing_contacts_by_linkedin(
+        tenant_id, [lead.get("linkedin_url") for lead in leads]
+    )
+    companies = find_existing_companies_by_name(
+        tenant_id, [lead.get("company_name") for lead in leads]
+    )
+    seen_urls = set(existing_urls)
+
+    new_companies = []
+    pending = []  # (lead, company or None)
     for lead in leads:
         linkedin_url = (lead.get("linkedin_url") or "").strip()
 
-        # Dedup by LinkedIn URL
-        if linkedin_url:
-            existing = Contact.query.filter_by(
-                tenant_id=str(tenant_id), linkedin_url=linkedin_url
-            ).first()
-            if existing:
+        # Dedup by LinkedIn URL (existing contacts and earlier leads in the page)
+        url_key = normalize_linkedin_url(linkedin_url)
+        if url_key:
+            if url_key in seen_urls:
                 skipped_duplicates += 1
                 continue
+            seen_urls.add(url_key)
 
-        # Find or create company
+        # Find or create company (shared by leads from the same new company)
         company = None
         company_name = (lead.get("company_name") or "").strip()
         if company_name:
-            company = Company.query.filter(
-                Company.tenant_id == str(tenant_id),
-                db.func.lower(Company.name) == company_name.lower(),
-            ).first()
+            company = companies.get(company_name.lower())
             if not company:
                 company = Company(
                     tenant_id=str(tenant_id),
@@ -72,32 +86,41 @@ def upload_leads():
                     status="new",
                     owner_id=owner_id,
                 )
-                db.session.add(company)
-                db.session.flush()
-                created_companies += 1
+                companies[company_name.lower()] = company
+                new_companies.append(company)
+        pending.append((lead, company))
+
+    if new_companies:
+        db.session.add_all(new_companies)
+        db.session.flush()
+        created_companies = len(new_companies)
 
+    new_contacts = []
+    for lead, company in pending:
         # Parse name
         full_name = (lead.get("name") or "").strip()
         parts = full_name.split(None, 1)
         first_name = parts[0] if parts else ""
         last_name = parts[1] if len(parts) > 1 else ""
 
-        # Create contact
-        contact = Contact(
-            tenant_id=str(tenant_id),
-            first_name=first_name,
-            last_name=last_name,
-            job_title=lead.get("job_title"),
-            linkedin_url=linkedin_url or None,
-            company_id=company.id if company else None,
-            owner_id=owner_id,
-            tag_id=tag.id if tag else None,
-            import_source=source,
-            is_stub=False,
+        new_contacts.append(
+            Contact(
+                tenant_id=str(tenant_id),
+                first_name=first_name,
+                last_name=last_name,
+                job_title=lead.get("job_title"),
+                linkedin_url=(lead.get("linkedin_url") or "").strip() or None,
+                company_id=company.id if company else None,
+                owner_id=owner_id,
+                tag_id=tag.id if tag else None,
+                import_source=source,
+                is_stub=False,
+            )
         )
-        db.session.add(contact)
+    if new_contacts:
+        db.session.add_all(new_contacts)
         db.session.flush()
-        created_contacts += 1
+    created_contacts = len(new_contacts)
 
     db.session.commit()
 
@@ -330,6 +353,7 @@ def get_linkedin_queue():
         cid_params,
     )
     db.session.commit()
+    invalidate_tenant_analytics(tenant_id)
 
     return jsonify(items)
 
@@ -420,6 +444,7 @@ def update_linkedin_queue_item(queue_id):
         )
 
     db.session.commit()
+    invalidate_tenant_analytics(tenant_id)
 
     return jsonify({"ok": True})
 
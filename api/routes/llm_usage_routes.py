@@ -6,6 +6,12 @@ from flask import Blueprint, g, jsonify, request
 
 from ..auth import require_role
 from ..models import db
+from ..services.llm_usage_rollups import (
+    compact_usage_rollups,
+    maybe_compact,
+    reconcile_usage_rollups,
+    usage_source,
+)
 
 llm_usage_bp = Blueprint("llm_usage", __name__)
 
@@ -36,6 +42,15 @@ def _date_filter(args):
     return clauses, params
 
 
+def _usd(value):
+    """Round a summed cost to the column's 6 decimals.
+
+    Rollups and the raw log tail add the same costs in different orders,
+    so unrounded float sums can differ in the last bits.
+    """
+    return round(float(value), 6)
+
+
 def _where(clauses):
     """Build a WHERE string from a list of clauses."""
     if not clauses:
@@ -51,27 +66,36 @@ def llm_usage_summary():
     Query params:
         start_date: ISO date (default: 30 days ago)
         end_date: ISO date (default: today)
-        group_by: 'day' or 'month' (default: 'day')
+        group_by: 'hour', 'day' or 'month' (default: 'day')
+
+    Reads pre-aggregated rollups plus the raw log tail since the last
+    compaction (see ``services.llm_usage_rollups``).
     """
     denied = _require_super_admin()
     if denied:
         return denied
 
     group_by = request.args.get("group_by", "day")
-    if group_by not in ("day", "month"):
+    if group_by not in ("hour", "day", "month"):
         group_by = "day"
 
-    clauses, params = _date_filter(request.args)
-    where = _where(clauses)
+    # Rollups for compacted periods + raw rows after the watermark
+    maybe_compact()
+    _, date_params = _date_filter(request.args)
+    source, params = usage_source(
+        "hour" if group_by == "hour" else "day",
+        start_date=date_params.get("start_date"),
+        end_date_end=date_params.get("end_date_end"),
+    )
 
     # Totals
     totals_row = db.session.execute(
         db.text(
             "SELECT COALESCE(SUM(l.cost_usd), 0), "
-            "COUNT(*), "
+            "COALESCE(SUM(l.calls), 0), "
             "COALESCE(SUM(l.input_tokens), 0), "
             "COALESCE(SUM(l.output_tokens), 0) "
-            "FROM llm_usage_log l " + where
+            "FROM " + source
         ),
         params,
     ).fetchone()
@@ -80,12 +104,12 @@ def llm_usage_summary():
     by_tenant = db.session.execute(
         db.text(
             "SELECT t.slug, t.name, CAST(l.tenant_id AS TEXT), "
-            "COUNT(*), "
+            "SUM(l.calls), "
             "COALESCE(SUM(l.cost_usd), 0), "
             "COALESCE(SUM(l.input_tokens), 0), "
             "COALESCE(SUM(l.output_tokens), 0) "
-            "FROM llm_usage_log l "
-            "JOIN tenants t ON t.id = l.tenant_id " + where + " "
+            "FROM " + source + " "
+            "JOIN tenants t ON t.id = l.tenant_id "
             "GROUP BY t.slug, t.name, l.tenant_id "
             "ORDER BY 5 DESC"
         ),
@@ -95,11 +119,11 @@ def llm_usage_summary():
     # By operation
     by_operation = db.session.execute(
         db.text(
-            "SELECT l.operation, COUNT(*), "
+            "SELECT l.operation, SUM(l.calls), "
             "COALESCE(SUM(l.cost_usd), 0), "
             "COALESCE(SUM(l.input_tokens), 0), "
             "COALESCE(SUM(l.output_tokens), 0) "
-            "FROM llm_usage_log l " + where + " "
+            "FROM " + source + " "
             "GROUP BY l.operation ORDER BY 3 DESC"
         ),
         params,
@@ -108,11 +132,11 @@ def llm_usage_summary():
     # By model
     by_model = db.session.execute(
         db.text(
-            "SELECT l.provider, l.model, COUNT(*), "
+            "SELECT l.provider, l.model, SUM(l.calls), "
             "COALESCE(SUM(l.cost_usd), 0), "
             "COALESCE(SUM(l.input_tokens), 0), "
             "COALESCE(SUM(l.output_tokens), 0) "
-            "FROM llm_usage_log l " + where + " "
+            "FROM " + source + " "
             "GROUP BY l.provider, l.model ORDER BY 4 DESC"
         ),
         params,
@@ -121,24 +145,23 @@ def llm_usage_summary():
     # Time series (PG-specific date_trunc)
     time_series = []
     try:
-        trunc = "day" if group_by == "day" else "month"
         ts_rows = db.session.execute(
             db.text(
                 "SELECT date_trunc(:trunc, l.created_at) AS period, "
-                "COUNT(*), "
+                "SUM(l.calls), "
                 "COALESCE(SUM(l.cost_usd), 0), "
                 "COALESCE(SUM(l.input_tokens), 0), "
                 "COALESCE(SUM(l.output_tokens), 0) "
-                "FROM llm_usage_log l " + where + " "
+                "FROM " + source + " "
                 "GROUP BY period ORDER BY period"
             ),
-            dict(trunc=trunc, **params),
+            dict(trunc=group_by, **params),
         ).fetchall()
         time_series = [
             {
                 "period": r[0].isoformat() if r[0] else None,
                 "calls": r[1],
-                "cost": float(r[2]),
+                "cost": _usd(r[2]),
                 "input_tokens": r[3],
                 "output_tokens": r[4],
             }
@@ -146,11 +169,11 @@ def llm_usage_summary():
         ]
     except Exception:
         # date_trunc not available (e.g. SQLite in tests)
-        pass
+        db.session.rollback()
 
     return jsonify(
         {
-            "total_cost_usd": float(totals_row[0]),
+            "total_cost_usd": _usd(totals_row[0]),
             "total_calls": totals_row[1],
             "total_input_tokens": totals_row[2],
             "total_output_tokens": totals_row[3],
@@ -160,7 +183,7 @@ def llm_usage_summary():
                     "tenant_name": r[1],
                     "tenant_id": r[2],
                     "calls": r[3],
-                    "cost": float(r[4]),
+                    "cost": _usd(r[4]),
                     "input_tokens": r[5],
                     "output_tokens": r[6],
                 }
@@ -170,7 +193,7 @@ def llm_usage_summary():
                 {
                     "operation": r[0],
                     "calls": r[1],
-                    "cost": float(r[2]),
+                    "cost": _usd(r[2]),
                     "input_tokens": r[3],
                     "output_tokens": r[4],
                 }
@@ -181,7 +204,7 @@ def llm_usage_summary():
                     "provider": r[0],
                     "model": r[1],
                     "calls": r[2],
-                    "cost": float(r[3]),
+                    "cost": _usd(r[3]),
                     "input_tokens": r[4],
                     "output_tokens": r[5],
                 }
@@ -192,6 +215,101 @@ def llm_usage_summary():
     )
 
 
+@llm_usage_bp.route("/api/llm-usage/rollups/compact", methods=["POST"])
+@require_role("admin")
+def llm_usage_rollups_compact():
+    """Fold raw log rows up to now (minus the in-flight lag) into rollups."""
+    denied = _require_super_admin()
+    if denied:
+        return denied
+    return jsonify(compact_usage_rollups())
+
+
+@llm_usage_bp.route("/api/llm-usage/rollups/reconcile", methods=["GET", "POST"])
+@require_role("admin")
+def llm_usage_rollups_reconcile():
+    """Check compacted days against the raw log; POST also repairs them."""
+    denied = _require_super_admin()
+    if denied:
+        return denied
+    return jsonify(reconcile_usage_rollups(repair=request.method == "POST"))
+
+
+@llm_usage_bp.route("/api/llm-usage/cache", methods=["GET"])
+@require_role("admin")
+def llm_usage_cache():
+    """Prompt-cache effectiveness per operation.
+
+    Hit rate is the share of prompt tokens served from cache:
+    cache_read / (input + cache_creation + cache_read). Anthropic reports
+    the three token kinds separately, so their sum is the full prompt size.
+
+    Query params:
+        start_date, end_date: ISO date filters
+        tenant_id: filter by tenant
+    """
+    denied = _require_super_admin()
+    if denied:
+        return denied
+
+    clauses, params = _date_filter(request.args)
+    clauses.append("l.provider = 'anthropic'")
+    tenant_id = request.args.get("tenant_id")
+    if tenant_id:
+        clauses.append("CAST(l.tenant_id AS TEXT) = :tenant_id")
+        params["tenant_id"] = tenant_id
+    where = _where(clauses)
+
+    rows = db.session.execute(
+        db.text(
+            "SELECT l.operation, COUNT(*), "
+            "COALESCE(SUM(l.input_tokens), 0), "
+            "COALESCE(SUM(l.cache_creation_tokens), 0), "
+            "COALESCE(SUM(l.cache_read_tokens), 0), "
+            "COALESCE(SUM(l.cost_usd), 0), "
+            "SUM(CASE WHEN l.cache_read_tokens > 0 THEN 1 ELSE 0 END) "
+            "FROM llm_usage_log l " + where + " "
+            "GROUP BY l.operation ORDER BY 5 DESC"
+        ),
+        params,
+    ).fetchall()
+
+    def _rate(part, whole):
+        return round(part / whole, 4) if whole else 0.0
+
+    by_operation = []
+    totals = {"input": 0, "write": 0, "read": 0}
+    for r in rows:
+        op, calls, uncached, write, read, cost, hit_calls = r
+        prompt = uncached + write + read
+        totals["input"] += uncached
+        totals["write"] += write
+        totals["read"] += read
+        by_operation.append(
+            {
+                "operation": op,
+                "calls": calls,
+                "calls_with_cache_hit": int(hit_calls or 0),
+                "input_tokens": uncached,
+                "cache_creation_tokens": write,
+                "cache_read_tokens": read,
+                "cache_hit_rate": _rate(read, prompt),
+                "cost": float(cost),
+            }
+        )
+
+    total_prompt = totals["input"] + totals["write"] + totals["read"]
+    return jsonify(
+        {
+            "total_input_tokens": totals["input"],
+            "total_cache_creation_tokens": totals["write"],
+            "total_cache_read_tokens": totals["read"],
+            "cache_hit_rate": _rate(totals["read"], total_prompt),
+            "by_operation": by_operation,
+        }
+    )
+
+
 @llm_usage_bp.route("/api/llm-usage/logs", methods=["GET"])
 @require_role("admin")
 def llm_usage_logs():
@@ -244,7 +362,8 @@ def llm_usage_logs():
             "SELECT l.id, CAST(l.tenant_id AS TEXT), t.slug, "
             "CAST(l.user_id AS TEXT), l.operation, l.provider, l.model, "
             "l.input_tokens, l.output_tokens, l.cost_usd, "
-            "l.duration_ms, l.metadata, l.created_at "
+            "l.duration_ms, l.metadata, l.created_at, "
+            "l.cache_creation_tokens, l.cache_read_tokens "
             "FROM llm_usage_log l "
             "LEFT JOIN tenants t ON t.id = l.tenant_id " + where + " "
             "ORDER BY l.created_at DESC "
@@ -268,6 +387,8 @@ def llm_usage_logs():
             "duration_ms": r[10],
             "metadata": r[11] if isinstance(r[11], dict) else {},
             "created_at": r[12].isoformat() if hasattr(r[12], "isoformat") else r[12],
+            "cache_creation_tokens": r[13] or 0,
+            "cache_read_tokens": r[14] or 0,
         }
         for r in rows
     ]
@@ -3,6 +3,7 @@ from flask import Blueprint, jsonify, request
 from ..auth import require_auth, require_role, resolve_tenant
 from ..display import display_status, display_tier
 from ..models import db, EDIT_REASONS
+from ..services.campaign_analytics import invalidate_tenant_analytics
 from ..services.message_generator import regenerate_message, estimate_regeneration_cost
 
 messages_bp = Blueprint("messages", __name__)
@@ -197,6 +198,7 @@ def update_message(message_id):
         params,
     )
     db.session.commit()
+    invalidate_tenant_analytics(tenant_id)
 
     return jsonify({"ok": True})
 
@@ -267,6 +269,7 @@ def regen_message(message_id):
     if not result:
         return jsonify({"error": "Message not found"}), 404
 
+    invalidate_tenant_analytics(tenant_id)
     return jsonify(result)
 
 
@@ -322,6 +325,7 @@ def mark_message_sent(message_id):
         {"id": message_id, "t": tenant_id},
     )
     db.session.commit()
+    invalidate_tenant_analytics(tenant_id)
 
     return jsonify({"ok": True, "status": "sent", "channel": channel})
 
@@ -369,5 +373,6 @@ def batch_update_messages():
         params,
     )
     db.session.commit()
+    invalidate_tenant_analytics(tenant_id)
 
     return jsonify({"ok": True, "updated": len(ids)})
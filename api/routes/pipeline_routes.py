@@ -19,6 +19,7 @@ from ..services.pipeline_engine import (
 from ..services.dag_executor import (
     start_dag_pipeline,
 )
+from ..services.stage_estimates import stage_run_eta
 from ..services.stage_registry import (
     STAGE_REGISTRY,
     topo_sort,
@@ -225,6 +226,11 @@ def pipeline_status():
                 "completed_at": _fmt_dt(row[8]),
                 "updated_at": _fmt_dt(row[9]),
             }
+            eta = stage_run_eta(
+                tenant_id, stage_name, row[1], row[2], row[3], row[4], row[7]
+            )
+            if eta is not None:
+                stage_data["eta_seconds"] = eta
             # Include per-item progress from config
             config_raw = row[10]
             if config_raw:
@@ -651,6 +657,11 @@ def pipeline_dag_status():
                 "completed_at": _fmt_dt(row[7]),
                 "updated_at": _fmt_dt(row[8]),
             }
+            eta = stage_run_eta(
+                tenant_id, stage_code, row[0], row[1], row[2], row[3], row[6]
+            )
+            if eta is not None:
+                stage_data["eta_seconds"] = eta
             sr_config = row[9]
             if sr_config:
                 try:
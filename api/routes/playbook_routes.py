@@ -10,7 +10,7 @@ import socket
 import threading
 import time
 
-from flask import Blueprint, Response, jsonify, request
+from flask import Blueprint, Response, g, jsonify, request
 
 from ..auth import require_auth, resolve_tenant
 from ..display import display_seniority
@@ -93,6 +93,9 @@ _ALLOWED_PAGE_CONTEXTS = frozenset(
     }
 )
 
+# Model used to fold older chat messages into the rolling thread summary
+SUMMARY_MODEL = "claude-haiku-4-5-20251001"
+
 
 @playbook_bp.route("/api/playbook", methods=["GET"])
 @require_auth
@@ -256,15 +259,20 @@ def undo_ai_edit():
     doc.version += 1
     doc.updated_by = getattr(request, "user_id", None)
 
-    # Delete the ai_tool snapshots that were undone
+    # Delete the ai_tool snapshots that were undone (rebasing any
+    # snapshot stored as a delta against one of them)
+    from ..services.version_store import delete_versions
+
     if latest_snap.turn_id:
-        StrategyVersion.query.filter_by(
-            document_id=doc.id,
-            edit_source="ai_tool",
-            turn_id=latest_snap.turn_id,
-        ).delete()
+        delete_versions(
+            StrategyVersion.query.filter_by(
+                document_id=doc.id,
+                edit_source="ai_tool",
+                turn_id=latest_snap.turn_id,
+            ).all()
+        )
     else:
-        db.session.delete(latest_snap)
+        delete_versions([latest_snap])
 
     db.session.commit()
 
@@ -1633,37 +1641,17 @@ def post_chat_message():
             payload={"message": message_text},
         )
 
-    # Load chat history for context — thread-aware
-    # Find latest thread_start marker to scope history
-    latest_thread_start = (
-        StrategyChatMessage.query.filter_by(
-            document_id=doc.id, tenant_id=tenant_id, thread_start=True
-        )
-        .order_by(StrategyChatMessage.created_at.desc())
-        .first()
-    )
+    client = _get_anthropic_client()
 
-    if latest_thread_start:
-        history = (
-            StrategyChatMessage.query.filter(
-                StrategyChatMessage.document_id == doc.id,
-                StrategyChatMessage.tenant_id == tenant_id,
-                StrategyChatMessage.id != user_msg.id,
-                db.or_(
-                    StrategyChatMessage.id == latest_thread_start.id,
-                    StrategyChatMessage.created_at > latest_thread_start.created_at,
-                ),
-            )
-            .order_by(StrategyChatMessage.created_at.asc())
-            .all()
-        )
-    else:
-        history = (
-            StrategyChatMessage.query.filter_by(document_id=doc.id, tenant_id=tenant_id)
-            .filter(StrategyChatMessage.id != user_msg.id)
-            .order_by(StrategyChatMessage.created_at.asc())
-            .all()
-        )
+    # Load chat history for context — thread-aware, incremental on top of
+    # the thread's rolling summary
+    history, summary_text = _load_thread_history(
+        client=client,
+        tenant_id=tenant_id,
+        doc=doc,
+        exclude_message_id=user_msg.id,
+        user_id=user_id,
+    )
 
     # Load enrichment data if research has been done
     enrichment_data = None
@@ -1686,8 +1674,7 @@ def post_chat_message():
     # Determine phase for system prompt (request param overrides doc phase)
     phase = data.get("phase") or doc.phase or "strategy"
 
-    messages = build_messages(history, message_text)
-    client = _get_anthropic_client()
+    messages = build_messages(history, message_text, summary=summary_text)
 
     if _wants_streaming(request):
         # Streaming path: defer research wait into the SSE generator so
@@ -1743,6 +1730,102 @@ def post_chat_message():
         )
 
 
+def _load_thread_history(client, tenant_id, doc, exclude_message_id, user_id=None):
+    """Load the current thread's messages after its summary checkpoint.
+
+    Messages already folded into the thread's ``ConversationSummary`` are
+    not loaded. When enough new messages accumulate, the older part of the
+    delta is summarized on top of the previous summary (one Haiku call) and
+    the checkpoint advances.
+
+    Returns:
+        ``(history, summary_text)`` — StrategyChatMessage rows after the
+        checkpoint (oldest first) and the summary covering everything before
+        them, or None.
+    """
+    from ..services.memory.conversation_manager import (
+        RECENT_WINDOW,
+        load_summary_checkpoint,
+        roll_summary,
+        save_summary_checkpoint,
+    )
+
+    # Find latest thread_start marker to scope history
+    latest_thread_start = (
+        StrategyChatMessage.query.filter_by(
+            document_id=doc.id, tenant_id=tenant_id, thread_start=True
+        )
+        .order_by(StrategyChatMessage.created_at.desc())
+        .first()
+    )
+    thread_key = latest_thread_start.id if latest_thread_start else doc.id
+    checkpoint = load_summary_checkpoint(doc.id, thread_key)
+
+    query = StrategyChatMessage.query.filter(
+        StrategyChatMessage.document_id == doc.id,
+        StrategyChatMessage.tenant_id == tenant_id,
+        StrategyChatMessage.id != exclude_message_id,
+    )
+    if latest_thread_start:
+        query = query.filter(
+            db.or_(
+                StrategyChatMessage.id == latest_thread_start.id,
+                StrategyChatMessage.created_at > latest_thread_start.created_at,
+            )
+        )
+    if checkpoint:
+        query = query.filter(StrategyChatMessage.created_at > checkpoint.covered_until)
+    history = query.order_by(StrategyChatMessage.created_at.asc()).all()
+
+    def _summarize(prompt):
+        start = time.monotonic()
+        try:
+            result = client.query(
+                system_prompt="You summarize GTM strategy conversations.",
+                user_prompt=prompt,
+                model=SUMMARY_MODEL,
+                max_tokens=600,
+            )
+        except Exception:
+            logger.warning("Conversation summarization failed", exc_info=True)
+            return None
+        log_llm_usage(
+            tenant_id=tenant_id,
+            operation="conversation_summary",
+            model=result.model,
+            input_tokens=result.input_tokens,
+            output_tokens=result.output_tokens,
+            provider="anthropic",
+            user_id=user_id,
+            duration_ms=int((time.monotonic() - start) * 1000),
+            metadata={"document_id": str(doc.id)},
+        )
+        return result.content
+
+    delta = [
+        {
+            "id": m.id,
+            "role": m.role,
+            "content": m.content,
+            "created_at": m.created_at,
+            "extra": m.extra,
+        }
+        for m in history
+        if m.role in ("user", "assistant")
+    ]
+    rolled = roll_summary(delta, checkpoint, _summarize)
+    if rolled is not None:
+        save_summary_checkpoint(tenant_id, doc.id, thread_key, rolled)
+        db.session.commit()
+        checkpoint = rolled
+        # Keep only the messages the new summary does not cover
+        history = [m for m in history if m.created_at > rolled.covered_until]
+        if len(history) > RECENT_WINDOW:
+            history = history[-RECENT_WINDOW:]
+
+    return history, checkpoint.summary if checkpoint else None
+
+
 def _stream_response(
     client,
     messages,
@@ -1832,6 +1915,7 @@ def _stream_simple_response(
                 system_prompt=system_prompt,
                 max_tokens=1024,
                 temperature=0.4,
+                cache_prompt=True,
             ):
                 full_text.append(chunk)
                 yield "data: {}\n\n".format(
@@ -1864,6 +1948,8 @@ def _stream_simple_response(
                 model=usage.get("model", client.default_model),
                 input_tokens=usage.get("input_tokens", 0),
                 output_tokens=usage.get("output_tokens", 0),
+                cache_creation_tokens=usage.get("cache_creation_input_tokens", 0),
+                cache_read_tokens=usage.get("cache_read_input_tokens", 0),
                 provider="anthropic",
                 user_id=user_id,
                 duration_ms=duration_ms,
@@ -2015,6 +2101,7 @@ def _stream_agent_response(
         full_text = []
         msg_id = None
         done_data = None
+        start_time = time.time()
 
         try:
             for sse_event in execute_graph_turn(
@@ -2109,7 +2196,12 @@ def _stream_agent_response(
                     model=done_data.get("model", client.default_model),
                     input_tokens=done_data.get("total_input_tokens", 0),
                     output_tokens=done_data.get("total_output_tokens", 0),
+                    cache_read_tokens=done_data.get("total_cache_read_tokens", 0),
+                    cache_creation_tokens=done_data.get(
+                        "total_cache_creation_tokens", 0
+                    ),
                     user_id=user_id,
+                    duration_ms=int((time.time() - start_time) * 1000),
                     metadata={
                         "agent_turn": True,
                         "tool_calls": len(done_data.get("tool_calls", [])),
@@ -2205,6 +2297,7 @@ def _stream_agent_response(
                     system_prompt=system_prompt,
                     max_tokens=512,
                     temperature=0.4,
+                    cache_prompt=True,
                 ):
                     analysis_parts.append(chunk)
                     yield "data: {}\n\n".format(
@@ -2235,6 +2328,10 @@ def _stream_agent_response(
                         model=usage.get("model", client.default_model),
                         input_tokens=usage.get("input_tokens", 0),
                         output_tokens=usage.get("output_tokens", 0),
+                        cache_creation_tokens=usage.get(
+                            "cache_creation_input_tokens", 0
+                        ),
+                        cache_read_tokens=usage.get("cache_read_input_tokens", 0),
                         provider="anthropic",
                         user_id=user_id,
                         metadata={
@@ -2353,6 +2450,7 @@ def _sync_response(
             system_prompt=system_prompt,
             max_tokens=1024,
             temperature=0.4,
+            cache_prompt=True,
         ):
             full_text.append(chunk)
 
@@ -2384,6 +2482,8 @@ def _sync_response(
             model=usage.get("model", client.default_model),
             input_tokens=usage.get("input_tokens", 0),
             output_tokens=usage.get("output_tokens", 0),
+            cache_creation_tokens=usage.get("cache_creation_input_tokens", 0),
+            cache_read_tokens=usage.get("cache_read_input_tokens", 0),
             provider="anthropic",
             user_id=user_id,
             duration_ms=duration_ms,
@@ -2430,6 +2530,7 @@ def _sync_agent_response(
     """
     import uuid as _uuid
 
+    start_time = time.time()
     try:
         events = list(
             execute_graph_turn(
@@ -2465,6 +2566,7 @@ def _sync_agent_response(
     done_data = done_event.data if done_event else {}
 
     assistant_content = "".join(text_parts)
+    duration_ms = int((time.time() - start_time) * 1000)
 
     # Build metadata with tool call summary and cost totals
     extra = {}
@@ -2512,7 +2614,10 @@ def _sync_agent_response(
             model=done_data.get("model", client.default_model),
             input_tokens=done_data.get("total_input_tokens", 0),
             output_tokens=done_data.get("total_output_tokens", 0),
+            cache_read_tokens=done_data.get("total_cache_read_tokens", 0),
+            cache_creation_tokens=done_data.get("total_cache_creation_tokens", 0),
             user_id=user_id,
+            duration_ms=duration_ms,
             metadata={
                 "agent_turn": True,
                 "tool_calls": len(done_data.get("tool_calls", [])),
@@ -3130,7 +3235,7 @@ def chat_v2():
     from flask import current_app, stream_with_context
 
     from ..agents.chat_tier import execute_chat_turn
-    from ..agents.planner_bridge import execute_planner_turn, get_active_plan
+    from ..agents.planner_bridge import execute_planner_turn, load_active_plan
     from ..agents.plans.loader import load_plan
     from ..agents.router import route_message
 
@@ -3154,6 +3259,7 @@ def chat_v2():
 
     # Build context dicts for routing
     tenant_context = {
+        "tenant_id": str(tenant_id),
         "company_name": tenant.name if tenant else "",
         "domain": tenant.domain if tenant and hasattr(tenant, "domain") else "",
         "namespace": tenant.namespace
@@ -3205,6 +3311,7 @@ def chat_v2():
     decision = route_message(
         message_text, page_context, thread_id, tenant_context, state
     )
+    db.session.commit()  # persist the logged route decision
     logger.info(
         "V2 chat route: '%s' -> %s (%s)",
         message_text[:60],
@@ -3225,8 +3332,12 @@ def chat_v2():
 
                 elif decision.target in ("planner", "planner_interrupt"):
                     existing_state = None
+                    state_version = None
                     if decision.target == "planner_interrupt":
-                        existing_state = get_active_plan(thread_id)
+                        stored = load_active_plan(thread_id, tenant_id)
+                        if stored is not None:
+                            existing_state = stored.state
+                            state_version = stored.version
 
                     if existing_state:
                         plan_config = existing_state.get("plan_config", {})
@@ -3241,6 +3352,8 @@ def chat_v2():
                         plan_config=plan_config,
                         tool_context=tool_context,
                         existing_state=existing_state,
+                        thread_id=thread_id,
+                        state_version=state_version,
                     ):
                         yield "data: {}\n\n".format(
                             json.dumps(sse_event.data | {"type": sse_event.type})
@@ -3266,3 +3379,18 @@ def chat_v2():
         mimetype="text/event-stream",
         headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
+
+
+@playbook_bp.route("/api/v2/planner/stats", methods=["GET"])
+@require_auth
+def planner_stats():
+    """Planner state store metrics: backend, active plans, state size.
+
+    Super admin only.
+    """
+    if not g.current_user.is_super_admin:
+        return jsonify({"error": "Super admin access required"}), 403
+
+    from ..agents.planner_bridge import plan_store_stats
+
+    return jsonify(plan_store_stats())
@@ -0,0 +1,77 @@
+"""Hot-path profiling API routes (super admin only).
+
+Exposes the span histograms recorded by ``services.tracing``. Switching
+tracing on/off or resetting applies to every API worker process (through
+the tracing control file). Recorded spans stay per worker: each response
+carries the ``pid`` of the worker that answered it.
+"""
+
+import os
+
+from flask import Blueprint, g, jsonify, request
+
+from ..auth import require_role
+from ..services import tracing
+
+profiling_bp = Blueprint("profiling", __name__)
+
+
+def _require_super_admin():
+    """Return error tuple if current user is not super admin, else None."""
+    if not g.current_user.is_super_admin:
+        return jsonify({"error": "Super admin access required"}), 403
+    return None
+
+
+@profiling_bp.route("/api/admin/profiling", methods=["GET"])
+@require_role("admin")
+def profiling_summary():
+    """Span duration histograms and the per-stage time breakdown.
+
+    ``spans`` maps span names (``stage.l2``, ``llm.perplexity``,
+    ``db.l2_enrichment``, ``http.website``...) to count, errors, total,
+    mean, min/max and p50/p90/p99 in milliseconds plus the non-empty
+    histogram buckets. ``breakdown`` maps each root span name to the self
+    time spent in every span name beneath it.
+    """
+    denied = _require_super_admin()
+    if denied:
+        return denied
+    return jsonify(tracing.snapshot())
+
+
+@profiling_bp.route("/api/admin/profiling", methods=["POST"])
+@require_role("admin")
+def profiling_configure():
+    """Turn tracing on/off and/or clear recorded spans in all workers.
+
+    Body (JSON):
+        enabled (bool): optional — start or stop recording spans
+        reset (bool): optional — drop histograms and buffered spans
+    """
+    denied = _require_super_admin()
+    if denied:
+        return denied
+
+    body = request.get_json(silent=True) or {}
+    tracing.configure(
+        enabled=bool(body["enabled"]) if "enabled" in body else None,
+        reset_spans=bool(body.get("reset")),
+    )
+    return jsonify({"enabled": tracing.is_enabled(), "pid": os.getpid()})
+
+
+@profiling_bp.route("/api/admin/profiling/export", methods=["GET"])
+@require_role("admin")
+def profiling_export():
+    """Recent spans as OpenTelemetry OTLP/JSON (``resourceSpans``).
+
+    Query params:
+        limit: most recent spans to include (default: the whole buffer)
+    """
+    denied = _require_super_admin()
+    if denied:
+        return denied
+
+    limit = request.args.get("limit", type=int)
+    return jsonify(tracing.to_otlp(tracing.recent_spans(limit)))
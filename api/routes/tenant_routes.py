@@ -6,10 +6,6 @@ from flask import Blueprint, g, jsonify, request
 
 from ..auth import require_auth, require_role, resolve_tenant
 from ..models import (
-    Campaign,
-    Company,
-    CompanyEnrichmentL1,
-    Contact,
     Message,
     PipelineRun,
     StageRun,
@@ -19,6 +15,7 @@ from ..models import (
     UserTenantRole,
     db,
 )
+from ..services.tenant_counters import get_counters, repair_counters
 from ..services.workflow_state import compute_workflow_state
 
 logger = logging.getLogger(__name__)
@@ -299,9 +296,8 @@ def get_onboarding_status():
     if not tenant:
         return jsonify({"error": "Tenant not found"}), 404
 
-    # Count entities
-    contact_count = Contact.query.filter_by(tenant_id=tenant_id).count()
-    campaign_count = Campaign.query.filter_by(tenant_id=tenant_id).count()
+    # Entity counts come from the maintained counters row
+    counters = get_counters(tenant_id)
 
     # Check if a strategy document exists with content
     strategy_doc = StrategyDocument.query.filter_by(tenant_id=tenant_id).first()
@@ -312,12 +308,12 @@ def get_onboarding_status():
     settings = _parse_settings(tenant)
 
     # Compute workflow state from actual data (BL-144)
-    workflow = compute_workflow_state(tenant_id)
+    workflow = compute_workflow_state(tenant_id, counters=counters)
 
     return jsonify(
         {
-            "contact_count": contact_count,
-            "campaign_count": campaign_count,
+            "contact_count": counters["contacts"],
+            "campaign_count": counters["campaigns"],
             "has_strategy": has_strategy,
             "onboarding_path": settings.get("onboarding_path"),
             "checklist_dismissed": settings.get("checklist_dismissed", False),
@@ -332,6 +328,24 @@ def get_onboarding_status():
     )
 
 
+@tenants_bp.route("/counters/repair", methods=["POST"])
+@require_role("admin")
+def repair_tenant_counters():
+    """Recompute live tenant counters and report drift (super_admin only).
+
+    Body (optional): {"tenant_id": "..."} to repair one namespace.
+    """
+    if not g.current_user.is_super_admin:
+        return jsonify({"error": "Only super admins can repair counters"}), 403
+
+    data = request.get_json(silent=True) or {}
+    tenant_id = data.get("tenant_id")
+    if tenant_id and not db.session.get(Tenant, tenant_id):
+        return jsonify({"error": "Tenant not found"}), 404
+
+    return jsonify(repair_counters(tenant_id))
+
+
 VALID_ONBOARDING_PATHS = {"strategy", "import", "templates"}
 
 
@@ -417,40 +431,22 @@ def get_workflow_suggestions():
     )
     current_phase = strategy_doc.phase if strategy_doc else "strategy"
 
-    contact_count = Contact.query.filter_by(tenant_id=tenant_id).count()
-    company_count = Company.query.filter_by(tenant_id=tenant_id).count()
-
-    # Count enriched companies (have L1 data)
-    enriched_count = (
-        db.session.query(CompanyEnrichmentL1.company_id)
-        .join(Company, Company.id == CompanyEnrichmentL1.company_id)
-        .filter(Company.tenant_id == tenant_id)
-        .count()
-    )
-
-    message_count = Message.query.filter_by(tenant_id=tenant_id).count()
-    campaign_count = Campaign.query.filter_by(tenant_id=tenant_id).count()
-
-    # Active campaigns (status = generating or review or active)
-    active_campaigns = Campaign.query.filter(
-        Campaign.tenant_id == tenant_id,
-        Campaign.status.in_(["generating", "review", "active"]),
-    ).count()
+    counters = get_counters(tenant_id)
 
     # Event detection for nudges (BL-169)
-    event_context = _detect_workflow_events(tenant_id)
+    event_context = _detect_workflow_events(tenant_id, counters)
 
     suggestions = _build_workflow_suggestions(
         tenant_id=tenant_id,
         has_strategy=has_strategy,
         has_extracted=has_extracted,
         current_phase=current_phase,
-        contact_count=contact_count,
-        company_count=company_count,
-        enriched_count=enriched_count,
-        message_count=message_count,
-        campaign_count=campaign_count,
-        active_campaigns=active_campaigns,
+        contact_count=counters["contacts"],
+        company_count=counters["companies"],
+        enriched_count=counters["l1_enriched_companies"],
+        message_count=counters["messages"],
+        campaign_count=counters["campaigns"],
+        active_campaigns=counters["active_campaigns"],
         event_context=event_context,
     )
 
@@ -460,9 +456,13 @@ def get_workflow_suggestions():
     return jsonify({"suggestions": suggestions, "nudge_count": nudge_count})
 
 
-def _detect_workflow_events(tenant_id):
+def _detect_workflow_events(tenant_id, counters=None):
     """Detect recent workflow events for event-driven nudges (BL-169).
 
+    Args:
+        tenant_id: Namespace to inspect.
+        counters: Tenant counters (``get_counters``); loaded when omitted.
+
     Returns a dict with event flags and context data for nudge generation.
     """
     from datetime import datetime, timedelta, timezone
@@ -531,14 +531,10 @@ def _detect_workflow_events(tenant_id):
 
     # Count triage results (passed vs disqualified) from company statuses
     if events["triage_completed"]:
-        events["triage_passed"] = Company.query.filter(
-            Company.tenant_id == tenant_id,
-            Company.status == "triage_passed",
-        ).count()
-        events["triage_disqualified"] = Company.query.filter(
-            Company.tenant_id == tenant_id,
-            Company.status == "triage_disqualified",
-        ).count()
+        if counters is None:
+            counters = get_counters(tenant_id)
+        events["triage_passed"] = counters["triage_passed"]
+        events["triage_disqualified"] = counters["triage_disqualified"]
 
     # Check for recently generated messages
     recent_messages = Message.query.filter(
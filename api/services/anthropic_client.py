@@ -22,6 +22,8 @@ import time
 
 import requests
 
+from . import tracing
+
 logger = logging.getLogger(__name__)
 
 # Pricing per 1M tokens
@@ -35,18 +37,133 @@ RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 529}
 
 ANTHROPIC_VERSION = "2023-06-01"
 
+# Prompt caching: cache writes bill at 1.25x the input rate, cache reads
+# at 0.1x. The API accepts at most 4 cache breakpoints per request.
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+MAX_CACHE_BREAKPOINTS = 4
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def _count_breakpoints(blocks):
+    return sum(1 for b in blocks if isinstance(b, dict) and b.get("cache_control"))
+
+
+def build_cached_system(system_prompt):
+    """Convert a system prompt into content blocks with a cache breakpoint.
+
+    Plain strings become a single text block marked ``cache_control``.
+    Block lists (e.g. from ``prompts.identity.build_identity_blocks``) are
+    passed through unchanged when they already carry breakpoints; otherwise
+    the last block is marked so the whole system prefix is cached.
+
+    Args:
+        system_prompt: System prompt string or list of content blocks.
+
+    Returns:
+        List of content block dicts suitable for the top-level 'system' field.
+    """
+    if not system_prompt:
+        return []
+    if isinstance(system_prompt, str):
+        return [{"type": "text", "text": system_prompt, "cache_control": _EPHEMERAL}]
+
+    blocks = [dict(b) for b in system_prompt]
+    if blocks and not _count_breakpoints(blocks):
+        blocks[-1]["cache_control"] = _EPHEMERAL
+    return blocks
+
+
+def build_cached_tools(tools):
+    """Return a copy of ``tools`` with a cache breakpoint on the last definition.
+
+    Tools are rendered before the system prompt, so one breakpoint on the
+    final tool caches the full tool schema block across tool-loop iterations.
+    """
+    if not tools:
+        return tools
+    cached = [dict(t) for t in tools]
+    cached[-1]["cache_control"] = _EPHEMERAL
+    return cached
+
+
+def _with_message_breakpoint(messages):
+    """Mark the last content block of the final message as a cache breakpoint.
+
+    In a tool loop each iteration re-sends the previous conversation plus
+    one new tool_result; caching up to the latest message lets the next
+    iteration read the whole prefix from cache. Input messages are not
+    mutated.
+    """
+    if not messages:
+        return messages
+    last = dict(messages[-1])
+    content = last.get("content")
+    if isinstance(content, str):
+        if not content:
+            return messages
+        last["content"] = [
+            {"type": "text", "text": content, "cache_control": _EPHEMERAL}
+        ]
+    elif isinstance(content, list) and content and isinstance(content[-1], dict):
+        blocks = list(content)
+        blocks[-1] = dict(blocks[-1], cache_control=_EPHEMERAL)
+        last["content"] = blocks
+    else:
+        return messages
+    return list(messages[:-1]) + [last]
+
+
+def apply_prompt_cache(payload):
+    """Add cache breakpoints to a Messages API payload in place.
+
+    Breakpoints go on (in priority order) the tool definitions, the system
+    prompt, and the final message, without exceeding the API limit of
+    ``MAX_CACHE_BREAKPOINTS``.
+    """
+    if payload.get("tools"):
+        payload["tools"] = build_cached_tools(payload["tools"])
+    payload["system"] = build_cached_system(payload.get("system"))
+
+    used = _count_breakpoints(payload.get("tools") or []) + _count_breakpoints(
+        payload["system"]
+    )
+    if used < MAX_CACHE_BREAKPOINTS:
+        payload["messages"] = _with_message_breakpoint(payload.get("messages"))
+    return payload
+
 
 class AnthropicResponse:
     """Structured response from an Anthropic API call."""
 
-    __slots__ = ("content", "model", "input_tokens", "output_tokens", "cost_usd")
+    __slots__ = (
+        "content",
+        "model",
+        "input_tokens",
+        "output_tokens",
+        "cost_usd",
+        "cache_creation_input_tokens",
+        "cache_read_input_tokens",
+    )
 
-    def __init__(self, content, model, input_tokens, output_tokens, cost_usd):
+    def __init__(
+        self,
+        content,
+        model,
+        input_tokens,
+        output_tokens,
+        cost_usd,
+        cache_creation_input_tokens=0,
+        cache_read_input_tokens=0,
+    ):
         self.content = content
         self.model = model
         self.input_tokens = input_tokens
         self.output_tokens = output_tokens
         self.cost_usd = cost_usd
+        self.cache_creation_input_tokens = cache_creation_input_tokens
+        self.cache_read_input_tokens = cache_read_input_tokens
 
 
 class AnthropicClient:
@@ -68,10 +185,23 @@ class AnthropicClient:
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         # Populated after stream_query() completes
-        self.last_stream_usage = {"input_tokens": 0, "output_tokens": 0, "model": ""}
+        self.last_stream_usage = {
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+            "model": "",
+        }
 
+    @tracing.traced("llm.anthropic")
     def query(
-        self, system_prompt, user_prompt, model=None, max_tokens=1024, temperature=0.3
+        self,
+        system_prompt,
+        user_prompt,
+        model=None,
+        max_tokens=1024,
+        temperature=0.3,
+        cache_prompt=False,
     ):
         """Send a query to Anthropic Messages API.
 
@@ -81,6 +211,7 @@ class AnthropicClient:
             model: Model name (default: self.default_model)
             max_tokens: Max output tokens
             temperature: Sampling temperature
+            cache_prompt: Add a prompt-cache breakpoint on the system prompt
 
         Returns:
             AnthropicResponse with content, tokens, and cost
@@ -89,6 +220,7 @@ class AnthropicClient:
             requests.HTTPError: On non-retryable errors or after retries exhausted
         """
         model = model or self.default_model
+        tracing.annotate(model=model)
 
         payload = {
             "model": model,
@@ -99,6 +231,8 @@ class AnthropicClient:
             "max_tokens": max_tokens,
             "temperature": temperature,
         }
+        if cache_prompt:
+            payload["system"] = build_cached_system(system_prompt)
 
         headers = {
             "x-api-key": self.api_key,
@@ -128,7 +262,11 @@ class AnthropicClient:
                 usage = data.get("usage", {})
                 input_tokens = usage.get("input_tokens", 0)
                 output_tokens = usage.get("output_tokens", 0)
-                cost_usd = self._estimate_cost(model, input_tokens, output_tokens)
+                cache_write = usage.get("cache_creation_input_tokens") or 0
+                cache_read = usage.get("cache_read_input_tokens") or 0
+                cost_usd = self._estimate_cost(
+                    model, input_tokens, output_tokens, cache_write, cache_read
+                )
 
                 return AnthropicResponse(
                     content=content,
@@ -136,6 +274,8 @@ class AnthropicClient:
                     input_tokens=input_tokens,
                     output_tokens=output_tokens,
                     cost_usd=cost_usd,
+                    cache_creation_input_tokens=cache_write,
+                    cache_read_input_tokens=cache_read,
                 )
 
             except requests.HTTPError as e:
@@ -160,6 +300,7 @@ class AnthropicClient:
 
         raise last_error
 
+    @tracing.traced("llm.anthropic")
     def query_with_tools(
         self,
         messages,
@@ -168,6 +309,7 @@ class AnthropicClient:
         max_tokens=8192,
         model=None,
         temperature=0.4,
+        cache_prompt=False,
     ):
         """Send a query with tool definitions. Returns the full API response.
 
@@ -177,11 +319,15 @@ class AnthropicClient:
 
         Args:
             messages: List of message dicts with 'role' and 'content' keys.
-            system_prompt: System instruction (top-level 'system' field).
+            system_prompt: System instruction (top-level 'system' field),
+                either a string or a list of content blocks.
             tools: List of tool definitions in Claude API format.
             max_tokens: Max output tokens (default 4096).
             model: Model name (default: self.default_model).
             temperature: Sampling temperature (default 0.4).
+            cache_prompt: Add prompt-cache breakpoints on the tool
+                definitions, the system prompt and the conversation prefix,
+                so later tool-loop iterations read them from cache.
 
         Returns:
             dict with keys: content (list of blocks), model, usage,
@@ -192,6 +338,7 @@ class AnthropicClient:
                 exhausted.
         """
         model = model or self.default_model
+        tracing.annotate(model=model)
 
         payload = {
             "model": model,
@@ -201,6 +348,8 @@ class AnthropicClient:
             "max_tokens": max_tokens,
             "temperature": temperature,
         }
+        if cache_prompt:
+            apply_prompt_cache(payload)
 
         headers = {
             "x-api-key": self.api_key,
@@ -250,7 +399,13 @@ class AnthropicClient:
         raise last_error
 
     def stream_query(
-        self, messages, system_prompt, max_tokens=4096, model=None, temperature=0.3
+        self,
+        messages,
+        system_prompt,
+        max_tokens=4096,
+        model=None,
+        temperature=0.3,
+        cache_prompt=False,
     ):
         """Stream a response from Anthropic Messages API via SSE.
 
@@ -258,15 +413,18 @@ class AnthropicClient:
         call ``stream_query_usage`` on the returned generator or access
         ``stream_usage`` on this client instance to get token counts.
 
-        Usage data is captured from ``message_start`` (input tokens) and
-        ``message_delta`` (output tokens) SSE events.
+        Usage data is captured from ``message_start`` (input and cache
+        tokens) and ``message_delta`` (output tokens) SSE events.
 
         Args:
             messages: List of message dicts with 'role' and 'content' keys.
-            system_prompt: System instruction (top-level 'system' field).
+            system_prompt: System instruction (top-level 'system' field),
+                either a string or a list of content blocks.
             max_tokens: Max output tokens (default 4096).
             model: Model name (default: self.default_model).
             temperature: Sampling temperature.
+            cache_prompt: Add prompt-cache breakpoints on the system prompt
+                and the conversation prefix.
 
         Yields:
             str: Text chunks from content_block_delta events.
@@ -284,6 +442,8 @@ class AnthropicClient:
             "temperature": temperature,
             "stream": True,
         }
+        if cache_prompt:
+            apply_prompt_cache(payload)
 
         headers = {
             "x-api-key": self.api_key,
@@ -304,6 +464,8 @@ class AnthropicClient:
         self.last_stream_usage = {
             "input_tokens": 0,
             "output_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
             "model": model,
         }
 
@@ -331,11 +493,15 @@ class AnthropicClient:
                         data = json.loads(data_str)
                     except (json.JSONDecodeError, ValueError):
                         continue
-                    # Capture input tokens from message_start event
+                    # Capture input and cache tokens from message_start event
                     usage = data.get("message", {}).get("usage", {})
-                    input_tokens = usage.get("input_tokens", 0)
-                    if input_tokens:
-                        self.last_stream_usage["input_tokens"] = input_tokens
+                    for key in (
+                        "input_tokens",
+                        "cache_creation_input_tokens",
+                        "cache_read_input_tokens",
+                    ):
+                        if usage.get(key):
+                            self.last_stream_usage[key] = usage[key]
                     continue
 
                 if current_event == "message_delta":
@@ -366,10 +532,21 @@ class AnthropicClient:
                             yield text
 
     @staticmethod
-    def _estimate_cost(model, input_tokens, output_tokens):
-        """Estimate USD cost based on model pricing."""
+    def _estimate_cost(
+        model,
+        input_tokens,
+        output_tokens,
+        cache_creation_input_tokens=0,
+        cache_read_input_tokens=0,
+    ):
+        """Estimate USD cost based on model pricing, including cache tokens."""
         # Default to haiku pricing if model not found
         pricing = MODEL_PRICING.get(model, MODEL_PRICING["claude-haiku-4-5-20251001"])
-        input_cost = (input_tokens / 1_000_000) * pricing["input_per_m"]
+        billed_input = (
+            input_tokens
+            + cache_creation_input_tokens * CACHE_WRITE_MULTIPLIER
+            + cache_read_input_tokens * CACHE_READ_MULTIPLIER
+        )
+        input_cost = (billed_input / 1_000_000) * pricing["input_per_m"]
         output_cost = (output_tokens / 1_000_000) * pricing["output_per_m"]
         return round(input_cost + output_cost, 6)
@@ -0,0 +1,168 @@
+"""Set-based link/unlink engine for bulk tag and campaign assignment.
+
+Bulk endpoints resolve the target entity IDs once and then write junction
+rows (``contact_tag_assignments``, ``company_tag_assignments``,
+``campaign_contacts``) in chunks instead of one statement per
+(entity, link) pair:
+
+- PostgreSQL: one ``INSERT ... SELECT FROM unnest(...) CROSS JOIN
+  unnest(...) ON CONFLICT DO NOTHING`` per chunk, counting the ``RETURNING``
+  rows, and ``DELETE ... = ANY(array)`` for removal.
+- Other dialects (SQLite in tests): multi-row ``VALUES`` inserts with
+  ``RETURNING`` and ``IN`` list deletes, sized to stay under bind-parameter
+  limits.
+
+Both report exact counts of rows created/removed, so callers can derive
+already-linked / not-found numbers from the pair total.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import bindparam
+
+from ..models import db
+
+# Entity IDs per PostgreSQL statement (each expands to len(link_ids) rows)
+CHUNK_SIZE = 5000
+
+# Bind parameters per statement on dialects without array binds
+MAX_PARAMS = 900
+
+_JUNCTIONS = {
+    "contact_tag_assignments": ("contact_id", "tag_id"),
+    "company_tag_assignments": ("company_id", "tag_id"),
+    "campaign_contacts": ("contact_id", "campaign_id"),
+}
+
+
+def _is_postgres() -> bool:
+    return db.engine.dialect.name == "postgresql"
+
+
+def _columns(table: str) -> tuple[str, str]:
+    try:
+        return _JUNCTIONS[table]
+    except KeyError:
+        raise ValueError("Unsupported junction table: {}".format(table)) from None
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def link_entities(
+    table: str, tenant_id: str, entity_ids: list[str], link_ids: list[str]
+) -> int:
+    """Create every (entity, link) pair that does not exist yet.
+
+    Args:
+        table: Junction table (one of ``_JUNCTIONS``).
+        tenant_id: Tenant written on new rows.
+        entity_ids: Contact/company IDs, already scoped to the tenant.
+        link_ids: Tag IDs or a single campaign ID, already validated.
+
+    Returns:
+        Number of rows inserted; existing pairs are skipped.
+    """
+    entity_col, link_col = _columns(table)
+    if not entity_ids or not link_ids:
+        return 0
+
+    created = 0
+    if _is_postgres():
+        sql = db.text(
+            "WITH ins AS ("
+            "INSERT INTO {t} (id, tenant_id, {e}, {l}) "
+            "SELECT uuid_generate_v4(), CAST(:tenant_id AS uuid), e.id, l.id "
+            "FROM unnest(CAST(:entity_ids AS uuid[])) AS e(id) "
+            "CROSS JOIN unnest(CAST(:link_ids AS uuid[])) AS l(id) "
+            "ON CONFLICT DO NOTHING RETURNING 1"
+            ") SELECT COUNT(*) FROM ins".format(t=table, e=entity_col, l=link_col)
+        )
+        for chunk in _chunks(entity_ids, CHUNK_SIZE):
+            created += db.session.execute(
+                sql,
+                {
+                    "tenant_id": str(tenant_id),
+                    "entity_ids": chunk,
+                    "link_ids": list(link_ids),
+                },
+            ).scalar()
+        return created
+
+    pairs = [(eid, lid) for lid in link_ids for eid in entity_ids]
+    for chunk in _chunks(pairs, MAX_PARAMS // 4):
+        values, params = [], {"tenant_id": str(tenant_id)}
+        for i, (eid, lid) in enumerate(chunk):
+            values.append("(:id{0}, :tenant_id, :e{0}, :l{0})".format(i))
+            params["id{}".format(i)] = str(uuid.uuid4())
+            params["e{}".format(i)] = eid
+            params["l{}".format(i)] = lid
+        rows = db.session.execute(
+            db.text(
+                "INSERT INTO {t} (id, tenant_id, {e}, {l}) VALUES {v} "
+                "ON CONFLICT DO NOTHING RETURNING 1".format(
+                    t=table, e=entity_col, l=link_col, v=", ".join(values)
+                )
+            ),
+            params,
+        ).fetchall()
+        created += len(rows)
+    return created
+
+
+def unlink_entities(
+    table: str, tenant_id: str, entity_ids: list[str], link_ids: list[str]
+) -> int:
+    """Delete every existing (entity, link) pair.
+
+    Returns:
+        Number of rows removed.
+    """
+    entity_col, link_col = _columns(table)
+    if not entity_ids or not link_ids:
+        return 0
+
+    removed = 0
+    if _is_postgres():
+        sql = db.text(
+            "DELETE FROM {t} WHERE tenant_id = CAST(:tenant_id AS uuid) "
+            "AND {e} = ANY(CAST(:entity_ids AS uuid[])) "
+            "AND {l} = ANY(CAST(:link_ids AS uuid[]))".format(
+                t=table, e=entity_col, l=link_col
+            )
+        )
+        for chunk in _chunks(entity_ids, CHUNK_SIZE):
+            removed += db.session.execute(
+                sql,
+                {
+                    "tenant_id": str(tenant_id),
+                    "entity_ids": chunk,
+                    "link_ids": list(link_ids),
+                },
+            ).rowcount
+        return removed
+
+    sql = db.text(
+        "DELETE FROM {t} WHERE tenant_id = :tenant_id "
+        "AND {e} IN :entity_ids AND {l} IN :link_ids".format(
+            t=table, e=entity_col, l=link_col
+        )
+    ).bindparams(
+        bindparam("entity_ids", expanding=True),
+        bindparam("link_ids", expanding=True),
+    )
+    size = max(1, MAX_PARAMS - len(link_ids) - 1)
+    for chunk in _chunks(entity_ids, size):
+        removed += db.session.execute(
+            sql,
+            {
+                "tenant_id": str(tenant_id),
+                "entity_ids": chunk,
+                "link_ids": list(link_ids),
+            },
+        ).rowcount
+    return removed
@@ -0,0 +1,287 @@
+"""Campaign analytics aggregation with a short-lived per-campaign cache.
+
+All message, send and contact metrics of a campaign come from one SQL
+statement: the campaign's messages are selected once into a materialized
+CTE and every section (message counts, email/LinkedIn send stats,
+engagement, send timeline, contact reach) is a grouped branch over it,
+tagged by ``part`` and folded into the response in Python.
+
+The review UI polls the analytics endpoint, so results are cached in
+process for ``CACHE_TTL_SECONDS``. Code paths that change a campaign's
+messages, send logs or LinkedIn queue call ``invalidate_campaign_analytics``
+(or ``invalidate_tenant_analytics``);
+the TTL bounds staleness for writes made by other worker processes.
+"""
+
+import threading
+import time
+
+from ..models import db
+
+# Seconds a computed payload is served from cache
+CACHE_TTL_SECONDS = 15
+
+# Upper bound on cached campaigns per process
+CACHE_MAX_ENTRIES = 512
+
+_cache_lock = threading.Lock()
+_cache = {}  # (tenant_id, campaign_id) -> (expires_at, payload)
+
+# One row per part/group. Aggregate columns are generic (c1..c9) and mean:
+#   messages:  c1 = count, c2 = SUM(generation_cost_usd)
+#   email:     c1 = count, c2..c5 = opened/replied/bounced/clicked,
+#              c6/c7 = total opens/clicks, c8 = hard bounces,
+#              c9 = soft bounces
+#   linkedin:  c1 = count
+#   contacts:  c1 = total, c2 = with email, c3 = with LinkedIn, c4 = both
+_ANALYTICS_SQL = """
+    WITH cm AS MATERIALIZED (
+        SELECT m.id, m.status, m.channel, m.sequence_step,
+               m.generation_cost_usd
+        FROM messages m
+        JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id
+        WHERE cc.campaign_id = :cid AND cc.tenant_id = :t
+    ),
+    reach AS (
+        SELECT cc.contact_id,
+               (ct.email_address IS NOT NULL AND ct.email_address != '')
+                   AS has_email,
+               (ct.linkedin_url IS NOT NULL AND ct.linkedin_url != '')
+                   AS has_linkedin
+        FROM campaign_contacts cc
+        JOIN contacts ct ON cc.contact_id = ct.id
+        WHERE cc.campaign_id = :cid AND cc.tenant_id = :t
+    )
+    SELECT 'messages' AS part, cm.status, cm.channel, cm.sequence_step,
+           COUNT(*) AS c1,
+           COALESCE(SUM(cm.generation_cost_usd), 0) AS c2,
+           0 AS c3, 0 AS c4, 0 AS c5, 0 AS c6, 0 AS c7, 0 AS c8, 0 AS c9,
+           NULL AS first_at, NULL AS last_at
+    FROM cm
+    GROUP BY cm.status, cm.channel, cm.sequence_step
+    UNION ALL
+    SELECT 'email', esl.status, NULL, NULL,
+           COUNT(*),
+           COUNT(CASE WHEN esl.opened_at IS NOT NULL THEN 1 END),
+           COUNT(CASE WHEN esl.replied_at IS NOT NULL THEN 1 END),
+           COUNT(CASE WHEN esl.bounced_at IS NOT NULL THEN 1 END),
+           COUNT(CASE WHEN esl.clicked_at IS NOT NULL THEN 1 END),
+           COALESCE(SUM(esl.open_count), 0),
+           COALESCE(SUM(esl.click_count), 0),
+           COUNT(CASE WHEN esl.bounce_type = 'hard' THEN 1 END),
+           COUNT(CASE WHEN esl.bounce_type = 'soft' THEN 1 END),
+           MIN(esl.sent_at), MAX(esl.sent_at)
+    FROM email_send_log esl
+    JOIN cm ON esl.message_id = cm.id
+    GROUP BY esl.status
+    UNION ALL
+    SELECT 'linkedin', lsq.status, NULL, NULL,
+           COUNT(*), 0, 0, 0, 0, 0, 0, 0, 0,
+           MIN(lsq.sent_at), MAX(lsq.sent_at)
+    FROM linkedin_send_queue lsq
+    JOIN cm ON lsq.message_id = cm.id
+    GROUP BY lsq.status
+    UNION ALL
+    SELECT 'contacts', NULL, NULL, NULL,
+           COUNT(DISTINCT contact_id),
+           COUNT(DISTINCT CASE WHEN has_email THEN contact_id END),
+           COUNT(DISTINCT CASE WHEN has_linkedin THEN contact_id END),
+           COUNT(DISTINCT CASE WHEN has_email AND has_linkedin
+                               THEN contact_id END),
+           0, 0, 0, 0, 0, NULL, NULL
+    FROM reach
+"""
+
+
+def _rate(num, den):
+    if den == 0:
+        return 0
+    return round((num / den) * 100, 1)
+
+
+def _earliest(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+def _latest(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+def compute_campaign_analytics(campaign_id, tenant_id, generation_cost_usd=0):
+    """Aggregate a campaign's metrics in a single query.
+
+    Args:
+        campaign_id: Campaign UUID.
+        tenant_id: Owning tenant UUID.
+        generation_cost_usd: Cost recorded in the campaign's generation
+            config; when 0 the sum of the messages' own costs is used.
+
+    Returns:
+        Dict with ``messages``, ``sending``, ``contacts``, ``cost``,
+        ``engagement`` sections and ``first_send_at`` / ``last_send_at``
+        (raw timestamp values).
+    """
+    rows = db.session.execute(
+        db.text(_ANALYTICS_SQL), {"cid": campaign_id, "t": tenant_id}
+    ).fetchall()
+
+    msg_by_status = {}
+    msg_by_channel = {}
+    msg_by_step = {}
+    message_cost = 0.0
+    email_counts = {}
+    li_counts = {}
+    engagement = [0] * 8
+    contacts = [0, 0, 0, 0]
+    first_send_at = None
+    last_send_at = None
+
+    for row in rows:
+        part, status, channel, step = row[0], row[1], row[2], row[3]
+        count = int(row[4] or 0)
+        if part == "messages":
+            msg_by_status[status] = msg_by_status.get(status, 0) + count
+            msg_by_channel[channel] = msg_by_channel.get(channel, 0) + count
+            step_key = str(step)
+            msg_by_step[step_key] = msg_by_step.get(step_key, 0) + count
+            message_cost += float(row[5] or 0)
+        elif part == "email":
+            email_counts[status] = count
+            for i in range(8):
+                engagement[i] += int(row[5 + i] or 0)
+        elif part == "linkedin":
+            li_counts[status] = count
+        elif part == "contacts":
+            contacts = [count] + [int(v or 0) for v in row[5:8]]
+        if part in ("email", "linkedin"):
+            first_send_at = _earliest(first_send_at, row[13])
+            last_send_at = _latest(last_send_at, row[14])
+
+    msg_total = sum(msg_by_status.values())
+    email_total = sum(email_counts.values())
+    li_total = sum(li_counts.values())
+    if not generation_cost_usd:
+        generation_cost_usd = message_cost
+
+    (
+        opened_count,
+        replied_count,
+        bounced_count,
+        clicked_count,
+        total_opens,
+        total_clicks,
+        hard_bounces,
+        soft_bounces,
+    ) = engagement
+    emails_delivered = email_counts.get("delivered", 0) + email_counts.get("sent", 0)
+
+    return {
+        "messages": {
+            "total": msg_total,
+            "by_status": msg_by_status,
+            "by_channel": msg_by_channel,
+            "by_step": msg_by_step,
+        },
+        "sending": {
+            "email": {
+                "total": email_total,
+                "queued": email_counts.get("queued", 0),
+                "sent": email_counts.get("sent", 0),
+                "delivered": email_counts.get("delivered", 0),
+                "bounced": email_counts.get("bounced", 0),
+                "failed": email_counts.get("failed", 0),
+            },
+            "linkedin": {
+                "total": li_total,
+                "queued": li_counts.get("queued", 0),
+                "sent": li_counts.get("sent", 0),
+                "delivered": li_counts.get("delivered", 0),
+                "failed": li_counts.get("failed", 0),
+            },
+        },
+        "contacts": {
+            "total": contacts[0],
+            "with_email": contacts[1],
+            "with_linkedin": contacts[2],
+            "both_channels": contacts[3],
+        },
+        "cost": {
+            "generation_usd": generation_cost_usd,
+            "email_sends": email_total,
+        },
+        "engagement": {
+            "opened": opened_count,
+            "replied": replied_count,
+            "bounced": bounced_count,
+            "clicked": clicked_count,
+            "total_opens": total_opens,
+            "total_clicks": total_clicks,
+            "hard_bounces": hard_bounces,
+            "soft_bounces": soft_bounces,
+            "open_rate": _rate(opened_count, emails_delivered),
+            "reply_rate": _rate(replied_count, emails_delivered),
+            "bounce_rate": _rate(bounced_count, email_total),
+            "click_rate": _rate(clicked_count, emails_delivered),
+        },
+        "first_send_at": first_send_at,
+        "last_send_at": last_send_at,
+    }
+
+
+def get_cached_analytics(tenant_id, campaign_id):
+    """Return the cached payload for a campaign, or None if absent/expired."""
+    key = (str(tenant_id), str(campaign_id))
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _cache[key]
+            return None
+        return entry[1]
+
+
+def store_analytics(tenant_id, campaign_id, payload, ttl=CACHE_TTL_SECONDS):
+    """Cache a campaign's analytics payload for ``ttl`` seconds."""
+    now = time.monotonic()
+    with _cache_lock:
+        if len(_cache) >= CACHE_MAX_ENTRIES:
+            for k in [k for k, (exp, _) in _cache.items() if exp <= now]:
+                del _cache[k]
+            if len(_cache) >= CACHE_MAX_ENTRIES:
+                oldest = min(_cache, key=lambda k: _cache[k][0])
+                del _cache[oldest]
+        _cache[(str(tenant_id), str(campaign_id))] = (now + ttl, payload)
+
+
+def invalidate_campaign_analytics(campaign_id):
+    """Drop cached analytics for one campaign."""
+    campaign_key = str(campaign_id)
+    with _cache_lock:
+        for key in [k for k in _cache if k[1] == campaign_key]:
+            del _cache[key]
+
+
+def invalidate_tenant_analytics(tenant_id):
+    """Drop cached analytics for all of a tenant's campaigns.
+
+    For writes keyed by message or queue id (message PATCH, LinkedIn queue
+    updates) that do not know which campaign they touch.
+    """
+    tenant_key = str(tenant_id)
+    with _cache_lock:
+        for key in [k for k in _cache if k[0] == tenant_key]:
+            del _cache[key]
+
+
+def clear_analytics_cache():
+    with _cache_lock:
+        _cache.clear()
@@ -14,6 +14,8 @@ from datetime import datetime, timezone
 from sqlalchemy import text
 
 from ..models import db
+from . import tracing
+from .context_bundles import refresh_contact_bundles
 from .perplexity_client import PerplexityClient
 from .stage_registry import get_model_for_stage
 
@@ -144,6 +146,7 @@ def enrich_career(
 
     # 2. Upsert to contact_enrichment
     _upsert_career_enrichment(entity_id, research_data, total_cost)
+    refresh_contact_bundles([entity_id])
 
     db.session.commit()
 
@@ -253,6 +256,7 @@ def _research_career(contact_data, model, user_id=None, enrichment_language=None
 # ---------------------------------------------------------------------------
 
 
+@tracing.traced("db.career_enrichment")
 def _upsert_career_enrichment(contact_id, data, cost):
     """Upsert career enrichment fields into contact_enrichment table."""
     now_str = datetime.now(timezone.utc).isoformat()
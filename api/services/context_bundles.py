@@ -0,0 +1,309 @@
+"""Materialized enrichment-context bundles for message generation.
+
+Generating or regenerating a message needs the contact's company profile,
+the company's L2 research (with the split profile/signals/market/opportunity
+modules filling fields the legacy L2 row lacks) and the person enrichment.
+Instead of three to six queries per contact, each company and contact has a
+compact JSON bundle in ``enrichment_context_bundles`` (migration 057):
+
+- the enrichers store it on write (``refresh_company_bundles``,
+  ``refresh_contact_bundles``),
+- PostgreSQL triggers delete it when any source row changes,
+- ``load_bundles`` fetches every bundle of a campaign in one query and
+  builds (and stores) only the missing or outdated ones.
+
+Bundles carry ``BUNDLE_VERSION``; bump it when the bundle shape changes and
+old rows are rebuilt on read. Other dialects (SQLite in tests) have no
+invalidation triggers, so bundles are built live there and never stored.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+
+from sqlalchemy import bindparam
+
+from ..models import db
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_VERSION = 1
+
+# IDs per IN-list query
+LOOKUP_CHUNK_SIZE = 1000
+
+# Bundle "l2" fields and the module tables that can supply them, in
+# precedence order (l2 = legacy company_enrichment_l2 row).
+L2_FIELDS = (
+    ("company_intel", ("l2", "pr")),
+    ("recent_news", ("l2", "mk")),
+    ("ai_opportunities", ("l2", "op")),
+    ("pain_hypothesis", ("l2", "op")),
+    ("key_products", ("l2", "pr")),
+    ("customer_segments", ("l2", "pr")),
+    ("competitors", ("l2", "pr")),
+    ("tech_stack", ("l2", "pr")),
+    ("hiring_signals", ("l2", "sg")),
+    ("digital_initiatives", ("l2", "sg")),
+    ("pitch_framing", ("l2", "op")),
+    ("growth_signals", ("l2", "mk")),
+    ("expansion", ("l2", "mk", "pr")),
+    ("ma_activity", ("l2", "mk")),
+)
+
+PERSON_FIELDS = (
+    "person_summary",
+    "relationship_synthesis",
+    "career_trajectory",
+    "speaking_engagements",
+    "publications",
+    "ai_champion_score",
+    "authority_score",
+)
+
+_MODULE_TABLES = (
+    ("l2", "company_enrichment_l2"),
+    ("pr", "company_enrichment_profile"),
+    ("sg", "company_enrichment_signals"),
+    ("mk", "company_enrichment_market"),
+    ("op", "company_enrichment_opportunity"),
+)
+
+
+def _l2_column(field, sources):
+    cols = ["{}.{}".format(alias, field) for alias in sources]
+    return cols[0] if len(cols) == 1 else "COALESCE({})".format(", ".join(cols))
+
+
+_COMPANY_SQL = (
+    "SELECT c.id, c.tenant_id, c.name, c.domain, c.industry, c.hq_country, "
+    "c.summary, c.company_size, c.verified_employees, c.verified_revenue_eur_m, "
+    "c.tier, c.business_model, ("
+    + " OR ".join(
+        "{}.company_id IS NOT NULL".format(alias) for alias, _ in _MODULE_TABLES
+    )
+    + "), "
+    + ", ".join(_l2_column(f, src) for f, src in L2_FIELDS)
+    + " FROM companies c "
+    + " ".join(
+        "LEFT JOIN {} {} ON {}.company_id = c.id".format(table, alias, alias)
+        for alias, table in _MODULE_TABLES
+    )
+    + " WHERE c.id IN :ids"
+)
+
+_CONTACT_SQL = (
+    "SELECT ct.id, ct.tenant_id, ce.contact_id, "
+    + ", ".join("ce." + f for f in PERSON_FIELDS)
+    + " FROM contacts ct "
+    "LEFT JOIN contact_enrichment ce ON ce.contact_id = ct.id "
+    "WHERE ct.id IN :ids"
+)
+
+
+def bundles_maintained() -> bool:
+    """True when triggers invalidate stored bundles (PostgreSQL)."""
+    return db.engine.dialect.name == "postgresql"
+
+
+def _chunks(ids):
+    ids = list(ids)
+    for i in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+        yield ids[i : i + LOOKUP_CHUNK_SIZE]
+
+
+def _select_in(sql, ids, params=None):
+    stmt = db.text(sql).bindparams(bindparam("ids", expanding=True))
+    rows = []
+    for chunk in _chunks(ids):
+        rows.extend(db.session.execute(stmt, dict(params or {}, ids=chunk)))
+    return rows
+
+
+def build_company_bundles(company_ids) -> dict:
+    """Assemble company bundles from the source tables.
+
+    Returns:
+        ``{company_id: (tenant_id, bundle)}``; unknown ids are omitted.
+    """
+    bundles = {}
+    if not company_ids:
+        return bundles
+    for row in _select_in(_COMPANY_SQL, company_ids):
+        company = {
+            "name": row[2],
+            "domain": row[3],
+            "industry": row[4],
+            "hq_country": row[5],
+            "summary": row[6],
+            "company_size": row[7],
+            "employee_count": str(int(row[8])) if row[8] else None,
+            "revenue_eur_m": str(round(float(row[9]), 1)) if row[9] else None,
+            "tier": row[10],
+            "business_model": row[11],
+        }
+        l2 = {}
+        if row[12]:
+            l2 = {field: row[13 + i] for i, (field, _) in enumerate(L2_FIELDS)}
+        bundles[str(row[0])] = (str(row[1]), {"company": company, "l2": l2})
+    return bundles
+
+
+def build_contact_bundles(contact_ids) -> dict:
+    """Assemble contact bundles from the source tables.
+
+    Returns:
+        ``{contact_id: (tenant_id, bundle)}``; unknown ids are omitted.
+    """
+    bundles = {}
+    if not contact_ids:
+        return bundles
+    for row in _select_in(_CONTACT_SQL, contact_ids):
+        person = {}
+        if row[2] is not None:
+            person = {field: row[3 + i] for i, field in enumerate(PERSON_FIELDS)}
+        bundles[str(row[0])] = (str(row[1]), {"person": person})
+    return bundles
+
+
+def _store(entity_type, built, replace=True):
+    """Upsert built bundles.
+
+    Args:
+        replace: Overwrite stored bundles of the current version. Readers
+            pass False: their bundle may have been built from rows an
+            enricher has since rewritten, so they only fill missing or
+            outdated rows and never clobber a writer's fresher bundle.
+    """
+    if not built:
+        return
+    conflict = (
+        "ON CONFLICT (entity_type, entity_id) DO UPDATE SET "
+        "tenant_id = excluded.tenant_id, version = excluded.version, "
+        "bundle = excluded.bundle, built_at = excluded.built_at"
+    )
+    if not replace:
+        conflict += " WHERE enrichment_context_bundles.version < excluded.version"
+    bundle_sql = (
+        "CAST(:bundle AS jsonb)"
+        if db.engine.dialect.name == "postgresql"
+        else ":bundle"
+    )
+    db.session.execute(
+        db.text(
+            "INSERT INTO enrichment_context_bundles "
+            "(entity_type, entity_id, tenant_id, version, bundle, built_at) "
+            "VALUES (:type, :id, :tenant, :version, " + bundle_sql + ", "
+            "CURRENT_TIMESTAMP) " + conflict
+        ),
+        [
+            {
+                "type": entity_type,
+                "id": entity_id,
+                "tenant": tenant_id,
+                "version": BUNDLE_VERSION,
+                "bundle": json.dumps(bundle, default=str),
+            }
+            for entity_id, (tenant_id, bundle) in built.items()
+        ],
+    )
+
+
+def refresh_company_bundles(company_ids) -> None:
+    """Rebuild and store bundles for companies whose enrichment was written.
+
+    Runs in the caller's transaction; the caller commits.
+    """
+    if bundles_maintained():
+        _store("company", build_company_bundles([str(c) for c in company_ids]))
+
+
+def refresh_contact_bundles(contact_ids) -> None:
+    """Rebuild and store bundles for contacts whose enrichment was written.
+
+    Runs in the caller's transaction; the caller commits.
+    """
+    if bundles_maintained():
+        _store("contact", build_contact_bundles([str(c) for c in contact_ids]))
+
+
+def _parse(value):
+    if isinstance(value, str):
+        return json.loads(value)
+    return value or {}
+
+
+def load_bundles(company_ids, contact_ids) -> tuple[dict, dict]:
+    """Fetch bundles for many companies and contacts at once.
+
+    Stored bundles of the current version come back in one query (per
+    ``LOOKUP_CHUNK_SIZE`` ids); missing ones are built from the source
+    tables and stored for the next reader.
+
+    Returns:
+        ``(company_bundles, contact_bundles)`` keyed by id.
+    """
+    company_ids = sorted({str(c) for c in company_ids if c})
+    contact_ids = sorted({str(c) for c in contact_ids if c})
+    companies, contacts = {}, {}
+
+    if bundles_maintained() and (company_ids or contact_ids):
+        stmt = db.text(
+            "SELECT entity_type, entity_id, bundle "
+            "FROM enrichment_context_bundles "
+            "WHERE version = :version AND ("
+            "(entity_type = 'company' AND entity_id IN :company_ids) OR "
+            "(entity_type = 'contact' AND entity_id IN :contact_ids))"
+        ).bindparams(
+            bindparam("company_ids", expanding=True),
+            bindparam("contact_ids", expanding=True),
+        )
+        for start in range(
+            0, max(len(company_ids), len(contact_ids)), LOOKUP_CHUNK_SIZE
+        ):
+            end = start + LOOKUP_CHUNK_SIZE
+            rows = db.session.execute(
+                stmt,
+                {
+                    "version": BUNDLE_VERSION,
+                    "company_ids": company_ids[start:end],
+                    "contact_ids": contact_ids[start:end],
+                },
+            )
+            for entity_type, entity_id, bundle in rows:
+                target = companies if entity_type == "company" else contacts
+                target[str(entity_id)] = _parse(bundle)
+
+    missing_companies = [c for c in company_ids if c not in companies]
+    missing_contacts = [c for c in contact_ids if c not in contacts]
+    if not (missing_companies or missing_contacts):
+        return companies, contacts
+
+    built_companies = build_company_bundles(missing_companies)
+    built_contacts = build_contact_bundles(missing_contacts)
+    companies.update({k: bundle for k, (_, bundle) in built_companies.items()})
+    contacts.update({k: bundle for k, (_, bundle) in built_contacts.items()})
+
+    if bundles_maintained():
+        try:
+            _store("company", built_companies, replace=False)
+            _store("contact", built_contacts, replace=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.warning("Could not store enrichment context bundles", exc_info=True)
+    return companies, contacts
+
+
+def enrichment_context(company_bundle, contact_bundle) -> tuple[dict, dict]:
+    """Turn bundles into ``(company_data, enrichment_data)`` for the prompt
+    builders. Returns fresh dicts, so callers may mutate them."""
+    company_bundle = company_bundle or {}
+    contact_bundle = contact_bundle or {}
+    company_data = dict(company_bundle.get("company") or {})
+    enrichment_data = {
+        "l2": dict(company_bundle.get("l2") or {}),
+        "person": dict(contact_bundle.get("person") or {}),
+    }
+    return company_data, enrichment_data
@@ -31,11 +31,13 @@ def record_completion(
     status="completed",
     cost_usd=0,
     error=None,
+    duration_ms=None,
 ):
     """Insert an entity_stage_completions record.
 
     This is the core dual-write function: called after every entity processing
     to record what stage completed (or failed/skipped) for which entity.
+    ``cost_usd`` and ``duration_ms`` feed ``stage_estimates``.
     """
     row_id = str(_uuid_mod.uuid4())
     params = {
@@ -49,6 +51,7 @@ def record_completion(
         "status": status,
         "cost_usd": cost_usd or 0,
         "error": str(error)[:500] if error else None,
+        "duration_ms": int(duration_ms) if duration_ms is not None else None,
         "_now": datetime.datetime.utcnow().isoformat(),
     }
     try:
@@ -57,12 +60,14 @@ def record_completion(
             text("""
                 INSERT INTO entity_stage_completions
                     (id, tenant_id, tag_id, pipeline_run_id, entity_type,
-                     entity_id, stage, status, cost_usd, error)
+                     entity_id, stage, status, cost_usd, error, duration_ms)
                 VALUES (:id, :tenant_id, :tag_id, :pipeline_run_id, :entity_type,
-                        :entity_id, :stage, :status, :cost_usd, :error)
+                        :entity_id, :stage, :status, :cost_usd, :error,
+                        :duration_ms)
                 ON CONFLICT (pipeline_run_id, entity_id, stage) DO UPDATE
                 SET status = EXCLUDED.status, cost_usd = EXCLUDED.cost_usd,
-                    error = EXCLUDED.error, completed_at = :_now
+                    error = EXCLUDED.error, duration_ms = EXCLUDED.duration_ms,
+                    completed_at = :_now
             """),
             params,
         )
@@ -75,9 +80,10 @@ def record_completion(
                 text("""
                     INSERT INTO entity_stage_completions
                         (id, tenant_id, tag_id, pipeline_run_id, entity_type,
-                         entity_id, stage, status, cost_usd, error)
+                         entity_id, stage, status, cost_usd, error, duration_ms)
                     VALUES (:id, :tenant_id, :tag_id, :pipeline_run_id, :entity_type,
-                            :entity_id, :stage, :status, :cost_usd, :error)
+                            :entity_id, :stage, :status, :cost_usd, :error,
+                            :duration_ms)
                 """),
                 params,
             )
@@ -685,6 +691,8 @@ def run_dag_stage(
         done_count = 0
         failed_count = 0
         sample_remaining = sample_size
+        l1_batch_size = _l1_batch_size(stage_code, tenant_id, re_enrich_horizons)
+        prefetched_results = {}
 
         _update_stage_run(run_id, status="running")
         logger.info(
@@ -747,6 +755,7 @@ def run_dag_stage(
             if new_ids:
                 new_total = done_count + failed_count + len(new_ids)
                 _update_stage_run(run_id, total=new_total)
+                batch_pending = _l1_batch_candidates(l1_batch_size, new_ids)
 
                 for entity_id in new_ids:
                     if _check_stop_signal(run_id):
@@ -762,19 +771,37 @@ def run_dag_stage(
                     processed_ids.add(entity_id)
                     entity_name = _get_entity_name(stage_code, entity_id, tenant_id)
                     _update_current_item(run_id, entity_name, "processing")
+                    item_started = time.monotonic()
 
                     try:
-                        # Fetch previous data for re-enrichment
-                        prev_data = None
-                        if re_enrich_horizons and stage_code in re_enrich_horizons:
-                            prev_data = _fetch_previous_data(
-                                entity_type, entity_id, stage_code
+                        if entity_id in batch_pending:
+                            # Earlier candidates are already batched, so this
+                            # chunk starts at entity_id
+                            chunk = [e for e in new_ids if e in batch_pending]
+                            chunk = chunk[:l1_batch_size]
+                            batch_pending.difference_update(chunk)
+                            prefetched_results.update(_run_l1_batch(chunk, tenant_id))
+                        prefetched = prefetched_results.pop(entity_id, None)
+
+                        if prefetched and not prefetched.get("fallback"):
+                            result = prefetched
+                            cost = _extract_cost(result)
+                        else:
+                            # Fetch previous data for re-enrichment
+                            prev_data = None
+                            if re_enrich_horizons and stage_code in re_enrich_horizons:
+                                prev_data = _fetch_previous_data(
+                                    entity_type, entity_id, stage_code
+                                )
+
+                            result = _process_entity(
+                                stage_code,
+                                entity_id,
+                                tenant_id,
+                                previous_data=prev_data,
                             )
-
-                        result = _process_entity(
-                            stage_code, entity_id, tenant_id, previous_data=prev_data
-                        )
-                        cost = _extract_cost(result)
+                            # A batch fallback also carries its share of the batch call
+                            cost = _extract_cost(result) + _extract_cost(prefetched)
                         total_cost += cost
 
                         # Handle gate results (triage, review, etc.)
@@ -797,6 +824,9 @@ def run_dag_stage(
                             stage_code,
                             status=completion_status,
                             cost_usd=cost,
+                            duration_ms=result.get("duration_ms")
+                            if isinstance(result, dict) and result.get("batched")
+                            else (time.monotonic() - item_started) * 1000,
                         )
 
                         _update_current_item(run_id, entity_name, "ok")
@@ -820,6 +850,7 @@ def run_dag_stage(
                             stage_code,
                             status="failed",
                             error=str(e),
+                            duration_ms=(time.monotonic() - item_started) * 1000,
                         )
 
                         _update_current_item(run_id, entity_name, "failed")
@@ -865,6 +896,56 @@ def run_dag_stage(
             time.sleep(REACTIVE_POLL_INTERVAL)
 
 
+def _l1_batch_size(stage_code, tenant_id, re_enrich_horizons):
+    """Return the tenant's opt-in L1 batch size (0 = one company per call).
+
+    Re-enrichment runs stay single so each prompt carries the company's
+    previous data.
+    """
+    if stage_code != "l1" or (re_enrich_horizons and "l1" in re_enrich_horizons):
+        return 0
+    from .l1_enricher import get_batch_size
+
+    try:
+        return get_batch_size(tenant_id)
+    except Exception as e:
+        logger.warning("Could not read L1 batch size for %s: %s", tenant_id, e)
+        db.session.rollback()
+        return 0
+
+
+def _l1_batch_candidates(batch_size, entity_ids):
+    """Return the ids of ``entity_ids`` that can go into an L1 batch."""
+    if not batch_size:
+        return set()
+    from .l1_enricher import select_batch_candidates
+
+    try:
+        return set(select_batch_candidates(entity_ids))
+    except Exception as e:
+        logger.warning("L1 batch candidate query failed: %s", e)
+        db.session.rollback()
+        return set()
+
+
+def _run_l1_batch(company_ids, tenant_id):
+    """Enrich ``company_ids`` with one batched L1 call.
+
+    Returns ``enrich_l1_batch`` results. On an unexpected error it returns
+    an empty dict, so every company is processed singly instead.
+    """
+    if len(company_ids) < 2:
+        return {}
+    from .l1_enricher import enrich_l1_batch
+
+    try:
+        return enrich_l1_batch(company_ids, tenant_id)
+    except Exception as e:
+        logger.warning("Batched L1 failed for %d companies: %s", len(company_ids), e)
+        db.session.rollback()
+        return {}
+
+
 def _predecessors_terminal(predecessor_run_ids):
     """Check if all predecessor stage_runs are in a terminal state."""
     if not predecessor_run_ids:
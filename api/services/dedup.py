@@ -32,6 +32,66 @@ def normalize_domain(url):
     return url if url else None
 
 
+def normalize_linkedin_url(url):
+    """Normalize a LinkedIn profile URL for comparison."""
+    if not url:
+        return None
+    url = url.strip().lower().rstrip("/")
+    return url or None
+
+
+# IN-list size for batched lookups (stays under bind-parameter limits)
+LOOKUP_CHUNK_SIZE = 500
+
+
+def _chunked(values):
+    values = list(values)
+    for start in range(0, len(values), LOOKUP_CHUNK_SIZE):
+        yield values[start : start + LOOKUP_CHUNK_SIZE]
+
+
+def find_existing_contacts_by_linkedin(tenant_id, linkedin_urls):
+    """Batched LinkedIn URL lookup.
+
+    Returns:
+        dict mapping normalized URL → existing Contact id.
+    """
+    urls = {normalize_linkedin_url(u) for u in linkedin_urls} - {None}
+    # Stored URLs may keep their trailing slash
+    candidates = urls | {u + "/" for u in urls}
+    found = {}
+    for chunk in _chunked(candidates):
+        rows = (
+            db.session.query(func.lower(Contact.linkedin_url), Contact.id)
+            .filter(
+                Contact.tenant_id == str(tenant_id),
+                func.lower(Contact.linkedin_url).in_(chunk),
+            )
+            .all()
+        )
+        for url, contact_id in rows:
+            found.setdefault(normalize_linkedin_url(url), contact_id)
+    return found
+
+
+def find_existing_companies_by_name(tenant_id, names):
+    """Batched case-insensitive company name lookup.
+
+    Returns:
+        dict mapping lower(name) → existing Company.
+    """
+    keys = {(n or "").strip().lower() for n in names} - {""}
+    found = {}
+    for chunk in _chunked(keys):
+        matches = Company.query.filter(
+            Company.tenant_id == str(tenant_id),
+            func.lower(Company.name).in_(chunk),
+        ).all()
+        for company in matches:
+            found.setdefault(company.name.strip().lower(), company)
+    return found
+
+
 def find_existing_company(tenant_id, name=None, domain=None):
     """Find an existing company by domain (priority) or name.
 
@@ -70,8 +130,8 @@ def find_existing_contact(
 
     Returns (Contact, match_type) or (None, None).
     """
-    if linkedin_url:
-        url = linkedin_url.strip().lower().rstrip("/")
+    url = normalize_linkedin_url(linkedin_url)
+    if url:
         match = Contact.query.filter(
             Contact.tenant_id == str(tenant_id),
             func.lower(Contact.linkedin_url) == url,
@@ -23,6 +23,7 @@ from .pipeline_engine import (
     count_eligible,
     start_pipeline_threads,
 )
+from .stage_estimates import estimate_stage, pipeline_eta
 from .tool_registry import ToolContext, ToolDefinition
 
 logger = logging.getLogger(__name__)
@@ -30,20 +31,6 @@ logger = logging.getLogger(__name__)
 # Default enrichment stages for the auto-start flow
 DEFAULT_STAGES = ["l1", "l2", "person"]
 
-# Static cost defaults (USD per item) — same as enrich_routes
-STATIC_COST_DEFAULTS = {
-    "l1": 0.02,
-    "l2": 0.08,
-    "signals": 0.05,
-    "registry": 0.00,
-    "news": 0.04,
-    "person": 0.04,
-    "social": 0.03,
-    "career": 0.03,
-    "contact_details": 0.01,
-    "qc": 0.00,
-}
-
 # Credits per USD (1 credit = $0.001)
 CREDITS_PER_USD = 1000
 
@@ -72,22 +59,6 @@ def _get_tenant_tags(tenant_id):
     return [{"id": row[0], "name": row[1], "company_count": row[2]} for row in rows]
 
 
-def _get_cost_per_item(tenant_id, stage):
-    """Get average cost per item from historical stage_runs."""
-    row = db.session.execute(
-        text("""
-            SELECT AVG(cost_usd / NULLIF(done, 0)), COUNT(*)
-            FROM stage_runs
-            WHERE tenant_id = :t AND stage = :s
-              AND status = 'completed' AND done > 0 AND cost_usd > 0
-        """),
-        {"t": str(tenant_id), "s": stage},
-    ).fetchone()
-    if row and row[0] is not None and row[1] >= 5:
-        return round(float(row[0]), 4)
-    return STATIC_COST_DEFAULTS.get(stage, 0.05)
-
-
 # ---------------------------------------------------------------------------
 # Tool: estimate_enrichment_cost
 # ---------------------------------------------------------------------------
@@ -149,13 +120,16 @@ def estimate_enrichment_cost(args: dict, ctx: ToolContext) -> dict:
 
     # Compute per-stage estimates
     stage_estimates = []
+    by_stage = {}
     total_cost_usd = 0.0
     total_eligible = 0
 
     for stage in stages:
         eligible = count_eligible(ctx.tenant_id, tag_id, stage, None, [])
-        cost_per_item = _get_cost_per_item(ctx.tenant_id, stage)
-        stage_cost = round(eligible * cost_per_item, 2)
+        estimate = estimate_stage(ctx.tenant_id, stage, eligible)
+        by_stage[stage] = estimate
+        cost_per_item = estimate["cost_per_item"]
+        stage_cost = estimate["estimated_cost"]
         total_cost_usd += stage_cost
         total_eligible += eligible
 
@@ -167,10 +141,14 @@ def estimate_enrichment_cost(args: dict, ctx: ToolContext) -> dict:
                 "cost_per_item_credits": int(cost_per_item * CREDITS_PER_USD),
                 "total_cost_usd": stage_cost,
                 "total_cost_credits": int(stage_cost * CREDITS_PER_USD),
+                "cost_range_usd": estimate["cost_range"],
+                "eta_seconds": estimate["eta_seconds"],
+                "eta_p90_seconds": estimate["eta_p90_seconds"],
             }
         )
 
     total_cost_credits = int(total_cost_usd * CREDITS_PER_USD)
+    eta_seconds, eta_p90_seconds = pipeline_eta(by_stage)
 
     # Get budget status
     budget = get_budget_status(ctx.tenant_id)
@@ -193,15 +171,20 @@ def estimate_enrichment_cost(args: dict, ctx: ToolContext) -> dict:
         "total_eligible": total_eligible,
         "total_cost_usd": round(total_cost_usd, 2),
         "total_cost_credits": total_cost_credits,
+        "eta_seconds": eta_seconds,
+        "eta_p90_seconds": eta_p90_seconds,
         "budget": budget_info,
         "can_start": can_afford and total_eligible > 0,
         "summary": (
             "{} companies eligible across {} stages. "
-            "Estimated cost: {} credits (~${:.2f} USD).{}".format(
+            "Estimated cost: {} credits (~${:.2f} USD).{}{}".format(
                 total_eligible,
                 len(stages),
                 total_cost_credits,
                 total_cost_usd,
+                " Estimated time: ~{} min.".format(max(1, round(eta_seconds / 60)))
+                if eta_seconds
+                else "",
                 " Budget sufficient."
                 if can_afford
                 else " WARNING: Insufficient budget.",
@@ -1,23 +1,38 @@
 """Gmail scanner: background thread that extracts contacts from email headers and signatures.
 
 Architecture:
-1. Header extraction (deterministic): Parse From/To/CC/Reply-To fields
-2. Signature extraction (AI): Claude Haiku extracts structured data from signature blocks
+1. Header extraction (deterministic): Parse From/To/CC/Reply-To fields.
+   Message metadata is fetched with Gmail batch HTTP requests (up to 100
+   messages each), a few batches in flight at once, retrying quota and
+   transient errors with exponential backoff.
+2. Signature extraction (AI): Claude Haiku extracts structured data from
+   signature blocks. Runs in a pipeline thread while headers are still being
+   scanned: each new sender's latest message body is fetched as soon as the
+   sender is seen (messages are listed newest first).
 3. Aggregation: Merge by email, most recent info wins
+4. Checkpoint: the mailbox historyId, the newest processed message
+   internalDate and the aggregated contacts are stored per OAuth connection
+   (``GmailScanCheckpoint``). Re-scans list only messages added since that
+   historyId (``users.history.list``) and merge them into the stored
+   contacts; when the history has expired they list messages after the
+   internalDate watermark instead of the whole mailbox.
 """
 
 import email.utils
 import json
 import logging
+import queue
+import random
 import re
 import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 
-from ..models import ImportJob, OAuthConnection, db
+from ..models import GmailScanCheckpoint, ImportJob, OAuthConnection, db
 from .google_oauth import get_valid_token
 
 logger = logging.getLogger(__name__)
@@ -55,6 +70,36 @@ SIGNATURE_DELIMITERS = [
     re.compile(r"^Sent from my (iPhone|iPad|Android|Galaxy)", re.MULTILINE),
 ]
 
+# Gmail batch HTTP requests accept at most 100 calls
+METADATA_BATCH_SIZE = 100
+
+# Metadata batches in flight at once
+SCAN_CONCURRENCY = 3
+
+# Page size for messages.list (API maximum is 500)
+LIST_PAGE_SIZE = 500
+
+# Full-format bodies per batch request (responses are much larger)
+BODY_BATCH_SIZE = 20
+
+# Signatures per Claude call
+SIGNATURE_BATCH_SIZE = 15
+
+# Retries for quota (429 / rateLimitExceeded) and transient 5xx errors
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 32.0
+
+METADATA_HEADERS = ["From", "To", "Cc", "Reply-To", "Date"]
+
+# Page size for history.list (API maximum is 500)
+HISTORY_PAGE_SIZE = 500
+
+# Messages added with these labels are not scanned (messages.list skips them)
+HISTORY_SKIP_LABELS = {"SPAM", "TRASH"}
+
+SIGNATURE_MODEL = "claude-haiku-3-5-20241022"
+
 # Patterns suggesting a line is part of a signature
 SIG_LINE_PATTERNS = [
     re.compile(r"\+?\d[\d\s\-().]{7,}"),  # phone number
@@ -64,6 +109,149 @@ SIG_LINE_PATTERNS = [
 ]
 
 
+def _is_retryable(exc):
+    """True for quota and transient API errors worth retrying with backoff."""
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    try:
+        status = int(status)
+    except (TypeError, ValueError):
+        return False
+    if status in (429, 500, 502, 503, 504):
+        return True
+    if status == 403:
+        detail = str(getattr(exc, "content", "") or exc)
+        return "rateLimitExceeded" in detail or "userRateLimitExceeded" in detail
+    return False
+
+
+def _backoff_delay(attempt):
+    """Exponential backoff with jitter for retry ``attempt`` (0-based)."""
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2**attempt))
+    return delay * (0.5 + random.random() / 2)
+
+
+def _execute_with_backoff(request, sleep=time.sleep):
+    """Execute a single API request, retrying quota/transient errors."""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return request.execute()
+        except Exception as e:
+            if attempt == MAX_RETRIES or not _is_retryable(e):
+                raise
+            sleep(_backoff_delay(attempt))
+
+
+def _is_not_found(exc):
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    return str(status) == "404"
+
+
+def _config_key(config):
+    """Scan options that change which messages or contacts are kept.
+
+    A checkpoint is only reused by scans with the same key; otherwise the
+    stored contacts would not match what a full scan would produce (e.g. a
+    widened ``date_range`` must pick up the older messages).
+    """
+    domains = sorted(set(d.lower().strip() for d in config.get("exclude_domains", [])))
+    return json.dumps(
+        {
+            "exclude_domains": domains,
+            "date_range": config.get("date_range"),
+            "max_messages": config.get("max_messages", 5000),
+        },
+        sort_keys=True,
+    )
+
+
+def _serialize_contacts(contacts):
+    """Aggregated contacts as JSON-safe dicts (dates as ISO strings)."""
+    out = {}
+    for addr, c in contacts.items():
+        row = dict(c)
+        if row.get("last_message_date"):
+            row["last_message_date"] = row["last_message_date"].isoformat()
+        out[addr] = row
+    return out
+
+
+def _deserialize_contacts(data):
+    """Inverse of ``_serialize_contacts``; accepts a JSON string or dict."""
+    if isinstance(data, str):
+        data = json.loads(data) if data else {}
+    contacts = {}
+    for addr, c in (data or {}).items():
+        row = dict(c)
+        if row.get("last_message_date"):
+            try:
+                row["last_message_date"] = datetime.fromisoformat(
+                    row["last_message_date"]
+                )
+            except (TypeError, ValueError):
+                row["last_message_date"] = None
+        contacts[addr] = row
+    return contacts
+
+
+def batch_get_messages(service, msg_ids, fmt, metadata_headers=None, sleep=time.sleep):
+    """Fetch messages with one batch HTTP request per attempt.
+
+    Messages that fail with a quota or transient error are retried in a
+    smaller follow-up batch after a backoff delay; other failures are
+    dropped.
+
+    Args:
+        service: Gmail API service.
+        msg_ids: Up to ``METADATA_BATCH_SIZE`` message IDs.
+        fmt: ``"metadata"`` or ``"full"``.
+        metadata_headers: Header names for ``format="metadata"``.
+
+    Returns:
+        (responses, failed_ids): dict of message ID -> message resource,
+        and IDs that could not be fetched.
+    """
+    results = {}
+    failed = []
+    pending = list(dict.fromkeys(msg_ids))
+    kwargs = {"userId": "me", "format": fmt}
+    if metadata_headers:
+        kwargs["metadataHeaders"] = metadata_headers
+
+    for attempt in range(MAX_RETRIES + 1):
+        retry = []
+
+        def _callback(request_id, response, exception, retry=retry):
+            if exception is None:
+                results[request_id] = response
+            elif _is_retryable(exception):
+                retry.append(request_id)
+            else:
+                logger.debug("Failed to get message %s: %s", request_id, exception)
+                failed.append(request_id)
+
+        batch = service.new_batch_http_request(callback=_callback)
+        for mid in pending:
+            batch.add(service.users().messages().get(id=mid, **kwargs), request_id=mid)
+        try:
+            batch.execute()
+        except Exception as e:
+            if not _is_retryable(e):
+                logger.warning("Gmail batch request failed: %s", e)
+                failed.extend(m for m in pending if m not in results)
+                return results, failed
+            retry = [m for m in pending if m not in results and m not in failed]
+
+        if not retry:
+            break
+        if attempt == MAX_RETRIES:
+            failed.extend(retry)
+            break
+        pending = retry
+        sleep(_backoff_delay(attempt))
+
+    return results, failed
+
+
 class GmailScanner:
     """Scans Gmail messages and extracts contact information."""
 
@@ -74,26 +262,48 @@ class GmailScanner:
         self.contacts = {}  # email -> aggregated contact data
         self.messages_scanned = 0
         self.signatures_extracted = 0
+        self._credentials = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._claude_client = None
+        self._claude_batches = 0
+        self.scan_mode = "full"
+        self._watermark = 0  # skip messages at or before this internalDate
+        self._max_internal_date = 0
 
     def run(self, app):
         """Main entry point -- runs in a daemon thread with app context."""
         with app.app_context():
+            pipeline = None
             try:
+                checkpoint = self._load_checkpoint()
                 self._update_progress("scanning_headers", 0)
-                self._scan_messages()
-                self._update_progress("extracting_signatures", 50)
-                self._extract_signatures(app)
-                self._update_progress("aggregating", 90)
+                history_id = self._current_history_id()
+                message_ids, after = self._resume_from(checkpoint)
+                pipeline = SignaturePipeline(self, app)
+                pipeline.start()
+                self._scan_messages(
+                    on_new_sender=pipeline.submit,
+                    message_ids=message_ids,
+                    after=after,
+                )
+                self._update_progress("extracting_signatures", 85)
+                pipeline.finish()
+                self._update_progress("aggregating", 95)
                 self._aggregate_contacts()
                 self._save_extracted()
+                self._save_checkpoint(checkpoint, history_id)
                 self._update_status("extracted")
                 logger.info(
-                    "Gmail scan %s complete: %d contacts from %d messages",
+                    "Gmail scan %s (%s) complete: %d contacts from %d messages",
                     self.job_id,
+                    self.scan_mode,
                     len(self.contacts),
                     self.messages_scanned,
                 )
             except Exception as e:
+                if pipeline is not None:
+                    pipeline.cancel()
                 logger.error("Gmail scan %s failed: %s", self.job_id, e)
                 self._update_status("error", error=str(e))
 
@@ -109,6 +319,8 @@ class GmailScanner:
             "percent": percent,
             "messages_scanned": self.messages_scanned,
             "contacts_found": contacts_found or len(self.contacts),
+            "signatures_extracted": self.signatures_extracted,
+            "mode": self.scan_mode,
         }
         job.scan_progress = json.dumps(progress)
         job.updated_at = datetime.now(timezone.utc)
@@ -131,12 +343,186 @@ class GmailScanner:
             raise RuntimeError(f"OAuth connection {self.connection_id} not found")
         access_token = get_valid_token(conn)
         db.session.commit()
-        creds = Credentials(token=access_token)
-        return build("gmail", "v1", credentials=creds)
+        self._credentials = Credentials(token=access_token)
+        return build("gmail", "v1", credentials=self._credentials)
+
+    def _thread_service(self):
+        """Per-thread Gmail service (API clients are not thread-safe)."""
+        service = getattr(self._local, "service", None)
+        if service is None:
+            if self._credentials is None:
+                service = self._get_gmail_service()
+            else:
+                service = build("gmail", "v1", credentials=self._credentials)
+            self._local.service = service
+        return service
+
+    def _list_message_ids(self, service, query, max_messages):
+        """Yield message IDs in chunks of ``METADATA_BATCH_SIZE``, newest first."""
+        page_token = None
+        listed = 0
+        first_request = True
+        chunk = []
+        while listed < max_messages:
+            list_kwargs = {
+                "userId": "me",
+                "maxResults": min(LIST_PAGE_SIZE, max_messages - listed),
+            }
+            if query:
+                list_kwargs["q"] = query
+            if page_token:
+                list_kwargs["pageToken"] = page_token
+            try:
+                results = _execute_with_backoff(
+                    service.users().messages().list(**list_kwargs)
+                )
+            except Exception as e:
+                logger.error("Gmail list error: %s", e)
+                if first_request:
+                    # First API call failed — likely auth/scope error, surface it
+                    raise
+                break
+            first_request = False
+
+            for msg_stub in results.get("messages", [])[: max_messages - listed]:
+                chunk.append(msg_stub["id"])
+                listed += 1
+                if len(chunk) == METADATA_BATCH_SIZE:
+                    yield chunk
+                    chunk = []
+
+            page_token = results.get("nextPageToken")
+            if not page_token or not results.get("messages"):
+                break
+        if chunk:
+            yield chunk
+
+    def _load_checkpoint(self):
+        return db.session.get(GmailScanCheckpoint, self.connection_id)
+
+    def _current_history_id(self):
+        """Mailbox historyId before scanning; later changes go to the next scan."""
+        try:
+            profile = _execute_with_backoff(
+                self._thread_service().users().getProfile(userId="me")
+            )
+        except Exception as e:
+            logger.warning("Gmail getProfile failed, scan not checkpointed: %s", e)
+            return None
+        history_id = profile.get("historyId")
+        return str(history_id) if history_id else None
+
+    def _resume_from(self, checkpoint):
+        """Pick the scan mode and restore merged state from a checkpoint.
+
+        Returns:
+            (message_ids, after): explicit IDs to scan (incremental mode) or
+            None to list messages, optionally only those after ``after``
+            (epoch seconds).
+        """
+        if (
+            checkpoint is None
+            or self.config.get("full_rescan")
+            or checkpoint.config_key != _config_key(self.config)
+            or not checkpoint.last_internal_date
+        ):
+            return None, None
+
+        self.contacts = _deserialize_contacts(checkpoint.contacts)
+        self._watermark = checkpoint.last_internal_date
+        self._max_internal_date = checkpoint.last_internal_date
+        max_messages = self.config.get("max_messages", 5000)
+        message_ids = self._history_message_ids(
+            self._thread_service(), checkpoint.history_id, max_messages
+        )
+        if message_ids is not None:
+            self.scan_mode = "incremental"
+            return message_ids, None
+        # History expired: list messages newer than the watermark instead
+        self.scan_mode = "watermark"
+        return None, self._watermark // 1000
+
+    def _history_message_ids(self, service, start_history_id, max_messages):
+        """IDs of messages added since ``start_history_id``, newest first.
+
+        Returns:
+            List of message IDs, or None when Gmail no longer has history
+            that far back (404) and a listing fallback is needed.
+        """
+        msg_ids = []
+        page_token = None
+        while True:
+            kwargs = {
+                "userId": "me",
+                "startHistoryId": start_history_id,
+                "historyTypes": ["messageAdded"],
+                "maxResults": HISTORY_PAGE_SIZE,
+            }
+            if page_token:
+                kwargs["pageToken"] = page_token
+            try:
+                results = _execute_with_backoff(
+                    service.users().history().list(**kwargs)
+                )
+            except Exception as e:
+                if _is_not_found(e):
+                    logger.info(
+                        "Gmail history %s expired for connection %s",
+                        start_history_id,
+                        self.connection_id,
+                    )
+                    return None
+                raise
+            for record in results.get("history", []):
+                for added in record.get("messagesAdded", []):
+                    msg = added.get("message") or {}
+                    if HISTORY_SKIP_LABELS & set(msg.get("labelIds") or []):
+                        continue
+                    if msg.get("id"):
+                        msg_ids.append(msg["id"])
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                break
+        # History is oldest first; scan newest first like messages.list
+        msg_ids = list(dict.fromkeys(reversed(msg_ids)))
+        return msg_ids[:max_messages]
+
+    def _save_checkpoint(self, checkpoint, history_id):
+        """Persist historyId, watermark and merged contacts for the next scan."""
+        if not history_id:
+            return
+        if checkpoint is None:
+            conn = db.session.get(OAuthConnection, self.connection_id)
+            if conn is None:
+                return
+            checkpoint = GmailScanCheckpoint(
+                oauth_connection_id=self.connection_id, tenant_id=conn.tenant_id
+            )
+            db.session.add(checkpoint)
+        if self.scan_mode == "full":
+            total_scanned = self.messages_scanned
+        else:
+            total_scanned = (checkpoint.messages_scanned or 0) + self.messages_scanned
+        checkpoint.history_id = history_id
+        checkpoint.last_internal_date = self._max_internal_date
+        checkpoint.config_key = _config_key(self.config)
+        checkpoint.contacts = _serialize_contacts(self.contacts)
+        checkpoint.messages_scanned = total_scanned
+        checkpoint.last_scan_mode = self.scan_mode
+        checkpoint.updated_at = datetime.now(timezone.utc)
+        db.session.commit()
 
-    def _scan_messages(self):
-        """Scan Gmail messages and extract contacts from headers."""
-        service = self._get_gmail_service()
+    def _scan_messages(self, on_new_sender=None, message_ids=None, after=None):
+        """Scan Gmail messages and extract contacts from headers.
+
+        Args:
+            on_new_sender: Called with ``(email, message_id)`` the first time
+                an address is seen, so signature extraction can start early.
+            message_ids: Scan exactly these messages instead of listing the
+                mailbox (incremental re-scan).
+            after: Only list messages received after this epoch second.
+        """
+        service = self._thread_service()
         exclude_domains = set(
             d.lower().strip() for d in self.config.get("exclude_domains", [])
         )
@@ -145,81 +531,80 @@ class GmailScanner:
 
         # Build Gmail search query
         query_parts = []
-        if date_range and date_range > 0:
+        if after:
+            query_parts.append(f"after:{int(after)}")
+        elif date_range and date_range > 0:
             from datetime import timedelta
 
             after_date = datetime.now(timezone.utc) - timedelta(days=date_range)
             query_parts.append(f"after:{after_date.strftime('%Y/%m/%d')}")
 
         query = " ".join(query_parts) if query_parts else None
-        page_token = None
-
-        first_request = True
-        while self.messages_scanned < max_messages:
-            try:
-                # List messages first, then get headers
-                list_kwargs = {
-                    "userId": "me",
-                    "maxResults": min(100, max_messages - self.messages_scanned),
-                }
-                if query:
-                    list_kwargs["q"] = query
-                if page_token:
-                    list_kwargs["pageToken"] = page_token
 
-                results = service.users().messages().list(**list_kwargs).execute()
-                first_request = False
-                messages = results.get("messages", [])
-
-                if not messages:
-                    break
+        if message_ids is not None:
+            max_messages = len(message_ids)
+            id_chunks = (
+                message_ids[i : i + METADATA_BATCH_SIZE]
+                for i in range(0, len(message_ids), METADATA_BATCH_SIZE)
+            )
+        else:
+            id_chunks = self._list_message_ids(service, query, max_messages)
 
-                # Get message headers individually
-                for msg_stub in messages:
-                    if self.messages_scanned >= max_messages:
-                        break
-                    try:
-                        msg = (
-                            service.users()
-                            .messages()
-                            .get(
-                                userId="me",
-                                id=msg_stub["id"],
-                                format="metadata",
-                                metadataHeaders=[
-                                    "From",
-                                    "To",
-                                    "Cc",
-                                    "Reply-To",
-                                    "Date",
-                                ],
+        def _fetch(ids):
+            responses, _failed = batch_get_messages(
+                self._thread_service(), ids, "metadata", METADATA_HEADERS
+            )
+            return ids, responses
+
+        def _absorb(future):
+            ids, responses = future.result()
+            for mid in ids:
+                msg = responses.get(mid)
+                if msg is not None:
+                    new_senders = []
+                    internal_date = int(msg.get("internalDate") or 0)
+                    with self._lock:
+                        # Already merged by the scan that set the watermark
+                        if not (
+                            self._watermark
+                            and internal_date
+                            and internal_date <= self._watermark
+                        ):
+                            new_senders = self._process_message_headers(
+                                msg, exclude_domains
                             )
-                            .execute()
-                        )
-                        self._process_message_headers(msg, exclude_domains)
-                        self.messages_scanned += 1
-                    except Exception as e:
-                        logger.debug("Failed to get message %s: %s", msg_stub["id"], e)
-                        self.messages_scanned += 1
-
-                page_token = results.get("nextPageToken")
-                if not page_token:
-                    break
-
-                # Update progress periodically
-                if self.messages_scanned % 20 == 0:
-                    pct = min(45, int(self.messages_scanned / max_messages * 45))
-                    self._update_progress("scanning_headers", pct)
-
-            except Exception as e:
-                logger.error("Gmail list error: %s", e)
-                if first_request:
-                    # First API call failed — likely auth/scope error, surface it
-                    raise
-                break
+                            self._max_internal_date = max(
+                                self._max_internal_date, internal_date
+                            )
+                    if on_new_sender:
+                        for addr in new_senders:
+                            on_new_sender(addr, mid)
+                self.messages_scanned += 1
+            pct = min(80, int(self.messages_scanned / max(max_messages, 1) * 80))
+            self._update_progress("scanning_headers", pct)
+
+        with ThreadPoolExecutor(
+            max_workers=SCAN_CONCURRENCY, thread_name_prefix="gmail-headers"
+        ) as pool:
+            in_flight = set()
+            for ids in id_chunks:
+                in_flight.add(pool.submit(_fetch, ids))
+                if len(in_flight) >= SCAN_CONCURRENCY:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _absorb(future)
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _absorb(future)
 
     def _process_message_headers(self, message, exclude_domains):
-        """Extract contacts from a single message's headers."""
+        """Extract contacts from a single message's headers.
+
+        Returns:
+            Addresses seen for the first time.
+        """
+        new_senders = []
         headers = {
             h["name"]: h["value"] for h in message.get("payload", {}).get("headers", [])
         }
@@ -266,6 +651,7 @@ class GmailScanner:
                         "last_message_date": None,
                         "message_id_for_sig": message.get("id"),
                     }
+                    new_senders.append(addr)
 
                 contact = self.contacts[addr]
                 contact["message_count"] += 1
@@ -282,69 +668,24 @@ class GmailScanner:
                         first, last = self._split_display_name(display_name)
                         contact["first_name"] = first
                         contact["last_name"] = last
-
-    def _extract_signatures(self, app):
-        """For unique senders, fetch most recent email body and extract signature data."""
-        if not self.contacts:
-            return
-
-        service = self._get_gmail_service()
-
-        # Collect unique message IDs to fetch (one per sender)
-        msg_ids_to_fetch = {}
-        for addr, contact in self.contacts.items():
-            mid = contact.get("message_id_for_sig")
-            if mid and mid not in msg_ids_to_fetch:
-                msg_ids_to_fetch[mid] = addr
-
-        # Fetch message bodies and extract signature blocks
-        signatures = {}  # email -> signature text
-        for msg_id, addr in msg_ids_to_fetch.items():
-            try:
-                msg = (
-                    service.users()
-                    .messages()
-                    .get(
-                        userId="me",
-                        id=msg_id,
-                        format="full",
-                    )
-                    .execute()
-                )
-                body = self._extract_text_body(msg)
-                if body:
-                    sig = self._extract_signature_block(body)
-                    if sig and len(sig) > 10:
-                        signatures[addr] = sig
-            except Exception as e:
-                logger.debug("Failed to get body for %s: %s", msg_id, e)
-
-        if not signatures:
-            return
-
-        # Batch Claude calls for signature extraction
-        self._batch_extract_with_claude(app, signatures)
+        return new_senders
 
     def _batch_extract_with_claude(self, app, signatures):
         """Send signatures to Claude Haiku in batches for structured extraction."""
         from ..services.llm_logger import log_llm_usage
 
-        try:
-            import anthropic
-
-            client = anthropic.Anthropic()
-        except Exception:
-            logger.warning(
-                "Anthropic client not available, skipping signature extraction"
-            )
+        client = self._get_claude_client()
+        if client is None:
             return
 
         sig_items = list(signatures.items())
-        batch_size = 15
+        batch_size = SIGNATURE_BATCH_SIZE
         job = db.session.get(ImportJob, self.job_id)
 
         for i in range(0, len(sig_items), batch_size):
             batch = sig_items[i : i + batch_size]
+            batch_index = self._claude_batches
+            self._claude_batches += 1
 
             # Build prompt
             prompt_parts = []
@@ -362,7 +703,7 @@ class GmailScanner:
             try:
                 start_ms = int(time.time() * 1000)
                 response = client.messages.create(
-                    model="claude-haiku-3-5-20241022",
+                    model=SIGNATURE_MODEL,
                     max_tokens=2048,
                     messages=[{"role": "user", "content": prompt}],
                 )
@@ -373,13 +714,13 @@ class GmailScanner:
                     log_llm_usage(
                         tenant_id=str(job.tenant_id),
                         operation="gmail_signature_extraction",
-                        model="claude-haiku-3-5-20241022",
+                        model=SIGNATURE_MODEL,
                         input_tokens=response.usage.input_tokens,
                         output_tokens=response.usage.output_tokens,
                         duration_ms=duration_ms,
                         metadata={
                             "import_job_id": str(self.job_id),
-                            "batch_index": i // batch_size,
+                            "batch_index": batch_index,
                             "signatures_in_batch": len(batch),
                         },
                     )
@@ -398,29 +739,48 @@ class GmailScanner:
                         continue
 
                 # Apply extracted data to contacts
-                for item in extracted:
-                    idx = item.get("index", -1)
-                    if 0 <= idx < len(batch):
-                        addr = batch[idx][0]
-                        if addr in self.contacts:
-                            c = self.contacts[addr]
-                            if item.get("job_title"):
-                                c["job_title"] = item["job_title"]
-                            if item.get("company"):
-                                c["company_name"] = item["company"]
-                            if item.get("phone"):
-                                c["phone"] = item["phone"]
-                            if item.get("linkedin_url"):
-                                c["linkedin_url"] = item["linkedin_url"]
-                            if item.get("name") and not c.get("first_name"):
-                                parts = (item["name"] or "").split(None, 1)
-                                c["first_name"] = parts[0] if parts else ""
-                                c["last_name"] = parts[1] if len(parts) > 1 else ""
-                            self.signatures_extracted += 1
+                with self._lock:
+                    self._apply_signature_data(batch, extracted)
 
             except Exception as e:
                 logger.warning("Claude signature extraction batch failed: %s", e)
 
+    def _get_claude_client(self):
+        """Anthropic client shared by all signature batches of this scan."""
+        if self._claude_client is None:
+            try:
+                import anthropic
+
+                self._claude_client = anthropic.Anthropic()
+            except Exception:
+                logger.warning(
+                    "Anthropic client not available, skipping signature extraction"
+                )
+                self._claude_client = False
+        return self._claude_client or None
+
+    def _apply_signature_data(self, batch, extracted):
+        """Merge Claude's per-signature fields into the aggregated contacts."""
+        for item in extracted:
+            idx = item.get("index", -1)
+            if 0 <= idx < len(batch):
+                addr = batch[idx][0]
+                if addr in self.contacts:
+                    c = self.contacts[addr]
+                    if item.get("job_title"):
+                        c["job_title"] = item["job_title"]
+                    if item.get("company"):
+                        c["company_name"] = item["company"]
+                    if item.get("phone"):
+                        c["phone"] = item["phone"]
+                    if item.get("linkedin_url"):
+                        c["linkedin_url"] = item["linkedin_url"]
+                    if item.get("name") and not c.get("first_name"):
+                        parts = (item["name"] or "").split(None, 1)
+                        c["first_name"] = parts[0] if parts else ""
+                        c["last_name"] = parts[1] if len(parts) > 1 else ""
+                    self.signatures_extracted += 1
+
     def _aggregate_contacts(self):
         """Final aggregation pass -- build dedup-compatible rows."""
         # Already aggregated by email in self.contacts
@@ -470,6 +830,7 @@ class GmailScanner:
                 "messages_scanned": self.messages_scanned,
                 "contacts_found": len(rows),
                 "signatures_extracted": self.signatures_extracted,
+                "mode": self.scan_mode,
             }
             job.scan_progress = json.dumps(progress)
             db.session.commit()
@@ -566,6 +927,93 @@ class GmailScanner:
         return None
 
 
+class SignaturePipeline:
+    """Signature extraction stage running alongside header scanning.
+
+    Consumes ``(email, message_id)`` pairs for newly seen senders, fetches
+    the message bodies in batch requests, cuts out signature blocks and
+    sends them to Claude ``SIGNATURE_BATCH_SIZE`` at a time.
+    """
+
+    _DONE = object()
+
+    def __init__(self, scanner, app):
+        self.scanner = scanner
+        self.app = app
+        self._queue = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            daemon=True,
+            name=f"gmail-signatures-{scanner.job_id}",
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, addr, message_id):
+        """Queue a sender's message for signature extraction."""
+        self._queue.put((addr, message_id))
+
+    def finish(self):
+        """Process everything queued so far and wait for the stage to drain."""
+        self._queue.put(self._DONE)
+        self._thread.join()
+
+    def cancel(self):
+        """Stop without processing the remaining queue."""
+        self._cancelled.set()
+        self._queue.put(self._DONE)
+
+    def _run(self):
+        with self.app.app_context():
+            pending = {}  # message_id -> sender address
+            signatures = {}  # sender address -> signature text
+            done = False
+            while not done and not self._cancelled.is_set():
+                try:
+                    item = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    item = None
+                if item is self._DONE:
+                    done = True
+                elif item is not None:
+                    addr, message_id = item
+                    pending.setdefault(message_id, addr)
+
+                try:
+                    # Fetch bodies once a batch is full or the queue is idle
+                    if pending and (
+                        done or item is None or len(pending) >= BODY_BATCH_SIZE
+                    ):
+                        self._collect_signatures(pending, signatures)
+                        pending = {}
+                    if signatures and (done or len(signatures) >= SIGNATURE_BATCH_SIZE):
+                        ready = list(signatures.items())
+                        if not done:
+                            full = len(ready) - len(ready) % SIGNATURE_BATCH_SIZE
+                            ready = ready[:full]
+                        for addr, _sig in ready:
+                            del signatures[addr]
+                        self.scanner._batch_extract_with_claude(self.app, dict(ready))
+                except Exception as e:
+                    logger.warning("Signature pipeline step failed: %s", e)
+
+    def _collect_signatures(self, pending, signatures):
+        responses, _failed = batch_get_messages(
+            self.scanner._thread_service(), list(pending), "full"
+        )
+        for message_id, addr in pending.items():
+            msg = responses.get(message_id)
+            if msg is None:
+                continue
+            body = GmailScanner._extract_text_body(msg)
+            if body:
+                sig = GmailScanner._extract_signature_block(body)
+                if sig and len(sig) > 10:
+                    signatures[addr] = sig
+
+
 def start_gmail_scan(app, oauth_connection, job_id, config):
     """Spawn a background thread to run the Gmail scan."""
     scanner = GmailScanner(str(oauth_connection.id), job_id, config)
@@ -9,6 +9,7 @@ import json
 import logging
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests as http_requests
 from bs4 import BeautifulSoup
@@ -16,6 +17,7 @@ from flask import current_app
 from sqlalchemy import text
 
 from ..models import db
+from . import tracing
 from .enum_mapper import map_enum_value
 from .perplexity_client import PerplexityClient
 from .stage_registry import get_model_for_stage
@@ -63,6 +65,7 @@ WEBSITE_USER_AGENT = (
 )
 
 
+@tracing.traced("http.website")
 def scrape_website(domain):
     """Fetch and extract text content from a company's homepage.
 
@@ -165,7 +168,10 @@ Company: {company_name}
 {claims_section}
 
 Return this exact JSON structure (use ONLY the listed enum values — no free text for constrained fields):
-{{
+"""
+
+# Shared by the single-company and batched prompts (escaped for str.format)
+RESEARCH_JSON_SCHEMA = """{{
   "company_name": "Official company name as found in research",
   "summary": "2-3 sentence description of what the company does",
   "b2b": true/false or null if unclear,
@@ -185,6 +191,8 @@ Return this exact JSON structure (use ONLY the listed enum values — no free te
   "flags": ["list of any concerns or data quality issues"]
 }}"""
 
+USER_PROMPT_TEMPLATE += RESEARCH_JSON_SCHEMA
+
 
 # ---------------------------------------------------------------------------
 # Main entry point
@@ -252,17 +260,7 @@ def enrich_l1(company_id, tenant_id=None, previous_data=None, boost=False):
             logger.debug("No website content obtained for %s", domain)
 
     # 2d. Resolve enrichment language from tenant settings
-    enrichment_lang = None
-    try:
-        from ..models import Tenant
-
-        tenant_obj = db.session.get(Tenant, tenant_id)
-        if tenant_obj:
-            from .language import get_enrichment_language
-
-            enrichment_lang = get_enrichment_language(tenant_obj)
-    except Exception:
-        pass  # Fall back to English
+    enrichment_lang = _get_enrichment_language(tenant_id)
 
     # 3. Call Perplexity
     model = get_model_for_stage("l1", boost=boost)
@@ -312,7 +310,53 @@ def enrich_l1(company_id, tenant_id=None, previous_data=None, boost=False):
     output_tokens = usage.get("output_tokens", 0)
     cost_float = pplx_response.cost_usd
 
-    # 8. Determine status
+    # 8-10. Status, company row, company_enrichment_l1 and research_asset
+    _save_research(tenant_id, company_id, model, research, mapped, qc_flags, cost_float)
+
+    # 11. Log LLM usage
+    if log_llm_usage:
+        log_llm_usage(
+            tenant_id=tenant_id,
+            operation="l1_enrichment",
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            provider="perplexity",
+            duration_ms=duration_ms,
+            metadata={
+                "company_id": company_id,
+                "company_name": company_name,
+                "boost": boost,
+            },
+        )
+
+    db.session.commit()
+
+    return {"enrichment_cost_usd": cost_float, "qc_flags": qc_flags}
+
+
+def _get_enrichment_language(tenant_id):
+    """Return the tenant's enrichment language code, or None for English."""
+    try:
+        from ..models import Tenant
+
+        tenant_obj = db.session.get(Tenant, tenant_id)
+        if tenant_obj:
+            from .language import get_enrichment_language
+
+            return get_enrichment_language(tenant_obj)
+    except Exception:
+        pass  # Fall back to English
+    return None
+
+
+def _save_research(tenant_id, company_id, model, research, mapped, qc_flags, cost):
+    """Persist one company's validated research.
+
+    Sets the company status (``needs_review`` when QC flagged anything,
+    ``triage_passed`` otherwise) and writes the company row,
+    company_enrichment_l1 and research_assets. The caller commits.
+    """
     if qc_flags:
         status = "needs_review"
         error_message = json.dumps(qc_flags)
@@ -324,51 +368,315 @@ def enrich_l1(company_id, tenant_id=None, previous_data=None, boost=False):
 
     confidence_score = _parse_confidence(research.get("confidence"))
 
-    # 9. UPDATE company
-    _update_company(company_id, status, mapped, cost_float, error_message)
-
-    # 9b. UPSERT company_enrichment_l1
+    _update_company(company_id, status, mapped, cost, error_message)
     _upsert_enrichment_l1(
         company_id,
         mapped,
         research,
-        cost_float,
+        cost,
         confidence_score,
         quality_score,
         qc_flags,
     )
-
-    # 10. INSERT research_asset (raw SQL — table may not exist in tests)
+    # raw SQL — table may not exist in tests
     _insert_research_asset(
         tenant_id,
         company_id,
         model,
-        cost_float,
+        cost,
         research,
         confidence_score,
         quality_score,
     )
 
-    # 11. Log LLM usage
+
+# ---------------------------------------------------------------------------
+# Batched research (opt-in)
+# ---------------------------------------------------------------------------
+
+# Most companies packed into one Perplexity prompt. Tenants opt in with
+# settings["l1_batch_size"]; unset, 0 or 1 keeps one company per call.
+BATCH_MAX_SIZE = 8
+
+# Company sizes worth batching (companies not yet sized are included too).
+# Larger firms keep the full single-company token budget and website context.
+BATCH_ELIGIBLE_SIZES = ("micro", "small")
+
+# Website excerpt per company in a batched prompt
+BATCH_WEBSITE_MAX_CHARS = 800
+
+# Completion budget per company in a batched prompt
+BATCH_MAX_TOKENS_PER_COMPANY = 450
+
+BATCH_USER_PROMPT_TEMPLATE = (
+    """Research each of the following {count} companies independently. Return a JSON array with exactly one object per company, in the order listed.
+
+{companies_section}
+
+Each object must contain a "ref" field with the company's number from the list above, plus this exact structure (use ONLY the listed enum values — no free text for constrained fields):
+"""
+    + RESEARCH_JSON_SCHEMA
+)
+
+
+def get_batch_size(tenant_id):
+    """Return the tenant's L1 batch size, or 0 when batching is off."""
+    from ..models import Tenant
+
+    tenant = db.session.get(Tenant, str(tenant_id))
+    settings = tenant.settings if tenant else None
+    if isinstance(settings, str):
+        try:
+            settings = json.loads(settings)
+        except (json.JSONDecodeError, ValueError):
+            settings = None
+    try:
+        size = int((settings or {}).get("l1_batch_size") or 0)
+    except (TypeError, ValueError):
+        return 0
+    return min(size, BATCH_MAX_SIZE) if size >= 2 else 0
+
+
+def select_batch_candidates(company_ids):
+    """Return the ids (in input order) that may be researched in a batch.
+
+    A company qualifies when it is not the tenant's own company, has no
+    prior L1 enrichment (re-enrichment needs its previous data in the
+    prompt) and is micro/small or not sized yet.
+    """
+    if not company_ids:
+        return []
+    placeholders = ", ".join(f":id_{i}" for i in range(len(company_ids)))
+    params = {f"id_{i}": str(cid) for i, cid in enumerate(company_ids)}
+    rows = db.session.execute(
+        text(f"""
+            SELECT c.id, c.company_size, c.is_self, e.company_id
+            FROM companies c
+            LEFT JOIN company_enrichment_l1 e ON e.company_id = c.id
+            WHERE c.id IN ({placeholders})
+        """),
+        params,
+    ).fetchall()
+    eligible = {
+        str(row[0])
+        for row in rows
+        if not row[2]
+        and row[3] is None
+        and (row[1] is None or row[1] in BATCH_ELIGIBLE_SIZES)
+    }
+    return [str(cid) for cid in company_ids if str(cid) in eligible]
+
+
+def load_batch_companies(company_ids, scrape=True):
+    """Load the prompt context for each company, in input order.
+
+    Resolves missing domains from contact emails and scrapes the
+    homepages concurrently. Unknown ids are skipped.
+
+    Returns:
+        list of dicts with id, tenant_id, name, domain, industry, size,
+        revenue, contacts and website
+    """
+    if not company_ids:
+        return []
+    placeholders = ", ".join(f":id_{i}" for i in range(len(company_ids)))
+    params = {f"id_{i}": str(cid) for i, cid in enumerate(company_ids)}
+    rows = db.session.execute(
+        text(f"""
+            SELECT c.id, c.tenant_id, c.name, c.domain, c.industry,
+                   c.company_size, c.verified_revenue_eur_m
+            FROM companies c
+            WHERE c.id IN ({placeholders})
+        """),
+        params,
+    ).fetchall()
+    by_id = {str(row[0]): row for row in rows}
+
+    companies = []
+    for cid in company_ids:
+        row = by_id.get(str(cid))
+        if row is None:
+            continue
+        company_id = str(row[0])
+        companies.append(
+            {
+                "id": company_id,
+                "tenant_id": str(row[1]),
+                "name": row[2],
+                "domain": row[3] or _resolve_domain(company_id),
+                "industry": row[4],
+                "size": row[5],
+                "revenue": float(row[6]) if row[6] else None,
+                "contacts": _get_contact_linkedin_urls(company_id, limit=2),
+                "website": None,
+            }
+        )
+
+    domains = [c["domain"] for c in companies if c["domain"]]
+    if scrape and domains:
+        with ThreadPoolExecutor(max_workers=len(domains)) as pool:
+            pages = dict(zip(domains, pool.map(scrape_website, domains)))
+        for company in companies:
+            page = pages.get(company["domain"])
+            if page:
+                company["website"] = page[:BATCH_WEBSITE_MAX_CHARS]
+    return companies
+
+
+def _build_batch_prompt(companies):
+    """Build the user prompt listing each company as a numbered block."""
+    blocks = []
+    for ref, company in enumerate(companies, start=1):
+        lines = [f"[{ref}] Company: {company['name']}"]
+        lines.append(f"Domain: {company['domain'] or 'unknown'}")
+        for name, title, url in company["contacts"]:
+            label = f"{name} ({title})" if title else name
+            lines.append(f"Known employee: {label}: {url}")
+        lines.extend(
+            _company_claims(company["industry"], company["size"], company["revenue"])
+        )
+        if company["website"]:
+            lines.append(f"Website excerpt: {company['website']}")
+        blocks.append("\n".join(lines))
+    return BATCH_USER_PROMPT_TEMPLATE.format(
+        count=len(companies), companies_section="\n\n".join(blocks)
+    )
+
+
+def research_batch(companies, model=None, enrichment_language=None):
+    """Research several companies with one Perplexity call.
+
+    Args:
+        companies: Company contexts from ``load_batch_companies``
+        model: Perplexity model name (default: PERPLEXITY_MODEL constant)
+        enrichment_language: Two-letter language code for output language
+
+    Returns:
+        (items, response): ``items`` is index-aligned with ``companies``
+        (None where the response had no usable object, or all None when
+        the response could not be parsed); ``response`` is the
+        PerplexityResponse.
+    """
+    api_key = current_app.config.get("PERPLEXITY_API_KEY", "")
+    base_url = current_app.config.get(
+        "PERPLEXITY_BASE_URL", "https://api.perplexity.ai"
+    )
+    if not api_key:
+        raise ValueError("PERPLEXITY_API_KEY not configured")
+
+    model = model or PERPLEXITY_MODEL
+    client = PerplexityClient(api_key=api_key, base_url=base_url, default_model=model)
+    response = client.query(
+        system_prompt=_system_prompt(enrichment_language),
+        user_prompt=_build_batch_prompt(companies),
+        model=model,
+        max_tokens=BATCH_MAX_TOKENS_PER_COMPANY * len(companies),
+        temperature=PERPLEXITY_TEMPERATURE,
+    )
+    items = _match_batch_items(_parse_research_array(response.content), len(companies))
+    return items, response
+
+
+def enrich_l1_batch(company_ids, tenant_id, boost=False):
+    """Run L1 enrichment for several small companies with one research call.
+
+    Each item of the batched response is validated with
+    ``_validate_research``. Items that pass are stored exactly as
+    ``enrich_l1`` would store them. Any item that is missing or raises a QC
+    flag is not stored, and the caller should enrich that company with
+    ``enrich_l1``. If the call or parsing fails, every company falls back.
+    The call's cost is split evenly over the companies in the prompt. A
+    fallback's share is added to its company's enrichment cost.
+
+    Args:
+        company_ids: Company UUID strings, normally from ``select_batch_candidates``
+        tenant_id: UUID string of the tenant
+        boost: if True, use higher-quality (more expensive) Perplexity model
+
+    Returns:
+        dict company_id -> result. Stored companies get ``enrich_l1``'s
+        result shape plus ``batched`` and ``duration_ms`` (their share of
+        the call time). Fallbacks get ``{"fallback": reason,
+        "enrichment_cost_usd": share}``.
+    """
+    start_time = time.time()
+    companies = load_batch_companies(company_ids)
+    if not companies:
+        return {}
+
+    model = get_model_for_stage("l1", boost=boost)
+    try:
+        items, response = research_batch(
+            companies,
+            model=model,
+            enrichment_language=_get_enrichment_language(tenant_id),
+        )
+    except Exception as e:
+        logger.warning(
+            "Batched L1 research failed for %d companies: %s", len(companies), e
+        )
+        db.session.rollback()
+        return {
+            c["id"]: {"fallback": "api_error", "enrichment_cost_usd": 0}
+            for c in companies
+        }
+
+    share = (response.cost_usd or 0) / len(companies)
+    duration_ms = int((time.time() - start_time) * 1000)
+    results = {}
+    for company, research in zip(companies, items):
+        company_id = company["id"]
+        if research is None:
+            reason = "missing_item"
+        else:
+            qc_flags = _validate_research(research, company["name"])
+            reason = "qc_flags" if qc_flags else None
+        if reason:
+            db.session.execute(
+                text(
+                    "UPDATE companies SET enrichment_cost_usd = enrichment_cost_usd + :cost WHERE id = :id"
+                ),
+                {"cost": share, "id": company_id},
+            )
+            results[company_id] = {"fallback": reason, "enrichment_cost_usd": share}
+            continue
+
+        _save_research(
+            tenant_id, company_id, model, research, _map_fields(research), [], share
+        )
+        results[company_id] = {
+            "enrichment_cost_usd": share,
+            "qc_flags": [],
+            "batched": True,
+            "duration_ms": duration_ms // len(companies),
+        }
+
+    stored = sum(1 for r in results.values() if r.get("batched"))
     if log_llm_usage:
         log_llm_usage(
             tenant_id=tenant_id,
-            operation="l1_enrichment",
+            operation="l1_enrichment_batch",
             model=model,
-            input_tokens=input_tokens,
-            output_tokens=output_tokens,
+            input_tokens=response.input_tokens,
+            output_tokens=response.output_tokens,
             provider="perplexity",
             duration_ms=duration_ms,
             metadata={
-                "company_id": company_id,
-                "company_name": company_name,
+                "company_ids": [c["id"] for c in companies],
+                "batch_size": len(companies),
+                "stored": stored,
                 "boost": boost,
             },
         )
 
     db.session.commit()
-
-    return {"enrichment_cost_usd": cost_float, "qc_flags": qc_flags}
+    logger.info(
+        "Batched L1: %d/%d companies stored, $%.5f",
+        stored,
+        len(companies),
+        response.cost_usd or 0,
+    )
+    return results
 
 
 # ---------------------------------------------------------------------------
@@ -537,13 +845,7 @@ def _call_perplexity(
             lines.append(f"- {label}: {url}")
         contacts_section = "Known employees at this company:\n" + "\n".join(lines)
 
-    claims = []
-    if existing_industry:
-        claims.append(f"Claimed industry: {existing_industry}")
-    if existing_size:
-        claims.append(f"Claimed size: {existing_size}")
-    if existing_revenue:
-        claims.append(f"Claimed revenue: EUR {existing_revenue}M")
+    claims = _company_claims(existing_industry, existing_size, existing_revenue)
 
     claims_section = (
         "Existing claims to verify:\n" + "\n".join(f"- {c}" for c in claims)
@@ -593,21 +895,8 @@ def _call_perplexity(
         default_model=model,
     )
 
-    # Inject language instruction into system prompt
-    effective_system_prompt = SYSTEM_PROMPT
-    if enrichment_language and enrichment_language != "en":
-        from ..display import LANGUAGE_NAMES
-
-        lang_name = LANGUAGE_NAMES.get(enrichment_language, enrichment_language)
-        effective_system_prompt += (
-            f"\n\nIMPORTANT: Conduct research and write all output "
-            f"in {lang_name}. Field names and enum values must remain "
-            f"in English, but descriptive text (summary, markets, hq, etc.) "
-            f"should be in {lang_name}."
-        )
-
     return client.query(
-        system_prompt=effective_system_prompt,
+        system_prompt=_system_prompt(enrichment_language),
         user_prompt=user_prompt,
         model=model,
         max_tokens=PERPLEXITY_MAX_TOKENS,
@@ -615,6 +904,34 @@ def _call_perplexity(
     )
 
 
+def _company_claims(existing_industry, existing_size, existing_revenue):
+    """Return the "Claimed ..." lines for a company's existing data."""
+    claims = []
+    if existing_industry:
+        claims.append(f"Claimed industry: {existing_industry}")
+    if existing_size:
+        claims.append(f"Claimed size: {existing_size}")
+    if existing_revenue:
+        claims.append(f"Claimed revenue: EUR {existing_revenue}M")
+    return claims
+
+
+def _system_prompt(enrichment_language=None):
+    """Return SYSTEM_PROMPT with the language instruction injected."""
+    if not enrichment_language or enrichment_language == "en":
+        return SYSTEM_PROMPT
+
+    from ..display import LANGUAGE_NAMES
+
+    lang_name = LANGUAGE_NAMES.get(enrichment_language, enrichment_language)
+    return SYSTEM_PROMPT + (
+        f"\n\nIMPORTANT: Conduct research and write all output "
+        f"in {lang_name}. Field names and enum values must remain "
+        f"in English, but descriptive text (summary, markets, hq, etc.) "
+        f"should be in {lang_name}."
+    )
+
+
 # ---------------------------------------------------------------------------
 # Response parsing
 # ---------------------------------------------------------------------------
@@ -653,6 +970,66 @@ def _parse_research_json(content):
         return None
 
 
+def _parse_research_array(content):
+    """Parse a batched response into a list of research dicts.
+
+    Accepts a bare JSON array (optionally fenced) or an object wrapping it
+    under "companies"/"results". Returns list or None on failure.
+    """
+    if not content:
+        return None
+
+    text_content = content.strip()
+    if text_content.startswith("```"):
+        lines = text_content.split("\n")[1:]
+        if lines and lines[-1].strip() == "```":
+            lines = lines[:-1]
+        text_content = "\n".join(lines).strip()
+
+    try:
+        parsed = json.loads(text_content)
+    except (json.JSONDecodeError, ValueError):
+        start, end = text_content.find("["), text_content.rfind("]")
+        if start < 0 or end <= start:
+            return None
+        try:
+            parsed = json.loads(text_content[start : end + 1])
+        except (json.JSONDecodeError, ValueError):
+            return None
+
+    if isinstance(parsed, dict):
+        parsed = parsed.get("companies") or parsed.get("results")
+    if not isinstance(parsed, list):
+        return None
+    return [item for item in parsed if isinstance(item, dict)]
+
+
+def _match_batch_items(items, count):
+    """Align parsed batch items with the prompt's companies.
+
+    Items are matched on their 1-based "ref". When no item carries a
+    usable ref and the counts agree, the response order is used. Returns
+    a list of ``count`` research dicts (None where nothing matched).
+    """
+    matched = [None] * count
+    if not items:
+        return matched
+
+    has_ref = False
+    for item in items:
+        try:
+            ref = int(item.get("ref"))
+        except (TypeError, ValueError):
+            continue
+        has_ref = True
+        if 1 <= ref <= count and matched[ref - 1] is None:
+            matched[ref - 1] = item
+
+    if not has_ref and len(items) == count:
+        return list(items)
+    return matched
+
+
 # ---------------------------------------------------------------------------
 # Field mapping
 # ---------------------------------------------------------------------------
@@ -1344,6 +1721,7 @@ def _update_company(company_id, status, mapped, cost, error_message):
     db.session.execute(text(sql), params)
 
 
+@tracing.traced("db.enrichment_l1")
 def _upsert_enrichment_l1(
     company_id, mapped, research, cost_float, confidence_score, quality_score, qc_flags
 ):
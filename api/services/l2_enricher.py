@@ -17,7 +17,9 @@ from datetime import datetime, timezone
 from sqlalchemy import text
 
 from ..models import db
+from . import tracing
 from .anthropic_client import AnthropicClient
+from .context_bundles import refresh_company_bundles
 from .perplexity_client import PerplexityClient
 from .stage_registry import get_model_for_stage
 
@@ -635,6 +637,7 @@ def _synthesize(
 # ---------------------------------------------------------------------------
 
 
+@tracing.traced("db.l2_enrichment")
 def _upsert_l2_enrichment(
     company_id, news_data, strategic_data, synthesis_data, total_cost, l1_data=None
 ):
@@ -746,10 +749,13 @@ def _upsert_l2_enrichment(
     _upsert_split_signals(company_id, news_data, strategic_data, now, total_cost)
     _upsert_split_market(company_id, news_data, strategic_data, now, total_cost)
     _upsert_split_opportunity(company_id, synthesis_data, quick_wins, now, total_cost)
+    refresh_company_bundles([company_id])
 
 
+@tracing.traced("db.module")
 def _upsert_module(table_name, columns, params):
     """Generic upsert helper for a split module table."""
+    tracing.annotate(table=table_name)
     col_list = ", ".join(columns)
     val_list = ", ".join(f":{c}" for c in columns)
     update_list = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns)
@@ -776,6 +782,7 @@ def _upsert_module(table_name, columns, params):
         )
 
 
+@tracing.traced("db.split_profile")
 def _upsert_split_profile(
     company_id, news_data, strategic_data, synthesis_data, l1, now, total_cost
 ):
@@ -812,6 +819,7 @@ def _upsert_split_profile(
     )
 
 
+@tracing.traced("db.split_signals")
 def _upsert_split_signals(company_id, news_data, strategic_data, now, total_cost):
     """Upsert company_enrichment_signals."""
     cols = (
@@ -855,6 +863,7 @@ def _upsert_split_signals(company_id, news_data, strategic_data, now, total_cost
     )
 
 
+@tracing.traced("db.split_market")
 def _upsert_split_market(company_id, news_data, strategic_data, now, total_cost):
     """Upsert company_enrichment_market."""
     cols = (
@@ -882,6 +891,7 @@ def _upsert_split_market(company_id, news_data, strategic_data, now, total_cost)
     )
 
 
+@tracing.traced("db.split_opportunity")
 def _upsert_split_opportunity(company_id, synthesis_data, quick_wins, now, total_cost):
     """Upsert company_enrichment_opportunity."""
     cols = (
@@ -6,6 +6,7 @@ Tracks per-call token usage and cost for all LLM API calls.
 from decimal import Decimal, ROUND_HALF_UP
 
 from ..models import LlmUsageLog, db
+from . import tracing
 
 # Pricing per 1M tokens (input/output) as Decimal
 # Keys: "provider/model" or "provider/*" for wildcard fallback
@@ -57,15 +58,29 @@ MODEL_PRICING = {
 
 _ONE_MILLION = Decimal("1000000")
 
+# Anthropic prompt caching: writes cost 1.25x the base input rate,
+# reads cost 0.1x. Cache tokens are reported separately from input_tokens.
+CACHE_WRITE_MULTIPLIER = Decimal("1.25")
+CACHE_READ_MULTIPLIER = Decimal("0.10")
 
-def compute_cost(provider, model, input_tokens, output_tokens):
+
+def compute_cost(
+    provider,
+    model,
+    input_tokens,
+    output_tokens,
+    cache_creation_tokens=0,
+    cache_read_tokens=0,
+):
     """Compute cost in USD for a single LLM call.
 
     Args:
         provider: e.g. "anthropic"
         model: e.g. "claude-sonnet-4-5-20250929"
-        input_tokens: number of input tokens
+        input_tokens: number of uncached input tokens
         output_tokens: number of output tokens
+        cache_creation_tokens: input tokens written to the prompt cache
+        cache_read_tokens: input tokens read from the prompt cache
 
     Returns:
         Decimal rounded to 6 decimal places.
@@ -80,7 +95,15 @@ def compute_cost(provider, model, input_tokens, output_tokens):
 
     input_cost = pricing["input"] * Decimal(str(input_tokens)) / _ONE_MILLION
     output_cost = pricing["output"] * Decimal(str(output_tokens)) / _ONE_MILLION
-    total = (input_cost + output_cost).quantize(
+    cache_cost = (
+        pricing["input"]
+        * (
+            Decimal(str(cache_creation_tokens or 0)) * CACHE_WRITE_MULTIPLIER
+            + Decimal(str(cache_read_tokens or 0)) * CACHE_READ_MULTIPLIER
+        )
+        / _ONE_MILLION
+    )
+    total = (input_cost + output_cost + cache_cost).quantize(
         Decimal("0.000001"), rounding=ROUND_HALF_UP
     )
     return total
@@ -109,6 +132,8 @@ def log_llm_usage(
     duration_ms=None,
     metadata=None,
     reserved_credits=0,
+    cache_creation_tokens=0,
+    cache_read_tokens=0,
 ):
     """Create an LlmUsageLog entry and add to the current session.
 
@@ -123,15 +148,28 @@ def log_llm_usage(
         output_tokens: int
         provider: defaults to "anthropic"
         user_id: optional UUID string
-        duration_ms: optional int
+        duration_ms: optional int; when omitted and tracing is on, the
+            duration of this thread's last LLM client span is used if that
+            call ran under the currently open span (see
+            ``tracing.take_llm_duration_ms``)
         metadata: optional dict
         reserved_credits: credits previously reserved for this operation
+        cache_creation_tokens: prompt-cache write tokens (Anthropic)
+        cache_read_tokens: prompt-cache read tokens (Anthropic)
 
     Returns:
         The created LlmUsageLog instance.
     """
-    cost = compute_cost(provider, model, input_tokens, output_tokens)
+    cost = compute_cost(
+        provider,
+        model,
+        input_tokens,
+        output_tokens,
+        cache_creation_tokens=cache_creation_tokens,
+        cache_read_tokens=cache_read_tokens,
+    )
     credits = compute_credits(cost)
+    span_ms = tracing.take_llm_duration_ms()
 
     entry = LlmUsageLog(
         tenant_id=str(tenant_id),
@@ -141,9 +179,11 @@ def log_llm_usage(
         model=model,
         input_tokens=input_tokens,
         output_tokens=output_tokens,
+        cache_creation_tokens=cache_creation_tokens or 0,
+        cache_read_tokens=cache_read_tokens or 0,
         cost_usd=cost,
         credits_consumed=credits,
-        duration_ms=duration_ms,
+        duration_ms=duration_ms if duration_ms is not None else span_ms,
         extra=metadata or {},
     )
     db.session.add(entry)
@@ -0,0 +1,393 @@
+"""Incremental rollups of ``llm_usage_log`` for the usage dashboard.
+
+Every LLM call writes one ``llm_usage_log`` row, so aggregating the raw log
+on each ``/api/llm-usage/summary`` request gets slower every week. The
+compactor folds raw rows into hourly and daily buckets keyed by
+(tenant, operation, provider, model) in ``llm_usage_rollups`` and advances a
+single watermark (``llm_usage_rollup_state.compacted_until``). Readers
+combine the rollups with the raw tail after the watermark, so results
+always reconcile with the log:
+
+    rollups(period in range) + raw(created_at >= watermark, in range)
+
+Date filters are day-aligned, so every daily/hourly bucket is either fully
+inside or fully outside the requested range.
+
+Compaction runs from the scheduler loop and lazily from the summary
+endpoint when the watermark is older than ``ROLLUP_REFRESH_SECONDS``.
+``reconcile_usage_rollups`` compares compacted days against the raw log
+and can rebuild drifted days. Drift happens when a transaction that stayed
+open longer than ``COMPACTION_LAG_SECONDS`` commits after the watermark
+passed its ``created_at``: the row is then neither in the rollups nor in
+the raw tail. The scheduler therefore runs ``maybe_reconcile`` to repair
+the last ``RECONCILE_WINDOW_DAYS`` every ``RECONCILE_INTERVAL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from ..models import db
+
+logger = logging.getLogger(__name__)
+
+# Rows newer than this are left in the raw tail so transactions still in
+# flight (created_at is the transaction start) are not skipped.
+COMPACTION_LAG_SECONDS = 300
+
+# The summary endpoint compacts first when the watermark is older than this
+ROLLUP_REFRESH_SECONDS = 900
+
+# Minimum interval between scheduled reconcile-and-repair passes
+RECONCILE_INTERVAL_SECONDS = 3600
+
+# Compacted days re-checked by the scheduled pass (late commits land here)
+RECONCILE_WINDOW_DAYS = 2
+
+GRANULARITIES = ("hour", "day")
+
+_DIMENSIONS = "tenant_id, operation, provider, model"
+
+_MEASURES = (
+    "calls",
+    "cost_usd",
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_tokens",
+    "cache_read_tokens",
+)
+
+_RECONCILE_FIELDS = ("calls", "cost", "input_tokens", "output_tokens")
+
+_last_reconcile = 0.0
+
+
+def _is_postgres() -> bool:
+    return db.engine.dialect.name == "postgresql"
+
+
+def _bucket_expr(granularity: str, column: str = "l.created_at") -> str:
+    """SQL expression truncating ``column`` to a UTC hour/day."""
+    if granularity not in GRANULARITIES:
+        raise ValueError("Unknown granularity: {}".format(granularity))
+    if _is_postgres():
+        return "date_trunc('{}', {} AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'".format(
+            granularity, column
+        )
+    fmt = "%Y-%m-%d %H:00:00" if granularity == "hour" else "%Y-%m-%d 00:00:00"
+    return "strftime('{}', {})".format(fmt, column)
+
+
+def _param_ts(dt: datetime):
+    """Bind value for a timestamp (SQLite stores naive UTC strings)."""
+    if _is_postgres():
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _parse_ts(value) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def get_watermark(for_update: bool = False) -> Optional[datetime]:
+    """Return the time before which all log rows are rolled up."""
+    sql = "SELECT compacted_until FROM llm_usage_rollup_state WHERE id = 1"
+    if for_update and _is_postgres():
+        sql += " FOR UPDATE"
+    row = db.session.execute(db.text(sql)).fetchone()
+    if row is None:
+        db.session.execute(
+            db.text(
+                "INSERT INTO llm_usage_rollup_state (id, compacted_until) "
+                "VALUES (1, NULL)"
+            )
+        )
+        return None
+    return _parse_ts(row[0])
+
+
+def _fold_range(since: Optional[datetime], until: datetime) -> int:
+    """Add raw rows in ``[since, until)`` to both rollup granularities."""
+    clauses = ["l.created_at < :until"]
+    params = {"until": _param_ts(until)}
+    if since is not None:
+        clauses.append("l.created_at >= :since")
+        params["since"] = _param_ts(since)
+    where = " AND ".join(clauses)
+
+    updates = ", ".join(
+        "{0} = llm_usage_rollups.{0} + excluded.{0}".format(m) for m in _MEASURES
+    )
+    for granularity in GRANULARITIES:
+        bucket = _bucket_expr(granularity)
+        db.session.execute(
+            db.text(
+                "INSERT INTO llm_usage_rollups (granularity, period_start, "
+                + _DIMENSIONS
+                + ", "
+                + ", ".join(_MEASURES)
+                + ") "
+                "SELECT :gran, " + bucket + ", l.tenant_id, l.operation, "
+                "l.provider, l.model, COUNT(*), COALESCE(SUM(l.cost_usd), 0), "
+                "COALESCE(SUM(l.input_tokens), 0), "
+                "COALESCE(SUM(l.output_tokens), 0), "
+                "COALESCE(SUM(l.cache_creation_tokens), 0), "
+                "COALESCE(SUM(l.cache_read_tokens), 0) "
+                "FROM llm_usage_log l WHERE " + where + " "
+                "GROUP BY " + bucket + ", l.tenant_id, l.operation, "
+                "l.provider, l.model "
+                "ON CONFLICT (granularity, period_start, " + _DIMENSIONS + ") "
+                "DO UPDATE SET " + updates
+            ),
+            dict(params, gran=granularity),
+        )
+
+    return db.session.execute(
+        db.text("SELECT COUNT(*) FROM llm_usage_log l WHERE " + where), params
+    ).scalar()
+
+
+def compact_usage_rollups(
+    now: Optional[datetime] = None,
+    lag_seconds: int = COMPACTION_LAG_SECONDS,
+) -> dict:
+    """Fold log rows between the watermark and ``now - lag`` into rollups.
+
+    Concurrent compactors serialize on the state row (PostgreSQL), so each
+    raw row is counted exactly once.
+
+    Returns:
+        ``{"rows_compacted": int, "compacted_until": iso str}``.
+    """
+    now = now or datetime.now(timezone.utc)
+    until = now - timedelta(seconds=lag_seconds)
+    try:
+        since = get_watermark(for_update=True)
+        if since is not None and since >= until:
+            db.session.commit()
+            return {"rows_compacted": 0, "compacted_until": since.isoformat()}
+
+        rows = _fold_range(since, until)
+        db.session.execute(
+            db.text(
+                "UPDATE llm_usage_rollup_state "
+                "SET compacted_until = :until, updated_at = :now WHERE id = 1"
+            ),
+            {"until": _param_ts(until), "now": _param_ts(now)},
+        )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    logger.info("Compacted %d LLM usage rows up to %s", rows, until.isoformat())
+    return {"rows_compacted": rows, "compacted_until": until.isoformat()}
+
+
+def maybe_compact(max_age_seconds: int = ROLLUP_REFRESH_SECONDS) -> None:
+    """Compact when the watermark is missing or older than ``max_age_seconds``.
+
+    Failures are logged and swallowed; readers still get exact numbers from
+    the (longer) raw tail.
+    """
+    try:
+        watermark = get_watermark()
+        stale_before = datetime.now(timezone.utc) - timedelta(
+            seconds=COMPACTION_LAG_SECONDS + max_age_seconds
+        )
+        if watermark is None or watermark < stale_before:
+            compact_usage_rollups()
+        else:
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        logger.exception("LLM usage rollup compaction failed")
+
+
+def usage_source(
+    granularity: str,
+    start_date: Optional[str] = None,
+    end_date_end: Optional[str] = None,
+) -> tuple[str, dict]:
+    """Build a ``( ... ) l`` subquery of rollups + raw tail.
+
+    Columns: tenant_id, operation, provider, model, created_at (period start
+    for rollup rows), calls, cost_usd, input_tokens, output_tokens. Sum
+    ``calls`` instead of counting rows.
+
+    Args:
+        granularity: Rollup granularity to read ('hour' or 'day').
+        start_date: Inclusive lower bound (same format as the raw filter).
+        end_date_end: Exclusive upper bound.
+
+    Returns:
+        ``(sql, params)``.
+    """
+    watermark = get_watermark()
+    params = {}
+    rollup_clauses = ["r.granularity = :rollup_gran"]
+    tail_clauses = []
+    if start_date:
+        rollup_clauses.append("r.period_start >= :start_date")
+        tail_clauses.append("t.created_at >= :start_date")
+        params["start_date"] = start_date
+    if end_date_end:
+        rollup_clauses.append("r.period_start < :end_date_end")
+        tail_clauses.append("t.created_at < :end_date_end")
+        params["end_date_end"] = end_date_end
+
+    tail_sql = (
+        "SELECT t.tenant_id, t.operation, t.provider, t.model, t.created_at, "
+        "1 AS calls, t.cost_usd, t.input_tokens, t.output_tokens "
+        "FROM llm_usage_log t"
+    )
+    if watermark is None:
+        where = " AND ".join(tail_clauses)
+        return "(" + tail_sql + (" WHERE " + where if where else "") + ") l", params
+
+    tail_clauses.append("t.created_at >= :watermark")
+    params["watermark"] = _param_ts(watermark)
+    params["rollup_gran"] = granularity
+    sql = (
+        "(SELECT r.tenant_id, r.operation, r.provider, r.model, "
+        "r.period_start AS created_at, r.calls, r.cost_usd, "
+        "r.input_tokens, r.output_tokens "
+        "FROM llm_usage_rollups r WHERE " + " AND ".join(rollup_clauses) + " "
+        "UNION ALL " + tail_sql + " WHERE " + " AND ".join(tail_clauses) + ") l"
+    )
+    return sql, params
+
+
+def reconcile_usage_rollups(
+    repair: bool = False, since: Optional[datetime] = None
+) -> dict:
+    """Compare compacted days against the raw log.
+
+    Args:
+        repair: Rebuild the rollups of days that do not match.
+        since: Only check days starting at or after this (UTC midnight)
+            timestamp; all compacted days when omitted.
+
+    Returns:
+        ``{"compacted_until": iso str | None, "days_checked": int,
+        "mismatches": [{"day", "raw", "rollup"}], "repaired": int}``.
+    """
+    watermark = get_watermark()
+    if watermark is None:
+        db.session.commit()
+        return {
+            "compacted_until": None,
+            "days_checked": 0,
+            "mismatches": [],
+            "repaired": 0,
+        }
+
+    def _totals(sql, params):
+        return {
+            str(r[0]): (int(r[1]), round(float(r[2]), 6), int(r[3]), int(r[4]))
+            for r in db.session.execute(db.text(sql), params).fetchall()
+        }
+
+    day = _bucket_expr("day")
+    raw_where = "l.created_at < :wm"
+    rolled_where = "r.granularity = 'day'"
+    params = {"wm": _param_ts(watermark)}
+    if since is not None:
+        raw_where += " AND l.created_at >= :since"
+        rolled_where += " AND r.period_start >= :since"
+        params["since"] = _param_ts(since)
+    raw = _totals(
+        "SELECT " + day + ", COUNT(*), COALESCE(SUM(l.cost_usd), 0), "
+        "COALESCE(SUM(l.input_tokens), 0), COALESCE(SUM(l.output_tokens), 0) "
+        "FROM llm_usage_log l WHERE " + raw_where + " GROUP BY " + day,
+        params,
+    )
+    rolled = _totals(
+        "SELECT r.period_start, SUM(r.calls), SUM(r.cost_usd), "
+        "SUM(r.input_tokens), SUM(r.output_tokens) "
+        "FROM llm_usage_rollups r WHERE " + rolled_where + " "
+        "GROUP BY r.period_start",
+        params,
+    )
+
+    empty = (0, 0.0, 0, 0)
+    mismatches = []
+    for key in sorted(set(raw) | set(rolled)):
+        if raw.get(key, empty) != rolled.get(key, empty):
+            mismatches.append(
+                {
+                    "day": key,
+                    "raw": dict(zip(_RECONCILE_FIELDS, raw.get(key, empty))),
+                    "rollup": dict(zip(_RECONCILE_FIELDS, rolled.get(key, empty))),
+                }
+            )
+
+    repaired = 0
+    if repair:
+        for mismatch in mismatches:
+            day_start = _parse_ts(mismatch["day"])
+            day_end = min(day_start + timedelta(days=1), watermark)
+            db.session.execute(
+                db.text(
+                    "DELETE FROM llm_usage_rollups "
+                    "WHERE period_start >= :start AND period_start < :end"
+                ),
+                {
+                    "start": _param_ts(day_start),
+                    "end": _param_ts(day_start + timedelta(days=1)),
+                },
+            )
+            _fold_range(day_start, day_end)
+            repaired += 1
+    db.session.commit()
+
+    return {
+        "compacted_until": watermark.isoformat(),
+        "days_checked": len(set(raw) | set(rolled)),
+        "mismatches": mismatches,
+        "repaired": repaired,
+    }
+
+
+def maybe_reconcile(
+    interval_seconds: int = RECONCILE_INTERVAL_SECONDS,
+    now: Optional[datetime] = None,
+) -> Optional[dict]:
+    """Repair the last ``RECONCILE_WINDOW_DAYS`` of rollups, rate-limited.
+
+    Folds in rows that committed after the watermark had passed their
+    ``created_at``. Failures are logged and swallowed.
+
+    Returns:
+        The reconcile report, or None when skipped or failed.
+    """
+    global _last_reconcile
+    tick = time.monotonic()
+    if _last_reconcile and tick - _last_reconcile < interval_seconds:
+        return None
+    _last_reconcile = tick
+
+    now = now or datetime.now(timezone.utc)
+    since = (now - timedelta(days=RECONCILE_WINDOW_DAYS)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    try:
+        report = reconcile_usage_rollups(repair=True, since=since)
+    except Exception:
+        db.session.rollback()
+        logger.exception("LLM usage rollup reconcile failed")
+        return None
+    if report["repaired"]:
+        logger.warning(
+            "Repaired %d LLM usage rollup day(s) with late-committed rows",
+            report["repaired"],
+        )
+    return report
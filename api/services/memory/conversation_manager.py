@@ -4,13 +4,20 @@ Implements a sliding window over chat history: recent messages are kept
 verbatim while older messages are compressed into a structured summary.
 This reduces token usage by 40-60% on long conversations while preserving
 key decisions, preferences, and findings.
+
+Summaries are rolling: each thread keeps one stored summary plus the id and
+timestamp of the last message it covers (``ConversationSummary``). Only
+messages after that checkpoint are loaded, and when enough of them pile up
+the older part of the delta is folded into the previous summary.
 """
 
 from __future__ import annotations
 
 import json
 import logging
-from typing import Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +43,33 @@ Format as a concise paragraph, max {max_words} words.
 Conversation to summarize:
 {conversation}"""
 
+INCREMENTAL_SUMMARIZE_PROMPT = """Update the running conversation summary with the new messages, preserving:
+- Key decisions the user made
+- User preferences and constraints
+- Factual findings from research
+- Action items and next steps
+- Open questions
+
+Keep everything from the existing summary that is still relevant; replace
+decisions the new messages revise. Drop: greetings, acknowledgments,
+repetitive content. Format as a concise paragraph, max {max_words} words.
+
+Existing summary:
+{summary}
+
+New messages:
+{conversation}"""
+
+
+@dataclass
+class SummaryCheckpoint:
+    """A stored thread summary and the last message it covers."""
+
+    summary: str
+    last_message_id: str
+    covered_until: datetime
+    message_count: int = 0
+
 
 def needs_summarization(messages: list[dict], window: int = RECENT_WINDOW) -> bool:
     """Check whether the message list should be summarized.
@@ -56,13 +90,19 @@ def build_summarization_request(
     messages: list[dict],
     window: int = RECENT_WINDOW,
     max_words: int = MAX_SUMMARY_WORDS,
+    previous_summary: Optional[str] = None,
 ) -> Optional[str]:
     """Build the prompt to send to the LLM for summarization.
 
+    With ``previous_summary`` set, ``messages`` should be only the messages
+    after the summary's checkpoint; the prompt then asks the LLM to update
+    the summary with them instead of re-summarizing the whole thread.
+
     Args:
-        messages: Full message list.
+        messages: Messages not yet covered by a summary.
         window: Recent messages to keep verbatim.
         max_words: Max words for the summary.
+        previous_summary: Summary of everything before ``messages``.
 
     Returns:
         The summarization prompt string, or None if no summarization needed.
@@ -74,12 +114,110 @@ def build_summarization_request(
     older = non_summary[:-window]
     conversation_text = _format_messages_for_summary(older)
 
+    if previous_summary:
+        return INCREMENTAL_SUMMARIZE_PROMPT.format(
+            max_words=max_words,
+            summary=previous_summary.strip(),
+            conversation=conversation_text,
+        )
     return SUMMARIZE_PROMPT.format(
         max_words=max_words,
         conversation=conversation_text,
     )
 
 
+def roll_summary(
+    delta: list[dict],
+    checkpoint: Optional[SummaryCheckpoint],
+    summarize: Callable[[str], Optional[str]],
+    window: int = RECENT_WINDOW,
+    threshold: int = RESUMMARIZE_THRESHOLD,
+    max_words: int = MAX_SUMMARY_WORDS,
+) -> Optional[SummaryCheckpoint]:
+    """Fold the older part of ``delta`` into the thread summary if due.
+
+    Args:
+        delta: Messages after the checkpoint (oldest first), each with
+            ``id``, ``role``, ``content`` and ``created_at``.
+        checkpoint: Current stored summary, or None for a new thread.
+        summarize: Callable taking a prompt and returning summary text
+            (None on failure).
+        window: Recent messages to keep verbatim.
+        threshold: Messages beyond the window before re-summarizing.
+        max_words: Max words for the summary.
+
+    Returns:
+        The new checkpoint, or None when no summarization was needed or the
+        summarizer failed (the caller keeps using the old checkpoint).
+    """
+    non_summary = [m for m in delta if not _is_summary(m)]
+    if len(non_summary) < window + threshold:
+        return None
+
+    prompt = build_summarization_request(
+        non_summary,
+        window=window,
+        max_words=max_words,
+        previous_summary=checkpoint.summary if checkpoint else None,
+    )
+    summary = summarize(prompt) if prompt else None
+    if not summary or not isinstance(summary, str):
+        return None
+
+    last_covered = non_summary[:-window][-1]
+    return SummaryCheckpoint(
+        summary=summary.strip(),
+        last_message_id=str(last_covered["id"]),
+        covered_until=last_covered["created_at"],
+        message_count=(checkpoint.message_count if checkpoint else 0)
+        + len(non_summary)
+        - window,
+    )
+
+
+def load_summary_checkpoint(
+    document_id: str, thread_key: str
+) -> Optional[SummaryCheckpoint]:
+    """Load the stored summary for a chat thread."""
+    from ...models import ConversationSummary
+
+    row = ConversationSummary.query.filter_by(
+        document_id=document_id, thread_key=thread_key
+    ).first()
+    if row is None:
+        return None
+    return SummaryCheckpoint(
+        summary=row.summary,
+        last_message_id=row.last_message_id,
+        covered_until=row.covered_until,
+        message_count=row.message_count or 0,
+    )
+
+
+def save_summary_checkpoint(
+    tenant_id: str,
+    document_id: str,
+    thread_key: str,
+    checkpoint: SummaryCheckpoint,
+) -> None:
+    """Upsert the stored summary for a chat thread (caller commits)."""
+    from ...models import ConversationSummary, db
+
+    row = ConversationSummary.query.filter_by(
+        document_id=document_id, thread_key=thread_key
+    ).first()
+    if row is None:
+        row = ConversationSummary(
+            tenant_id=tenant_id, document_id=document_id, thread_key=thread_key
+        )
+        db.session.add(row)
+    row.summary = checkpoint.summary
+    row.last_message_id = checkpoint.last_message_id
+    row.covered_until = checkpoint.covered_until
+    row.message_count = checkpoint.message_count
+    row.updated_at = db.func.now()
+
+
 def apply_floating_window(
     messages: list[dict],
     summary_text: Optional[str] = None,
@@ -107,16 +245,20 @@ def apply_floating_window(
     recent = non_summary[-window:]
 
     if summary_text:
-        summary_msg = {
-            "role": "user",
-            "content": ("[Earlier conversation summary]\n" + summary_text.strip()),
-        }
-        return [summary_msg] + recent
+        return [summary_message(summary_text)] + recent
 
     # No summary available — just return the recent window
     return recent
 
 
+def summary_message(summary_text: str) -> dict:
+    """Wrap a thread summary as a message for the Claude API."""
+    return {
+        "role": "user",
+        "content": "[Earlier conversation summary]\n" + summary_text.strip(),
+    }
+
+
 def extract_facts_for_memory(
     user_message: str,
     assistant_message: str,
@@ -0,0 +1,164 @@
+"""Local text embeddings for semantic memory recall.
+
+A hashing-trick vectorizer: word unigrams plus character trigrams are
+hashed into a fixed number of signed buckets, so no model download or
+external service is needed. Common GTM acronyms are expanded before
+hashing ("ICP" -> "ideal customer profile") so the usual paraphrases land
+on shared features; character trigrams cover inflections
+("targeting" / "target").
+
+Vectors are stored as int8 (scaled by their largest component) and scored
+with cosine similarity, using NumPy when installed and pure Python
+otherwise.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from array import array
+from typing import Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Embedding dimensionality; also the pgvector column size (migration 051)
+EMBEDDING_DIM = 256
+
+# Stored alongside vectors so a future vectorizer change can be detected
+EMBEDDING_MODEL = "hash-v1"
+
+# Relative weight of character trigram features vs. whole words
+_TRIGRAM_WEIGHT = 0.35
+
+_ALIASES = {
+    "icp": "ideal customer profile",
+    "gtm": "go to market",
+    "acv": "annual contract value",
+    "arr": "annual recurring revenue",
+    "mrr": "monthly recurring revenue",
+    "smb": "small medium business",
+    "sme": "small medium enterprise",
+    "dach": "germany austria switzerland",
+    "cxo": "executive",
+    "ceo": "chief executive",
+    "cto": "chief technology",
+    "cfo": "chief financial",
+    "roi": "return investment",
+    "abm": "account based marketing",
+    "sdr": "sales development",
+    "b2b": "business to business",
+}
+
+
+def _tokens(text: str) -> list[str]:
+    from .rag_store import _STOP_WORDS
+
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    tokens = []
+    for word in words:
+        if word in _ALIASES:
+            tokens.extend(_ALIASES[word].split())
+        tokens.append(word)
+    return [t for t in tokens if t not in _STOP_WORDS and len(t) > 1]
+
+
+def _bucket(feature: str, dim: int) -> tuple[int, float]:
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    h = int.from_bytes(digest, "little")
+    return h % dim, (1.0 if h >> 63 else -1.0)
+
+
+def embed_text(text: str, dim: int = EMBEDDING_DIM) -> Optional[list[float]]:
+    """Embed text into an L2-normalised ``dim``-dimensional vector.
+
+    Returns:
+        List of floats, or None when the text has no usable tokens.
+    """
+    tokens = _tokens(text or "")
+    if not tokens:
+        return None
+
+    vec = [0.0] * dim
+    for token in tokens:
+        idx, sign = _bucket("w:" + token, dim)
+        vec[idx] += sign
+        padded = "#{}#".format(token)
+        grams = [padded[i : i + 3] for i in range(len(padded) - 2)]
+        weight = _TRIGRAM_WEIGHT / max(len(grams), 1) * 3
+        for gram in grams:
+            idx, sign = _bucket("c:" + gram, dim)
+            vec[idx] += sign * weight
+
+    norm = math.sqrt(sum(v * v for v in vec))
+    if norm == 0:
+        return None
+    return [v / norm for v in vec]
+
+
+def quantize(vec: list[float]) -> bytes:
+    """Pack a vector as int8 bytes scaled by its largest component."""
+    peak = max((abs(v) for v in vec), default=0.0) or 1.0
+    scale = 127.0 / peak
+    return array("b", (int(round(v * scale)) for v in vec)).tobytes()
+
+
+def dequantize(blob: bytes) -> list[float]:
+    """Inverse of ``quantize`` up to scale (cosine is scale-invariant)."""
+    if isinstance(blob, memoryview):
+        blob = blob.tobytes()
+    return [float(v) for v in array("b", blob)]
+
+
+def to_pgvector(vec: list[float]) -> str:
+    """Format a vector as a pgvector text literal."""
+    return "[" + ",".join("{:.5f}".format(v) for v in vec) + "]"
+
+
+def top_k_cosine(
+    query: list[float],
+    rows: Iterable[tuple[str, bytes]],
+    k: int,
+) -> list[tuple[str, float]]:
+    """Brute-force cosine similarity of ``query`` against quantized rows.
+
+    Args:
+        query: L2-normalised query vector.
+        rows: ``(fact_id, int8 blob)`` pairs.
+        k: Number of best matches to return.
+
+    Returns:
+        ``(fact_id, similarity)`` pairs, best first.
+    """
+    rows = [
+        (fid, blob.tobytes() if isinstance(blob, memoryview) else blob)
+        for fid, blob in rows
+        if blob
+    ]
+    if not rows or k <= 0:
+        return []
+
+    if np is not None:
+        matrix = np.frombuffer(b"".join(b for _, b in rows), dtype=np.int8)
+        matrix = matrix.reshape(len(rows), -1).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1.0
+        sims = matrix @ np.asarray(query, dtype=np.float32) / norms
+        if len(rows) > k:
+            best = np.argpartition(-sims, k - 1)[:k]
+        else:
+            best = np.arange(len(rows))
+        best = best[np.argsort(-sims[best])]
+        return [(rows[i][0], float(sims[i])) for i in best]
+
+    scored = []
+    for fid, blob in rows:
+        values = array("b", blob)
+        norm = math.sqrt(sum(v * v for v in values)) or 1.0
+        sim = sum(q * v for q, v in zip(query, values)) / norm
+        scored.append((fid, sim))
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return scored[:k]
@@ -1,14 +1,20 @@
 """RAG long-term memory store (BL-262).
 
-Stores and retrieves key facts across chat sessions.  MVP uses
-keyword-based retrieval with simple scoring.  Can be upgraded to
-pgvector embeddings later.
+Stores and retrieves key facts across chat sessions.  Retrieval is
+keyword-based: each fact's keywords are written to an inverted index
+(``memory_fact_keywords``, migration 050) and candidates are ranked with
+BM25 in SQL, so lookups touch only the posting lists of the query terms
+instead of scanning the tenant's facts.  A recency decay is applied on
+top of the text score.  Optional semantic recall adds local embeddings
+(``embeddings.py``) fused with the keyword score.
 """
 
 from __future__ import annotations
 
 import logging
+import math
 import re
+from datetime import datetime, timezone
 from typing import Optional
 
 from ...models import db
@@ -24,6 +30,29 @@ CHARS_PER_TOKEN = 4
 # Maximum number of facts to retrieve per query
 MAX_FACTS_RETRIEVED = 10
 
+# BM25 parameters. Keywords are deduplicated per fact, so term frequency is
+# always 1 and only the length normalisation (b) matters in practice.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Candidates fetched from SQL per returned fact, re-ranked with recency
+CANDIDATE_MULTIPLIER = 5
+
+# Recency decay: a fact's score halves every RECENCY_HALF_LIFE_DAYS, but
+# never drops below RECENCY_FLOOR of its text score.
+RECENCY_HALF_LIFE_DAYS = 30.0
+RECENCY_FLOOR = 0.5
+
+# Semantic recall (MEMORY_SEMANTIC_RECALL): share of the fused score that
+# comes from embedding similarity; the rest is the max-normalised BM25 score.
+SEMANTIC_WEIGHT = 0.5
+
+# Vector-only matches below this cosine similarity are ignored (hash noise)
+SEMANTIC_MIN_SIMILARITY = 0.2
+
+# Newest embeddings scanned per query when pgvector is not available
+SEMANTIC_SCAN_LIMIT = 20000
+
 # Stop-words to exclude from keyword extraction
 _STOP_WORDS = frozenset(
     "a an the is are was were be been being have has had do does did "
@@ -40,8 +69,26 @@ class MemoryStore:
 
     Stores facts as text chunks with extracted keywords for retrieval.
     Scoped by tenant_id for multi-tenant isolation.
+
+    With semantic recall enabled (``semantic=True`` or the
+    ``MEMORY_SEMANTIC_RECALL`` config flag), facts also get a local
+    embedding and retrieval fuses vector similarity with the keyword score,
+    so paraphrases ("ICP" vs "ideal customer") are recalled.
     """
 
+    def __init__(self, semantic: Optional[bool] = None):
+        self._semantic = semantic
+
+    @property
+    def semantic(self) -> bool:
+        if self._semantic is not None:
+            return self._semantic
+        from flask import current_app, has_app_context
+
+        if not has_app_context():
+            return False
+        return bool(current_app.config.get("MEMORY_SEMANTIC_RECALL", False))
+
     def store_fact(
         self,
         tenant_id: str,
@@ -70,19 +117,18 @@ class MemoryStore:
         keywords = extract_keywords(text)
 
         try:
-            import json as _json
             import uuid as _uuid
+
             from sqlalchemy import text as sa_text
 
             fact_id = str(_uuid.uuid4())
-            kw_value = _json.dumps(keywords)
 
             db.session.execute(
                 sa_text(
                     "INSERT INTO memory_facts "
                     "(id, tenant_id, playbook_id, source_message_id, "
-                    "chunk_text, chunk_type, keywords, session_id) "
-                    "VALUES (:id, :tid, :pid, :mid, :txt, :ctype, :kw, :sid)"
+                    "chunk_text, chunk_type, keywords, keyword_count, session_id) "
+                    "VALUES (:id, :tid, :pid, :mid, :txt, :ctype, :kw, :kwn, :sid)"
                 ),
                 {
                     "id": fact_id,
@@ -91,10 +137,22 @@ class MemoryStore:
                     "mid": source_message_id,
                     "txt": text.strip(),
                     "ctype": chunk_type,
-                    "kw": kw_value,
+                    # Bound as a list so PostgreSQL receives a TEXT[]
+                    "kw": keywords,
+                    "kwn": len(keywords),
                     "sid": session_id,
                 },
             )
+            if keywords:
+                db.session.execute(
+                    sa_text(
+                        "INSERT INTO memory_fact_keywords (fact_id, tenant_id, keyword) "
+                        "VALUES (:fid, :tid, :kw)"
+                    ),
+                    [{"fid": fact_id, "tid": tenant_id, "kw": kw} for kw in keywords],
+                )
+            if self.semantic:
+                self._store_embedding(fact_id, tenant_id, playbook_id, text)
             db.session.commit()
             return fact_id
         except Exception:
@@ -108,61 +166,74 @@ class MemoryStore:
         query: str,
         max_tokens: int = MAX_MEMORY_TOKENS,
         max_facts: int = MAX_FACTS_RETRIEVED,
+        playbook_id: Optional[str] = None,
     ) -> list[dict]:
         """Retrieve relevant facts for a query.
 
-        Uses keyword overlap scoring to rank stored facts by relevance.
+        Ranks facts by BM25 over the keyword index, then applies a recency
+        decay so that, between equally relevant facts, newer ones win. In
+        semantic mode the nearest facts by embedding are added to the
+        candidates and the score becomes
+        ``(1 - SEMANTIC_WEIGHT) * bm25 / max_bm25 + SEMANTIC_WEIGHT * cosine``.
 
         Args:
             tenant_id: Tenant UUID.
             query: The search query text.
             max_tokens: Maximum total tokens for returned facts.
             max_facts: Maximum number of facts to return.
+            playbook_id: When set, only facts for this playbook or facts not
+                tied to any playbook are considered.
 
         Returns:
             List of ``{"id": str, "text": str, "type": str, "score": float}``
             dicts ordered by relevance score (descending).
         """
+        semantic = self.semantic
         query_keywords = extract_keywords(query)
-        if not query_keywords:
+        if not query_keywords and not semantic:
             return []
 
+        limit = max_facts * CANDIDATE_MULTIPLIER
         try:
-            from sqlalchemy import text as sa_text
-
-            # Retrieve candidate facts for this tenant
-            result = db.session.execute(
-                sa_text(
-                    "SELECT id, chunk_text, chunk_type, keywords "
-                    "FROM memory_facts "
-                    "WHERE tenant_id = :tid "
-                    "ORDER BY created_at DESC "
-                    "LIMIT 100"
-                ),
-                {"tid": tenant_id},
-            )
-            rows = result.fetchall()
+            rows = []
+            if query_keywords:
+                rows = self._bm25_candidates(
+                    tenant_id, query_keywords, limit=limit, playbook_id=playbook_id
+                )
+            # fact_id -> [text, type, created_at, bm25, cosine]
+            candidates = {
+                str(r[0]): [r[1], r[2], r[3], float(r[4] or 0), 0.0] for r in rows
+            }
+            if semantic:
+                hits = self._vector_candidates(tenant_id, query, limit, playbook_id)
+                for fact_id, similarity in hits:
+                    if fact_id in candidates:
+                        candidates[fact_id][4] = similarity
+                    elif similarity >= SEMANTIC_MIN_SIMILARITY:
+                        candidates[fact_id] = [None, None, None, 0.0, similarity]
+                self._fill_fact_rows(candidates)
         except Exception:
             logger.exception("Failed to retrieve memory facts")
+            db.session.rollback()
             return []
 
-        # Score each fact by keyword overlap
+        max_bm25 = max((c[3] for c in candidates.values()), default=0.0) or 1.0
+        now = datetime.now(timezone.utc)
         scored = []
-        query_kw_set = set(query_keywords)
-        for row in rows:
-            fact_id, text, chunk_type, kw_raw = row
-            fact_keywords = _parse_keywords(kw_raw)
-            if not fact_keywords:
+        for fact_id, (text, chunk_type, created_at, bm25, cos) in candidates.items():
+            if text is None:
                 continue
-
-            overlap = query_kw_set & set(fact_keywords)
-            if not overlap:
+            if semantic:
+                relevance = (1 - SEMANTIC_WEIGHT) * bm25 / max_bm25
+                relevance += SEMANTIC_WEIGHT * max(cos, 0.0)
+            else:
+                relevance = bm25
+            score = relevance * _recency_weight(created_at, now)
+            if score <= 0:
                 continue
-
-            score = len(overlap) / max(len(query_kw_set), 1)
             scored.append(
                 {
-                    "id": str(fact_id),
+                    "id": fact_id,
                     "text": text,
                     "type": chunk_type,
                     "score": round(score, 3),
@@ -186,6 +257,228 @@ class MemoryStore:
 
         return results
 
+    def _bm25_candidates(
+        self,
+        tenant_id: str,
+        keywords: list[str],
+        limit: int,
+        playbook_id: Optional[str] = None,
+    ) -> list[tuple]:
+        """Return the top ``limit`` facts by BM25 score for ``keywords``.
+
+        Corpus statistics (fact count, average keyword count, per-keyword
+        document frequency) come from two small aggregate queries; the
+        scoring join only reads index rows for the query keywords.
+
+        Returns:
+            Rows of ``(id, chunk_text, chunk_type, created_at, score)``.
+        """
+        from sqlalchemy import bindparam
+        from sqlalchemy import text as sa_text
+
+        scope_sql = ""
+        params = {"tid": tenant_id}
+        if playbook_id:
+            scope_sql = " AND (f.playbook_id = :pid OR f.playbook_id IS NULL)"
+            params["pid"] = playbook_id
+
+        # Corpus statistics are tenant-wide; the playbook scope only
+        # filters which facts are ranked.
+        total, avg_len = db.session.execute(
+            sa_text(
+                "SELECT COUNT(*), AVG(keyword_count) FROM memory_facts "
+                "WHERE tenant_id = :tid"
+            ),
+            {"tid": tenant_id},
+        ).fetchone()
+        if not total:
+            return []
+        avg_len = float(avg_len or 0) or 1.0
+
+        df_rows = db.session.execute(
+            sa_text(
+                "SELECT k.keyword, COUNT(*) FROM memory_fact_keywords k "
+                "WHERE k.tenant_id = :tid AND k.keyword IN :kws "
+                "GROUP BY k.keyword"
+            ).bindparams(bindparam("kws", expanding=True)),
+            {"tid": tenant_id, "kws": keywords},
+        ).fetchall()
+        if not df_rows:
+            return []
+
+        # Per-term IDF weights, inlined as a CASE so the database sums them
+        cases = []
+        for i, (keyword, df) in enumerate(df_rows):
+            params["term%d" % i] = keyword
+            params["idf%d" % i] = _bm25_idf(total, df)
+            cases.append("WHEN :term{0} THEN :idf{0}".format(i))
+        idf_sum = "SUM(CASE k.keyword {} ELSE 0 END)".format(" ".join(cases))
+
+        params.update(
+            {
+                "kws": [r[0] for r in df_rows],
+                "k1": BM25_K1,
+                "k1p1": BM25_K1 + 1,
+                "b": BM25_B,
+                "avgdl": avg_len,
+                "lim": limit,
+            }
+        )
+        stmt = sa_text(
+            "SELECT f.id, f.chunk_text, f.chunk_type, f.created_at, "
+            + idf_sum
+            + " * :k1p1 / (1 + :k1 * (1 - :b + :b * f.keyword_count / :avgdl))"
+            " AS score "
+            "FROM memory_fact_keywords k "
+            "JOIN memory_facts f ON f.id = k.fact_id "
+            "WHERE k.tenant_id = :tid AND k.keyword IN :kws" + scope_sql + " "
+            "GROUP BY f.id, f.chunk_text, f.chunk_type, f.created_at, "
+            "f.keyword_count "
+            "ORDER BY score DESC "
+            "LIMIT :lim"
+        ).bindparams(bindparam("kws", expanding=True))
+        return db.session.execute(stmt, params).fetchall()
+
+    def _store_embedding(
+        self,
+        fact_id: str,
+        tenant_id: str,
+        playbook_id: Optional[str],
+        text: str,
+    ) -> bool:
+        """Write the local embedding for a fact (caller commits)."""
+        from sqlalchemy import text as sa_text
+
+        from .embeddings import EMBEDDING_MODEL, embed_text, quantize, to_pgvector
+
+        vec = embed_text(text)
+        if vec is None:
+            return False
+        params = {
+            "fid": fact_id,
+            "tid": tenant_id,
+            "pid": playbook_id,
+            "model": EMBEDDING_MODEL,
+            "emb": quantize(vec),
+        }
+        if _pgvector_enabled():
+            db.session.execute(
+                sa_text(
+                    "INSERT INTO memory_fact_embeddings "
+                    "(fact_id, tenant_id, playbook_id, model, embedding, vec) "
+                    "VALUES (:fid, :tid, :pid, :model, :emb, CAST(:vec AS vector))"
+                ),
+                dict(params, vec=to_pgvector(vec)),
+            )
+        else:
+            db.session.execute(
+                sa_text(
+                    "INSERT INTO memory_fact_embeddings "
+                    "(fact_id, tenant_id, playbook_id, model, embedding) "
+                    "VALUES (:fid, :tid, :pid, :model, :emb)"
+                ),
+                params,
+            )
+        return True
+
+    def _vector_candidates(
+        self,
+        tenant_id: str,
+        query: str,
+        limit: int,
+        playbook_id: Optional[str] = None,
+    ) -> list[tuple[str, float]]:
+        """Nearest facts to ``query`` by embedding cosine similarity.
+
+        Uses the pgvector HNSW index when migration 051 could add it;
+        otherwise scans the newest ``SEMANTIC_SCAN_LIMIT`` int8 embeddings
+        of the tenant in-process.
+        """
+        from sqlalchemy import text as sa_text
+
+        from .embeddings import embed_text, to_pgvector, top_k_cosine
+
+        vec = embed_text(query)
+        if vec is None:
+            return []
+
+        scope_sql = ""
+        params = {"tid": tenant_id, "lim": limit}
+        if playbook_id:
+            scope_sql = " AND (playbook_id = :pid OR playbook_id IS NULL)"
+            params["pid"] = playbook_id
+
+        if _pgvector_enabled():
+            rows = db.session.execute(
+                sa_text(
+                    "SELECT fact_id, 1 - (vec <=> CAST(:q AS vector)) "
+                    "FROM memory_fact_embeddings "
+                    "WHERE tenant_id = :tid AND vec IS NOT NULL" + scope_sql + " "
+                    "ORDER BY vec <=> CAST(:q AS vector) LIMIT :lim"
+                ),
+                dict(params, q=to_pgvector(vec)),
+            ).fetchall()
+            return [(str(r[0]), float(r[1])) for r in rows]
+
+        rows = db.session.execute(
+            sa_text(
+                "SELECT fact_id, embedding FROM memory_fact_embeddings "
+                "WHERE tenant_id = :tid" + scope_sql + " "
+                "ORDER BY created_at DESC LIMIT :scan"
+            ),
+            dict(params, scan=SEMANTIC_SCAN_LIMIT),
+        ).fetchall()
+        return top_k_cosine(vec, ((str(r[0]), r[1]) for r in rows), limit)
+
+    def _fill_fact_rows(self, candidates: dict) -> None:
+        """Load text/type/created_at for vector-only candidates in one query."""
+        from sqlalchemy import bindparam
+        from sqlalchemy import text as sa_text
+
+        missing = [fid for fid, c in candidates.items() if c[0] is None]
+        if not missing:
+            return
+        rows = db.session.execute(
+            sa_text(
+                "SELECT id, chunk_text, chunk_type, created_at "
+                "FROM memory_facts WHERE id IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"ids": missing},
+        ).fetchall()
+        for fact_id, text, chunk_type, created_at in rows:
+            candidates[str(fact_id)][:3] = [text, chunk_type, created_at]
+
+    def backfill_embeddings(self, tenant_id: str, batch_size: int = 500) -> int:
+        """Embed a tenant's facts that have no embedding yet.
+
+        Used after turning on ``MEMORY_SEMANTIC_RECALL`` for existing data.
+
+        Returns:
+            Number of embeddings written.
+        """
+        from sqlalchemy import text as sa_text
+
+        written = 0
+        while True:
+            rows = db.session.execute(
+                sa_text(
+                    "SELECT f.id, f.playbook_id, f.chunk_text FROM memory_facts f "
+                    "LEFT JOIN memory_fact_embeddings e ON e.fact_id = f.id "
+                    "WHERE f.tenant_id = :tid AND e.fact_id IS NULL LIMIT :lim"
+                ),
+                {"tid": tenant_id, "lim": batch_size},
+            ).fetchall()
+            batch_written = 0
+            for fact_id, playbook_id, text in rows:
+                if self._store_embedding(str(fact_id), tenant_id, playbook_id, text):
+                    batch_written += 1
+            db.session.commit()
+            written += batch_written
+            # Facts without usable tokens never get an embedding; stop
+            # instead of re-reading them forever.
+            if len(rows) < batch_size or batch_written == 0:
+                return written
+
     def format_for_injection(self, facts: list[dict]) -> str:
         """Format retrieved facts as a text block for prompt injection.
 
@@ -213,6 +506,17 @@ class MemoryStore:
         try:
             from sqlalchemy import text as sa_text
 
+            db.session.execute(
+                sa_text("DELETE FROM memory_fact_keywords WHERE tenant_id = :tid"),
+                {"tid": tenant_id},
+            )
+            if self.semantic:
+                db.session.execute(
+                    sa_text(
+                        "DELETE FROM memory_fact_embeddings WHERE tenant_id = :tid"
+                    ),
+                    {"tid": tenant_id},
+                )
             result = db.session.execute(
                 sa_text("DELETE FROM memory_facts WHERE tenant_id = :tid"),
                 {"tid": tenant_id},
@@ -248,6 +552,55 @@ def extract_keywords(text: str) -> list[str]:
     return result
 
 
+_pgvector_state: Optional[bool] = None
+
+
+def _pgvector_enabled() -> bool:
+    """Whether memory_fact_embeddings has a pgvector ``vec`` column.
+
+    Checked once per process; migration 051 only adds the column when the
+    extension is installed on the server.
+    """
+    global _pgvector_state
+    if _pgvector_state is None:
+        if db.engine.dialect.name != "postgresql":
+            _pgvector_state = False
+        else:
+            from sqlalchemy import text as sa_text
+
+            _pgvector_state = bool(
+                db.session.execute(
+                    sa_text(
+                        "SELECT 1 FROM information_schema.columns "
+                        "WHERE table_name = 'memory_fact_embeddings' "
+                        "AND column_name = 'vec'"
+                    )
+                ).fetchone()
+            )
+    return _pgvector_state
+
+
+def _bm25_idf(total: int, df: int) -> float:
+    """BM25 inverse document frequency (always positive variant)."""
+    return math.log(1 + (total - df + 0.5) / (df + 0.5))
+
+
+def _recency_weight(created_at, now: datetime) -> float:
+    """Decay multiplier in ``[RECENCY_FLOOR, 1]`` based on fact age."""
+    if created_at is None:
+        return 1.0
+    if isinstance(created_at, str):
+        try:
+            created_at = datetime.fromisoformat(created_at)
+        except ValueError:
+            return 1.0
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    age_days = max((now - created_at).total_seconds() / 86400.0, 0.0)
+    decay = 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+    return RECENCY_FLOOR + (1 - RECENCY_FLOOR) * decay
+
+
 def _parse_keywords(kw_raw) -> list[str]:
     """Parse keywords from database storage format.
 
@@ -14,6 +14,8 @@ import uuid
 from decimal import Decimal
 
 from ..models import Message, db
+from .campaign_analytics import invalidate_campaign_analytics
+from .context_bundles import enrichment_context, load_bundles
 from .generation_prompts import (
     SYSTEM_PROMPT,
     build_generation_prompt,
@@ -304,6 +306,11 @@ def _generate_all(campaign_id: str, tenant_id: str, user_id: str):
 
     total_contacts = len(contacts)
     generated_count = 0
+
+    # Enrichment context for every contact in one lookup
+    bundles = load_bundles(
+        [str(r[9]) for r in contacts if r[9]], [str(r[1]) for r in contacts]
+    )
     total_cost = Decimal("0")
 
     for i, contact_row in enumerate(contacts):
@@ -351,7 +358,7 @@ def _generate_all(campaign_id: str, tenant_id: str, user_id: str):
             }
             company_id = str(contact_row[9]) if contact_row[9] else None
             company_data, enrichment_data = _load_enrichment_context(
-                contact_id, company_id
+                contact_id, company_id, bundles
             )
 
             # BL-181: variant_count from generation_config (default 1, max 3)
@@ -449,6 +456,7 @@ def _generate_all(campaign_id: str, tenant_id: str, user_id: str):
             {"gc": generated_count, "cost": float(total_cost), "id": campaign_id},
         )
         db.session.commit()
+        invalidate_campaign_analytics(campaign_id)
 
         # Small delay between contacts to avoid rate limits
         if i < total_contacts - 1:
@@ -464,6 +472,7 @@ def _generate_all(campaign_id: str, tenant_id: str, user_id: str):
         {"id": campaign_id},
     )
     db.session.commit()
+    invalidate_campaign_analytics(campaign_id)
 
     logger.info(
         "Generation complete: campaign=%s contacts=%d messages=%d cost=$%.4f",
@@ -474,92 +483,25 @@ def _generate_all(campaign_id: str, tenant_id: str, user_id: str):
     )
 
 
-def _load_enrichment_context(contact_id: str, company_id: str) -> tuple[dict, dict]:
+def _load_enrichment_context(
+    contact_id: str, company_id: str, bundles: tuple[dict, dict] | None = None
+) -> tuple[dict, dict]:
     """Load company and enrichment data for a contact.
 
     BL-173: Enhanced to include company_size, verified_employees,
     verified_revenue, and richer L2/person fields for grounded
     message personalization.
-    """
-    company_data = {}
-    enrichment_data = {"l2": {}, "person": {}}
-
-    if company_id:
-        row = db.session.execute(
-            db.text("""
-                SELECT name, domain, industry, hq_country, summary,
-                       company_size, verified_employees, verified_revenue_eur_m,
-                       tier, business_model
-                FROM companies WHERE id = :id
-            """),
-            {"id": company_id},
-        ).fetchone()
-        if row:
-            company_data = {
-                "name": row[0],
-                "domain": row[1],
-                "industry": row[2],
-                "hq_country": row[3],
-                "summary": row[4],
-                "company_size": row[5],
-                "employee_count": str(int(row[6])) if row[6] else None,
-                "revenue_eur_m": str(round(float(row[7]), 1)) if row[7] else None,
-                "tier": row[8],
-                "business_model": row[9],
-            }
-
-        # BL-173: Load full L2 enrichment for grounded personalization
-        l2_row = db.session.execute(
-            db.text("""
-                SELECT company_intel, recent_news, ai_opportunities,
-                       pain_hypothesis, key_products, customer_segments,
-                       competitors, tech_stack, hiring_signals,
-                       digital_initiatives, pitch_framing, growth_signals,
-                       expansion, ma_activity
-                FROM company_enrichment_l2 WHERE company_id = :id
-            """),
-            {"id": company_id},
-        ).fetchone()
-        if l2_row:
-            enrichment_data["l2"] = {
-                "company_intel": l2_row[0],
-                "recent_news": l2_row[1],
-                "ai_opportunities": l2_row[2],
-                "pain_hypothesis": l2_row[3],
-                "key_products": l2_row[4],
-                "customer_segments": l2_row[5],
-                "competitors": l2_row[6],
-                "tech_stack": l2_row[7],
-                "hiring_signals": l2_row[8],
-                "digital_initiatives": l2_row[9],
-                "pitch_framing": l2_row[10],
-                "growth_signals": l2_row[11],
-                "expansion": l2_row[12],
-                "ma_activity": l2_row[13],
-            }
-
-    # BL-173: Load richer person enrichment for grounded personalization
-    person_row = db.session.execute(
-        db.text("""
-            SELECT person_summary, relationship_synthesis,
-                   career_trajectory, speaking_engagements, publications,
-                   ai_champion_score, authority_score
-            FROM contact_enrichment WHERE contact_id = :id
-        """),
-        {"id": contact_id},
-    ).fetchone()
-    if person_row:
-        enrichment_data["person"] = {
-            "person_summary": person_row[0],
-            "relationship_synthesis": person_row[1],
-            "career_trajectory": person_row[2],
-            "speaking_engagements": person_row[3],
-            "publications": person_row[4],
-            "ai_champion_score": person_row[5],
-            "authority_score": person_row[6],
-        }
 
-    return company_data, enrichment_data
+    Reads the materialized context bundles (``services.context_bundles``);
+    pass ``bundles`` preloaded for a whole campaign to skip the lookup.
+    """
+    if bundles is None:
+        bundles = load_bundles([company_id], [contact_id])
+    companies, contacts = bundles
+    return enrichment_context(
+        companies.get(str(company_id)) if company_id else None,
+        contacts.get(str(contact_id)),
+    )
 
 
 def _generate_single_message(
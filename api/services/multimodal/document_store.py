@@ -2,6 +2,13 @@
 
 Orchestrates upload metadata storage, content extraction, and
 summary caching in PostgreSQL.
+
+Uploads record the SHA-256 of their bytes (``file_uploads.content_sha256``,
+migration 060). Extracting a file whose hash matches an already processed
+upload of the same tenant copies that upload's extracted rows (text,
+tables, vision descriptions, summary) instead of re-extracting.
+``record_processing`` stores which processor (and version) handled an
+upload and whether the shared result cache answered it (migration 061).
 """
 
 from __future__ import annotations
@@ -39,6 +46,7 @@ class DocumentStore:
         size_bytes: int,
         storage_path: str,
         created_by: Optional[str] = None,
+        content_sha256: Optional[str] = None,
     ) -> Optional[str]:
         """Record a file upload in the database.
 
@@ -49,6 +57,7 @@ class DocumentStore:
             size_bytes: File size in bytes.
             storage_path: Path where file is stored.
             created_by: User UUID who uploaded.
+            content_sha256: SHA-256 of the file bytes, if already known.
 
         Returns:
             The file upload UUID, or None on error.
@@ -69,8 +78,8 @@ class DocumentStore:
                 sa_text(
                     "INSERT INTO file_uploads "
                     "(tenant_id, filename, mime_type, size_bytes, "
-                    "storage_path, status, created_by) "
-                    "VALUES (:tid, :fn, :mt, :sz, :sp, 'pending', :cb) "
+                    "storage_path, status, created_by, content_sha256) "
+                    "VALUES (:tid, :fn, :mt, :sz, :sp, 'pending', :cb, :sha) "
                     "RETURNING id"
                 ),
                 {
@@ -80,10 +89,11 @@ class DocumentStore:
                     "sz": size_bytes,
                     "sp": storage_path,
                     "cb": created_by,
+                    "sha": content_sha256,
                 },
             )
-            db.session.commit()
             row = result.fetchone()
+            db.session.commit()
             return str(row[0]) if row else None
         except Exception:
             logger.exception("Failed to save upload metadata")
@@ -173,14 +183,237 @@ class DocumentStore:
                     "mu": model_used,
                 },
             )
-            db.session.commit()
             row = result.fetchone()
+            db.session.commit()
             return str(row[0]) if row else None
         except Exception:
             logger.exception("Failed to save extracted content")
             db.session.rollback()
             return None
 
+    def record_processing(
+        self,
+        file_id: str,
+        tenant_id: str,
+        processor: str,
+        processor_version: str,
+        cache_hit: bool,
+        content_sha256: Optional[str] = None,
+    ) -> bool:
+        """Record how an upload was processed.
+
+        Args:
+            file_id: File upload UUID.
+            tenant_id: Tenant UUID (for isolation).
+            processor: Processor name (pdf, image, excel, word, video).
+            processor_version: The processor's PROCESSOR_VERSION.
+            cache_hit: Whether the result came from the result cache.
+            content_sha256: SHA-256 of the file bytes, if computed.
+
+        Returns:
+            True if updated.
+        """
+        try:
+            from sqlalchemy import text as sa_text
+
+            db.session.execute(
+                sa_text(
+                    "UPDATE file_uploads SET processor = :p, "
+                    "processor_version = :v, cache_hit = :hit, "
+                    "processed_at = CURRENT_TIMESTAMP, "
+                    "content_sha256 = COALESCE(:sha, content_sha256) "
+                    "WHERE id = :fid AND tenant_id = :tid"
+                ),
+                {
+                    "p": processor,
+                    "v": processor_version,
+                    "hit": cache_hit,
+                    "sha": content_sha256,
+                    "fid": file_id,
+                    "tid": tenant_id,
+                },
+            )
+            db.session.commit()
+            return True
+        except Exception:
+            logger.exception("Failed to record processing metadata")
+            db.session.rollback()
+            return False
+
+    def find_processed_duplicate(
+        self, tenant_id: str, content_sha256: str, exclude_file_id: str
+    ) -> Optional[str]:
+        """Find a finished upload of the tenant with the same content hash.
+
+        Args:
+            tenant_id: Tenant UUID (duplicates are never shared across
+                tenants).
+            content_sha256: SHA-256 of the file bytes.
+            exclude_file_id: The upload being processed.
+
+        Returns:
+            File upload UUID with status ``done``, or None.
+        """
+        try:
+            from sqlalchemy import text as sa_text
+
+            row = db.session.execute(
+                sa_text(
+                    "SELECT id FROM file_uploads "
+                    "WHERE tenant_id = :tid AND content_sha256 = :sha "
+                    "AND status = 'done' AND id != :fid "
+                    "ORDER BY created_at DESC LIMIT 1"
+                ),
+                {"tid": tenant_id, "sha": content_sha256, "fid": exclude_file_id},
+            ).fetchone()
+            return str(row[0]) if row else None
+        except Exception:
+            logger.exception("Failed to look up duplicate upload")
+            db.session.rollback()
+            return None
+
+    def copy_extracted_content(self, source_file_id: str, file_id: str) -> int:
+        """Copy every extracted_content row of one upload to another.
+
+        Returns:
+            Number of rows copied (0 on error).
+        """
+        try:
+            from sqlalchemy import text as sa_text
+
+            result = db.session.execute(
+                sa_text(
+                    "INSERT INTO extracted_content "
+                    "(file_id, content_type, content_text, content_summary, "
+                    "page_number, token_count, model_used) "
+                    "SELECT :fid, content_type, content_text, content_summary, "
+                    "page_number, token_count, model_used "
+                    "FROM extracted_content WHERE file_id = :src"
+                ),
+                {"fid": file_id, "src": source_file_id},
+            )
+            db.session.commit()
+            return result.rowcount or 0
+        except Exception:
+            logger.exception("Failed to copy extracted content")
+            db.session.rollback()
+            return 0
+
+    def extract_pdf(
+        self,
+        file_id: str,
+        tenant_id: str,
+        file_path: str,
+        workers: Optional[int] = None,
+    ) -> dict:
+        """Extract a stored PDF into extracted_content, page by page.
+
+        Pages are saved as their range finishes (``content_type`` ``text``
+        and ``table``), so partial content is readable while a long deck
+        is still processing. A finished upload of the same tenant with the
+        same SHA-256 is reused instead, including its vision descriptions
+        and summary.
+
+        Args:
+            file_id: File upload UUID.
+            tenant_id: Tenant UUID.
+            file_path: Path of the stored PDF.
+            workers: Extraction worker processes (see pdf_processor).
+
+        Returns:
+            Dict with ``page_count``, ``vision_pages`` (1-based page
+            numbers still needing a vision pass), ``reused_from`` (source
+            file UUID or None) and ``errors``.
+        """
+        from sqlalchemy import text as sa_text
+
+        from .pdf_processor import (
+            PROCESSOR_VERSION,
+            _table_to_markdown,
+            extract_text_from_pdf,
+        )
+        from .result_cache import file_sha256
+
+        sha = file_sha256(file_path)
+        db.session.execute(
+            sa_text(
+                "UPDATE file_uploads SET content_sha256 = :sha "
+                "WHERE id = :fid AND tenant_id = :tid"
+            ),
+            {"sha": sha, "fid": file_id, "tid": tenant_id},
+        )
+        db.session.commit()
+
+        source_id = self.find_processed_duplicate(tenant_id, sha, file_id)
+        if source_id and self.copy_extracted_content(source_id, file_id):
+            source = self.get_upload_info(source_id, tenant_id) or {}
+            self.update_status(
+                file_id, "done", tenant_id, page_count=source.get("page_count")
+            )
+            self.record_processing(file_id, tenant_id, "pdf", PROCESSOR_VERSION, True)
+            return {
+                "page_count": source.get("page_count"),
+                "vision_pages": self._pending_vision_pages(file_id),
+                "reused_from": source_id,
+                "errors": [],
+            }
+
+        self.update_status(file_id, "processing", tenant_id)
+
+        def _save_page(page):
+            if page.text.strip():
+                self.save_extracted_content(
+                    file_id, "text", page.text, page_number=page.page_number
+                )
+            for table in page.tables:
+                md_table = _table_to_markdown(table)
+                if md_table:
+                    self.save_extracted_content(
+                        file_id, "table", md_table, page_number=page.page_number
+                    )
+
+        result = extract_text_from_pdf(file_path, workers=workers, on_page=_save_page)
+        status = "failed" if result.errors and not result.pages else "done"
+        self.update_status(file_id, status, tenant_id, page_count=result.total_pages)
+        self.record_processing(
+            file_id, tenant_id, "pdf", PROCESSOR_VERSION, result.cached
+        )
+        return {
+            "page_count": result.total_pages,
+            "vision_pages": [p.page_number for p in result.pages if p.needs_vision],
+            "reused_from": None,
+            "errors": result.errors,
+        }
+
+    def _pending_vision_pages(self, file_id: str) -> list[int]:
+        """Pages of a copied extraction that are sparse and not yet described."""
+        from sqlalchemy import text as sa_text
+
+        from .pdf_processor import MAX_PAGES, SPARSE_TEXT_THRESHOLD
+
+        rows = db.session.execute(
+            sa_text(
+                "SELECT fu.page_count, ec.page_number, ec.content_type, "
+                "LENGTH(TRIM(ec.content_text)) "
+                "FROM file_uploads fu "
+                "LEFT JOIN extracted_content ec ON ec.file_id = fu.id "
+                "WHERE fu.id = :fid"
+            ),
+            {"fid": file_id},
+        ).fetchall()
+        if not rows or not rows[0][0]:
+            return []
+        covered = set()
+        for _, page_number, content_type, length in rows:
+            if page_number is None:
+                continue
+            if content_type == "image_desc" or (
+                content_type == "text" and (length or 0) >= SPARSE_TEXT_THRESHOLD
+            ):
+                covered.add(page_number)
+        last_page = min(rows[0][0], MAX_PAGES)
+        return [n for n in range(1, last_page + 1) if n not in covered]
+
     def get_file_summary(self, file_id: str, tenant_id: str) -> Optional[str]:
         """Get the cached summary for a file.
 
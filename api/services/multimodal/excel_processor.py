@@ -5,19 +5,40 @@ Supports three extraction strategies:
   1. Full table (small sheets <50 rows) -> markdown table
   2. Summary (large sheets >=50 rows) -> stats + sample rows
   3. Schema-based extraction -> structured JSON rows
+
+Sheets are read as row streams (openpyxl read-only mode, ``csv.reader``
+over the file) and summarized in one pass into a ``SheetSketch``: the
+first ``SMALL_SHEET_THRESHOLD`` rows, the last ``SAMPLE_TAIL_ROWS`` rows
+and per-column statistics (types, null rate, numeric min/max/avg, a
+bounded distinct-count estimate). Markdown tables and summaries are built
+from the sketch, so memory does not grow with the sheet size. The
+``SheetData`` readers remain for callers that want every row.
+
+Markdown extraction results are cached by content hash (``result_cache``).
 """
 
 from __future__ import annotations
 
+import codecs
 import csv
+import hashlib
+import heapq
 import io
 import logging
 import math
-from dataclasses import dataclass, field
-from typing import Optional
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, time
+from typing import Optional, Union
+
+from . import result_cache
 
 logger = logging.getLogger(__name__)
 
+# Bump when extraction output changes (invalidates cached results)
+PROCESSOR_VERSION = "2"
+
 # Row threshold: sheets with fewer rows get full markdown tables
 SMALL_SHEET_THRESHOLD = 50
 
@@ -28,6 +49,11 @@ MAX_OUTPUT_CHARS = 8000
 SAMPLE_HEAD_ROWS = 5
 SAMPLE_TAIL_ROWS = 3
 
+# Distinct values counted exactly per column before switching to a
+# k-minimum-values estimate with DISTINCT_SKETCH_K hashes
+DISTINCT_EXACT_LIMIT = 1000
+DISTINCT_SKETCH_K = 256
+
 
 @dataclass
 class SheetInfo:
@@ -50,6 +76,119 @@ class SheetData:
     col_count: int = 0
 
 
+@dataclass
+class ColumnSketch:
+    """One-pass statistics for a column, in bounded memory."""
+
+    name: str
+    count: int = 0
+    nulls: int = 0
+    types: dict[str, int] = field(default_factory=dict)
+    numeric_count: int = 0
+    # Cells holding the smallest / largest number, as read
+    numeric_min: object = None
+    numeric_max: object = None
+    numeric_sum: float = 0.0
+    _low: float = field(default=math.inf, repr=False)
+    _high: float = field(default=-math.inf, repr=False)
+    _exact: Optional[set] = field(default_factory=set, repr=False)
+    _kmv: list[int] = field(default_factory=list, repr=False)
+    _kmv_members: set = field(default_factory=set, repr=False)
+
+    def add(self, value) -> None:
+        self.count += 1
+        if value is None or value == "":
+            self.nulls += 1
+            return
+        kind, number = _classify(value)
+        self.types[kind] = self.types.get(kind, 0) + 1
+        if number is not None:
+            self.numeric_count += 1
+            self.numeric_sum += number
+            if number < self._low:
+                self._low, self.numeric_min = number, value
+            if number > self._high:
+                self._high, self.numeric_max = number, value
+        self._add_distinct(str(value))
+
+    def _add_distinct(self, key: str) -> None:
+        if self._exact is not None:
+            self._exact.add(key)
+            if len(self._exact) <= DISTINCT_EXACT_LIMIT:
+                return
+            keys, self._exact = self._exact, None
+            for k in keys:
+                self._kmv_add(_hash64(k))
+            return
+        self._kmv_add(_hash64(key))
+
+    def _kmv_add(self, h: int) -> None:
+        # Keep the K smallest hashes (max-heap of negated values)
+        if h in self._kmv_members:
+            return
+        if len(self._kmv) < DISTINCT_SKETCH_K:
+            heapq.heappush(self._kmv, -h)
+            self._kmv_members.add(h)
+        elif h < -self._kmv[0]:
+            evicted = -heapq.heapreplace(self._kmv, -h)
+            self._kmv_members.discard(evicted)
+            self._kmv_members.add(h)
+
+    @property
+    def distinct_exact(self) -> bool:
+        return self._exact is not None
+
+    @property
+    def distinct(self) -> int:
+        """Distinct non-null values (estimated past DISTINCT_EXACT_LIMIT)."""
+        if self._exact is not None:
+            return len(self._exact)
+        kth = -self._kmv[0]
+        return int((DISTINCT_SKETCH_K - 1) * float(1 << 64) / max(kth, 1))
+
+    @property
+    def null_rate(self) -> float:
+        return self.nulls / self.count if self.count else 0.0
+
+    @property
+    def dominant_type(self) -> str:
+        if not self.types:
+            return "empty"
+        ranked = sorted(self.types.items(), key=lambda kv: -kv[1])
+        kind, n = ranked[0]
+        if n < 0.9 * sum(self.types.values()):
+            return "mixed ({})".format("/".join(k for k, _ in ranked))
+        return kind
+
+
+@dataclass
+class SheetSketch:
+    """Bounded one-pass summary of a worksheet.
+
+    ``rows`` holds the first ``SMALL_SHEET_THRESHOLD`` data rows (all of
+    them for a small sheet), ``tail`` the last ``SAMPLE_TAIL_ROWS``.
+    """
+
+    name: str
+    headers: list[str] = field(default_factory=list)
+    columns: list[ColumnSketch] = field(default_factory=list)
+    rows: list[list] = field(default_factory=list)
+    tail: deque = field(default_factory=lambda: deque(maxlen=SAMPLE_TAIL_ROWS))
+    row_count: int = 0
+    col_count: int = 0
+
+    def add_row(self, row: list) -> None:
+        self.row_count += 1
+        for i, column in enumerate(self.columns):
+            column.add(row[i] if i < len(row) else None)
+        if len(self.rows) < SMALL_SHEET_THRESHOLD:
+            self.rows.append(row)
+        self.tail.append(row)
+
+
+Sheet = Union[SheetData, SheetSketch]
+
+
 @dataclass
 class ExcelExtractionResult:
     """Complete extraction result for a spreadsheet file."""
@@ -58,6 +197,7 @@ class ExcelExtractionResult:
     markdown: str = ""
     truncated: bool = False
     errors: list[str] = field(default_factory=list)
+    cached: bool = False
 
 
 @dataclass
@@ -115,40 +255,93 @@ def discover_sheets(file_path: str) -> list[SheetInfo]:
         return []
 
 
-def _read_sheet_data(file_path: str, sheet_name: Optional[str] = None) -> SheetData:
-    """Read all data from a single worksheet.
+def iter_sheet_rows(file_path: str, sheet_name: Optional[str] = None) -> Iterator[list]:
+    """Stream the rows (header first) of one worksheet.
+
+    Uses openpyxl read-only mode; the workbook is closed when the iterator
+    is exhausted or discarded.
 
     Args:
         file_path: Path to the .xlsx file.
         sheet_name: Sheet to read (default: active sheet).
-
-    Returns:
-        SheetData with headers and rows.
     """
     import openpyxl
 
     wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-    ws = wb[sheet_name] if sheet_name else wb.active
-
-    all_rows = []
-    for row in ws.iter_rows(values_only=True):
-        all_rows.append([_clean_cell(c) for c in row])
-
-    wb.close()
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.active
+        for row in ws.iter_rows(values_only=True):
+            yield list(row)
+    finally:
+        wb.close()
 
-    if not all_rows:
-        return SheetData(name=sheet_name or "Sheet1")
 
-    headers = [str(c) if c else "col_{}".format(i) for i, c in enumerate(all_rows[0])]
-    data_rows = all_rows[1:]
+def iter_csv_rows(file_path: str) -> Iterator[list]:
+    """Stream the rows (header first) of a CSV file.
 
-    return SheetData(
-        name=sheet_name or (ws.title if ws.title else "Sheet1"),
+    The file is decoded as UTF-8 (BOM-aware), or Latin-1 if it is not
+    valid UTF-8.
+    """
+    encoding = _detect_csv_encoding(file_path)
+    with open(file_path, "r", newline="", encoding=encoding) as f:
+        yield from csv.reader(f)
+
+
+def sketch_rows(name: str, rows) -> SheetSketch:
+    """Summarize a row stream (header first) into a SheetSketch."""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return SheetSketch(name=name)
+    headers = _header_names(first)
+    sketch = SheetSketch(
+        name=name,
         headers=headers,
-        rows=data_rows,
-        row_count=len(data_rows),
+        columns=[ColumnSketch(h) for h in headers],
         col_count=len(headers),
     )
+    for row in rows:
+        sketch.add_row([_clean_cell(c) for c in row])
+    return sketch
+
+
+def sketch_sheet(file_path: str, sheet_name: Optional[str] = None) -> SheetSketch:
+    """Sketch one worksheet of an Excel file in a single streaming pass."""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.active
+        return sketch_rows(
+            sheet_name or ws.title or "Sheet1", ws.iter_rows(values_only=True)
+        )
+    finally:
+        wb.close()
+
+
+def sketch_csv(file_path: str) -> SheetSketch:
+    """Sketch a CSV file in a single streaming pass."""
+    return sketch_rows("CSV", iter_csv_rows(file_path))
+
+
+def _read_sheet_data(file_path: str, sheet_name: Optional[str] = None) -> SheetData:
+    """Read all data from a single worksheet.
+
+    Args:
+        file_path: Path to the .xlsx file.
+        sheet_name: Sheet to read (default: active sheet).
+
+    Returns:
+        SheetData with headers and rows.
+    """
+    name = sheet_name
+    if name is None:
+        import openpyxl
+
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        name = wb.active.title or "Sheet1"
+        wb.close()
+    return _sheet_data(name, iter_sheet_rows(file_path, name))
 
 
 def read_csv_data(file_path: str) -> SheetData:
@@ -160,12 +353,7 @@ def read_csv_data(file_path: str) -> SheetData:
     Returns:
         SheetData with headers and rows.
     """
-    try:
-        with open(file_path, "r", newline="", encoding="utf-8-sig") as f:
-            return read_csv_from_text(f.read())
-    except UnicodeDecodeError:
-        with open(file_path, "r", newline="", encoding="latin-1") as f:
-            return read_csv_from_text(f.read())
+    return _sheet_data("CSV", iter_csv_rows(file_path))
 
 
 def read_csv_from_text(text: str) -> SheetData:
@@ -177,26 +365,7 @@ def read_csv_from_text(text: str) -> SheetData:
     Returns:
         SheetData with headers and rows.
     """
-    reader = csv.reader(io.StringIO(text))
-    all_rows = list(reader)
-
-    if not all_rows:
-        return SheetData(name="CSV")
-
-    headers = [
-        str(c).strip() if c else "col_{}".format(i) for i, c in enumerate(all_rows[0])
-    ]
-    data_rows = []
-    for row in all_rows[1:]:
-        data_rows.append([_clean_cell(c) for c in row])
-
-    return SheetData(
-        name="CSV",
-        headers=headers,
-        rows=data_rows,
-        row_count=len(data_rows),
-        col_count=len(headers),
-    )
+    return _sheet_data("CSV", csv.reader(io.StringIO(text)))
 
 
 def read_csv_from_bytes(data: bytes) -> SheetData:
@@ -208,11 +377,7 @@ def read_csv_from_bytes(data: bytes) -> SheetData:
     Returns:
         SheetData with headers and rows.
     """
-    try:
-        text = data.decode("utf-8-sig")
-    except UnicodeDecodeError:
-        text = data.decode("latin-1")
-    return read_csv_from_text(text)
+    return read_csv_from_text(_decode_csv_bytes(data))
 
 
 def extract_from_file(
@@ -233,10 +398,24 @@ def extract_from_file(
     """
     is_csv = file_path.lower().endswith(".csv")
 
+    try:
+        content_hash = result_cache.file_sha256(file_path)
+    except OSError:
+        content_hash = None
+    options = {"csv": is_csv, "sheet_name": sheet_name}
+    if content_hash:
+        cached = _load_cached(content_hash, options)
+        if cached:
+            return cached
+
     if is_csv:
-        return _extract_csv(file_path)
+        result = _extract_csv(file_path)
+    else:
+        result = _extract_excel(file_path, sheet_name)
 
-    return _extract_excel(file_path, sheet_name)
+    if content_hash:
+        _save_cached(content_hash, options, result)
+    return result
 
 
 def extract_from_bytes(
@@ -259,9 +438,17 @@ def extract_from_bytes(
 
     is_csv = filename.lower().endswith(".csv")
 
+    content_hash = result_cache.content_sha256(data)
+    options = {"csv": is_csv, "sheet_name": sheet_name}
+    cached = _load_cached(content_hash, options)
+    if cached:
+        return cached
+
     if is_csv:
-        sheet_data = read_csv_from_bytes(data)
-        return _build_result_from_sheet(sheet_data)
+        sketch = sketch_rows("CSV", csv.reader(io.StringIO(_decode_csv_bytes(data))))
+        result = _build_result_from_sheet(sketch)
+        _save_cached(content_hash, options, result)
+        return result
 
     # Write to temp file for openpyxl (requires seekable file)
     suffix = ".xlsx"
@@ -277,6 +464,7 @@ def extract_from_bytes(
         except OSError:
             pass
 
+    _save_cached(content_hash, options, result)
     return result
 
 
@@ -302,56 +490,66 @@ def extract_data_with_schema(
     """
     is_csv = file_path.lower().endswith(".csv")
 
+    if is_csv:
+        rows = iter_csv_rows(file_path)
+    else:
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            return SchemaExtractionResult(
+                error="openpyxl not installed -- run: pip install openpyxl"
+            )
+        rows = iter_sheet_rows(file_path, sheet_name)
+
     try:
-        if is_csv:
-            sheet_data = read_csv_data(file_path)
-        else:
-            try:
-                import openpyxl  # noqa: F401
-            except ImportError:
-                return SchemaExtractionResult(
-                    error="openpyxl not installed -- run: pip install openpyxl"
-                )
-            sheet_data = _read_sheet_data(file_path, sheet_name)
+        first = next(rows, None)
     except Exception as exc:
         return SchemaExtractionResult(error="Failed to read file: {}".format(str(exc)))
 
-    if not sheet_data.headers:
+    headers = _header_names(first) if first is not None else []
+    if not headers:
         return SchemaExtractionResult(error="No headers found in spreadsheet")
 
     # Build column mapping
     fields = [SchemaField(**f) if isinstance(f, dict) else f for f in schema_fields]
-    col_map = _build_column_mapping(fields, sheet_data.headers)
+    col_map = _build_column_mapping(fields, headers)
 
     # Track unmapped source columns
     mapped_headers = set(col_map.values())
-    unmapped = [h for h in sheet_data.headers if h not in mapped_headers and h.strip()]
+    unmapped = [h for h in headers if h not in mapped_headers and h.strip()]
 
     result = SchemaExtractionResult(unmapped_columns=unmapped)
+    col_indexes = {
+        f.name: headers.index(col_map[f.name])
+        for f in fields
+        if col_map.get(f.name) is not None
+    }
 
-    for row_idx, row in enumerate(sheet_data.rows):
-        record = {}
-        for f in fields:
-            source_col = col_map.get(f.name)
-            if source_col is None:
-                result.warnings.append(
-                    "Row {}: no source column mapped for field '{}'".format(
-                        row_idx + 1, f.name
+    try:
+        for row_idx, raw_row in enumerate(rows):
+            row = [_clean_cell(c) for c in raw_row]
+            record = {}
+            for f in fields:
+                col_idx = col_indexes.get(f.name)
+                if col_idx is None:
+                    result.warnings.append(
+                        "Row {}: no source column mapped for field '{}'".format(
+                            row_idx + 1, f.name
+                        )
                     )
-                )
-                record[f.name] = None
-                continue
-
-            col_idx = sheet_data.headers.index(source_col)
-            if col_idx < len(row):
-                raw_value = row[col_idx]
-                record[f.name] = _coerce_value(
-                    raw_value, f.type, f.name, row_idx + 1, result
-                )
-            else:
-                record[f.name] = None
+                    record[f.name] = None
+                    continue
 
-        result.rows.append(record)
+                if col_idx < len(row):
+                    record[f.name] = _coerce_value(
+                        row[col_idx], f.type, f.name, row_idx + 1, result
+                    )
+                else:
+                    record[f.name] = None
+
+            result.rows.append(record)
+    except Exception as exc:
+        return SchemaExtractionResult(error="Failed to read file: {}".format(str(exc)))
 
     # Deduplicate warnings
     result.warnings = list(dict.fromkeys(result.warnings))
@@ -359,8 +557,8 @@ def extract_data_with_schema(
     return result
 
 
-def sheet_to_markdown(sheet_data: SheetData) -> str:
-    """Convert a SheetData to a full markdown table.
+def sheet_to_markdown(sheet_data: Sheet) -> str:
+    """Convert a SheetData (or a small sheet's SheetSketch) to a markdown table.
 
     Args:
         sheet_data: Sheet data with headers and rows.
@@ -368,81 +566,63 @@ def sheet_to_markdown(sheet_data: SheetData) -> str:
     Returns:
         Markdown table string.
     """
-    if not sheet_data.headers:
-        return ""
-
-    lines = []
-    lines.append("| " + " | ".join(str(h) for h in sheet_data.headers) + " |")
-    lines.append("| " + " | ".join("---" for _ in sheet_data.headers) + " |")
-
-    for row in sheet_data.rows:
-        padded = list(row) + [""] * (len(sheet_data.headers) - len(row))
-        cells = [
-            str(c) if c is not None else "" for c in padded[: len(sheet_data.headers)]
-        ]
-        lines.append("| " + " | ".join(cells) + " |")
-
-    return "\n".join(lines)
+    return _rows_to_markdown(sheet_data.headers, sheet_data.rows)
 
 
-def sheet_to_summary(sheet_data: SheetData) -> str:
-    """Convert a large SheetData to a summary with stats.
+def sheet_to_summary(sheet_data: Sheet) -> str:
+    """Convert a large sheet to a summary with stats.
 
-    Includes: column headers, row count, sample rows (head + tail),
-    and basic stats (min/max/avg) on numeric columns.
+    Includes: column headers, row count, sample rows (head + tail), a
+    per-column profile (type, null rate, distinct values) and basic stats
+    (min/max/avg) on numeric columns, all taken from the sheet's sketch.
 
     Args:
-        sheet_data: Sheet data with headers and rows.
+        sheet_data: SheetSketch, or SheetData (sketched first).
 
     Returns:
         Markdown summary string.
     """
-    if not sheet_data.headers:
+    sketch = _as_sketch(sheet_data)
+    if not sketch.headers:
         return ""
 
     parts = []
-    parts.append("**Sheet**: {}".format(sheet_data.name))
+    parts.append("**Sheet**: {}".format(sketch.name))
     parts.append(
         "**Dimensions**: {} rows x {} columns".format(
-            sheet_data.row_count, sheet_data.col_count
+            sketch.row_count, sketch.col_count
         )
     )
-    parts.append("**Columns**: {}".format(", ".join(sheet_data.headers)))
+    parts.append("**Columns**: {}".format(", ".join(sketch.headers)))
 
     # Sample rows (head)
+    head_rows = sketch.rows[:SAMPLE_HEAD_ROWS]
     parts.append("")
-    parts.append(
-        "**Sample rows (first {}):**".format(
-            min(SAMPLE_HEAD_ROWS, sheet_data.row_count)
-        )
-    )
-
-    head_rows = sheet_data.rows[:SAMPLE_HEAD_ROWS]
-    sample_data = SheetData(
-        name=sheet_data.name,
-        headers=sheet_data.headers,
-        rows=head_rows,
-        row_count=len(head_rows),
-        col_count=sheet_data.col_count,
-    )
-    parts.append(sheet_to_markdown(sample_data))
+    parts.append("**Sample rows (first {}):**".format(len(head_rows)))
+    parts.append(_rows_to_markdown(sketch.headers, head_rows))
 
     # Tail rows if enough data
-    if sheet_data.row_count > SAMPLE_HEAD_ROWS + SAMPLE_TAIL_ROWS:
-        tail_rows = sheet_data.rows[-SAMPLE_TAIL_ROWS:]
+    if sketch.row_count > SAMPLE_HEAD_ROWS + SAMPLE_TAIL_ROWS:
         parts.append("")
         parts.append("**Last {} rows:**".format(SAMPLE_TAIL_ROWS))
-        tail_data = SheetData(
-            name=sheet_data.name,
-            headers=sheet_data.headers,
-            rows=tail_rows,
-            row_count=len(tail_rows),
-            col_count=sheet_data.col_count,
+        parts.append(_rows_to_markdown(sketch.headers, list(sketch.tail)))
+
+    # Column profile
+    parts.append("")
+    parts.append("**Column profile:**")
+    for column in sketch.columns:
+        parts.append(
+            "- **{}**: {}, {:.0%} null, {}{} distinct".format(
+                column.name,
+                column.dominant_type,
+                column.null_rate,
+                "" if column.distinct_exact else "~",
+                column.distinct,
+            )
         )
-        parts.append(sheet_to_markdown(tail_data))
 
     # Numeric column stats
-    stats = _compute_numeric_stats(sheet_data)
+    stats = _compute_numeric_stats(sketch)
     if stats:
         parts.append("")
         parts.append("**Numeric column statistics:**")
@@ -474,11 +654,125 @@ def _clean_cell(value):
     return value
 
 
+def _classify(value) -> tuple[str, Optional[float]]:
+    """Type label of a non-null cell and its numeric value, if any."""
+    if isinstance(value, bool):
+        return "boolean", None
+    if isinstance(value, (int, float)):
+        return "number", value if math.isfinite(value) else None
+    if isinstance(value, (datetime, date, time)):
+        return "date", None
+    if isinstance(value, str):
+        try:
+            number = float(value.replace(",", ""))
+        except ValueError:
+            return "text", None
+        return "number", number if math.isfinite(number) else None
+    return "text", None
+
+
+def _hash64(key: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def _header_names(row: list) -> list[str]:
+    headers = []
+    for i, c in enumerate(row):
+        value = _clean_cell(c)
+        headers.append(str(value) if value else "col_{}".format(i))
+    return headers
+
+
+def _sheet_data(name: str, rows) -> SheetData:
+    """Materialize a row stream (header first) into a SheetData."""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return SheetData(name=name)
+    headers = _header_names(first)
+    data_rows = [[_clean_cell(c) for c in row] for row in rows]
+    return SheetData(
+        name=name,
+        headers=headers,
+        rows=data_rows,
+        row_count=len(data_rows),
+        col_count=len(headers),
+    )
+
+
+def _as_sketch(sheet: Sheet) -> SheetSketch:
+    if isinstance(sheet, SheetSketch):
+        return sheet
+    sketch = SheetSketch(
+        name=sheet.name,
+        headers=list(sheet.headers),
+        columns=[ColumnSketch(h) for h in sheet.headers],
+        col_count=sheet.col_count,
+    )
+    for row in sheet.rows:
+        sketch.add_row(row)
+    return sketch
+
+
+def _rows_to_markdown(headers: list[str], rows) -> str:
+    if not headers:
+        return ""
+
+    lines = []
+    lines.append("| " + " | ".join(str(h) for h in headers) + " |")
+    lines.append("| " + " | ".join("---" for _ in headers) + " |")
+
+    for row in rows:
+        padded = list(row) + [""] * (len(headers) - len(row))
+        cells = [str(c) if c is not None else "" for c in padded[: len(headers)]]
+        lines.append("| " + " | ".join(cells) + " |")
+
+    return "\n".join(lines)
+
+
+def _detect_csv_encoding(file_path: str) -> str:
+    """``utf-8-sig`` if the file decodes as UTF-8, else ``latin-1``."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    try:
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "utf-8-sig"
+
+
+def _decode_csv_bytes(data: bytes) -> str:
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+def _load_cached(content_hash: str, options: dict) -> Optional[ExcelExtractionResult]:
+    data = result_cache.load("excel", PROCESSOR_VERSION, content_hash, options)
+    if not data:
+        return None
+    data["sheets"] = [SheetInfo(**s) for s in data.get("sheets", [])]
+    data["cached"] = True
+    return ExcelExtractionResult(**data)
+
+
+def _save_cached(
+    content_hash: str, options: dict, result: ExcelExtractionResult
+) -> None:
+    if result.errors:
+        return
+    result_cache.save("excel", PROCESSOR_VERSION, content_hash, asdict(result), options)
+
+
 def _extract_csv(file_path: str) -> ExcelExtractionResult:
     """Extract from a CSV file."""
     try:
-        sheet_data = read_csv_data(file_path)
-        return _build_result_from_sheet(sheet_data)
+        return _build_result_from_sheet(sketch_csv(file_path))
     except Exception as exc:
         logger.exception("CSV extraction failed: %s", file_path)
         return ExcelExtractionResult(
@@ -491,7 +785,7 @@ def _extract_excel(
 ) -> ExcelExtractionResult:
     """Extract from an Excel file."""
     try:
-        import openpyxl  # noqa: F401
+        import openpyxl
     except ImportError:
         return ExcelExtractionResult(
             errors=["openpyxl not installed -- run: pip install openpyxl"]
@@ -521,17 +815,25 @@ def _extract_excel(
             [s for s in sheets if s.name == sheet_name] if sheet_name else sheets
         )
 
-        for sheet_info in sheets_to_process:
-            sheet_data = _read_sheet_data(file_path, sheet_info.name)
-            parts.append("## {}".format(sheet_info.name))
-            parts.append("")
+        # One streaming pass per sheet over a single read-only workbook
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for sheet_info in sheets_to_process:
+                sketch = sketch_rows(
+                    sheet_info.name,
+                    wb[sheet_info.name].iter_rows(values_only=True),
+                )
+                parts.append("## {}".format(sheet_info.name))
+                parts.append("")
 
-            if sheet_data.row_count < SMALL_SHEET_THRESHOLD:
-                parts.append(sheet_to_markdown(sheet_data))
-            else:
-                parts.append(sheet_to_summary(sheet_data))
+                if sketch.row_count < SMALL_SHEET_THRESHOLD:
+                    parts.append(sheet_to_markdown(sketch))
+                else:
+                    parts.append(sheet_to_summary(sketch))
 
-            parts.append("")
+                parts.append("")
+        finally:
+            wb.close()
 
         markdown = "\n".join(parts)
 
@@ -550,8 +852,8 @@ def _extract_excel(
         )
 
 
-def _build_result_from_sheet(sheet_data: SheetData) -> ExcelExtractionResult:
-    """Build an ExcelExtractionResult from a single SheetData."""
+def _build_result_from_sheet(sheet_data: Sheet) -> ExcelExtractionResult:
+    """Build an ExcelExtractionResult from a single SheetData or SheetSketch."""
     sheets = [
         SheetInfo(
             name=sheet_data.name,
@@ -647,36 +949,20 @@ def _coerce_value(
     return str(raw) if raw is not None else None
 
 
-def _compute_numeric_stats(sheet_data: SheetData) -> dict:
+def _compute_numeric_stats(sheet_data: Sheet) -> dict:
     """Compute min/max/avg stats for numeric columns.
 
     Returns:
         Dict mapping column name to {min, max, avg, count}.
     """
     stats = {}
-    for col_idx, header in enumerate(sheet_data.headers):
-        values = []
-        for row in sheet_data.rows:
-            if col_idx < len(row):
-                v = row[col_idx]
-                if (
-                    isinstance(v, (int, float))
-                    and not isinstance(v, bool)
-                    and not math.isnan(v)
-                ):
-                    values.append(v)
-                elif isinstance(v, str):
-                    try:
-                        values.append(float(v.replace(",", "")))
-                    except (ValueError, TypeError):
-                        pass
-
-        if len(values) >= 3:  # Only report stats if enough numeric values
-            stats[header] = {
-                "min": min(values),
-                "max": max(values),
-                "avg": sum(values) / len(values),
-                "count": len(values),
+    for column in _as_sketch(sheet_data).columns:
+        if column.numeric_count >= 3:  # Only report stats if enough numeric values
+            stats[column.name] = {
+                "min": column.numeric_min,
+                "max": column.numeric_max,
+                "avg": column.numeric_sum / column.numeric_count,
+                "count": column.numeric_count,
             }
 
     return stats
@@ -1,7 +1,9 @@
 """HTML content extraction (BL-266).
 
 Uses trafilatura for boilerplate removal and main content extraction.
-Includes SSRF protection for URL fetching.
+Includes SSRF protection for URL fetching.  Extraction of a fetched page
+is cached by the hash of its HTML (``result_cache``), so an unchanged
+page is not re-parsed after the URL cache expires.
 """
 
 from __future__ import annotations
@@ -13,8 +15,13 @@ from dataclasses import dataclass
 from typing import Optional
 from urllib.parse import urlparse
 
+from . import result_cache
+
 logger = logging.getLogger(__name__)
 
+# Bump when extraction output changes (invalidates cached results)
+PROCESSOR_VERSION = "1"
+
 # Cache TTL in seconds (24 hours)
 CACHE_TTL = 86400
 
@@ -101,6 +108,18 @@ def fetch_and_extract(url: str, use_cache: bool = True) -> HTMLExtractionResult:
         if not downloaded:
             return HTMLExtractionResult(url=url, error="Failed to fetch URL")
 
+        content_hash = result_cache.content_sha256(
+            downloaded.encode("utf-8")
+            if isinstance(downloaded, str)
+            else bytes(downloaded)
+        )
+        extracted = result_cache.load("html", PROCESSOR_VERSION, content_hash)
+        if extracted:
+            result_data = dict(extracted, url=url)
+            if use_cache:
+                _set_cached(url, result_data)
+            return HTMLExtractionResult(cached=True, **result_data)
+
         content = trafilatura.extract(
             downloaded,
             include_comments=False,
@@ -135,6 +154,13 @@ def fetch_and_extract(url: str, use_cache: bool = True) -> HTMLExtractionResult:
         # Cache result
         if use_cache and content:
             _set_cached(url, result_data)
+        if content:
+            result_cache.save(
+                "html",
+                PROCESSOR_VERSION,
+                content_hash,
+                {k: v for k, v in result_data.items() if k != "url"},
+            )
 
         return HTMLExtractionResult(**result_data)
 
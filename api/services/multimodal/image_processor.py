@@ -1,7 +1,8 @@
 """Image processing for Claude vision API (BL-265).
 
 Handles image resizing, base64 encoding, and preparation for the
-Claude vision API.  Supports PNG, JPEG, WebP, and GIF.
+Claude vision API.  Supports PNG, JPEG, WebP, and GIF.  Prepared images
+are cached by content hash (``result_cache``).
 """
 
 from __future__ import annotations
@@ -9,9 +10,11 @@ from __future__ import annotations
 import base64
 import io
 import logging
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Optional
 
+from . import result_cache
+
 logger = logging.getLogger(__name__)
 
 # Claude vision max dimension
@@ -28,6 +31,9 @@ SUPPORTED_TYPES = {
 # Approximate tokens per image (Claude vision pricing)
 TOKENS_PER_IMAGE = 1600
 
+# Bump when prepare_image output changes (invalidates cached payloads)
+PROCESSOR_VERSION = "1"
+
 
 @dataclass
 class ImagePayload:
@@ -39,6 +45,7 @@ class ImagePayload:
     height: int
     original_size_bytes: int
     estimated_tokens: int = TOKENS_PER_IMAGE
+    cached: bool = False
 
 
 def prepare_image(
@@ -60,6 +67,13 @@ def prepare_image(
         logger.warning("Unsupported image type: %s", mime_type)
         return None
 
+    content_hash = result_cache.content_sha256(image_bytes)
+    options = {"mime_type": mime_type, "max_dimension": max_dimension}
+    cached = result_cache.load("image", PROCESSOR_VERSION, content_hash, options)
+    if cached:
+        cached["cached"] = True
+        return ImagePayload(**cached)
+
     try:
         from PIL import Image
     except ImportError:
@@ -82,13 +96,17 @@ def prepare_image(
         img.save(buf, format=output_format)
         encoded = base64.b64encode(buf.getvalue()).decode("utf-8")
 
-        return ImagePayload(
+        payload = ImagePayload(
             base64_data=encoded,
             media_type=mime_type,
             width=img.width,
             height=img.height,
             original_size_bytes=original_size,
         )
+        result_cache.save(
+            "image", PROCESSOR_VERSION, content_hash, asdict(payload), options
+        )
+        return payload
 
     except Exception as exc:
         logger.exception("Image processing failed: %s", exc)
@@ -2,14 +2,24 @@
 
 Uses pdfplumber for text-heavy PDFs.  Pages with sparse text
 (< 100 chars) are flagged for Claude vision API fallback.
+
+Large documents are split into page ranges extracted by a process pool
+(pdfplumber is CPU-bound); pages are handed to an ``on_page`` callback as
+their range completes, in page order, so callers can persist them before
+the whole document is done.  Results are cached by content hash
+(``result_cache``); a cache hit replays the pages through ``on_page``.
 """
 
 from __future__ import annotations
 
 import io
 import logging
-from dataclasses import dataclass, field
-from typing import Optional
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterator, Optional, Union
+
+from . import result_cache
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +29,23 @@ SPARSE_TEXT_THRESHOLD = 100
 # Maximum pages to process fully
 MAX_PAGES = 50
 
+# Pages per worker task
+PAGES_PER_CHUNK = 8
+
+# Documents with fewer pages are extracted in-process
+PARALLEL_MIN_PAGES = 16
+
+# Worker processes when neither ``workers`` nor PDF_EXTRACT_WORKERS is set
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# Bump when extraction output changes (invalidates cached results)
+PROCESSOR_VERSION = "1"
+
+# Executor used for page ranges (swappable for tests)
+_executor_factory = ProcessPoolExecutor
+
+PdfSource = Union[str, bytes]
+
 
 @dataclass
 class PageResult:
@@ -38,22 +65,29 @@ class PDFExtractionResult:
     total_pages: int = 0
     truncated: bool = False
     errors: list[str] = field(default_factory=list)
+    cached: bool = False
 
 
 def extract_text_from_pdf(
-    file_path: str, max_pages: int = MAX_PAGES
+    file_path: str,
+    max_pages: int = MAX_PAGES,
+    workers: Optional[int] = None,
+    on_page: Optional[Callable[[PageResult], None]] = None,
 ) -> PDFExtractionResult:
     """Extract text and tables from a PDF file.
 
     Args:
         file_path: Path to the PDF file.
         max_pages: Maximum number of pages to process.
+        workers: Worker processes (default PDF_EXTRACT_WORKERS or
+            ``DEFAULT_WORKERS``); 1 extracts in-process.
+        on_page: Called with each PageResult as soon as it is extracted.
 
     Returns:
         PDFExtractionResult with per-page text, tables, and vision flags.
     """
     try:
-        import pdfplumber
+        import pdfplumber  # noqa: F401
     except ImportError:
         return PDFExtractionResult(
             errors=["pdfplumber not installed — run: pip install pdfplumber"]
@@ -62,14 +96,7 @@ def extract_text_from_pdf(
     result = PDFExtractionResult()
 
     try:
-        with pdfplumber.open(file_path) as pdf:
-            result.total_pages = len(pdf.pages)
-            result.truncated = result.total_pages > max_pages
-
-            for i, page in enumerate(pdf.pages[:max_pages]):
-                page_result = _extract_page(page, i + 1)
-                result.pages.append(page_result)
-
+        _extract_into(result, file_path, max_pages, workers, on_page)
     except Exception as exc:
         logger.exception("PDF extraction failed: %s", file_path)
         result.errors.append("PDF extraction failed: {}".format(str(exc)))
@@ -78,33 +105,31 @@ def extract_text_from_pdf(
 
 
 def extract_text_from_bytes(
-    pdf_bytes: bytes, max_pages: int = MAX_PAGES
+    pdf_bytes: bytes,
+    max_pages: int = MAX_PAGES,
+    workers: Optional[int] = None,
+    on_page: Optional[Callable[[PageResult], None]] = None,
 ) -> PDFExtractionResult:
     """Extract text from PDF bytes (for in-memory processing).
 
     Args:
         pdf_bytes: Raw PDF file content.
         max_pages: Maximum pages to process.
+        workers: Worker processes; see ``extract_text_from_pdf``.
+        on_page: Called with each PageResult as soon as it is extracted.
 
     Returns:
         PDFExtractionResult.
     """
     try:
-        import pdfplumber
+        import pdfplumber  # noqa: F401
     except ImportError:
         return PDFExtractionResult(errors=["pdfplumber not installed"])
 
     result = PDFExtractionResult()
 
     try:
-        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-            result.total_pages = len(pdf.pages)
-            result.truncated = result.total_pages > max_pages
-
-            for i, page in enumerate(pdf.pages[:max_pages]):
-                page_result = _extract_page(page, i + 1)
-                result.pages.append(page_result)
-
+        _extract_into(result, pdf_bytes, max_pages, workers, on_page)
     except Exception as exc:
         logger.exception("PDF bytes extraction failed")
         result.errors.append("PDF extraction failed: {}".format(str(exc)))
@@ -152,6 +177,123 @@ def get_vision_pages(result: PDFExtractionResult) -> list[int]:
     return [p.page_number for p in result.pages if p.needs_vision]
 
 
+def _resolve_workers(workers: Optional[int]) -> int:
+    if workers is None:
+        try:
+            workers = int(os.environ.get("PDF_EXTRACT_WORKERS", DEFAULT_WORKERS))
+        except ValueError:
+            workers = DEFAULT_WORKERS
+    return max(1, workers)
+
+
+def _open(source: PdfSource):
+    import pdfplumber
+
+    if isinstance(source, (bytes, bytearray)):
+        return pdfplumber.open(io.BytesIO(source))
+    return pdfplumber.open(source)
+
+
+def _page_count(source: PdfSource) -> int:
+    with _open(source) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_range(source: PdfSource, start: int, end: int) -> list[PageResult]:
+    """Extract pages ``[start, end)`` (0-based); runs in a worker process."""
+    pages = []
+    with _open(source) as pdf:
+        for i in range(start, end):
+            page = pdf.pages[i]
+            pages.append(_extract_page(page, i + 1))
+            # Drop pdfplumber's per-page object cache as we go
+            close = getattr(page, "close", None)
+            if close:
+                close()
+    return pages
+
+
+def _iter_pages(source: PdfSource, count: int, workers: int) -> Iterator[PageResult]:
+    """Yield the first ``count`` pages in order, extracting ranges in parallel."""
+    ranges = [
+        (start, min(start + PAGES_PER_CHUNK, count))
+        for start in range(0, count, PAGES_PER_CHUNK)
+    ]
+    if workers <= 1 or count < PARALLEL_MIN_PAGES:
+        for start, end in ranges:
+            yield from _extract_range(source, start, end)
+        return
+
+    with _executor_factory(max_workers=min(workers, len(ranges))) as pool:
+        futures = [pool.submit(_extract_range, source, s, e) for s, e in ranges]
+        for (start, end), future in zip(ranges, futures):
+            try:
+                pages = future.result()
+            except Exception as exc:
+                # A crashed worker only costs its range an in-process retry
+                logger.warning(
+                    "Parallel extraction of pages %d-%d failed (%s); retrying",
+                    start + 1,
+                    end,
+                    exc,
+                )
+                pages = _extract_range(source, start, end)
+            yield from pages
+
+
+def _extract_into(
+    result: PDFExtractionResult,
+    source: PdfSource,
+    max_pages: int,
+    workers: Optional[int],
+    on_page: Optional[Callable[[PageResult], None]],
+) -> None:
+    if isinstance(source, (bytes, bytearray)):
+        content_hash = result_cache.content_sha256(bytes(source))
+    else:
+        try:
+            content_hash = result_cache.file_sha256(source)
+        except OSError:
+            content_hash = None
+    options = {"max_pages": max_pages}
+
+    cached = content_hash and result_cache.load(
+        "pdf", PROCESSOR_VERSION, content_hash, options
+    )
+    if cached:
+        result.total_pages = cached["total_pages"]
+        result.truncated = cached["truncated"]
+        result.cached = True
+        for data in cached["pages"]:
+            page = PageResult(**data)
+            result.pages.append(page)
+            if on_page is not None:
+                on_page(page)
+        return
+
+    result.total_pages = _page_count(source)
+    result.truncated = result.total_pages > max_pages
+    count = min(result.total_pages, max_pages)
+    for page in _iter_pages(source, count, _resolve_workers(workers)):
+        result.pages.append(page)
+        if on_page is not None:
+            on_page(page)
+
+    if not content_hash:
+        return
+    result_cache.save(
+        "pdf",
+        PROCESSOR_VERSION,
+        content_hash,
+        {
+            "total_pages": result.total_pages,
+            "truncated": result.truncated,
+            "pages": [asdict(p) for p in result.pages],
+        },
+        options,
+    )
+
+
 def _extract_page(page, page_number: int) -> PageResult:
     """Extract text and tables from a single pdfplumber page."""
     result = PageResult(page_number=page_number)
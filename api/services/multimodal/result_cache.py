@@ -0,0 +1,249 @@
+"""Shared on-disk result cache for multimodal processors.
+
+Processors cache their output keyed on the SHA-256 of the input bytes,
+the processor name and version, and the options that change the output
+(``cache_key``). A file attached again — in another chat thread, or
+re-uploaded — is served from the cache without re-parsing it or paying
+for vision/Whisper calls again.
+
+Entries are JSON files under ``MULTIMODAL_CACHE_DIR``, sharded by the
+first two characters of the key. Every read touches the file's mtime, and
+once the directory grows past ``MULTIMODAL_CACHE_MAX_BYTES`` the least
+recently used entries are deleted until it is back under
+``EVICT_TO_RATIO`` of the limit. A limit of 0 disables the cache.
+
+Bump a processor's ``PROCESSOR_VERSION`` when its output changes; old
+entries then stop matching and age out.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "/tmp/leadgen-multimodal-cache"
+
+# Size limit of the cache directory (MULTIMODAL_CACHE_MAX_BYTES overrides)
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# Eviction stops once the cache is below this share of the limit
+EVICT_TO_RATIO = 0.8
+
+
+def content_sha256(data: bytes) -> str:
+    """SHA-256 of in-memory content."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_sha256(file_path: str) -> str:
+    """SHA-256 of a file, read in 1 MB chunks."""
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_key(
+    content_hash: str, processor: str, version: str, options: Optional[dict] = None
+) -> str:
+    """Key for one processor run over one input.
+
+    Args:
+        content_hash: SHA-256 of the input bytes.
+        processor: Processor name (``pdf``, ``image``, ...).
+        version: The processor's ``PROCESSOR_VERSION``.
+        options: Arguments that change the output (JSON-serializable).
+
+    Returns:
+        Hex digest identifying the result.
+    """
+    payload = json.dumps(
+        [content_hash, processor, version, options or {}],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU of JSON results in a directory."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Bytes on disk as of the last scan plus bytes written since; a
+        # rescan happens only when this crosses the limit
+        self._approx_bytes: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.cache_dir) and self.max_bytes > 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], "{}.json".format(key))
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached value for ``key`` and mark it recently used."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Dropping unreadable cache entry %s: %s", key, exc)
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        """Store ``value`` (JSON-serializable) under ``key``."""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        try:
+            data = json.dumps(value, default=str).encode("utf-8")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write-then-rename so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("Failed to write cache entry %s: %s", key, exc)
+            return
+
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = self._scan_size()
+            else:
+                self._approx_bytes += len(data)
+            over = self._approx_bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until under the target size.
+
+        Returns:
+            Number of entries deleted.
+        """
+        if not self.enabled:
+            return 0
+        with self._lock:
+            entries = []
+            total = 0
+            for root, _dirs, files in os.walk(self.cache_dir):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, path))
+                    total += st.st_size
+            target = int(self.max_bytes * EVICT_TO_RATIO)
+            removed = 0
+            if total > self.max_bytes:
+                for _mtime, size, path in sorted(entries):
+                    if total <= target:
+                        break
+                    if self._remove(path):
+                        total -= size
+                        removed += 1
+            self._approx_bytes = total
+        if removed:
+            logger.info("Evicted %d multimodal cache entries", removed)
+        return removed
+
+    def clear(self) -> None:
+        if not self.cache_dir:
+            return
+        with self._lock:
+            for root, _dirs, files in os.walk(self.cache_dir):
+                for name in files:
+                    self._remove(os.path.join(root, name))
+            self._approx_bytes = 0
+
+    def _scan_size(self) -> int:
+        total = 0
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    continue
+        return total
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.unlink(path)
+            return True
+        except OSError:
+            return False
+
+
+_default_cache: Optional[ResultCache] = None
+
+
+def get_cache(cache_dir: Optional[str] = None) -> ResultCache:
+    """The process-wide cache, or one rooted at ``cache_dir``."""
+    global _default_cache
+    if cache_dir:
+        return ResultCache(cache_dir, _configured_max_bytes())
+    if _default_cache is None:
+        _default_cache = ResultCache(
+            os.environ.get("MULTIMODAL_CACHE_DIR", DEFAULT_CACHE_DIR),
+            _configured_max_bytes(),
+        )
+    return _default_cache
+
+
+def _configured_max_bytes() -> int:
+    try:
+        return int(os.environ.get("MULTIMODAL_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+    except ValueError:
+        return DEFAULT_MAX_BYTES
+
+
+def load(
+    processor: str,
+    version: str,
+    content_hash: str,
+    options: Optional[dict] = None,
+    cache_dir: Optional[str] = None,
+) -> Optional[dict]:
+    """Cached result of ``processor`` for this input, or None."""
+    return get_cache(cache_dir).get(
+        cache_key(content_hash, processor, version, options)
+    )
+
+
+def save(
+    processor: str,
+    version: str,
+    content_hash: str,
+    value: dict,
+    options: Optional[dict] = None,
+    cache_dir: Optional[str] = None,
+) -> None:
+    """Cache a result of ``processor`` for this input."""
+    get_cache(cache_dir).put(
+        cache_key(content_hash, processor, version, options), value
+    )
@@ -1,13 +1,26 @@
 """Video processing pipeline (BL-268).
 
-Extracts audio (ffmpeg) -> transcribes (Whisper API) -> extracts keyframes
-(ffmpeg scene detection) -> describes keyframes (Claude vision) -> merges
-into time-aligned summary.
+Two branches run concurrently once metadata is read:
+
+  audio:  extract audio (ffmpeg) -> transcribe (Whisper API)
+  visual: extract keyframes (ffmpeg scene detection) -> drop near-identical
+          frames (perceptual hash) -> describe keyframes (Claude vision,
+          optional)
+
+and are merged into a time-aligned summary. Keyframes are described
+``VISION_FRAMES_PER_CALL`` at a time in concurrent vision requests paced
+by a shared ``RateLimiter``. Per-stage wall-clock timings are reported on
+the result.
 
 External dependencies:
   - ffmpeg (system binary)
   - yt-dlp (pip package, for URL downloads)
   - openai (pip package, for Whisper API)
+
+Transcripts, keyframe descriptions and summaries are cached in the shared
+multimodal result cache (``result_cache``) keyed on the file hash and the
+skip/describe options. Incomplete results (a failed branch or keyframes
+left undescribed by vision errors) are not cached.
 """
 
 from __future__ import annotations
@@ -16,11 +29,18 @@ import hashlib
 import json
 import logging
 import os
+import re
 import subprocess
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Optional
 
+from ..rate_limiter import RateLimiter
+from . import result_cache
+
 logger = logging.getLogger(__name__)
 
 # Maximum video duration in minutes
@@ -45,8 +65,29 @@ TOKENS_PER_MINUTE_TRANSCRIPT = 150
 # Tokens per keyframe (Claude vision)
 TOKENS_PER_KEYFRAME = 1600
 
-# Cache directory
-DEFAULT_CACHE_DIR = "/tmp/leadgen-video-cache"
+# Bump when the cached result changes (invalidates cached results)
+PROCESSOR_VERSION = "2"
+
+# Frames whose 64-bit difference hashes differ in at most this many bits
+# are treated as the same shot
+DUPLICATE_FRAME_MAX_DISTANCE = 6
+
+# Keyframe description: model, frames per request, concurrent requests
+# (VIDEO_VISION_CONCURRENCY) and request rate across all videos in the
+# process (VIDEO_VISION_REQUESTS_PER_SECOND)
+VISION_MODEL = "claude-haiku-4-5-20251001"
+VISION_FRAMES_PER_CALL = 4
+DEFAULT_VISION_CONCURRENCY = 3
+DEFAULT_VISION_REQUESTS_PER_SECOND = 2.0
+
+VISION_SYSTEM_PROMPT = (
+    "You describe keyframes from a business video (product demo, webinar, "
+    "pitch). For each frame, describe in 1-2 sentences what is shown: "
+    "on-screen text, UI, products, charts, people and setting. Reply with "
+    "a JSON array of strings, one description per frame, in the order given."
+)
+
+_vision_limiter: Optional[RateLimiter] = None
 
 
 @dataclass
@@ -79,6 +120,7 @@ class KeyframeInfo:
     timestamp_seconds: float = 0.0
     file_path: str = ""
     description: str = ""
+    phash: Optional[int] = None
 
 
 @dataclass
@@ -104,6 +146,14 @@ class VideoProcessingResult:
     visual_summary: str = ""
     key_moments: list[dict] = field(default_factory=list)
     cost_estimate: Optional[CostEstimate] = None
+    duplicate_keyframes: int = 0
+    vision_calls: int = 0
+    vision_input_tokens: int = 0
+    vision_output_tokens: int = 0
+    # Keyframes whose vision request failed (description left empty)
+    undescribed_keyframes: int = 0
+    # Stage name -> wall-clock seconds (stages of the two branches overlap)
+    timings: dict[str, float] = field(default_factory=dict)
     cached: bool = False
     error: Optional[str] = None
 
@@ -381,6 +431,135 @@ def extract_keyframes(
         return []
 
 
+def frame_hash(image_path: str) -> Optional[int]:
+    """64-bit difference hash (dHash) of an image, or None without Pillow.
+
+    The frame is reduced to 9x8 grayscale and each bit records whether a
+    pixel is brighter than its right neighbour, so re-encodes, small shifts
+    and cursor movement barely change the hash.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    try:
+        with Image.open(image_path) as img:
+            small = img.convert("L").resize((9, 8))
+            return _dhash_pixels(list(small.getdata()), 9)
+    except Exception as exc:
+        logger.warning("Failed to hash frame %s: %s", image_path, exc)
+        return None
+
+
+def dedupe_keyframes(
+    keyframes: list[KeyframeInfo],
+    max_distance: int = DUPLICATE_FRAME_MAX_DISTANCE,
+) -> tuple[list[KeyframeInfo], int]:
+    """Drop keyframes that look like an earlier kept keyframe.
+
+    Frames that cannot be hashed are kept. Dropped frame images are
+    deleted.
+
+    Returns:
+        (kept keyframes in order, number dropped).
+    """
+    kept = []
+    dropped = 0
+    for kf in keyframes:
+        if kf.phash is None:
+            kf.phash = frame_hash(kf.file_path)
+        if kf.phash is not None and any(
+            k.phash is not None and _hamming(kf.phash, k.phash) <= max_distance
+            for k in kept
+        ):
+            dropped += 1
+            try:
+                os.unlink(kf.file_path)
+            except OSError:
+                pass
+            continue
+        kept.append(kf)
+    return kept, dropped
+
+
+def describe_keyframes(
+    keyframes: list[KeyframeInfo],
+    client=None,
+    query: str = "",
+    frames_per_call: int = VISION_FRAMES_PER_CALL,
+    max_workers: Optional[int] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> dict:
+    """Fill in ``description`` on keyframes with Claude vision.
+
+    Frames are sent ``frames_per_call`` per request; requests run on
+    ``max_workers`` threads and each first takes a token from
+    ``rate_limiter`` (default: the process-wide vision limiter). A batch
+    whose reply cannot be matched to its frames is retried one frame per
+    request. Failures leave descriptions empty and are counted.
+
+    Args:
+        keyframes: Keyframes with image paths.
+        client: ``AnthropicClient`` (default: one from ANTHROPIC_API_KEY).
+        query: What the user is looking for, passed to the model.
+        frames_per_call: Images per vision request.
+        max_workers: Concurrent requests (default: VIDEO_VISION_CONCURRENCY).
+        rate_limiter: Request pacing shared with other callers.
+
+    Returns:
+        Usage: ``{"calls", "input_tokens", "output_tokens", "model",
+        "failed_frames"}``.
+    """
+    usage = {
+        "calls": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "model": VISION_MODEL,
+        "failed_frames": 0,
+    }
+    if not keyframes:
+        return usage
+    if client is None:
+        from ..anthropic_client import AnthropicClient
+
+        client = AnthropicClient(default_model=VISION_MODEL)
+    limiter = rate_limiter or _get_vision_limiter()
+    workers = max_workers or _env_int(
+        "VIDEO_VISION_CONCURRENCY", DEFAULT_VISION_CONCURRENCY
+    )
+    batches = [
+        keyframes[i : i + frames_per_call]
+        for i in range(0, len(keyframes), max(1, frames_per_call))
+    ]
+
+    def _run(batch):
+        calls = []
+        descriptions = _describe_batch(batch, client, query, limiter, calls)
+        if descriptions is None and len(batch) > 1:
+            descriptions = [
+                _describe_batch([kf], client, query, limiter, calls) for kf in batch
+            ]
+            descriptions = [d[0] if d else None for d in descriptions]
+        failed = 0
+        for kf, text in zip(batch, descriptions or [None] * len(batch)):
+            kf.description = text or ""
+            failed += text is None
+        return calls, failed
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(workers, len(batches))),
+        thread_name_prefix="video-vision",
+    ) as pool:
+        for calls, failed in pool.map(_run, batches):
+            usage["failed_frames"] += failed
+            for resp in calls:
+                usage["calls"] += 1
+                usage["input_tokens"] += resp.input_tokens
+                usage["output_tokens"] += resp.output_tokens
+    return usage
+
+
 def download_video_url(url: str, output_dir: Optional[str] = None) -> Optional[str]:
     """Download a video from URL using yt-dlp.
 
@@ -436,18 +615,20 @@ def process_video(
     skip_keyframes: bool = False,
     openai_api_key: Optional[str] = None,
     cache_dir: Optional[str] = None,
+    describe_frames: bool = False,
+    query: str = "",
+    vision_client=None,
 ) -> VideoProcessingResult:
     """Full video processing pipeline.
 
     1. Get metadata and validate duration
     2. Check cache
-    3. Extract audio and transcribe
-    4. Extract keyframes
-    5. Build combined result
+    3. Concurrently: extract audio and transcribe / extract, dedupe and
+       (with ``describe_frames``) describe keyframes
+    4. Build combined result
 
-    Note: Keyframe descriptions (via Claude vision) are NOT done here --
-    they should be handled by the calling agent which has access to the
-    Claude API. This processor returns keyframe image paths.
+    Without ``describe_frames`` the keyframe image paths are returned for
+    the calling agent to inspect.
 
     Args:
         file_path: Path to video file.
@@ -455,12 +636,16 @@ def process_video(
         skip_transcription: Skip audio transcription.
         skip_keyframes: Skip keyframe extraction.
         openai_api_key: OpenAI API key for Whisper.
-        cache_dir: Directory for caching results.
+        cache_dir: Cache directory; defaults to the shared multimodal cache.
+        describe_frames: Describe keyframes with Claude vision.
+        query: What to look for, passed to the vision model.
+        vision_client: ``AnthropicClient`` for descriptions.
 
     Returns:
         VideoProcessingResult with all extracted data.
     """
     result = VideoProcessingResult()
+    started = time.monotonic()
 
     # 1. Check ffmpeg
     if not check_ffmpeg():
@@ -468,7 +653,8 @@ def process_video(
         return result
 
     # 2. Get metadata
-    metadata = get_video_metadata(file_path)
+    with _timed(result.timings, "metadata"):
+        metadata = get_video_metadata(file_path)
     if metadata is None:
         result.error = "Failed to read video metadata"
         return result
@@ -489,35 +675,94 @@ def process_video(
     result.cost_estimate = estimate_cost(metadata)
 
     # 5. Check cache
-    cache_dir = cache_dir or DEFAULT_CACHE_DIR
-    cached = _load_from_cache(metadata.file_hash, cache_dir)
+    options = {
+        "skip_transcription": skip_transcription,
+        "skip_keyframes": skip_keyframes,
+    }
+    if describe_frames and not skip_keyframes:
+        options["describe_frames"] = True
+        options["query"] = query
+    cached = _load_from_cache(metadata.file_hash, cache_dir, options)
     if cached:
         cached.cached = True
         cached.metadata = metadata
         cached.cost_estimate = result.cost_estimate
         return cached
 
-    # 6. Audio transcription
-    if not skip_transcription and metadata.has_audio:
-        audio_path = extract_audio(file_path)
-        if audio_path:
+    # 6. Audio and visual branches run concurrently; each writes only its
+    # own result fields and timing keys
+    def _audio_branch():
+        if skip_transcription or not metadata.has_audio:
+            return
+        with _timed(result.timings, "audio_extract"):
+            audio_path = extract_audio(file_path)
+        if not audio_path:
+            return
+        with _timed(result.timings, "transcribe"):
             segments = transcribe_audio(audio_path, api_key=openai_api_key)
-            result.transcript_segments = segments
-            result.transcript_text = " ".join(s.text for s in segments)
-
-            # Clean up audio file
+        result.transcript_segments = segments
+        result.transcript_text = " ".join(s.text for s in segments)
+
+        # Clean up audio file
+        try:
+            os.unlink(audio_path)
+        except OSError:
+            pass
+
+    def _visual_branch():
+        if skip_keyframes:
+            return
+        with _timed(result.timings, "keyframes"):
+            keyframes = extract_keyframes(file_path)
+        with _timed(result.timings, "dedupe"):
+            keyframes, result.duplicate_keyframes = dedupe_keyframes(keyframes)
+        result.keyframes = keyframes
+        if describe_frames and keyframes:
+            with _timed(result.timings, "describe"):
+                usage = describe_keyframes(keyframes, vision_client, query)
+            result.vision_calls = usage["calls"]
+            result.vision_input_tokens = usage["input_tokens"]
+            result.vision_output_tokens = usage["output_tokens"]
+            result.undescribed_keyframes = usage.get("failed_frames", 0)
+
+    failures = []
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="video") as pool:
+        branches = {
+            "audio": pool.submit(_audio_branch),
+            "visual": pool.submit(_visual_branch),
+        }
+        for name, branch in branches.items():
             try:
-                os.unlink(audio_path)
-            except OSError:
-                pass
+                branch.result()
+            except Exception as exc:
+                logger.exception("Video %s branch failed: %s", name, file_path)
+                failures.append("{} processing failed: {}".format(name, exc))
+    if failures:
+        result.error = "; ".join(failures)
+
+    # 7. Merge described keyframes with the transcript
+    if describe_frames and result.keyframes:
+        summary = build_combined_summary(
+            result.transcript_text,
+            [
+                {
+                    "timestamp_seconds": kf.timestamp_seconds,
+                    "description": kf.description,
+                }
+                for kf in result.keyframes
+                if kf.description
+            ],
+            metadata.duration_seconds,
+        )
+        result.transcript_summary = summary["transcript_summary"]
+        result.visual_summary = summary["visual_summary"]
+        result.key_moments = summary["key_moments"]
 
-    # 7. Keyframe extraction
-    if not skip_keyframes:
-        keyframes = extract_keyframes(file_path)
-        result.keyframes = keyframes
+    result.timings["total"] = round(time.monotonic() - started, 3)
 
-    # 8. Save to cache
-    _save_to_cache(metadata.file_hash, result, cache_dir)
+    # 8. Save complete results to cache; a retry should redo failed work
+    if not result.error and not result.undescribed_keyframes:
+        _save_to_cache(metadata.file_hash, result, cache_dir, options)
 
     return result
 
@@ -571,6 +816,109 @@ def build_combined_summary(
 # ---------------------------------------------------------------------------
 
 
+@contextmanager
+def _timed(timings: dict, stage: str):
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        timings[stage] = round(time.monotonic() - start, 3)
+
+
+def _dhash_pixels(pixels: list[int], width: int) -> int:
+    """Difference hash of a row-major grayscale grid ``width`` pixels wide."""
+    value = 0
+    for row in range(len(pixels) // width):
+        offset = row * width
+        for col in range(width - 1):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def _hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _get_vision_limiter() -> RateLimiter:
+    global _vision_limiter
+    if _vision_limiter is None:
+        try:
+            rate = float(
+                os.environ.get(
+                    "VIDEO_VISION_REQUESTS_PER_SECOND",
+                    DEFAULT_VISION_REQUESTS_PER_SECOND,
+                )
+            )
+        except ValueError:
+            rate = DEFAULT_VISION_REQUESTS_PER_SECOND
+        _vision_limiter = RateLimiter(rate)
+    return _vision_limiter
+
+
+def _describe_batch(
+    batch: list[KeyframeInfo], client, query: str, limiter: RateLimiter, calls: list
+) -> Optional[list[str]]:
+    """One vision request for ``batch``; None if the reply does not fit it."""
+    from .image_processor import build_vision_content_block, prepare_image_from_path
+
+    content = []
+    labels = []
+    for i, kf in enumerate(batch, 1):
+        payload = prepare_image_from_path(kf.file_path, "image/jpeg")
+        if payload is None:
+            return None
+        label = "Frame {} at {:02d}:{:02d}".format(
+            i, int(kf.timestamp_seconds // 60), int(kf.timestamp_seconds % 60)
+        )
+        content.extend(build_vision_content_block(payload, label))
+        labels.append(label)
+
+    instruction = "Describe these {} frames.".format(len(batch))
+    if query:
+        instruction += " The viewer wants to know: {}".format(query)
+    content.append({"type": "text", "text": instruction})
+
+    limiter.acquire()
+    try:
+        resp = client.query(
+            system_prompt=VISION_SYSTEM_PROMPT,
+            user_prompt=content,
+            model=VISION_MODEL,
+            max_tokens=200 * len(batch),
+        )
+    except Exception as exc:
+        logger.warning("Keyframe description failed (%s): %s", labels, exc)
+        return None
+    calls.append(resp)
+    return _parse_descriptions(resp.content, len(batch))
+
+
+def _parse_descriptions(text: str, expected: int) -> Optional[list[str]]:
+    """Descriptions from a JSON-array reply, or None if there are not ``expected``."""
+    match = re.search(r"\[.*\]", text or "", re.DOTALL)
+    if match:
+        try:
+            items = json.loads(match.group(0))
+        except ValueError:
+            items = None
+        if (
+            isinstance(items, list)
+            and len(items) == expected
+            and all(isinstance(i, str) for i in items)
+        ):
+            return [i.strip() for i in items]
+    if expected == 1 and text and text.strip():
+        return [text.strip()]
+    return None
+
+
 def _compute_file_hash(file_path: str) -> str:
     """Compute SHA-256 hash of a file."""
     h = hashlib.sha256()
@@ -635,18 +983,14 @@ def _extract_interval_frames(
         return []
 
 
-def _get_cache_path(file_hash: str, cache_dir: str) -> str:
-    """Get the cache file path for a given hash."""
-    os.makedirs(cache_dir, exist_ok=True)
-    return os.path.join(cache_dir, "{}.json".format(file_hash))
-
-
 def _save_to_cache(
-    file_hash: str, result: VideoProcessingResult, cache_dir: str
+    file_hash: str,
+    result: VideoProcessingResult,
+    cache_dir: Optional[str] = None,
+    options: Optional[dict] = None,
 ) -> None:
     """Save processing result to cache."""
     try:
-        cache_path = _get_cache_path(file_hash, cache_dir)
         cache_data = {
             "transcript_text": result.transcript_text,
             "transcript_segments": [
@@ -657,34 +1001,49 @@ def _save_to_cache(
                 }
                 for s in result.transcript_segments
             ],
+            "keyframes": [
+                {
+                    "timestamp_seconds": kf.timestamp_seconds,
+                    "description": kf.description,
+                }
+                for kf in result.keyframes
+                if kf.description
+            ],
             "key_moments": result.key_moments,
             "transcript_summary": result.transcript_summary,
             "visual_summary": result.visual_summary,
+            "duplicate_keyframes": result.duplicate_keyframes,
         }
-        with open(cache_path, "w") as f:
-            json.dump(cache_data, f)
+        result_cache.save(
+            "video", PROCESSOR_VERSION, file_hash, cache_data, options, cache_dir
+        )
     except Exception as exc:
         logger.warning("Failed to save video cache: %s", exc)
 
 
-def _load_from_cache(file_hash: str, cache_dir: str) -> Optional[VideoProcessingResult]:
+def _load_from_cache(
+    file_hash: str,
+    cache_dir: Optional[str] = None,
+    options: Optional[dict] = None,
+) -> Optional[VideoProcessingResult]:
     """Load processing result from cache."""
     try:
-        cache_path = _get_cache_path(file_hash, cache_dir)
-        if not os.path.exists(cache_path):
+        data = result_cache.load(
+            "video", PROCESSOR_VERSION, file_hash, options, cache_dir
+        )
+        if data is None:
             return None
 
-        with open(cache_path, "r") as f:
-            data = json.load(f)
-
         result = VideoProcessingResult(
             transcript_text=data.get("transcript_text", ""),
             transcript_segments=[
                 TranscriptSegment(**s) for s in data.get("transcript_segments", [])
             ],
+            keyframes=[KeyframeInfo(**kf) for kf in data.get("keyframes", [])],
             key_moments=data.get("key_moments", []),
             transcript_summary=data.get("transcript_summary", ""),
             visual_summary=data.get("visual_summary", ""),
+            duplicate_keyframes=data.get("duplicate_keyframes", 0),
         )
         return result
 
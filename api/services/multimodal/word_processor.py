@@ -1,18 +1,24 @@
 """Word document (.docx) processing (BL-266).
 
 Uses python-docx to extract paragraphs, tables, and headings,
-converting them to markdown format.
+converting them to markdown format.  Results are cached by content hash
+(``result_cache``).
 """
 
 from __future__ import annotations
 
 import io
 import logging
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Optional
 
+from . import result_cache
+
 logger = logging.getLogger(__name__)
 
+# Bump when extraction output changes (invalidates cached results)
+PROCESSOR_VERSION = "1"
+
 
 @dataclass
 class WordExtractionResult:
@@ -24,6 +30,7 @@ class WordExtractionResult:
     table_count: int = 0
     word_count: int = 0
     error: Optional[str] = None
+    cached: bool = False
 
 
 def extract_from_file(file_path: str) -> WordExtractionResult:
@@ -53,6 +60,20 @@ def extract_from_bytes(docx_bytes: bytes) -> WordExtractionResult:
     Returns:
         WordExtractionResult with markdown content.
     """
+    content_hash = result_cache.content_sha256(docx_bytes)
+    cached = result_cache.load("word", PROCESSOR_VERSION, content_hash)
+    if cached:
+        cached["cached"] = True
+        return WordExtractionResult(**cached)
+
+    result = _extract(docx_bytes)
+    if result.error is None:
+        result_cache.save("word", PROCESSOR_VERSION, content_hash, asdict(result))
+    return result
+
+
+def _extract(docx_bytes: bytes) -> WordExtractionResult:
+    """Parse .docx bytes into a WordExtractionResult."""
     try:
         import docx
     except ImportError:
@@ -12,6 +12,7 @@ from flask import current_app
 from sqlalchemy import text
 
 from ..models import db
+from . import tracing
 from .perplexity_client import PerplexityClient
 from .stage_registry import get_model_for_stage
 
@@ -220,6 +221,7 @@ def _safe_json_list(val):
     return "[]"
 
 
+@tracing.traced("db.news")
 def _upsert_news(company_id, parsed, cost_usd):
     """Upsert enrichment results into company_news."""
     params = {
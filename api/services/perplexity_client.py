@@ -22,6 +22,8 @@ import time
 
 import requests
 
+from . import tracing
+
 logger = logging.getLogger(__name__)
 
 # Pricing per 1M tokens (input + output combined for sonar models)
@@ -67,6 +69,7 @@ class PerplexityClient:
         self.max_retries = max_retries
         self.retry_delay = retry_delay
 
+    @tracing.traced("llm.perplexity")
     def query(
         self,
         system_prompt,
@@ -93,6 +96,7 @@ class PerplexityClient:
             requests.HTTPError: On non-retryable errors or after retries exhausted
         """
         model = model or self.default_model
+        tracing.annotate(model=model)
 
         payload = {
             "model": model,
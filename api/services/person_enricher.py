@@ -16,7 +16,9 @@ from datetime import datetime, timezone
 from sqlalchemy import text
 
 from ..models import db
+from . import tracing
 from .anthropic_client import AnthropicClient
+from .context_bundles import refresh_contact_bundles
 from .perplexity_client import PerplexityClient
 from .stage_registry import get_model_for_stage
 
@@ -363,6 +365,7 @@ def enrich_person(
 
     # 8. Update contact fields (pass signals_data for linkedin_activity_level)
     _update_contact(contact_id, scores, total_cost, signals_data=signals_data)
+    refresh_contact_bundles([contact_id])
 
     db.session.commit()
 
@@ -925,6 +928,7 @@ def _build_linkedin_summary(profile_data):
 # ---------------------------------------------------------------------------
 
 
+@tracing.traced("db.contact_enrichment")
 def _upsert_contact_enrichment(
     contact_id,
     person_summary,
@@ -15,6 +15,7 @@ from flask import current_app
 from sqlalchemy import text
 
 from ..models import db
+from . import tracing
 
 logger = logging.getLogger(__name__)
 
@@ -225,6 +226,7 @@ def count_eligible(tenant_id, tag_id, stage, owner_id=None, tier_filter=None):
     return row[0] if row else 0
 
 
+@tracing.traced("http.n8n")
 def call_n8n_webhook(stage, data, timeout=120):
     """Call n8n sub-workflow via webhook. Synchronous -- waits for result."""
     base_url = current_app.config.get("N8N_BASE_URL", "https://n8n.visionvolve.com")
@@ -519,6 +521,15 @@ def _process_entity(
     # Resolve legacy stage names
     stage = _LEGACY_STAGE_ALIASES.get(stage, stage)
 
+    with tracing.span("stage." + stage, entity_id=str(entity_id)):
+        return _dispatch_entity(
+            stage, entity_id, tenant_id, previous_data, triage_rules
+        )
+
+
+def _dispatch_entity(stage, entity_id, tenant_id, previous_data, triage_rules):
+    """Run one entity through the processor for a (resolved) stage code."""
+
     if stage in DIRECT_STAGES:
         if stage == "l1":
             from .l1_enricher import enrich_l1
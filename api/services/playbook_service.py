@@ -1943,7 +1943,7 @@ def build_proactive_analysis_prompt(strategy_content, enrichment_data=None):
     return "\n".join(parts)
 
 
-def build_messages(chat_history, user_message):
+def build_messages(chat_history, user_message, summary=None):
     """Convert DB chat history into Anthropic API message format.
 
     Takes a list of StrategyChatMessage model objects and a new user message
@@ -1954,6 +1954,8 @@ def build_messages(chat_history, user_message):
         chat_history: List of StrategyChatMessage objects (must have .role
             and .content attributes).
         user_message: The new user message text to append.
+        summary: Rolling summary of the thread before ``chat_history``;
+            prepended as a summary message when given.
 
     Returns:
         list[dict]: Messages in Anthropic format:
@@ -1972,6 +1974,11 @@ def build_messages(chat_history, user_message):
         if msg.role in ("user", "assistant")
     ]
 
+    if summary:
+        from .memory.conversation_manager import summary_message
+
+        messages.insert(0, summary_message(summary))
+
     # Append the new user message
     messages.append({"role": "user", "content": user_message})
 
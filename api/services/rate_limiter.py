@@ -0,0 +1,48 @@
+"""Thread-safe token-bucket rate limiter shared by outbound API clients.
+
+Used by the per-tenant Resend client and the keyframe vision batches of
+the video processor.
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket: ``rate`` requests per second with bursts up to ``burst``.
+
+    ``acquire`` reserves a token and sleeps outside the lock until it is
+    due, so waiting threads are served in arrival order.
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = float(burst or max(1.0, rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, blocking until it is available.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def set_rate(self, rate):
+        with self._lock:
+            self.rate = float(rate)
+            self.burst = max(1.0, self.rate)
@@ -28,7 +28,9 @@ from bs4 import BeautifulSoup
 from sqlalchemy import text
 
 from ..models import db
+from . import tracing
 from .anthropic_client import AnthropicClient
+from .context_bundles import refresh_company_bundles
 from .perplexity_client import PerplexityClient
 
 try:
@@ -90,6 +92,7 @@ def _make_event(
 # ---------------------------------------------------------------------------
 
 
+@tracing.traced("http.website")
 def _fetch_page(url, timeout=WEBSITE_TIMEOUT):
     """Fetch a single URL and return the response, or None on failure."""
     try:
@@ -879,8 +882,10 @@ def _save_l1_enrichment(company_id, search_results, cost_usd, confidence):
         )
 
 
+@tracing.traced("db.module")
 def _upsert_module(table_name, columns, params):
     """Generic upsert helper for enrichment tables."""
+    tracing.annotate(table=table_name)
     col_list = ", ".join(columns)
     val_list = ", ".join(f":{c}" for c in columns)
     update_list = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns)
@@ -1176,6 +1181,7 @@ def _save_l2_and_modules(company_id, search_results, synthesis, total_cost):
             "cost": round(total_cost * 0.30, 4),
         },
     )
+    refresh_company_bundles([company_id])
 
 
 def _save_research_asset(
@@ -0,0 +1,210 @@
+"""Per-tenant Resend API client with batch sends and a shared rate limiter.
+
+The ``resend`` SDK authenticates with the module-global ``resend.api_key``,
+so two tenants sending at the same time would race on it. ``ResendClient``
+talks to the REST API directly with its own key and HTTP session, and every
+request first takes a token from the tenant's ``RateLimiter`` so concurrent
+campaign sends of one tenant share a single request budget.
+
+Usage:
+    from api.services.resend_client import get_resend_client
+
+    client = get_resend_client(tenant_id, api_key, requests_per_second=2)
+    results = client.send_batch(emails, idempotency_key="campaign-...")
+"""
+
+import logging
+import threading
+import time
+
+import requests
+
+from .rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Resend's default per-key limit
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+
+# Emails per /emails/batch request (API maximum)
+MAX_BATCH_SIZE = 100
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503}
+
+# Transport failures retried like RETRYABLE_STATUS_CODES (the batch may or
+# may not have reached Resend; the Idempotency-Key makes a retry safe)
+RETRYABLE_EXCEPTIONS = (requests.Timeout, requests.ConnectionError)
+
+# Same Idempotency-Key still in flight, or reused with a different payload
+IDEMPOTENCY_CONFLICT_STATUS = 409
+
+_registry_lock = threading.Lock()
+_clients = {}  # tenant_id -> ResendClient
+
+
+class IdempotencyConflict(requests.HTTPError):
+    """Resend answered 409 for the batch's Idempotency-Key."""
+
+
+class ResendClient:
+    """Resend REST client bound to one API key."""
+
+    def __init__(
+        self,
+        api_key,
+        base_url="https://api.resend.com",
+        timeout=30,
+        max_retries=3,
+        retry_delay=1.0,
+        rate_limiter=None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.rate_limiter = rate_limiter
+        self._session = requests.Session()
+
+    def send_batch(self, emails, idempotency_key=None):
+        """Send up to ``MAX_BATCH_SIZE`` emails in one request.
+
+        Uses permissive batch validation, so an invalid email fails on its
+        own instead of rejecting the whole batch. Retries 429/5xx responses
+        (honouring ``Retry-After``), timeouts and dropped connections; with
+        an idempotency key Resend returns the original response for a
+        repeated batch instead of re-sending.
+
+        Args:
+            emails: Resend email payloads (``from``, ``to``, ``subject``,
+                ``html``, optional ``reply_to``).
+            idempotency_key: Stable key for this exact batch.
+
+        Returns:
+            One dict per email, in order: ``{"id": ...}`` or ``{"error": ...}``.
+
+        Raises:
+            IdempotencyConflict: On a 409 for ``idempotency_key``
+            requests.HTTPError: On non-retryable errors or after retries exhausted
+            requests.RequestException: On transport errors after retries exhausted
+        """
+        if len(emails) > MAX_BATCH_SIZE:
+            raise ValueError(
+                "Resend batches hold at most {} emails".format(MAX_BATCH_SIZE)
+            )
+        headers = {
+            "Authorization": "Bearer {}".format(self.api_key),
+            "Content-Type": "application/json",
+            "x-batch-validation": "permissive",
+        }
+        if idempotency_key:
+            headers["Idempotency-Key"] = idempotency_key
+
+        for attempt in range(1 + self.max_retries):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                resp = self._session.post(
+                    "{}/emails/batch".format(self.base_url),
+                    headers=headers,
+                    json=emails,
+                    timeout=self.timeout,
+                )
+            except RETRYABLE_EXCEPTIONS as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.retry_delay * (2**attempt)
+                logger.warning(
+                    "Resend API %s (attempt %d/%d), retrying in %.1fs",
+                    type(e).__name__,
+                    attempt + 1,
+                    1 + self.max_retries,
+                    delay,
+                )
+                time.sleep(delay)
+                continue
+            if (
+                resp.status_code in RETRYABLE_STATUS_CODES
+                and attempt < self.max_retries
+            ):
+                delay = self._retry_after(resp) or self.retry_delay * (2**attempt)
+                logger.warning(
+                    "Resend API %s (attempt %d/%d), retrying in %.1fs",
+                    resp.status_code,
+                    attempt + 1,
+                    1 + self.max_retries,
+                    delay,
+                )
+                time.sleep(delay)
+                continue
+            if resp.status_code == IDEMPOTENCY_CONFLICT_STATUS:
+                raise IdempotencyConflict(
+                    "Resend 409 for idempotency key {}".format(idempotency_key),
+                    response=resp,
+                )
+            resp.raise_for_status()
+            return self._per_email_results(resp.json(), len(emails))
+
+    @staticmethod
+    def _retry_after(resp):
+        try:
+            return float(resp.headers.get("Retry-After", ""))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _per_email_results(data, count):
+        """Map a batch response onto the request order.
+
+        ``data`` lists created emails in order, skipping the ones reported
+        in ``errors`` by index.
+        """
+        errors = {
+            e.get("index"): e.get("message") or "Rejected by Resend"
+            for e in (data.get("errors") or [])
+        }
+        created = iter(data.get("data") or [])
+        results = []
+        for index in range(count):
+            if index in errors:
+                results.append({"error": errors[index]})
+                continue
+            item = next(created, None)
+            if item and item.get("id"):
+                results.append({"id": item["id"]})
+            else:
+                results.append({"error": "No id returned by Resend"})
+        return results
+
+
+def is_rejected(exc):
+    """Whether a ``send_batch`` error means Resend did not accept the batch.
+
+    Only definite 4xx rejections count. Timeouts, dropped connections, 5xx
+    and exhausted 429 retries can follow an accepted batch, and a 409 is an
+    idempotency conflict; those batches must be replayed with their key.
+    """
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is None or isinstance(exc, IdempotencyConflict):
+        return False
+    return 400 <= status < 500 and status != 429
+
+
+def get_resend_client(tenant_id, api_key, requests_per_second=None):
+    """Shared client (and rate limiter) for a tenant.
+
+    A new client is built when the tenant's API key changes; the limiter
+    survives so an in-flight send keeps its budget.
+    """
+    rate = float(requests_per_second or DEFAULT_REQUESTS_PER_SECOND)
+    key = str(tenant_id)
+    with _registry_lock:
+        client = _clients.get(key)
+        if client is None or client.api_key != api_key:
+            limiter = client.rate_limiter if client else RateLimiter(rate)
+            client = ResendClient(api_key, rate_limiter=limiter)
+            _clients[key] = client
+        if client.rate_limiter.rate != rate:
+            client.rate_limiter.set_rate(rate)
+        return client
@@ -153,6 +153,10 @@ def start_scheduler(app):
     Runs inside the Flask app context. Call once during app startup.
     """
     global _scheduler_thread, _scheduler_running
+    from .llm_usage_rollups import maybe_compact, maybe_reconcile
+    from .stage_estimates import maybe_refresh_models
+    from .tenant_counters import maybe_repair_counters
+    from .version_store import maybe_compact_versions
 
     if _scheduler_running:
         return
@@ -166,6 +170,11 @@ def start_scheduler(app):
                     count = check_due_schedules()
                     if count > 0:
                         logger.info("Triggered %d scheduled enrichments", count)
+                    maybe_compact()
+                    maybe_reconcile()
+                    maybe_repair_counters()
+                    maybe_compact_versions()
+                    maybe_refresh_models()
             except Exception:
                 logger.exception("Scheduler check failed")
 
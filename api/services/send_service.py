@@ -2,13 +2,24 @@
 
 Handles dispatching approved email messages via the Resend API,
 with idempotent send tracking via EmailSendLog.
+
+Messages go out through Resend's batch endpoint (up to 100 per request) on
+a per-tenant client whose token-bucket rate limiter is shared by all of the
+tenant's concurrent sends. Each batch's log rows are committed as "queued"
+together with the batch's Idempotency-Key before the API call, so re-running
+a send after a crash replays unconfirmed batches with the same key instead
+of mailing anyone twice. A batch whose request fails without a definite
+rejection (timeout, dropped connection, 5xx, 409) may already have been
+accepted, so its rows also stay "queued" for the next run to replay.
 """
 
 from __future__ import annotations
 
 import logging
 import time
-from datetime import datetime, timezone
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
 
 from ..models import (
     Campaign,
@@ -19,26 +30,58 @@ from ..models import (
     Tenant,
     db,
 )
+from .campaign_analytics import invalidate_campaign_analytics
+from .resend_client import (
+    MAX_BATCH_SIZE,
+    IdempotencyConflict,
+    get_resend_client,
+    is_rejected,
+)
 
 logger = logging.getLogger(__name__)
 
-# Rate limit: 100ms between sends (Resend allows 10 req/s)
-SEND_DELAY_SECONDS = 0.1
+# Emails per Resend batch request
+SEND_BATCH_SIZE = MAX_BATCH_SIZE
+
+# Batch requests in flight per campaign send (the tenant rate limiter still
+# caps requests per second)
+SEND_CONCURRENCY = 2
+
+# Message IDs per EmailSendLog pre-check query
+LOOKUP_CHUNK_SIZE = 500
+
+# Resend keeps idempotency keys for 24h; older unconfirmed batches are not
+# replayed because a retry could send them twice (they are marked failed)
+RESUME_WINDOW = timedelta(hours=23)
+
+# Error recorded on queued logs that aged out of RESUME_WINDOW
+STALE_QUEUED_ERROR = (
+    "Send interrupted before Resend confirmed it and its idempotency key has "
+    "expired; delivery is unknown. Check Resend before resending."
+)
 
 
 def send_campaign_emails(campaign_id: str, tenant_id: str) -> dict:
     """Send all approved email messages for a campaign via Resend.
 
-    Idempotent: skips messages that already have a non-failed EmailSendLog entry.
+    Idempotent: skips messages that already have a non-failed EmailSendLog
+    entry, except "queued" entries from an interrupted run, which are
+    resumed with their original batch idempotency key. Queued entries older
+    than ``RESUME_WINDOW`` cannot be replayed safely; they are marked failed
+    (counted in failed_count) so they do not stay queued forever, and a
+    later run will retry them. A batch is only replayed whole, in its
+    original order, so the payload sent under its key never changes.
 
     Args:
         campaign_id: UUID of the campaign
         tenant_id: UUID of the tenant
 
     Returns:
-        dict with sent_count, failed_count, skipped_count, total
+        dict with sent_count, failed_count, skipped_count, queued_count
+        (left queued for a later replay), total, plus resumed_count,
+        batches, duration_seconds and emails_per_second
     """
-    import resend
+    started = time.monotonic()
 
     # 1. Load campaign and validate sender_config
     campaign = db.session.get(Campaign, campaign_id)
@@ -59,7 +102,7 @@ def send_campaign_emails(campaign_id: str, tenant_id: str) -> dict:
     if not from_email:
         raise ValueError("Campaign sender_config missing from_email")
 
-    # 2. Configure Resend API key from tenant settings
+    # 2. Per-tenant Resend client from tenant settings
     tenant = db.session.get(Tenant, tenant_id)
     if not tenant:
         raise ValueError("Tenant not found")
@@ -75,9 +118,11 @@ def send_campaign_emails(campaign_id: str, tenant_id: str) -> dict:
     if not api_key:
         raise ValueError("Tenant settings missing resend_api_key")
 
-    resend.api_key = api_key
+    client = get_resend_client(
+        tenant_id, api_key, tenant_settings.get("resend_requests_per_second")
+    )
 
-    # 3. Load approved email messages not yet sent (idempotent check)
+    # 3. Load approved email messages
     messages = (
         db.session.query(Message, Contact, CampaignContact)
         .join(CampaignContact, Message.campaign_contact_id == CampaignContact.id)
@@ -91,135 +136,249 @@ def send_campaign_emails(campaign_id: str, tenant_id: str) -> dict:
         .all()
     )
 
-    sent_count = 0
-    failed_count = 0
+    # 4. One pre-check for already-sent and interrupted messages
+    existing = _existing_logs(tenant_id, [m.id for m, _c, _cc in messages])
+    resume_after = datetime.now(timezone.utc) - RESUME_WINDOW
+
+    sender = f"{from_name} <{from_email}>" if from_name else from_email
+    batches = {}  # idempotency key -> [(message, log)]
+    resume_keys = {}  # idempotency key -> queued logs seen in this run
+    new_items = []
     skipped_count = 0
+    failed_count = 0
+    queued_count = 0
+
+    for message, contact, _cc in messages:
+        log = existing.get(str(message.id))
+        if log is not None and log.status != "failed":
+            created = log.created_at
+            if created is not None and created.tzinfo is None:
+                created = created.replace(tzinfo=timezone.utc)
+            if (
+                log.status == "queued"
+                and created is not None
+                and created < resume_after
+            ):
+                log.status = "failed"
+                log.error = STALE_QUEUED_ERROR
+                failed_count += 1
+            elif log.status == "queued" and log.idempotency_key:
+                key = log.idempotency_key
+                resume_keys[key] = resume_keys.get(key, 0) + 1
+            else:
+                skipped_count += 1
+            continue
 
-    for message, contact, cc in messages:
-        # Idempotent: check if already sent (non-failed log exists)
-        existing_log = (
-            db.session.query(EmailSendLog)
-            .filter(
-                EmailSendLog.message_id == message.id,
-                EmailSendLog.tenant_id == tenant_id,
-                EmailSendLog.status != "failed",
+        if not contact.email_address:
+            # Failed log for contacts without email
+            db.session.add(
+                EmailSendLog(
+                    tenant_id=tenant_id,
+                    message_id=message.id,
+                    status="failed",
+                    from_email=from_email,
+                    error="Contact has no email address",
+                )
             )
-            .first()
-        )
-        if existing_log:
-            skipped_count += 1
+            failed_count += 1
             continue
-
-        to_email = contact.email_address
-        if not to_email:
-            # Create a failed log for contacts without email
+        new_items.append((message, contact))
+
+    # 5. Rebuild interrupted batches whole, in their original order
+    message_by_id = {str(m.id): m for m, _c, _cc in messages}
+    for key, seen in resume_keys.items():
+        items = _batch_items(tenant_id, key, message_by_id)
+        if items is None:
+            logger.warning(
+                "Queued batch %s no longer matches what was sent; "
+                "left queued rather than replayed with a different payload",
+                key,
+            )
+            queued_count += seen
+            continue
+        batches[key] = items
+    resumed_count = sum(len(items) for items in batches.values())
+
+    # 6. Queue new batches: log rows and keys are committed before sending.
+    # Rows are ordered the way _batch_items rebuilds them on a replay
+    queued_at = datetime.now(timezone.utc)
+    for start in range(0, len(new_items), SEND_BATCH_SIZE):
+        chunk = new_items[start : start + SEND_BATCH_SIZE]
+        key = _batch_key(campaign_id)
+        items = []
+        for message, contact in chunk:
             log = EmailSendLog(
+                id=str(uuid.uuid4()),
                 tenant_id=tenant_id,
                 message_id=message.id,
-                status="failed",
+                status="queued",
                 from_email=from_email,
-                error="Contact has no email address",
+                to_email=contact.email_address,
+                idempotency_key=key,
+                created_at=queued_at,
             )
             db.session.add(log)
-            db.session.commit()
-            failed_count += 1
-            continue
+            items.append((message, log))
+        batches[key] = sorted(items, key=lambda item: item[1].id)
+    db.session.commit()
 
-        # Create queued log entry
-        log = EmailSendLog(
-            tenant_id=tenant_id,
-            message_id=message.id,
-            status="queued",
-            from_email=from_email,
-            to_email=to_email,
-        )
-        db.session.add(log)
-        db.session.flush()
-
-        # Build the email body as HTML
-        body_html = _render_body_html(message.body)
-        sender = f"{from_name} <{from_email}>" if from_name else from_email
+    # 7. Send batches concurrently; results are written back per batch
+    sent_count = 0
 
+    def _payload(message, log):
+        params = {
+            "from": sender,
+            "to": [log.to_email],
+            "subject": message.subject or "(no subject)",
+            "html": _render_body_html(message.body),
+        }
+        if reply_to:
+            params["reply_to"] = [reply_to]
+        return params
+
+    def _absorb(future):
+        nonlocal sent_count, failed_count, queued_count
+        key, items = in_flight.pop(future)
         try:
-            result = _send_single_email(
-                to_email=to_email,
-                sender=sender,
-                reply_to=reply_to,
-                subject=message.subject or "(no subject)",
-                body_html=body_html,
-            )
-
-            # Update log with success
-            log.resend_message_id = result.get("id")
-            log.status = "sent"
-            log.sent_at = datetime.now(timezone.utc)
-
-            # Update message sent_at
-            message.sent_at = datetime.now(timezone.utc)
-
-            db.session.commit()
-            sent_count += 1
-
+            results = future.result()
+        except IdempotencyConflict as e:
+            logger.warning("Resend batch %s left queued: %s", key, e)
+            queued_count += len(items)
+            return
         except Exception as e:
-            logger.error("Failed to send email for message %s: %s", message.id, str(e))
-            log.status = "failed"
-            log.error = str(e)[:500]
-            db.session.commit()
-            failed_count += 1
-
-        # Rate limit delay
-        time.sleep(SEND_DELAY_SECONDS)
-
-    return {
+            if not is_rejected(e):
+                # Resend may have accepted it: replay later under the same key
+                logger.warning("Resend batch %s unconfirmed, left queued: %s", key, e)
+                queued_count += len(items)
+                return
+            logger.error("Resend batch %s failed: %s", key, e)
+            results = [{"error": str(e)}] * len(items)
+        now = datetime.now(timezone.utc)
+        for (message, log), result in zip(items, results):
+            if result.get("id"):
+                log.resend_message_id = result["id"]
+                log.status = "sent"
+                log.sent_at = now
+                message.sent_at = now
+                sent_count += 1
+            else:
+                logger.error(
+                    "Failed to send email for message %s: %s",
+                    message.id,
+                    result.get("error"),
+                )
+                log.status = "failed"
+                log.error = str(result.get("error"))[:500]
+                failed_count += 1
+        db.session.commit()
+        invalidate_campaign_analytics(campaign_id)
+
+    in_flight = {}
+    with ThreadPoolExecutor(
+        max_workers=SEND_CONCURRENCY, thread_name_prefix="resend-send"
+    ) as pool:
+        for key, items in batches.items():
+            payload = [_payload(message, log) for message, log in items]
+            future = pool.submit(client.send_batch, payload, key)
+            in_flight[future] = (key, items)
+            while len(in_flight) >= SEND_CONCURRENCY:
+                done, _pending = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _absorb(future)
+        while in_flight:
+            done, _pending = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                _absorb(future)
+
+    duration = time.monotonic() - started
+    result = {
         "sent_count": sent_count,
         "failed_count": failed_count,
         "skipped_count": skipped_count,
-        "total": sent_count + failed_count + skipped_count,
+        "queued_count": queued_count,
+        "total": sent_count + failed_count + skipped_count + queued_count,
+        "resumed_count": resumed_count,
+        "batches": len(batches),
+        "duration_seconds": round(duration, 3),
+        "emails_per_second": round(sent_count / duration, 1) if duration else 0.0,
     }
+    logger.info(
+        "Campaign %s send: %d sent, %d failed, %d skipped, %d left queued, "
+        "%d resumed in %d batches, %.2fs (%.1f emails/s)",
+        campaign_id,
+        sent_count,
+        failed_count,
+        skipped_count,
+        queued_count,
+        resumed_count,
+        len(batches),
+        duration,
+        result["emails_per_second"],
+    )
+    return result
 
 
-def _send_single_email(
-    *,
-    to_email: str,
-    sender: str,
-    reply_to: str | None,
-    subject: str,
-    body_html: str,
-) -> dict:
-    """Send a single email via the Resend API.
+def _existing_logs(tenant_id: str, message_ids: list) -> dict:
+    """Latest EmailSendLog per message, fetched in chunked IN queries.
 
-    Args:
-        to_email: recipient email address
-        sender: formatted sender (e.g. "Name <email>" or just "email")
-        reply_to: optional reply-to address
-        subject: email subject line
-        body_html: HTML body content
+    A non-failed log wins over failed ones so retried failures do not hide
+    a later successful send.
+    """
+    logs = {}
+    if not message_ids:
+        return logs
+    ids = [str(m) for m in message_ids]
+    for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+        chunk = ids[start : start + LOOKUP_CHUNK_SIZE]
+        rows = (
+            db.session.query(EmailSendLog)
+            .filter(
+                EmailSendLog.tenant_id == tenant_id,
+                EmailSendLog.message_id.in_(chunk),
+            )
+            .order_by(EmailSendLog.created_at)
+        )
+        for log in rows:
+            current = logs.get(str(log.message_id))
+            if current is None or current.status == "failed":
+                logs[str(log.message_id)] = log
+    return logs
 
-    Returns:
-        dict with Resend response (includes 'id')
 
-    Raises:
-        Exception on API error
+def _batch_items(tenant_id: str, key: str, message_by_id: dict) -> list | None:
+    """Every log of a queued batch with its message, in original order.
+
+    Returns None unless the whole batch can be replayed: every row still
+    queued and every message loaded by this run. Replaying a subset, or the
+    same rows in another order, would change the payload sent under ``key``
+    (Resend answers 409, or ids are matched to the wrong messages).
     """
-    import resend
+    logs = (
+        db.session.query(EmailSendLog)
+        .filter(
+            EmailSendLog.tenant_id == tenant_id,
+            EmailSendLog.idempotency_key == key,
+        )
+        .order_by(EmailSendLog.created_at, EmailSendLog.id)
+        .all()
+    )
+    items = []
+    for log in logs:
+        message = message_by_id.get(str(log.message_id))
+        if message is None or log.status != "queued":
+            return None
+        items.append((message, log))
+    return items or None
 
-    params = {
-        "from_": sender,
-        "to": [to_email],
-        "subject": subject,
-        "html": body_html,
-    }
-    if reply_to:
-        params["reply_to"] = [reply_to]
 
-    response = resend.Emails.send(params)
+def _batch_key(campaign_id: str) -> str:
+    """Resend Idempotency-Key for a new batch.
 
-    # resend SDK returns an object with .id, convert to dict
-    if hasattr(response, "id"):
-        return {"id": response.id}
-    if isinstance(response, dict):
-        return response
-    return {"id": str(response)}
+    Random rather than derived from the message IDs: retrying previously
+    failed messages must not hit Resend's cached response for the old batch.
+    The key is stored on the batch's log rows for resuming.
+    """
+    return "campaign-{}-{}".format(campaign_id, uuid.uuid4().hex)
 
 
 def _render_body_html(body: str) -> str:
@@ -13,6 +13,8 @@ from flask import current_app
 from sqlalchemy import text
 
 from ..models import db
+from . import tracing
+from .context_bundles import refresh_company_bundles
 from .perplexity_client import PerplexityClient
 from .stage_registry import get_model_for_stage
 
@@ -153,6 +155,7 @@ def enrich_signals(
 
     # 5. Upsert to company_enrichment_signals
     _upsert_signals(company_id, parsed, cost_usd)
+    refresh_company_bundles([company_id])
 
     # 6. Log LLM usage
     duration_ms = int((time.time() - start_time) * 1000)
@@ -231,6 +234,7 @@ def _safe_json(val):
     return json.dumps(val)
 
 
+@tracing.traced("db.signals")
 def _upsert_signals(company_id, parsed, cost_usd):
     """Upsert enrichment results into company_enrichment_signals."""
     params = {
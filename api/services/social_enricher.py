@@ -14,6 +14,8 @@ from datetime import datetime, timezone
 from sqlalchemy import text
 
 from ..models import db
+from . import tracing
+from .context_bundles import refresh_contact_bundles
 from .perplexity_client import PerplexityClient
 from .stage_registry import get_model_for_stage
 
@@ -143,6 +145,7 @@ def enrich_social(
 
     # 2. Upsert to contact_enrichment
     _upsert_social_enrichment(entity_id, research_data, total_cost)
+    refresh_contact_bundles([entity_id])
 
     # 3. Update linkedin_url on contacts table if found
     linkedin_url = research_data.get("linkedin_url")
@@ -252,6 +255,7 @@ def _research_social(contact_data, model, user_id=None, enrichment_language=None
 # ---------------------------------------------------------------------------
 
 
+@tracing.traced("db.social_enrichment")
 def _upsert_social_enrichment(contact_id, data, cost):
     """Upsert social enrichment fields into contact_enrichment table."""
     now_str = datetime.now(timezone.utc).isoformat()
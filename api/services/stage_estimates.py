@@ -0,0 +1,470 @@
+"""Empirical cost and duration model for enrichment stages.
+
+Estimates used to multiply a static ``cost_default_usd`` (or the average
+of a tenant's stage runs) by the eligible count and reported no runtime.
+This module learns per-stage distributions instead:
+
+- per-entity cost and duration from ``entity_stage_completions``
+  (``cost_usd``, ``duration_ms``),
+- per-entity averages of finished ``stage_runs`` (cost / done and
+  wall-clock / processed), used until enough entity samples exist,
+- per-model LLM call cost and latency from ``llm_usage_log`` rows of the
+  stage's operations (``STAGE_OPERATIONS``).
+
+Each (scope, stage) keeps the newest ``MAX_SAMPLES`` samples in
+``stage_cost_models`` (migration 062), scope being a tenant id or
+``global``. A refresh reads only rows after the stored watermarks, merges
+them into the window and recomputes p50/p90/mean/std. Tenant models are
+refreshed lazily by the estimate endpoints, the global model from the
+scheduler.
+
+Totals for N entities use the sum of N independent samples: expected
+``N * mean`` with a p90 of ``N * mean + Z_90 * std * sqrt(N)``. A stage
+processes its entities ``ENTITY_CONCURRENCY_PER_STAGE`` at a time and the
+stages of a pipeline run in parallel, so a pipeline's ETA is that of its
+slowest stage.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from ..models import StageCostModel, db
+from .stage_registry import STAGE_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Samples required before a distribution replaces the next fallback
+MIN_SAMPLES = 5
+
+# Newest samples kept per (scope, stage), and per model
+MAX_SAMPLES = 1000
+MAX_MODEL_SAMPLES = 500
+
+# Finished stage_runs read for the per-run fallback
+MAX_RUN_SAMPLES = 50
+
+# Tenant models older than this are refreshed before an estimate; the
+# scheduler refreshes the global model at the same interval
+REFRESH_SECONDS = 900
+
+# run_dag_stage processes a stage's entities one at a time
+ENTITY_CONCURRENCY_PER_STAGE = 1
+
+# One-sided 90th percentile of the standard normal distribution
+Z_90 = 1.2816
+
+GLOBAL_SCOPE = "global"
+
+# llm_usage_log operations written while running each stage
+STAGE_OPERATIONS = {
+    "l1": ("l1_enrichment", "l1_enrichment_batch"),
+    "l2": ("l2_news_research", "l2_strategic_research", "l2_synthesis"),
+    "signals": ("signals_enrichment",),
+    "news": ("news_enrichment",),
+    "person": (
+        "person_profile_research",
+        "person_signals_research",
+        "person_synthesis",
+    ),
+    "social": ("social_enrichment",),
+    "career": ("career_enrichment",),
+    "contact_details": ("contact_details_enrichment",),
+}
+
+_last_global_refresh = 0.0
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+
+
+def percentile(values: list, q: float) -> Optional[float]:
+    """Linearly interpolated ``q`` percentile (0-100) of ``values``."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    lo = math.floor(pos)
+    hi = math.ceil(pos)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def summarize(values: list) -> Optional[dict]:
+    """``{"n", "p50", "p90", "mean", "std"}`` of ``values``, or None if empty."""
+    values = [float(v) for v in values if v is not None]
+    if not values:
+        return None
+    n = len(values)
+    mean = sum(values) / n
+    var = sum((v - mean) ** 2 for v in values) / (n - 1) if n > 1 else 0.0
+    return {
+        "n": n,
+        "p50": round(percentile(values, 50), 6),
+        "p90": round(percentile(values, 90), 6),
+        "mean": round(mean, 6),
+        "std": round(math.sqrt(var), 6),
+    }
+
+
+def total_range(dist: dict, count: int, concurrency: int = 1) -> tuple:
+    """Expected and p90 total of ``count`` draws from ``dist``, divided by
+    ``concurrency`` (for durations)."""
+    expected = count * dist["mean"]
+    p90 = expected + Z_90 * dist["std"] * math.sqrt(count)
+    concurrency = max(1, concurrency)
+    return expected / concurrency, p90 / concurrency
+
+
+# ---------------------------------------------------------------------------
+# Refresh
+# ---------------------------------------------------------------------------
+
+
+def _is_postgres() -> bool:
+    return db.engine.dialect.name == "postgresql"
+
+
+def _param_ts(dt: datetime):
+    """Bind value for a timestamp (SQLite stores naive UTC strings)."""
+    if _is_postgres():
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _parse_ts(value) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _load_json(value) -> dict:
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return {}
+    return value or {}
+
+
+def _scope_filter(scope: str, column: str, params: dict) -> str:
+    if scope == GLOBAL_SCOPE:
+        return ""
+    params["tenant_id"] = scope
+    return " AND {} = :tenant_id".format(column)
+
+
+def _new_completions(scope: str, stage: str, since: Optional[datetime]) -> list:
+    params = {"stage": stage, "limit": MAX_SAMPLES}
+    sql = (
+        "SELECT cost_usd, duration_ms, completed_at FROM entity_stage_completions "
+        "WHERE stage = :stage AND status IN ('completed', 'disqualified')"
+    )
+    sql += _scope_filter(scope, "tenant_id", params)
+    if since is not None:
+        sql += " AND completed_at > :since"
+        params["since"] = _param_ts(since)
+    sql += " ORDER BY completed_at DESC LIMIT :limit"
+    return db.session.execute(db.text(sql), params).fetchall()
+
+
+def _new_usage(scope: str, stage: str, since: Optional[datetime]) -> list:
+    operations = STAGE_OPERATIONS.get(stage)
+    if not operations:
+        return []
+    params = {"limit": MAX_MODEL_SAMPLES * 4}
+    placeholders = []
+    for i, op in enumerate(operations):
+        params["op_{}".format(i)] = op
+        placeholders.append(":op_{}".format(i))
+    sql = (
+        "SELECT model, cost_usd, duration_ms, created_at FROM llm_usage_log "
+        "WHERE operation IN ({})".format(", ".join(placeholders))
+    )
+    sql += _scope_filter(scope, "tenant_id", params)
+    if since is not None:
+        sql += " AND created_at > :since"
+        params["since"] = _param_ts(since)
+    sql += " ORDER BY created_at DESC LIMIT :limit"
+    return db.session.execute(db.text(sql), params).fetchall()
+
+
+def _run_samples(scope: str, stage: str) -> tuple[list, list]:
+    """Per-entity cost and duration (ms) averages of recent finished runs."""
+    params = {"stage": stage, "limit": MAX_RUN_SAMPLES}
+    sql = (
+        "SELECT cost_usd, done, failed, started_at, completed_at FROM stage_runs "
+        "WHERE stage = :stage AND status = 'completed' AND done > 0"
+    )
+    sql += _scope_filter(scope, "tenant_id", params)
+    sql += " ORDER BY started_at DESC LIMIT :limit"
+    costs = []
+    durations = []
+    for cost, done, failed, started, completed in db.session.execute(
+        db.text(sql), params
+    ):
+        if cost and float(cost) > 0:
+            costs.append(float(cost) / done)
+        started, completed = _parse_ts(started), _parse_ts(completed)
+        if started and completed and completed > started:
+            elapsed_ms = (completed - started).total_seconds() * 1000
+            durations.append(elapsed_ms / (done + (failed or 0)))
+    return costs, durations
+
+
+def refresh_stage_model(scope: str, stage: str) -> StageCostModel:
+    """Fold rows added since the last refresh into one (scope, stage) model.
+
+    Runs in the caller's transaction; the caller commits.
+    """
+    model = db.session.get(StageCostModel, (scope, stage))
+    if model is None:
+        model = StageCostModel(scope=scope, stage=stage)
+        db.session.add(model)
+    samples = _load_json(model.samples)
+
+    rows = _new_completions(scope, stage, _parse_ts(model.completions_until))
+    entity = [
+        [float(cost or 0), int(ms) if ms is not None else None] for cost, ms, _ in rows
+    ] + samples.get("entity", [])
+    entity = entity[:MAX_SAMPLES]
+    if rows:
+        model.completions_until = _parse_ts(rows[0][2])
+
+    usage = _new_usage(scope, stage, _parse_ts(model.usage_until))
+    by_model = samples.get("models", {})
+    for name, cost, ms, _ in reversed(usage):
+        by_model.setdefault(name, []).insert(
+            0, [float(cost or 0), int(ms) if ms is not None else None]
+        )
+    by_model = {name: s[:MAX_MODEL_SAMPLES] for name, s in by_model.items()}
+    if usage:
+        model.usage_until = _parse_ts(usage[0][3])
+
+    run_costs, run_durations = _run_samples(scope, stage)
+
+    model.samples = {"entity": entity, "models": by_model}
+    model.stats = {
+        "cost": summarize([c for c, _ in entity]),
+        "duration_ms": summarize([d for _, d in entity]),
+        "run_cost": summarize(run_costs),
+        "run_duration_ms": summarize(run_durations),
+        "models": {
+            name: {
+                "calls": len(s),
+                "cost": summarize([c for c, _ in s]),
+                "duration_ms": summarize([d for _, d in s]),
+            }
+            for name, s in by_model.items()
+        },
+    }
+    model.updated_at = datetime.now(timezone.utc)
+    return model
+
+
+def refresh_models(scope: str = GLOBAL_SCOPE, stages=None) -> int:
+    """Refresh every stage's model for ``scope`` and commit.
+
+    Returns:
+        Number of stage models refreshed.
+    """
+    stages = list(stages or STAGE_REGISTRY)
+    for stage in stages:
+        refresh_stage_model(scope, stage)
+    db.session.commit()
+    return len(stages)
+
+
+def maybe_refresh_models(interval_seconds: int = REFRESH_SECONDS) -> None:
+    """Refresh the global model at most every ``interval_seconds``.
+
+    Failures are logged; estimates fall back to older data or defaults.
+    """
+    global _last_global_refresh
+    now = time.monotonic()
+    if _last_global_refresh and now - _last_global_refresh < interval_seconds:
+        return
+    _last_global_refresh = now
+    try:
+        refresh_models(GLOBAL_SCOPE)
+    except Exception:
+        db.session.rollback()
+        logger.exception("Stage cost model refresh failed")
+
+
+# ---------------------------------------------------------------------------
+# Estimates
+# ---------------------------------------------------------------------------
+
+
+def _stats(scope: str, stage: str, refresh: bool) -> dict:
+    model = db.session.get(StageCostModel, (scope, stage))
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=REFRESH_SECONDS)
+    if refresh and (model is None or _parse_ts(model.updated_at) < stale_before):
+        try:
+            model = refresh_stage_model(scope, stage)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception("Stage cost model refresh failed (%s, %s)", scope, stage)
+            model = db.session.get(StageCostModel, (scope, stage))
+    return _load_json(model.stats) if model is not None else {}
+
+
+def _pick(candidates) -> tuple:
+    for basis, dist in candidates:
+        if dist and dist["n"] >= MIN_SAMPLES:
+            return basis, dist
+    return None, None
+
+
+def get_stage_profile(tenant_id, stage: str) -> dict:
+    """Per-entity cost and duration distributions for a tenant's stage.
+
+    Each falls back from the tenant's entity samples to its stage-run
+    averages, then to the global model; cost finally to the registry's
+    ``cost_default_usd``, duration to None.
+
+    Returns:
+        ``{"cost": dist, "cost_basis": str, "duration_ms": dist | None,
+        "duration_basis": str | None, "models": {...}}``.
+    """
+    tenant = _stats(str(tenant_id), stage, refresh=True)
+    shared = _stats(GLOBAL_SCOPE, stage, refresh=False)
+
+    cost_basis, cost = _pick(
+        [
+            ("tenant", tenant.get("cost")),
+            ("tenant_runs", tenant.get("run_cost")),
+            ("global", shared.get("cost")),
+        ]
+    )
+    if cost is None:
+        default = STAGE_REGISTRY.get(stage, {}).get("cost_default_usd", 0.05)
+        cost_basis = "default"
+        cost = {"n": 0, "p50": default, "p90": default, "mean": default, "std": 0.0}
+
+    duration_basis, duration = _pick(
+        [
+            ("tenant", tenant.get("duration_ms")),
+            ("tenant_runs", tenant.get("run_duration_ms")),
+            ("global", shared.get("duration_ms")),
+            ("global_runs", shared.get("run_duration_ms")),
+        ]
+    )
+    return {
+        "cost": cost,
+        "cost_basis": cost_basis,
+        "duration_ms": duration,
+        "duration_basis": duration_basis,
+        "models": tenant.get("models") or shared.get("models") or {},
+    }
+
+
+def estimate_stage(
+    tenant_id,
+    stage: str,
+    count: int,
+    concurrency: int = ENTITY_CONCURRENCY_PER_STAGE,
+) -> dict:
+    """Cost range and ETA for running ``stage`` on ``count`` entities.
+
+    Returns:
+        Dict with ``cost_per_item`` (mean), ``estimated_cost`` (expected
+        total), ``cost_range`` ([expected, p90]), per-item p50/p90,
+        ``eta_seconds`` / ``eta_p90_seconds`` (None without duration data),
+        the bases used and the per-model call stats.
+    """
+    profile = get_stage_profile(tenant_id, stage)
+    cost = profile["cost"]
+    expected, p90 = total_range(cost, count)
+    result = {
+        "cost_per_item": round(cost["mean"], 4),
+        "cost_per_item_p50": round(cost["p50"], 4),
+        "cost_per_item_p90": round(cost["p90"], 4),
+        "estimated_cost": round(expected, 2),
+        "cost_range": [round(expected, 2), round(p90, 2)],
+        "cost_basis": profile["cost_basis"],
+        "cost_samples": cost["n"],
+        "eta_seconds": None,
+        "eta_p90_seconds": None,
+        "duration_basis": profile["duration_basis"],
+        "models": {
+            name: {
+                "calls": m["calls"],
+                "cost_p50": (m["cost"] or {}).get("p50"),
+                "cost_p90": (m["cost"] or {}).get("p90"),
+                "duration_p50_ms": (m["duration_ms"] or {}).get("p50"),
+                "duration_p90_ms": (m["duration_ms"] or {}).get("p90"),
+            }
+            for name, m in profile["models"].items()
+        },
+    }
+    duration = profile["duration_ms"]
+    if duration is not None:
+        eta, eta_p90 = total_range(duration, count, concurrency)
+        result["duration_per_item_p50_ms"] = round(duration["p50"])
+        result["duration_per_item_p90_ms"] = round(duration["p90"])
+        result["eta_seconds"] = round(eta / 1000)
+        result["eta_p90_seconds"] = round(eta_p90 / 1000)
+    return result
+
+
+def pipeline_eta(stage_estimates: dict) -> tuple:
+    """(expected, p90) seconds for stages running in parallel.
+
+    Stages without duration data are ignored; (None, None) if none have it.
+    """
+    etas = [e["eta_seconds"] for e in stage_estimates.values() if e.get("eta_seconds")]
+    p90s = [
+        e["eta_p90_seconds"]
+        for e in stage_estimates.values()
+        if e.get("eta_p90_seconds")
+    ]
+    return (max(etas) if etas else None, max(p90s) if p90s else None)
+
+
+def stage_run_eta(
+    tenant_id,
+    stage: str,
+    status: str,
+    total: int,
+    done: int,
+    failed: int,
+    started_at=None,
+    now: Optional[datetime] = None,
+) -> Optional[int]:
+    """Seconds until a running stage run finishes its known items.
+
+    Uses the run's own pace once it has processed ``MIN_SAMPLES`` items,
+    else the stage's duration model. None when the run is not active or
+    there is nothing to go on.
+    """
+    if status not in ("pending", "running"):
+        return None
+    processed = (done or 0) + (failed or 0)
+    remaining = (total or 0) - processed
+    if remaining <= 0:
+        return 0 if status == "running" else None
+
+    started = _parse_ts(started_at)
+    if status == "running" and started is not None and processed >= MIN_SAMPLES:
+        now = now or datetime.now(timezone.utc)
+        per_item = (now - started).total_seconds() / processed
+        return round(remaining * per_item / ENTITY_CONCURRENCY_PER_STAGE)
+
+    duration = get_stage_profile(tenant_id, stage)["duration_ms"]
+    if duration is None:
+        return None
+    eta, _ = total_range(duration, remaining, ENTITY_CONCURRENCY_PER_STAGE)
+    return round(eta / 1000)
@@ -70,15 +70,17 @@ def _snapshot(doc, edit_source="ai_tool", turn_id=None):
             that triggered this tool call. All snapshots from one agent
             turn share the same turn_id.
     """
+    from .version_store import pack
+
     snap = StrategyVersion(
         document_id=doc.id,
         tenant_id=doc.tenant_id,
         version=doc.version,
-        content=doc.content,
         extracted_data=doc.extracted_data,
         edit_source=edit_source,
         turn_id=turn_id,
     )
+    pack(snap, doc.content)
     db.session.add(snap)
     return snap
 
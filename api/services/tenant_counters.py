@@ -0,0 +1,199 @@
+"""Per-tenant live counters for dashboard endpoints.
+
+``/api/tenants/workflow-suggestions`` and ``/api/tenants/onboarding-status``
+are polled by every open dashboard, and used to run a handful of
+``COUNT(*)`` queries over contacts, companies, messages and campaigns on
+each request. On PostgreSQL those numbers live in ``tenant_counters`` and
+are kept current by statement-level triggers in the writing transaction
+(migration 054), so readers fetch a single row.
+
+Other dialects (SQLite in tests) have no triggers; ``get_counters`` computes
+the same numbers live there. ``repair_counters`` recomputes counters from
+the base tables and overwrites any drift (e.g. rows changed with triggers
+disabled during a restore); the scheduler runs it periodically.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Optional
+
+from ..models import db
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = (
+    "contacts",
+    "enriched_contacts",
+    "companies",
+    "l1_enriched_companies",
+    "triage_passed",
+    "triage_disqualified",
+    "messages",
+    "campaigns",
+    "active_campaigns",
+)
+
+# Minimum interval between scheduled drift repairs
+REPAIR_INTERVAL_SECONDS = 6 * 3600
+
+_COMPUTE_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM contacts WHERE tenant_id = :t),
+        (SELECT COUNT(*) FROM contacts
+            WHERE tenant_id = :t AND processed_enrich = true),
+        (SELECT COUNT(*) FROM companies WHERE tenant_id = :t),
+        (SELECT COUNT(*) FROM company_enrichment_l1 l
+            JOIN companies c ON c.id = l.company_id WHERE c.tenant_id = :t),
+        (SELECT COUNT(*) FROM companies
+            WHERE tenant_id = :t AND status = 'triage_passed'),
+        (SELECT COUNT(*) FROM companies
+            WHERE tenant_id = :t AND status = 'triage_disqualified'),
+        (SELECT COUNT(*) FROM messages WHERE tenant_id = :t),
+        (SELECT COUNT(*) FROM campaigns WHERE tenant_id = :t),
+        (SELECT COUNT(*) FROM campaigns
+            WHERE tenant_id = :t AND status IN ('generating', 'review', 'active'))
+"""
+
+_last_repair = 0.0
+
+
+def _is_postgres() -> bool:
+    return db.engine.dialect.name == "postgresql"
+
+
+def counters_maintained() -> bool:
+    """True when the database keeps ``tenant_counters`` current via triggers."""
+    return _is_postgres()
+
+
+def compute_counters(tenant_id) -> dict:
+    """Count everything from the base tables in one round trip."""
+    row = db.session.execute(db.text(_COMPUTE_SQL), {"t": str(tenant_id)}).fetchone()
+    return {field: int(value or 0) for field, value in zip(COUNTER_FIELDS, row)}
+
+
+def _read_row(tenant_id, for_update: bool = False) -> Optional[dict]:
+    sql = "SELECT " + ", ".join(COUNTER_FIELDS) + " FROM tenant_counters "
+    sql += "WHERE tenant_id = :t"
+    if for_update and _is_postgres():
+        sql += " FOR UPDATE"
+    row = db.session.execute(db.text(sql), {"t": str(tenant_id)}).fetchone()
+    if row is None:
+        return None
+    return {field: int(value or 0) for field, value in zip(COUNTER_FIELDS, row)}
+
+
+def get_counters(tenant_id) -> dict:
+    """Return the tenant's counters as ``{field: int}``.
+
+    Reads the maintained row when available. A missing row (tenant created
+    after the backfill with no writes yet) is seeded from a live count;
+    concurrent trigger upserts win the ``ON CONFLICT`` race, so the row is
+    never double counted.
+    """
+    if not counters_maintained():
+        return compute_counters(tenant_id)
+
+    counters = _read_row(tenant_id)
+    if counters is not None:
+        return counters
+
+    counters = compute_counters(tenant_id)
+    db.session.execute(
+        db.text(
+            "INSERT INTO tenant_counters (tenant_id, "
+            + ", ".join(COUNTER_FIELDS)
+            + ") VALUES (:t, "
+            + ", ".join(":" + f for f in COUNTER_FIELDS)
+            + ") ON CONFLICT (tenant_id) DO NOTHING"
+        ),
+        dict(counters, t=str(tenant_id)),
+    )
+    db.session.commit()
+    return counters
+
+
+def repair_counters(tenant_id=None) -> dict:
+    """Recompute counters from the base tables and overwrite drift.
+
+    The counter row is locked before counting, so writers whose triggers
+    already touched it are waited for and writers that commit later apply
+    their deltas on top of the repaired value.
+
+    Args:
+        tenant_id: Repair a single tenant; all tenants when None.
+
+    Returns:
+        ``{"tenants_checked": int, "drift": [{"tenant_id", "field",
+        "stored", "actual"}]}``.
+    """
+    if tenant_id is not None:
+        tenant_ids = [str(tenant_id)]
+    else:
+        tenant_ids = [
+            str(r[0])
+            for r in db.session.execute(db.text("SELECT id FROM tenants")).fetchall()
+        ]
+
+    drift = []
+    for tid in tenant_ids:
+        try:
+            stored = _read_row(tid, for_update=True)
+            actual = compute_counters(tid)
+            for field in COUNTER_FIELDS:
+                stored_value = stored.get(field) if stored else None
+                if stored_value != actual[field]:
+                    drift.append(
+                        {
+                            "tenant_id": tid,
+                            "field": field,
+                            "stored": stored_value,
+                            "actual": actual[field],
+                        }
+                    )
+            db.session.execute(
+                db.text(
+                    "INSERT INTO tenant_counters (tenant_id, "
+                    + ", ".join(COUNTER_FIELDS)
+                    + ", updated_at, repaired_at) VALUES (:t, "
+                    + ", ".join(":" + f for f in COUNTER_FIELDS)
+                    + ", CURRENT_TIMESTAMP, CURRENT_TIMESTAMP) "
+                    "ON CONFLICT (tenant_id) DO UPDATE SET "
+                    + ", ".join("{0} = excluded.{0}".format(f) for f in COUNTER_FIELDS)
+                    + ", updated_at = CURRENT_TIMESTAMP, "
+                    "repaired_at = CURRENT_TIMESTAMP"
+                ),
+                dict(actual, t=tid),
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    if drift:
+        logger.warning(
+            "Repaired %d drifted tenant counters across %d tenants",
+            len(drift),
+            len({d["tenant_id"] for d in drift}),
+        )
+    return {"tenants_checked": len(tenant_ids), "drift": drift}
+
+
+def maybe_repair_counters(interval_seconds: int = REPAIR_INTERVAL_SECONDS) -> None:
+    """Run ``repair_counters`` for all tenants at most every ``interval_seconds``.
+
+    Only meaningful where counters are maintained; failures are logged.
+    """
+    global _last_repair
+    if not counters_maintained():
+        return
+    now = time.monotonic()
+    if _last_repair and now - _last_repair < interval_seconds:
+        return
+    _last_repair = now
+    try:
+        repair_counters()
+    except Exception:
+        logger.exception("Tenant counter repair failed")
@@ -0,0 +1,503 @@
+"""Lightweight in-process tracing for enrichment hot paths.
+
+Spans are opened with ``span(name, **attributes)`` or the ``traced``
+decorator around entity processing (``stage.<code>``), LLM calls
+(``llm.<provider>``), DB upserts (``db.<table or module>``) and HTTP
+fetches (``http.<target>``). Spans nest per thread. Finished spans feed:
+
+- a duration histogram per span name,
+- a per-root breakdown of where the time of e.g. one ``stage.l2`` entity
+  went (self time per descendant span name),
+- a bounded buffer of recent spans, exportable as OpenTelemetry
+  OTLP/JSON ``resourceSpans``.
+
+Tracing is off unless TRACING_ENABLED is set or it is switched on with
+``configure`` (the admin profiling endpoint). While off, ``span`` returns a
+shared no-op context manager and ``traced`` calls straight through.
+
+Recorded spans live in the process, and the API runs several gunicorn
+workers. ``configure`` therefore writes the on/off switch and a reset
+generation to a small control file (TRACING_CONTROL_PATH) that every
+worker of the host polls at most every ``CONTROL_POLL_SECONDS``.
+Snapshots carry the worker ``pid``, so per-worker numbers can be told apart.
+"""
+
+import functools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+BUCKET_BOUNDS_MS = (
+    1,
+    2,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+    60000,
+    120000,
+)
+
+# Finished spans kept for OTLP export (oldest dropped first)
+BUFFER_SIZE = int(os.environ.get("TRACING_BUFFER_SIZE", "5000"))
+
+# OTLP resource service.name
+SERVICE_NAME = "leadgen-api"
+
+# Breakdown key for a root span's own (non-child) time
+SELF_TIME = "(self)"
+
+# Control file shared by the worker processes of a host, and how often
+# each worker re-checks it
+CONTROL_PATH = os.environ.get(
+    "TRACING_CONTROL_PATH",
+    os.path.join(tempfile.gettempdir(), "leadgen-tracing.json"),
+)
+CONTROL_POLL_SECONDS = 2.0
+
+_enabled = os.environ.get("TRACING_ENABLED", "").lower() in ("1", "true", "yes")
+_control_checked = 0.0
+_control_mtime = None
+_generation = 0
+_lock = threading.Lock()
+_local = threading.local()
+_histograms = {}
+_breakdown = {}
+_recent = deque(maxlen=BUFFER_SIZE)
+
+
+class _Histogram:
+    """Fixed-bucket duration histogram with count/sum/min/max."""
+
+    __slots__ = ("buckets", "count", "errors", "max_ms", "min_ms", "total_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def add(self, ms, error=False):
+        self.count += 1
+        self.errors += bool(error)
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+        for i, bound in enumerate(BUCKET_BOUNDS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def quantile(self, q):
+        """Estimate the q-quantile by interpolating inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                low = BUCKET_BOUNDS_MS[i - 1] if i else 0.0
+                high = BUCKET_BOUNDS_MS[i] if i < len(BUCKET_BOUNDS_MS) else self.max_ms
+                low = max(low, self.min_ms)
+                high = min(high, self.max_ms)
+                return low + (high - low) * (rank - seen) / n
+            seen += n
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "min_ms": round(self.min_ms, 3) if self.min_ms is not None else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": _round(self.quantile(0.5)),
+            "p90_ms": _round(self.quantile(0.9)),
+            "p99_ms": _round(self.quantile(0.99)),
+            "buckets": [
+                {"le_ms": bound, "count": n}
+                for bound, n in zip((*BUCKET_BOUNDS_MS, None), self.buckets)
+                if n
+            ],
+        }
+
+
+def _round(value):
+    return round(value, 3) if value is not None else None
+
+
+class Span:
+    """A timed operation. Use via ``span()``; not reentrant."""
+
+    __slots__ = (
+        "_t0",
+        "attributes",
+        "child_ms",
+        "end_ns",
+        "error",
+        "name",
+        "parent",
+        "root",
+        "span_id",
+        "start_ns",
+        "trace_id",
+    )
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.parent = None
+        self.root = self
+        self.error = None
+        self.child_ms = 0.0
+        self.end_ns = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        stack = _stack()
+        if stack:
+            self.parent = stack[-1]
+            self.root = self.parent.root
+            self.trace_id = self.parent.trace_id
+        else:
+            self.trace_id = os.urandom(16).hex()
+            # A new unit of work: an earlier LLM duration is not its own
+            _local.last_llm = None
+        self.span_id = os.urandom(8).hex()
+        stack.append(self)
+        self.start_ns = time.time_ns()
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_ns = time.perf_counter_ns() - self._t0
+        self.end_ns = self.start_ns + elapsed_ns
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"[:200]
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        _finish(self, elapsed_ns / 1e6)
+        return False
+
+    @property
+    def duration_ms(self):
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns else None
+
+
+class _NoopSpan:
+    """Returned by ``span()`` while tracing is off."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _finish(finished, ms):
+    """Fold a finished span into the histograms, breakdown and buffer."""
+    self_ms = max(0.0, ms - finished.child_ms)
+    if finished.parent is not None:
+        finished.parent.child_ms += ms
+    if finished.name.startswith("llm."):
+        # Remember which span the call ran under; see take_llm_duration_ms
+        _local.last_llm = (ms, finished.parent)
+
+    root = finished.root
+    with _lock:
+        hist = _histograms.get(finished.name)
+        if hist is None:
+            hist = _histograms[finished.name] = _Histogram()
+        hist.add(ms, finished.error is not None)
+
+        entry = _breakdown.get(root.name)
+        if entry is None:
+            entry = _breakdown[root.name] = {"count": 0, "total_ms": 0.0, "spans": {}}
+        part = SELF_TIME if finished is root else finished.name
+        totals = entry["spans"].setdefault(part, [0, 0.0])
+        totals[0] += 1
+        totals[1] += self_ms
+        if finished is root:
+            entry["count"] += 1
+            entry["total_ms"] += ms
+
+        _recent.append(finished)
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation API
+# ---------------------------------------------------------------------------
+
+
+def _read_control():
+    try:
+        with open(CONTROL_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _poll_control(force=False):
+    """Apply the shared control file if it changed since the last check."""
+    global _control_checked, _control_mtime, _enabled, _generation
+    now = time.monotonic()
+    if not force and now - _control_checked < CONTROL_POLL_SECONDS:
+        return
+    _control_checked = now
+    try:
+        mtime = os.stat(CONTROL_PATH).st_mtime_ns
+    except OSError:
+        return
+    if mtime == _control_mtime:
+        return
+    control = _read_control()
+    if not isinstance(control, dict):
+        return
+    _control_mtime = mtime
+    _enabled = bool(control.get("enabled"))
+    generation = control.get("generation", 0)
+    if generation != _generation:
+        _generation = generation
+        reset()
+
+
+def is_enabled():
+    _poll_control()
+    return _enabled
+
+
+def set_enabled(enabled):
+    """Turn tracing on or off for this process only."""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def configure(enabled=None, reset_spans=False):
+    """Switch tracing and/or clear recorded spans in every worker process.
+
+    Writes the shared control file (picked up by the other workers within
+    ``CONTROL_POLL_SECONDS``) and applies the change here immediately.
+
+    Args:
+        enabled: New on/off state; None keeps the current one
+        reset_spans: Drop histograms and buffered spans
+    """
+    global _control_mtime, _enabled, _generation
+    _poll_control(force=True)
+    enabled = _enabled if enabled is None else bool(enabled)
+    generation = _generation + 1 if reset_spans else _generation
+    tmp_path = "{}.{}".format(CONTROL_PATH, os.getpid())
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump({"enabled": enabled, "generation": generation}, f)
+        os.replace(tmp_path, CONTROL_PATH)
+        _control_mtime = os.stat(CONTROL_PATH).st_mtime_ns
+    except OSError:
+        logger.warning("Could not write %s; applying to this worker only", CONTROL_PATH)
+
+    _enabled = enabled
+    if generation != _generation:
+        _generation = generation
+        reset()
+
+
+def span(name, **attributes):
+    """Context manager timing ``name``; a shared no-op while tracing is off."""
+    _poll_control()
+    if not _enabled:
+        return _NOOP
+    return Span(name, attributes)
+
+
+def traced(name):
+    """Decorator wrapping each call of the function in ``span(name)``."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            _poll_control()
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def annotate(**attributes):
+    """Set attributes on the innermost open span of this thread, if any."""
+    if not _enabled:
+        return
+    stack = _stack()
+    if stack:
+        stack[-1].attributes.update(attributes)
+
+
+def take_llm_duration_ms():
+    """Return and clear the duration of this thread's last ``llm.*`` span.
+
+    Only handed out while the span that was open around the LLM call is
+    still the innermost open span (or no span is open for a call made
+    outside any span), so a log call never picks up the duration of an
+    unrelated earlier call on the same thread.
+    """
+    last = getattr(_local, "last_llm", None)
+    _local.last_llm = None
+    if last is None:
+        return None
+    ms, owner = last
+    stack = _stack()
+    if owner is not (stack[-1] if stack else None):
+        return None
+    return int(ms)
+
+
+def clear_llm_duration():
+    """Forget this thread's last ``llm.*`` duration (start of a request)."""
+    _local.last_llm = None
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+
+def snapshot():
+    """Return histograms per span name and the per-root time breakdown."""
+    with _lock:
+        spans = {name: hist.to_dict() for name, hist in sorted(_histograms.items())}
+        breakdown = {}
+        for root_name, entry in sorted(_breakdown.items()):
+            total = entry["total_ms"]
+            parts = {
+                name: {
+                    "count": count,
+                    "total_ms": round(ms, 3),
+                    "share": round(ms / total, 4) if total else None,
+                }
+                for name, (count, ms) in sorted(
+                    entry["spans"].items(), key=lambda kv: -kv[1][1]
+                )
+            }
+            breakdown[root_name] = {
+                "count": entry["count"],
+                "total_ms": round(total, 3),
+                "mean_ms": round(total / entry["count"], 3) if entry["count"] else None,
+                "spans": parts,
+            }
+        buffered = len(_recent)
+    return {
+        "enabled": is_enabled(),
+        "pid": os.getpid(),
+        "buffered_spans": buffered,
+        "spans": spans,
+        "breakdown": breakdown,
+    }
+
+
+def recent_spans(limit=None):
+    """Return up to ``limit`` most recently finished spans, oldest first."""
+    with _lock:
+        spans = list(_recent)
+    return spans[-limit:] if limit else spans
+
+
+def reset():
+    """Drop all recorded histograms, breakdowns and buffered spans."""
+    with _lock:
+        _histograms.clear()
+        _breakdown.clear()
+        _recent.clear()
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans=None):
+    """Render spans as an OTLP/JSON ``ExportTraceServiceRequest`` dict.
+
+    Args:
+        spans: Finished spans (default: the whole recent-span buffer)
+    """
+    if spans is None:
+        spans = recent_spans()
+    otlp_spans = []
+    for s in spans:
+        item = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in s.attributes.items()
+                if value is not None
+            ],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.parent is not None:
+            item["parentSpanId"] = s.parent.span_id
+        otlp_spans.append(item)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": SERVICE_NAME}},
+                        {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+                    ]
+                },
+                "scopeSpans": [
+                    {"scope": {"name": __name__}, "spans": otlp_spans},
+                ],
+            }
+        ]
+    }
@@ -1,7 +1,9 @@
 """Version service for strategy document snapshots (BL-1014).
 
 Provides create, list, get, restore, and auto-snapshot operations for
-Google Docs-style version browsing on strategy documents.
+Google Docs-style version browsing on strategy documents. Content is
+stored as keyframes and deltas by ``version_store``; listing reads only
+metadata columns and content is rebuilt when a single version is opened.
 """
 
 from __future__ import annotations
@@ -9,7 +11,10 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timezone
 
+from sqlalchemy.orm import load_only
+
 from ..models import StrategyDocument, StrategyVersion, db
+from .version_store import content_hash, pack
 
 logger = logging.getLogger(__name__)
 
@@ -40,21 +45,32 @@ def create_version(
         document_id=document_id,
         tenant_id=doc.tenant_id,
         version=next_version,
-        content=content,
         extracted_data=doc.extracted_data,
         edit_source=edit_source,
         description=description,
         metadata_=metadata or {},
     )
+    pack(snap, content)
     db.session.add(snap)
     db.session.commit()
     return snap.to_dict()
 
 
 def list_versions(document_id: str, limit: int = 50) -> list[dict]:
-    """List versions for a document, newest first."""
+    """List versions for a document, newest first (metadata only)."""
     versions = (
-        StrategyVersion.query.filter_by(document_id=document_id)
+        StrategyVersion.query.options(
+            load_only(
+                StrategyVersion.id,
+                StrategyVersion.document_id,
+                StrategyVersion.version,
+                StrategyVersion.edit_source,
+                StrategyVersion.description,
+                StrategyVersion.metadata_,
+                StrategyVersion.created_at,
+            )
+        )
+        .filter_by(document_id=document_id)
         .order_by(StrategyVersion.version.desc())
         .limit(limit)
         .all()
@@ -139,7 +155,11 @@ def auto_snapshot_if_needed(
         if created.tzinfo is None:
             created = created.replace(tzinfo=timezone.utc)
         age = (now - created).total_seconds()
-        if age < 30 and latest.content == doc.content:
+        if latest.content_hash is not None:
+            same = latest.content_hash == content_hash(doc.content)
+        else:
+            same = latest.content == doc.content
+        if age < 30 and same:
             logger.debug(
                 "Debounced auto-snapshot for doc %s (%.1fs old, same content)",
                 document_id,
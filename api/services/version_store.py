@@ -0,0 +1,298 @@
+"""Compact storage for strategy document versions.
+
+Snapshots used to hold a full copy of the document each. They are now
+stored as (``strategy_versions.storage``, migration 059):
+
+- ``keyframe``: zlib-compressed full text in ``payload``,
+- ``delta``: zlib-compressed line diff against a keyframe (``base_id``),
+- ``full``: plain text in ``content`` (rows written before migration 059
+  and rows built directly by tests or scripts).
+
+Deltas always point at a keyframe, never at another delta, so any version
+is rebuilt from at most two rows. A new keyframe is cut every
+``KEYFRAME_INTERVAL`` deltas, or earlier when the document has drifted so
+far from its keyframe that the delta is no longer much smaller than a
+compressed copy. ``content_hash`` / ``content_size`` let callers compare
+and describe versions without decoding them.
+
+Deleting versions goes through ``delete_versions``, which rebases the
+surviving deltas of a deleted keyframe first. ``compact_versions`` (run
+from the scheduler) re-encodes old ``full`` rows.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import logging
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from ..models import StrategyVersion, db
+
+logger = logging.getLogger(__name__)
+
+# Deltas stored against one keyframe before the next keyframe is cut
+KEYFRAME_INTERVAL = 20
+
+# A delta larger than this share of the compressed full text is stored as
+# a keyframe instead
+DELTA_MAX_RATIO = 0.5
+
+# compact_versions re-encodes full rows older than this
+COMPACT_AFTER_DAYS = 7
+
+# Minimum interval between scheduled compactions
+COMPACT_INTERVAL_SECONDS = 6 * 3600
+
+_last_compaction = 0.0
+
+
+# ---------------------------------------------------------------------------
+# Codec
+# ---------------------------------------------------------------------------
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def _compress(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 9)
+
+
+def _decompress(payload: bytes) -> str:
+    return zlib.decompress(bytes(payload)).decode("utf-8")
+
+
+def make_delta(base: str, text: str) -> list:
+    """Line diff that rebuilds ``text`` from ``base``.
+
+    Ops are ``[start, end]`` (copy base lines) or a string (insert).
+    """
+    base_lines = base.splitlines(keepends=True)
+    new_lines = text.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, base_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(new_lines[j1:j2]))
+    return ops
+
+
+def apply_delta(base: str, ops: list) -> str:
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0] : op[1]])
+    return "".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Encode / decode rows
+# ---------------------------------------------------------------------------
+
+
+def read_content(snap: StrategyVersion) -> str | None:
+    """Reconstruct a version's full text."""
+    if snap.storage == "keyframe":
+        return _decompress(snap.payload)
+    if snap.storage == "delta":
+        base = db.session.get(StrategyVersion, snap.base_id)
+        if base is None:
+            raise ValueError(
+                "Keyframe {} of version {} is missing".format(snap.base_id, snap.id)
+            )
+        ops = json.loads(_decompress(snap.payload))
+        return apply_delta(read_content(base), ops)
+    return snap.content_text
+
+
+def _set_keyframe(snap: StrategyVersion, text: str) -> None:
+    snap.storage = "keyframe"
+    snap.base_id = None
+    snap.payload = _compress(text)
+    snap.content_text = None
+
+
+def _set_delta(snap: StrategyVersion, keyframe: StrategyVersion, base: str, text: str):
+    """Store ``text`` as a delta against ``keyframe`` if that pays off.
+
+    Returns:
+        True when stored as a delta, False when it was made a keyframe.
+    """
+    payload = zlib.compress(
+        json.dumps(make_delta(base, text), separators=(",", ":")).encode("utf-8"), 9
+    )
+    if len(payload) > DELTA_MAX_RATIO * len(_compress(text)):
+        _set_keyframe(snap, text)
+        return False
+    snap.storage = "delta"
+    snap.base_id = keyframe.id
+    snap.payload = payload
+    snap.content_text = None
+    return True
+
+
+def _latest_keyframe(document_id):
+    return (
+        StrategyVersion.query.filter_by(document_id=document_id, storage="keyframe")
+        .order_by(StrategyVersion.created_at.desc(), StrategyVersion.version.desc())
+        .first()
+    )
+
+
+def pack(snap: StrategyVersion, text: str | None) -> StrategyVersion:
+    """Encode ``text`` into a new snapshot row (before it is added).
+
+    The row becomes a delta against the document's latest keyframe, or a
+    keyframe itself (first version, ``KEYFRAME_INTERVAL`` reached, or the
+    delta would not be small).
+
+    Returns:
+        ``snap``, for chaining.
+    """
+    text = text or ""
+    snap.content_hash = content_hash(text)
+    snap.content_size = len(text)
+    keyframe = _latest_keyframe(snap.document_id)
+    if keyframe is not None:
+        deltas = StrategyVersion.query.filter_by(base_id=keyframe.id).count()
+        if deltas < KEYFRAME_INTERVAL:
+            _set_delta(snap, keyframe, read_content(keyframe), text)
+            return snap
+    _set_keyframe(snap, text)
+    return snap
+
+
+def _repack_run(rows: list, texts: dict) -> None:
+    """Re-encode ``rows`` (ascending) as keyframe + deltas from ``texts``."""
+    keyframe = None
+    base = None
+    count = 0
+    for row in rows:
+        text = texts[row.id] or ""
+        row.content_hash = content_hash(text)
+        row.content_size = len(text)
+        if keyframe is not None and count < KEYFRAME_INTERVAL:
+            if _set_delta(row, keyframe, base, text):
+                count += 1
+                continue
+        else:
+            _set_keyframe(row, text)
+        keyframe, base, count = row, text, 0
+
+
+def delete_versions(versions) -> int:
+    """Delete snapshot rows, rebasing deltas that depend on them.
+
+    Surviving deltas of a deleted keyframe are re-encoded against a new
+    keyframe (the earliest of them) before the delete, and doomed deltas are
+    deleted before doomed keyframes. Runs in the caller's transaction; the
+    caller commits.
+
+    Returns:
+        Number of rows deleted.
+    """
+    versions = list(versions)
+    doomed = {v.id for v in versions}
+    keyframe_ids = [v.id for v in versions if v.storage == "keyframe"]
+    if keyframe_ids:
+        dependents = (
+            StrategyVersion.query.filter(
+                StrategyVersion.base_id.in_(keyframe_ids),
+                StrategyVersion.id.notin_(doomed),
+            )
+            .order_by(StrategyVersion.created_at, StrategyVersion.version)
+            .all()
+        )
+        texts = {row.id: read_content(row) for row in dependents}
+        by_base: dict = {}
+        for row in dependents:
+            by_base.setdefault(row.base_id, []).append(row)
+        for rows in by_base.values():
+            _repack_run(rows, texts)
+        db.session.flush()
+    # base_id has no ON DELETE action: remove deltas before the keyframes
+    # they point at (a plain session.delete orders rows by primary key)
+    delta_ids = [v.id for v in versions if v.storage == "delta"]
+    other_ids = [v.id for v in versions if v.storage != "delta"]
+    for ids in (delta_ids, other_ids):
+        if ids:
+            StrategyVersion.query.filter(StrategyVersion.id.in_(ids)).delete(
+                synchronize_session="fetch"
+            )
+    return len(versions)
+
+
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+
+
+def compact_versions(
+    older_than_days: int = COMPACT_AFTER_DAYS, document_id=None, limit_docs: int = 100
+) -> dict:
+    """Re-encode old plain-text (``full``) versions as keyframes + deltas.
+
+    Each document's full rows older than the cutoff are packed in version
+    order; existing keyframes and deltas are left alone. Commits per
+    document.
+
+    Returns:
+        ``{"documents": n, "versions": n, "bytes_before": n, "bytes_after": n}``.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    query = db.session.query(StrategyVersion.document_id).filter(
+        StrategyVersion.storage == "full",
+        StrategyVersion.created_at < cutoff,
+    )
+    if document_id is not None:
+        query = query.filter(StrategyVersion.document_id == document_id)
+    doc_ids = [r[0] for r in query.distinct().limit(limit_docs).all()]
+
+    stats = {"documents": 0, "versions": 0, "bytes_before": 0, "bytes_after": 0}
+    for doc_id in doc_ids:
+        rows = (
+            StrategyVersion.query.filter(
+                StrategyVersion.document_id == doc_id,
+                StrategyVersion.storage == "full",
+                StrategyVersion.created_at < cutoff,
+            )
+            .order_by(StrategyVersion.created_at, StrategyVersion.version)
+            .all()
+        )
+        texts = {row.id: row.content_text or "" for row in rows}
+        _repack_run(rows, texts)
+        db.session.commit()
+        stats["documents"] += 1
+        stats["versions"] += len(rows)
+        stats["bytes_before"] += sum(len(t.encode("utf-8")) for t in texts.values())
+        stats["bytes_after"] += sum(len(row.payload or b"") for row in rows)
+    if doc_ids:
+        logger.info("Compacted strategy versions: %s", stats)
+    return stats
+
+
+def maybe_compact_versions(interval_seconds: int = COMPACT_INTERVAL_SECONDS) -> None:
+    """Run ``compact_versions`` at most every ``interval_seconds``.
+
+    Failures are logged; uncompacted rows stay readable.
+    """
+    global _last_compaction
+    now = time.monotonic()
+    if _last_compaction and now - _last_compaction < interval_seconds:
+        return
+    _last_compaction = now
+    try:
+        compact_versions()
+    except Exception:
+        db.session.rollback()
+        logger.exception("Strategy version compaction failed")
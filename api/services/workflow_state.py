@@ -18,6 +18,7 @@ from ..models import (
     StrategyDocument,
     db,
 )
+from .tenant_counters import get_counters
 
 
 def _parse_jsonb(val):
@@ -127,9 +128,14 @@ PHASE_NEXT_ACTIONS = {
 }
 
 
-def compute_workflow_state(tenant_id):
+def compute_workflow_state(tenant_id, counters=None):
     """Compute the current workflow phase from actual data.
 
+    Args:
+        tenant_id: Namespace to inspect.
+        counters: Tenant counters (``tenant_counters.get_counters``); loaded
+            when omitted so contact totals never need a COUNT(*) scan.
+
     Returns a dict with:
       - current_phase: str
       - completed_phases: list[str]
@@ -159,13 +165,9 @@ def compute_workflow_state(tenant_id):
         return _build_result("strategy_draft", context)
 
     # --- Contacts ---
-    contact_count = (
-        db.session.execute(
-            db.text("SELECT COUNT(*) FROM contacts WHERE tenant_id = :t"),
-            {"t": tid},
-        ).scalar()
-        or 0
-    )
+    if counters is None:
+        counters = get_counters(tid)
+    contact_count = counters["contacts"]
     context["contacts"] = {"total": contact_count}
 
     if contact_count == 0:
@@ -175,15 +177,7 @@ def compute_workflow_state(tenant_id):
     running_pipeline = PipelineRun.query.filter_by(
         tenant_id=tid, status="running"
     ).first()
-    enriched_contacts = (
-        db.session.execute(
-            db.text(
-                "SELECT COUNT(*) FROM contacts WHERE tenant_id = :t AND processed_enrich = true"
-            ),
-            {"t": tid},
-        ).scalar()
-        or 0
-    )
+    enriched_contacts = counters["enriched_contacts"]
     completed_runs = (
         PipelineRun.query.filter_by(tenant_id=tid, status="completed")
         .order_by(PipelineRun.completed_at.desc())
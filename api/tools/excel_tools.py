@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from ..services.multimodal.document_store import DocumentStore
 from ..services.multimodal.excel_processor import (
+    PROCESSOR_VERSION,
     extract_data_with_schema,
     extract_from_file,
 )
@@ -82,6 +83,10 @@ def analyze_spreadsheet(args: dict, ctx: ToolContext) -> dict:
     if result.errors:
         return {"error": "; ".join(result.errors)}
 
+    store.record_processing(
+        file_id, ctx.tenant_id, "excel", PROCESSOR_VERSION, result.cached
+    )
+
     return {
         "filename": info.get("filename", ""),
         "sheets": [
@@ -7,10 +7,13 @@ keyframes, and generating combined summaries.
 
 from __future__ import annotations
 
+import logging
 import os
 
 from ..services.multimodal.document_store import DocumentStore
 from ..services.multimodal.video_processor import (
+    PROCESSOR_VERSION,
+    VISION_MODEL,
     check_ffmpeg,
     download_video_url,
     estimate_cost,
@@ -19,6 +22,8 @@ from ..services.multimodal.video_processor import (
 )
 from ..services.tool_registry import ToolContext, ToolDefinition
 
+logger = logging.getLogger(__name__)
+
 
 def analyze_video(args: dict, ctx: ToolContext) -> dict:
     """Analyze a video file or URL.
@@ -82,16 +87,33 @@ def analyze_video(args: dict, ctx: ToolContext) -> dict:
             "query": query,
         }
 
-    # Full processing
+    # Full processing; keyframes are described here when a Claude key is set
+    describe_frames = bool(os.environ.get("ANTHROPIC_API_KEY"))
     result = process_video(
         file_path,
         max_duration_minutes=max_duration,
         openai_api_key=os.environ.get("OPENAI_API_KEY"),
+        describe_frames=describe_frames,
+        query=query,
     )
 
+    # Vision tokens are spent even when the other branch failed
+    if result.vision_calls:
+        _log_vision_usage(ctx, result)
+
     if result.error:
         return {"error": result.error, "filename": filename}
 
+    if file_id:
+        store.record_processing(
+            file_id,
+            ctx.tenant_id,
+            "video",
+            PROCESSOR_VERSION,
+            result.cached,
+            content_sha256=metadata.file_hash or None,
+        )
+
     response = {
         "filename": filename,
         "cached": result.cached,
@@ -99,6 +121,7 @@ def analyze_video(args: dict, ctx: ToolContext) -> dict:
         "estimated_cost_usd": cost.total_cost_usd,
         "has_audio": metadata.has_audio,
         "query": query,
+        "timings": result.timings,
     }
 
     # Transcript
@@ -110,12 +133,13 @@ def analyze_video(args: dict, ctx: ToolContext) -> dict:
         response["transcript"] = transcript
         response["transcript_segments_count"] = len(result.transcript_segments)
 
-    # Keyframes (paths only -- agent handles vision API calls)
+    # Keyframes: descriptions when described, else paths for the agent
     if result.keyframes:
         response["keyframes"] = [
             {
                 "timestamp_seconds": kf.timestamp_seconds,
                 "file_path": kf.file_path,
+                "description": kf.description,
                 "time_formatted": "{:02d}:{:02d}".format(
                     int(kf.timestamp_seconds // 60),
                     int(kf.timestamp_seconds % 60),
@@ -123,16 +147,41 @@ def analyze_video(args: dict, ctx: ToolContext) -> dict:
             }
             for kf in result.keyframes
         ]
+        response["duplicate_keyframes_skipped"] = result.duplicate_keyframes
+    if result.visual_summary:
+        response["visual_summary"] = result.visual_summary
 
     return response
 
 
+def _log_vision_usage(ctx: ToolContext, result) -> None:
+    """Record keyframe description tokens against the tenant."""
+    try:
+        from ..models import db
+        from ..services.llm_logger import log_llm_usage
+
+        log_llm_usage(
+            tenant_id=ctx.tenant_id,
+            operation="video_keyframes",
+            model=VISION_MODEL,
+            input_tokens=result.vision_input_tokens,
+            output_tokens=result.vision_output_tokens,
+            user_id=ctx.user_id,
+            duration_ms=int(result.timings.get("describe", 0) * 1000),
+            metadata={"calls": result.vision_calls, "frames": len(result.keyframes)},
+        )
+        db.session.commit()
+    except Exception:
+        logger.exception("Failed to log video vision usage")
+
+
 VIDEO_TOOLS = [
     ToolDefinition(
         name="analyze_video",
         description=(
             "Analyze a video file or URL (YouTube, Vimeo). Extracts audio "
-            "transcript (via Whisper), keyframes (via scene detection), and "
+            "transcript (via Whisper), keyframes (via scene detection) with "
+            "descriptions of what is on screen, and "
             "provides cost estimates. Use estimate_only=true first to check "
             "cost before full processing. Videos longer than 15 minutes are "
             "rejected. Supports uploaded files (by file_id) and URLs."
@@ -0,0 +1,6 @@
+-- Migration 048: Prompt-cache token accounting on llm_usage_log
+-- Anthropic reports cache writes and cache reads separately from input_tokens.
+-- Tracking them lets the usage report show cache hit rate per operation.
+
+ALTER TABLE llm_usage_log ADD COLUMN IF NOT EXISTS cache_creation_tokens INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE llm_usage_log ADD COLUMN IF NOT EXISTS cache_read_tokens INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,20 @@
+-- Migration 049: Shared planner state store
+-- Replaces the per-process planner_bridge._active_plans dict so plans
+-- started on one gunicorn worker can be resumed on another.
+-- state is zlib-compressed JSON; version backs optimistic concurrency.
+
+CREATE TABLE IF NOT EXISTS planner_states (
+    thread_id text PRIMARY KEY,
+    tenant_id uuid REFERENCES tenants(id),
+    plan_id text,
+    state bytea NOT NULL,
+    state_bytes integer NOT NULL DEFAULT 0,
+    version integer NOT NULL DEFAULT 1,
+    updated_at timestamptz NOT NULL DEFAULT now(),
+    expires_at timestamptz NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_planner_states_expires
+    ON planner_states (expires_at);
+CREATE INDEX IF NOT EXISTS idx_planner_states_tenant
+    ON planner_states (tenant_id);
@@ -0,0 +1,30 @@
+-- Migration 050: Inverted keyword index for long-term memory retrieval
+-- MemoryStore.retrieve() previously loaded the newest 100 facts per tenant
+-- and scored them in Python, so older facts were never found. Facts are now
+-- ranked with BM25 in SQL over this keyword -> fact table.
+
+ALTER TABLE memory_facts ADD COLUMN IF NOT EXISTS keyword_count integer NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS memory_fact_keywords (
+    fact_id uuid NOT NULL REFERENCES memory_facts(id) ON DELETE CASCADE,
+    tenant_id uuid NOT NULL REFERENCES tenants(id),
+    keyword text NOT NULL,
+    PRIMARY KEY (fact_id, keyword)
+);
+
+-- Posting-list lookup: all facts of a tenant containing a keyword
+CREATE INDEX IF NOT EXISTS idx_memory_fact_keywords_lookup
+    ON memory_fact_keywords (tenant_id, keyword, fact_id);
+
+CREATE INDEX IF NOT EXISTS idx_memory_facts_playbook
+    ON memory_facts (tenant_id, playbook_id);
+
+-- Backfill from the keywords array
+UPDATE memory_facts
+SET keyword_count = COALESCE(cardinality(keywords), 0)
+WHERE keyword_count = 0;
+
+INSERT INTO memory_fact_keywords (fact_id, tenant_id, keyword)
+SELECT DISTINCT f.id, f.tenant_id, kw
+FROM memory_facts f, unnest(f.keywords) AS kw
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,27 @@
+-- Migration 051: Local embeddings for semantic memory recall
+-- int8-quantized hashing-trick vectors (256 dims) per memory fact. When the
+-- pgvector extension is available a vector column + HNSW index is added and
+-- used for nearest-neighbour search; otherwise the API scans the compact
+-- embedding bytes in-process.
+
+CREATE TABLE IF NOT EXISTS memory_fact_embeddings (
+    fact_id uuid PRIMARY KEY REFERENCES memory_facts(id) ON DELETE CASCADE,
+    tenant_id uuid NOT NULL REFERENCES tenants(id),
+    playbook_id uuid,
+    model varchar(32) NOT NULL,
+    embedding bytea NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_memory_fact_embeddings_tenant
+    ON memory_fact_embeddings (tenant_id, created_at DESC);
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'vector') THEN
+        CREATE EXTENSION IF NOT EXISTS vector;
+        ALTER TABLE memory_fact_embeddings ADD COLUMN IF NOT EXISTS vec vector(256);
+        CREATE INDEX IF NOT EXISTS idx_memory_fact_embeddings_vec
+            ON memory_fact_embeddings USING hnsw (vec vector_cosine_ops);
+    END IF;
+END $$;
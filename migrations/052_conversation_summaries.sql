@@ -0,0 +1,20 @@
+-- Migration 052: Rolling conversation summaries per chat thread
+-- post_chat_message loads only messages newer than covered_until and folds
+-- older ones into the stored summary incrementally.
+
+CREATE TABLE IF NOT EXISTS conversation_summaries (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    tenant_id UUID NOT NULL REFERENCES tenants(id),
+    document_id UUID NOT NULL REFERENCES strategy_documents(id) ON DELETE CASCADE,
+    thread_key VARCHAR(36) NOT NULL,
+    summary TEXT NOT NULL,
+    last_message_id UUID NOT NULL,
+    covered_until TIMESTAMPTZ NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    UNIQUE (document_id, thread_key)
+);
+
+-- Delta loads: messages of a document after the checkpoint
+CREATE INDEX IF NOT EXISTS idx_strategy_chat_messages_doc_created
+    ON strategy_chat_messages (document_id, created_at);
@@ -0,0 +1,31 @@
+-- Migration 053: Pre-aggregated LLM usage rollups
+-- /api/llm-usage/summary reads hourly/daily aggregates plus the raw
+-- llm_usage_log tail after llm_usage_rollup_state.compacted_until instead of
+-- aggregating the whole log on every request. The first compaction
+-- backfills all existing log rows.
+
+CREATE TABLE IF NOT EXISTS llm_usage_rollups (
+    granularity varchar(4) NOT NULL CHECK (granularity IN ('hour', 'day')),
+    period_start timestamptz NOT NULL,
+    tenant_id uuid NOT NULL,
+    operation text NOT NULL,
+    provider text NOT NULL,
+    model text NOT NULL,
+    calls integer NOT NULL DEFAULT 0,
+    cost_usd numeric(14, 6) NOT NULL DEFAULT 0,
+    input_tokens bigint NOT NULL DEFAULT 0,
+    output_tokens bigint NOT NULL DEFAULT 0,
+    cache_creation_tokens bigint NOT NULL DEFAULT 0,
+    cache_read_tokens bigint NOT NULL DEFAULT 0,
+    PRIMARY KEY (granularity, period_start, tenant_id, operation, provider, model)
+);
+
+CREATE TABLE IF NOT EXISTS llm_usage_rollup_state (
+    id integer PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    compacted_until timestamptz,
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+INSERT INTO llm_usage_rollup_state (id, compacted_until) VALUES (1, NULL)
+ON CONFLICT (id) DO NOTHING;
+
@@ -0,0 +1,283 @@
+-- Migration 054: Per-tenant live counters
+-- Dashboard endpoints (workflow-suggestions, onboarding-status) read one row
+-- instead of running COUNT(*) over contacts/companies/messages/campaigns on
+-- every poll. Counters are maintained in the writing transaction by
+-- statement-level triggers (one upsert per tenant per statement, so bulk
+-- imports stay cheap); services.tenant_counters.repair_counters() recomputes
+-- drift.
+
+CREATE TABLE IF NOT EXISTS tenant_counters (
+    tenant_id uuid PRIMARY KEY REFERENCES tenants(id) ON DELETE CASCADE,
+    contacts integer NOT NULL DEFAULT 0,
+    enriched_contacts integer NOT NULL DEFAULT 0,
+    companies integer NOT NULL DEFAULT 0,
+    l1_enriched_companies integer NOT NULL DEFAULT 0,
+    triage_passed integer NOT NULL DEFAULT 0,
+    triage_disqualified integer NOT NULL DEFAULT 0,
+    messages integer NOT NULL DEFAULT 0,
+    campaigns integer NOT NULL DEFAULT 0,
+    active_campaigns integer NOT NULL DEFAULT 0,
+    updated_at timestamptz NOT NULL DEFAULT now(),
+    repaired_at timestamptz
+);
+
+CREATE OR REPLACE FUNCTION bump_tenant_counters(
+    p_tenant uuid,
+    p_contacts integer DEFAULT 0,
+    p_enriched_contacts integer DEFAULT 0,
+    p_companies integer DEFAULT 0,
+    p_l1_enriched_companies integer DEFAULT 0,
+    p_triage_passed integer DEFAULT 0,
+    p_triage_disqualified integer DEFAULT 0,
+    p_messages integer DEFAULT 0,
+    p_campaigns integer DEFAULT 0,
+    p_active_campaigns integer DEFAULT 0
+) RETURNS void AS $$
+BEGIN
+    IF p_tenant IS NULL THEN
+        RETURN;
+    END IF;
+    INSERT INTO tenant_counters AS tc (
+        tenant_id, contacts, enriched_contacts, companies,
+        l1_enriched_companies, triage_passed, triage_disqualified,
+        messages, campaigns, active_campaigns
+    ) VALUES (
+        p_tenant, p_contacts, p_enriched_contacts, p_companies,
+        p_l1_enriched_companies, p_triage_passed, p_triage_disqualified,
+        p_messages, p_campaigns, p_active_campaigns
+    )
+    ON CONFLICT (tenant_id) DO UPDATE SET
+        contacts = tc.contacts + EXCLUDED.contacts,
+        enriched_contacts = tc.enriched_contacts + EXCLUDED.enriched_contacts,
+        companies = tc.companies + EXCLUDED.companies,
+        l1_enriched_companies = tc.l1_enriched_companies + EXCLUDED.l1_enriched_companies,
+        triage_passed = tc.triage_passed + EXCLUDED.triage_passed,
+        triage_disqualified = tc.triage_disqualified + EXCLUDED.triage_disqualified,
+        messages = tc.messages + EXCLUDED.messages,
+        campaigns = tc.campaigns + EXCLUDED.campaigns,
+        active_campaigns = tc.active_campaigns + EXCLUDED.active_campaigns,
+        updated_at = now();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Each trigger function turns the statement's transition rows into signed
+-- per-tenant deltas: +1 for rows in new_rows, -1 for rows in old_rows.
+
+-- contacts ------------------------------------------------------------------
+CREATE OR REPLACE FUNCTION trg_tenant_counters_contacts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_tenant_counters(d.tenant_id,
+            p_contacts => d.n, p_enriched_contacts => d.enriched)
+        FROM (SELECT tenant_id, COUNT(*)::int AS n,
+                     (COUNT(*) FILTER (WHERE processed_enrich))::int AS enriched
+              FROM new_rows GROUP BY tenant_id) d;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_tenant_counters(d.tenant_id,
+            p_contacts => -d.n, p_enriched_contacts => -d.enriched)
+        FROM (SELECT tenant_id, COUNT(*)::int AS n,
+                     (COUNT(*) FILTER (WHERE processed_enrich))::int AS enriched
+              FROM old_rows GROUP BY tenant_id) d;
+    ELSE
+        PERFORM bump_tenant_counters(d.tenant_id,
+            p_contacts => d.n, p_enriched_contacts => d.enriched)
+        FROM (SELECT tenant_id, SUM(n)::int AS n, SUM(enriched)::int AS enriched
+              FROM (SELECT tenant_id, 1 AS n,
+                           CASE WHEN processed_enrich THEN 1 ELSE 0 END AS enriched
+                    FROM new_rows
+                    UNION ALL
+                    SELECT tenant_id, -1,
+                           CASE WHEN processed_enrich THEN -1 ELSE 0 END
+                    FROM old_rows) x
+              GROUP BY tenant_id) d
+        WHERE d.n <> 0 OR d.enriched <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tenant_counters_contacts_ins ON contacts;
+CREATE TRIGGER tenant_counters_contacts_ins AFTER INSERT ON contacts
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_tenant_counters_contacts();
+DROP TRIGGER IF EXISTS tenant_counters_contacts_del ON contacts;
+CREATE TRIGGER tenant_counters_contacts_del AFTER DELETE ON contacts
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_tenant_counters_contacts();
+DROP TRIGGER IF EXISTS tenant_counters_contacts_upd ON contacts;
+CREATE TRIGGER tenant_counters_contacts_upd AFTER UPDATE ON contacts
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_tenant_counters_contacts();
+
+-- companies (total + triage outcome by status) ------------------------------
+CREATE OR REPLACE FUNCTION trg_tenant_counters_companies() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_tenant_counters(d.tenant_id, p_companies => d.n,
+            p_triage_passed => d.passed, p_triage_disqualified => d.disq)
+        FROM (SELECT tenant_id, COUNT(*)::int AS n,
+                     (COUNT(*) FILTER (WHERE status = 'triage_passed'))::int AS passed,
+                     (COUNT(*) FILTER (WHERE status = 'triage_disqualified'))::int AS disq
+              FROM new_rows GROUP BY tenant_id) d;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_tenant_counters(d.tenant_id, p_companies => -d.n,
+            p_triage_passed => -d.passed, p_triage_disqualified => -d.disq)
+        FROM (SELECT tenant_id, COUNT(*)::int AS n,
+                     (COUNT(*) FILTER (WHERE status = 'triage_passed'))::int AS passed,
+                     (COUNT(*) FILTER (WHERE status = 'triage_disqualified'))::int AS disq
+              FROM old_rows GROUP BY tenant_id) d;
+    ELSE
+        PERFORM bump_tenant_counters(d.tenant_id, p_companies => d.n,
+            p_triage_passed => d.passed, p_triage_disqualified => d.disq)
+        FROM (SELECT tenant_id, SUM(n)::int AS n, SUM(passed)::int AS passed,
+                     SUM(disq)::int AS disq
+              FROM (SELECT tenant_id, 1 AS n,
+                           CASE WHEN status = 'triage_passed' THEN 1 ELSE 0 END AS passed,
+                           CASE WHEN status = 'triage_disqualified' THEN 1 ELSE 0 END AS disq
+                    FROM new_rows
+                    UNION ALL
+                    SELECT tenant_id, -1,
+                           CASE WHEN status = 'triage_passed' THEN -1 ELSE 0 END,
+                           CASE WHEN status = 'triage_disqualified' THEN -1 ELSE 0 END
+                    FROM old_rows) x
+              GROUP BY tenant_id) d
+        WHERE d.n <> 0 OR d.passed <> 0 OR d.disq <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tenant_counters_companies_ins ON companies;
+CREATE TRIGGER tenant_counters_companies_ins AFTER INSERT ON companies
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_tenant_counters_companies();
+DROP TRIGGER IF EXISTS tenant_counters_companies_del ON companies;
+CREATE TRIGGER tenant_counters_companies_del AFTER DELETE ON companies
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_tenant_counters_companies();
+DROP TRIGGER IF EXISTS tenant_counters_companies_upd ON companies;
+CREATE TRIGGER tenant_counters_companies_upd AFTER UPDATE ON companies
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_tenant_counters_companies();
+
+-- company_enrichment_l1 (tenant resolved through companies) -----------------
+CREATE OR REPLACE FUNCTION trg_tenant_counters_l1() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_tenant_counters(d.tenant_id, p_l1_enriched_companies => d.n)
+        FROM (SELECT c.tenant_id, COUNT(*)::int AS n
+              FROM new_rows r JOIN companies c ON c.id = r.company_id
+              GROUP BY c.tenant_id) d;
+    ELSE
+        PERFORM bump_tenant_counters(d.tenant_id, p_l1_enriched_companies => -d.n)
+        FROM (SELECT c.tenant_id, COUNT(*)::int AS n
+              FROM old_rows r JOIN companies c ON c.id = r.company_id
+              GROUP BY c.tenant_id) d;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tenant_counters_l1_ins ON company_enrichment_l1;
+CREATE TRIGGER tenant_counters_l1_ins AFTER INSERT ON company_enrichment_l1
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_tenant_counters_l1();
+DROP TRIGGER IF EXISTS tenant_counters_l1_del ON company_enrichment_l1;
+CREATE TRIGGER tenant_counters_l1_del AFTER DELETE ON company_enrichment_l1
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_tenant_counters_l1();
+
+-- messages ------------------------------------------------------------------
+CREATE OR REPLACE FUNCTION trg_tenant_counters_messages() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_tenant_counters(d.tenant_id, p_messages => d.n)
+        FROM (SELECT tenant_id, COUNT(*)::int AS n FROM new_rows
+              GROUP BY tenant_id) d;
+    ELSE
+        PERFORM bump_tenant_counters(d.tenant_id, p_messages => -d.n)
+        FROM (SELECT tenant_id, COUNT(*)::int AS n FROM old_rows
+              GROUP BY tenant_id) d;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tenant_counters_messages_ins ON messages;
+CREATE TRIGGER tenant_counters_messages_ins AFTER INSERT ON messages
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_tenant_counters_messages();
+DROP TRIGGER IF EXISTS tenant_counters_messages_del ON messages;
+CREATE TRIGGER tenant_counters_messages_del AFTER DELETE ON messages
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_tenant_counters_messages();
+
+-- campaigns (total + active by status) --------------------------------------
+CREATE OR REPLACE FUNCTION trg_tenant_counters_campaigns() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_tenant_counters(d.tenant_id, p_campaigns => d.n,
+            p_active_campaigns => d.active)
+        FROM (SELECT tenant_id, COUNT(*)::int AS n,
+                     (COUNT(*) FILTER (WHERE status IN ('generating', 'review', 'active')))::int AS active
+              FROM new_rows GROUP BY tenant_id) d;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_tenant_counters(d.tenant_id, p_campaigns => -d.n,
+            p_active_campaigns => -d.active)
+        FROM (SELECT tenant_id, COUNT(*)::int AS n,
+                     (COUNT(*) FILTER (WHERE status IN ('generating', 'review', 'active')))::int AS active
+              FROM old_rows GROUP BY tenant_id) d;
+    ELSE
+        PERFORM bump_tenant_counters(d.tenant_id, p_campaigns => d.n,
+            p_active_campaigns => d.active)
+        FROM (SELECT tenant_id, SUM(n)::int AS n, SUM(active)::int AS active
+              FROM (SELECT tenant_id, 1 AS n,
+                           CASE WHEN status IN ('generating', 'review', 'active')
+                                THEN 1 ELSE 0 END AS active
+                    FROM new_rows
+                    UNION ALL
+                    SELECT tenant_id, -1,
+                           CASE WHEN status IN ('generating', 'review', 'active')
+                                THEN -1 ELSE 0 END
+                    FROM old_rows) x
+              GROUP BY tenant_id) d
+        WHERE d.n <> 0 OR d.active <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tenant_counters_campaigns_ins ON campaigns;
+CREATE TRIGGER tenant_counters_campaigns_ins AFTER INSERT ON campaigns
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_tenant_counters_campaigns();
+DROP TRIGGER IF EXISTS tenant_counters_campaigns_del ON campaigns;
+CREATE TRIGGER tenant_counters_campaigns_del AFTER DELETE ON campaigns
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_tenant_counters_campaigns();
+DROP TRIGGER IF EXISTS tenant_counters_campaigns_upd ON campaigns;
+CREATE TRIGGER tenant_counters_campaigns_upd AFTER UPDATE ON campaigns
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_tenant_counters_campaigns();
+
+-- Backfill ------------------------------------------------------------------
+INSERT INTO tenant_counters (
+    tenant_id, contacts, enriched_contacts, companies, l1_enriched_companies,
+    triage_passed, triage_disqualified, messages, campaigns, active_campaigns,
+    repaired_at
+)
+SELECT t.id,
+    (SELECT COUNT(*) FROM contacts WHERE tenant_id = t.id),
+    (SELECT COUNT(*) FROM contacts WHERE tenant_id = t.id AND processed_enrich = true),
+    (SELECT COUNT(*) FROM companies WHERE tenant_id = t.id),
+    (SELECT COUNT(*) FROM company_enrichment_l1 l
+        JOIN companies c ON c.id = l.company_id WHERE c.tenant_id = t.id),
+    (SELECT COUNT(*) FROM companies WHERE tenant_id = t.id AND status = 'triage_passed'),
+    (SELECT COUNT(*) FROM companies WHERE tenant_id = t.id AND status = 'triage_disqualified'),
+    (SELECT COUNT(*) FROM messages WHERE tenant_id = t.id),
+    (SELECT COUNT(*) FROM campaigns WHERE tenant_id = t.id),
+    (SELECT COUNT(*) FROM campaigns WHERE tenant_id = t.id
+        AND status IN ('generating', 'review', 'active')),
+    now()
+FROM tenants t
+ON CONFLICT (tenant_id) DO NOTHING;
@@ -0,0 +1,22 @@
+-- Migration 055: Incremental Gmail scan checkpoints
+-- After a completed scan the scanner stores the mailbox historyId, the
+-- newest processed message internalDate (watermark) and the aggregated
+-- contacts per OAuth connection. The next scan asks users.history.list for
+-- messages added since that historyId and merges them into the stored
+-- contacts instead of re-reading the whole mailbox.
+
+CREATE TABLE IF NOT EXISTS gmail_scan_checkpoints (
+    oauth_connection_id uuid PRIMARY KEY
+        REFERENCES oauth_connections(id) ON DELETE CASCADE,
+    tenant_id uuid NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+    history_id text NOT NULL,
+    last_internal_date bigint NOT NULL DEFAULT 0,
+    config_key text NOT NULL DEFAULT '',
+    contacts jsonb NOT NULL DEFAULT '{}'::jsonb,
+    messages_scanned integer NOT NULL DEFAULT 0,
+    last_scan_mode text,
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_gmail_scan_checkpoints_tenant
+    ON gmail_scan_checkpoints(tenant_id);
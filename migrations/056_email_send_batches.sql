@@ -0,0 +1,12 @@
+-- Migration 056: Resumable batched email sends
+-- send_campaign_emails() sends approved messages through Resend's batch
+-- endpoint. Each batch's rows are committed as 'queued' with the batch's
+-- Idempotency-Key before the API call, so a send interrupted by a crash is
+-- resumed by replaying the same batch with the same key (Resend returns the
+-- original result instead of sending twice).
+
+ALTER TABLE email_send_log ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_email_send_log_queued_batch
+    ON email_send_log(tenant_id, idempotency_key)
+    WHERE status = 'queued';
@@ -0,0 +1,80 @@
+-- Migration 057: Materialized enrichment-context bundles
+-- Message generation needs the same company profile, L2/module enrichment
+-- and person enrichment for every step, variant and regeneration. The
+-- enrichers store a compact JSON bundle per company and per contact on
+-- write; services.context_bundles loads all bundles for a campaign in one
+-- query. Row-level triggers delete a bundle whenever one of its source rows
+-- changes, so a stale bundle is never served and is rebuilt on next read.
+
+CREATE TABLE IF NOT EXISTS enrichment_context_bundles (
+    entity_type text NOT NULL CHECK (entity_type IN ('company', 'contact')),
+    entity_id uuid NOT NULL,
+    tenant_id uuid NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+    version smallint NOT NULL,
+    bundle jsonb NOT NULL DEFAULT '{}'::jsonb,
+    built_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (entity_type, entity_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_enrichment_context_bundles_tenant
+    ON enrichment_context_bundles(tenant_id);
+
+-- Invalidation ---------------------------------------------------------------
+-- TG_ARGV[0] is the bundle entity type, TG_ARGV[1] the column holding its id.
+
+CREATE OR REPLACE FUNCTION trg_invalidate_context_bundle() RETURNS trigger AS $$
+DECLARE
+    v_id uuid;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        EXECUTE format('SELECT ($1).%I', TG_ARGV[1]) INTO v_id USING OLD;
+    ELSE
+        EXECUTE format('SELECT ($1).%I', TG_ARGV[1]) INTO v_id USING NEW;
+    END IF;
+    DELETE FROM enrichment_context_bundles
+    WHERE entity_type = TG_ARGV[0] AND entity_id = v_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS context_bundle_companies ON companies;
+CREATE TRIGGER context_bundle_companies
+    AFTER UPDATE OF name, domain, industry, hq_country, summary, company_size,
+        verified_employees, verified_revenue_eur_m, tier, business_model
+    OR DELETE ON companies
+    FOR EACH ROW EXECUTE FUNCTION trg_invalidate_context_bundle('company', 'id');
+
+DROP TRIGGER IF EXISTS context_bundle_l2 ON company_enrichment_l2;
+CREATE TRIGGER context_bundle_l2
+    AFTER INSERT OR UPDATE OR DELETE ON company_enrichment_l2
+    FOR EACH ROW EXECUTE FUNCTION trg_invalidate_context_bundle('company', 'company_id');
+
+DROP TRIGGER IF EXISTS context_bundle_profile ON company_enrichment_profile;
+CREATE TRIGGER context_bundle_profile
+    AFTER INSERT OR UPDATE OR DELETE ON company_enrichment_profile
+    FOR EACH ROW EXECUTE FUNCTION trg_invalidate_context_bundle('company', 'company_id');
+
+DROP TRIGGER IF EXISTS context_bundle_signals ON company_enrichment_signals;
+CREATE TRIGGER context_bundle_signals
+    AFTER INSERT OR UPDATE OR DELETE ON company_enrichment_signals
+    FOR EACH ROW EXECUTE FUNCTION trg_invalidate_context_bundle('company', 'company_id');
+
+DROP TRIGGER IF EXISTS context_bundle_market ON company_enrichment_market;
+CREATE TRIGGER context_bundle_market
+    AFTER INSERT OR UPDATE OR DELETE ON company_enrichment_market
+    FOR EACH ROW EXECUTE FUNCTION trg_invalidate_context_bundle('company', 'company_id');
+
+DROP TRIGGER IF EXISTS context_bundle_opportunity ON company_enrichment_opportunity;
+CREATE TRIGGER context_bundle_opportunity
+    AFTER INSERT OR UPDATE OR DELETE ON company_enrichment_opportunity
+    FOR EACH ROW EXECUTE FUNCTION trg_invalidate_context_bundle('company', 'company_id');
+
+DROP TRIGGER IF EXISTS context_bundle_contacts ON contacts;
+CREATE TRIGGER context_bundle_contacts
+    AFTER DELETE ON contacts
+    FOR EACH ROW EXECUTE FUNCTION trg_invalidate_context_bundle('contact', 'id');
+
+DROP TRIGGER IF EXISTS context_bundle_contact_enrichment ON contact_enrichment;
+CREATE TRIGGER context_bundle_contact_enrichment
+    AFTER INSERT OR UPDATE OR DELETE ON contact_enrichment
+    FOR EACH ROW EXECUTE FUNCTION trg_invalidate_context_bundle('contact', 'contact_id');
@@ -0,0 +1,25 @@
+-- Migration 058: Logged routing/intent/interrupt classification decisions
+-- The router, intent classifier and interrupt classifier record which
+-- label they chose for a (normalized) message and whether it came from the
+-- keyword fast path, Haiku or the local classifier. Keyword and Haiku rows
+-- are the training set for the local classifier
+-- (scripts/train_route_classifier.py) and the Haiku baseline for its
+-- offline evaluation (scripts/eval_route_classifier.py).
+
+CREATE TABLE IF NOT EXISTS route_decisions (
+    id uuid DEFAULT uuid_generate_v4() PRIMARY KEY,
+    tenant_id uuid REFERENCES tenants(id) ON DELETE CASCADE,
+    task text NOT NULL CHECK (task IN ('route', 'intent', 'interrupt')),
+    message text NOT NULL,
+    context jsonb DEFAULT '{}'::jsonb,
+    label text NOT NULL,
+    source text NOT NULL CHECK (source IN ('keyword', 'haiku', 'local')),
+    confidence double precision,
+    latency_ms integer,
+    created_at timestamptz DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_route_decisions_task_created
+    ON route_decisions (task, created_at);
+CREATE INDEX IF NOT EXISTS idx_route_decisions_tenant
+    ON route_decisions (tenant_id);
@@ -0,0 +1,18 @@
+-- Migration 059: Keyframe + delta storage for strategy document versions
+-- Versions were full copies of the document. New versions are stored as
+-- zlib-compressed keyframes or as compressed line diffs against the latest
+-- keyframe (base_id); see api/services/version_store.py. Existing rows keep
+-- storage = 'full' (plain text in content) until the scheduler's compaction
+-- re-encodes them. content_hash / content_size describe a version without
+-- decoding it.
+
+ALTER TABLE strategy_versions
+    ADD COLUMN IF NOT EXISTS storage varchar(10) NOT NULL DEFAULT 'full'
+        CHECK (storage IN ('full', 'keyframe', 'delta')),
+    ADD COLUMN IF NOT EXISTS base_id uuid REFERENCES strategy_versions(id),
+    ADD COLUMN IF NOT EXISTS payload bytea,
+    ADD COLUMN IF NOT EXISTS content_hash varchar(64),
+    ADD COLUMN IF NOT EXISTS content_size integer;
+
+CREATE INDEX IF NOT EXISTS idx_strategy_versions_base
+    ON strategy_versions (base_id) WHERE base_id IS NOT NULL;
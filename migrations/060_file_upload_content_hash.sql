@@ -0,0 +1,10 @@
+-- Migration 060: Content hash on file uploads
+-- DocumentStore.extract_pdf records the SHA-256 of each upload and reuses
+-- the extracted_content rows (text, tables, vision descriptions, summary)
+-- of an already processed upload of the same tenant with the same hash.
+
+ALTER TABLE file_uploads ADD COLUMN IF NOT EXISTS content_sha256 varchar(64);
+
+CREATE INDEX IF NOT EXISTS idx_file_uploads_sha256
+    ON file_uploads (tenant_id, content_sha256)
+    WHERE content_sha256 IS NOT NULL;
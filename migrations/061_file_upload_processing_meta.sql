@@ -0,0 +1,11 @@
+-- Migration 061: Processing metadata on file uploads
+-- Records which multimodal processor (and version) handled an upload and
+-- whether the shared on-disk result cache (api/services/multimodal/
+-- result_cache.py, keyed on content hash + processor version + options)
+-- answered it.
+
+ALTER TABLE file_uploads
+    ADD COLUMN IF NOT EXISTS processor varchar(20),
+    ADD COLUMN IF NOT EXISTS processor_version varchar(20),
+    ADD COLUMN IF NOT EXISTS cache_hit boolean,
+    ADD COLUMN IF NOT EXISTS processed_at timestamptz;
@@ -0,0 +1,25 @@
+-- Migration 062: Empirical stage cost and duration model
+-- entity_stage_completions records how long each entity took, and
+-- stage_cost_models keeps a bounded window of recent per-entity samples
+-- (cost_usd, duration_ms) per tenant (scope = tenant id) and across all
+-- tenants (scope = 'global'), plus per-model LLM call samples from
+-- llm_usage_log and the percentiles derived from them
+-- (api/services/stage_estimates.py). The watermarks let each refresh read
+-- only rows added since the previous one.
+
+ALTER TABLE entity_stage_completions
+    ADD COLUMN IF NOT EXISTS duration_ms integer;
+
+CREATE INDEX IF NOT EXISTS idx_esc_stage_completed
+    ON entity_stage_completions(stage, completed_at);
+
+CREATE TABLE IF NOT EXISTS stage_cost_models (
+    scope text NOT NULL,
+    stage text NOT NULL,
+    samples jsonb NOT NULL DEFAULT '{}'::jsonb,
+    stats jsonb NOT NULL DEFAULT '{}'::jsonb,
+    completions_until timestamptz,
+    usage_until timestamptz,
+    updated_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (scope, stage)
+);
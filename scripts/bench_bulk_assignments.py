@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark the set-based bulk assignment engine at 100k entities.
+
+Seeds synthetic contacts plus two tags and a campaign for an existing
+tenant, then times link_entities()/unlink_entities() for tag add (fresh and
+repeated), tag removal and campaign assignment. Seeded contacts use the
+@bench-bulk.invalid email domain and seeded tags/campaign are prefixed
+"bench-bulk-", so --cleanup removes only them.
+
+Usage (against a disposable/staging database):
+  python3 scripts/bench_bulk_assignments.py --tenant-id <uuid> --contacts 100000
+  python3 scripts/bench_bulk_assignments.py --tenant-id <uuid> --cleanup
+
+Prerequisites:
+  - DATABASE_URL env var or .env file
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import text as sa_text  # noqa: E402
+
+from api import create_app  # noqa: E402
+from api.models import db  # noqa: E402
+from api.services.bulk_assignments import link_entities, unlink_entities  # noqa: E402
+
+BENCH_DOMAIN = "bench-bulk.invalid"
+BENCH_PREFIX = "bench-bulk-"
+BATCH_SIZE = 5000
+
+
+def seed(tenant_id, count):
+    started = time.perf_counter()
+    rows = []
+    for i in range(count):
+        rows.append(
+            {
+                "id": str(uuid.uuid4()),
+                "tid": tenant_id,
+                "fn": "Bench{}".format(i),
+                "email": "bench{}@{}".format(i, BENCH_DOMAIN),
+            }
+        )
+        if len(rows) >= BATCH_SIZE or i == count - 1:
+            db.session.execute(
+                sa_text(
+                    "INSERT INTO contacts (id, tenant_id, first_name, last_name, "
+                    "email_address) VALUES (:id, :tid, :fn, '', :email)"
+                ),
+                rows,
+            )
+            db.session.commit()
+            rows = []
+            print(f"  seeded {i + 1}/{count}", end="\r")
+
+    tag_ids = []
+    for name in ("tag-a", "tag-b"):
+        tag_ids.append(
+            db.session.execute(
+                sa_text(
+                    "INSERT INTO tags (tenant_id, name) VALUES (:tid, :name) "
+                    "RETURNING id"
+                ),
+                {"tid": tenant_id, "name": BENCH_PREFIX + name},
+            ).scalar()
+        )
+    campaign_id = db.session.execute(
+        sa_text(
+            "INSERT INTO campaigns (tenant_id, name) VALUES (:tid, :name) RETURNING id"
+        ),
+        {"tid": tenant_id, "name": BENCH_PREFIX + "campaign"},
+    ).scalar()
+    db.session.execute(sa_text("ANALYZE contacts"))
+    db.session.commit()
+    print(f"\nSeeded {count} contacts in {time.perf_counter() - started:.1f}s")
+    return [str(t) for t in tag_ids], str(campaign_id)
+
+
+def cleanup(tenant_id):
+    db.session.execute(
+        sa_text(
+            "DELETE FROM contacts WHERE tenant_id = :tid AND email_address LIKE :pat"
+        ),
+        {"tid": tenant_id, "pat": "%@" + BENCH_DOMAIN},
+    )
+    for table in ("tags", "campaigns"):
+        db.session.execute(
+            sa_text(f"DELETE FROM {table} WHERE tenant_id = :tid AND name LIKE :pat"),
+            {"tid": tenant_id, "pat": BENCH_PREFIX + "%"},
+        )
+    db.session.commit()
+    print("Removed benchmark contacts, tags and campaign")
+
+
+def _timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    db.session.commit()
+    print(f"{label:<28} {time.perf_counter() - started:7.2f}s  rows={result}")
+
+
+def bench(tenant_id, tag_ids, campaign_id):
+    contact_ids = [
+        str(r[0])
+        for r in db.session.execute(
+            sa_text(
+                "SELECT id FROM contacts WHERE tenant_id = :tid "
+                "AND email_address LIKE :pat"
+            ),
+            {"tid": tenant_id, "pat": "%@" + BENCH_DOMAIN},
+        ).fetchall()
+    ]
+    print(f"Benchmarking with {len(contact_ids)} contacts x {len(tag_ids)} tags")
+
+    def add():
+        return link_entities("contact_tag_assignments", tenant_id, contact_ids, tag_ids)
+
+    _timed("add-tags (new)", add)
+    _timed("add-tags (already tagged)", add)
+    _timed(
+        "remove-tags",
+        lambda: unlink_entities(
+            "contact_tag_assignments", tenant_id, contact_ids, tag_ids
+        ),
+    )
+    _timed(
+        "assign-campaign",
+        lambda: link_entities(
+            "campaign_contacts", tenant_id, contact_ids, [campaign_id]
+        ),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenant-id", required=True)
+    parser.add_argument("--contacts", type=int, default=100_000)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if args.cleanup:
+            cleanup(args.tenant_id)
+            return
+        tag_ids, campaign_id = seed(args.tenant_id, args.contacts)
+        bench(args.tenant_id, tag_ids, campaign_id)
+
+
+if __name__ == "__main__":
+    main()
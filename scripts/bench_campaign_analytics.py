@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Benchmark campaign analytics on a 50k-message campaign.
+
+Seeds a campaign for an existing tenant with synthetic contacts, five
+sequence steps per contact (email / LinkedIn mix) and send-log rows for
+the sent emails, then times the previous per-section aggregation (ten
+queries, each re-joining messages with campaign_contacts) against the
+single-pass query and a cache hit. Seeded contacts use the
+@bench-analytics.invalid email domain and the campaign is prefixed
+"bench-analytics-", so --cleanup removes only them.
+
+Usage (against a disposable/staging database):
+  python3 scripts/bench_campaign_analytics.py --tenant-id <uuid> --messages 50000
+  python3 scripts/bench_campaign_analytics.py --tenant-id <uuid> --cleanup
+
+Prerequisites:
+  - DATABASE_URL env var or .env file
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import text as sa_text  # noqa: E402
+
+from api import create_app  # noqa: E402
+from api.models import db  # noqa: E402
+from api.services.campaign_analytics import (  # noqa: E402
+    compute_campaign_analytics,
+    get_cached_analytics,
+    store_analytics,
+)
+
+BENCH_DOMAIN = "bench-analytics.invalid"
+BENCH_PREFIX = "bench-analytics-"
+BATCH_SIZE = 5000
+REPEATS = 5
+
+# (channel, status) per sequence step
+STEPS = [
+    ("email", "sent"),
+    ("linkedin_connect", "sent"),
+    ("email", "approved"),
+    ("linkedin_message", "draft"),
+    ("email", "draft"),
+]
+
+_CAMPAIGN_MESSAGES = """
+    FROM messages m
+    JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id
+    WHERE cc.campaign_id = :cid AND cc.tenant_id = :t
+"""
+
+# The per-section statements the endpoint used to run, one round-trip each
+LEGACY_QUERIES = [
+    "SELECT m.status, COUNT(*)" + _CAMPAIGN_MESSAGES + " GROUP BY m.status",
+    "SELECT m.channel, COUNT(*)" + _CAMPAIGN_MESSAGES + " GROUP BY m.channel",
+    "SELECT m.sequence_step, COUNT(*)"
+    + _CAMPAIGN_MESSAGES
+    + " GROUP BY m.sequence_step",
+    "SELECT esl.status, COUNT(*) FROM email_send_log esl "
+    "JOIN messages m ON esl.message_id = m.id "
+    "JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id "
+    "WHERE cc.campaign_id = :cid AND cc.tenant_id = :t GROUP BY esl.status",
+    "SELECT lsq.status, COUNT(*) FROM linkedin_send_queue lsq "
+    "JOIN messages m ON lsq.message_id = m.id "
+    "JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id "
+    "WHERE cc.campaign_id = :cid AND cc.tenant_id = :t GROUP BY lsq.status",
+    "SELECT COUNT(DISTINCT cc.contact_id), "
+    "COUNT(DISTINCT CASE WHEN ct.email_address != '' THEN cc.contact_id END), "
+    "COUNT(DISTINCT CASE WHEN ct.linkedin_url != '' THEN cc.contact_id END) "
+    "FROM campaign_contacts cc JOIN contacts ct ON cc.contact_id = ct.id "
+    "WHERE cc.campaign_id = :cid AND cc.tenant_id = :t",
+    "SELECT COALESCE(SUM(m.generation_cost_usd), 0)" + _CAMPAIGN_MESSAGES,
+    "SELECT MIN(esl.sent_at), MAX(esl.sent_at) FROM email_send_log esl "
+    "JOIN messages m ON esl.message_id = m.id "
+    "JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id "
+    "WHERE cc.campaign_id = :cid AND cc.tenant_id = :t "
+    "AND esl.sent_at IS NOT NULL",
+    "SELECT MIN(lsq.sent_at), MAX(lsq.sent_at) FROM linkedin_send_queue lsq "
+    "JOIN messages m ON lsq.message_id = m.id "
+    "JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id "
+    "WHERE cc.campaign_id = :cid AND cc.tenant_id = :t "
+    "AND lsq.sent_at IS NOT NULL",
+    "SELECT COUNT(CASE WHEN esl.opened_at IS NOT NULL THEN 1 END), "
+    "COALESCE(SUM(esl.open_count), 0) FROM email_send_log esl "
+    "JOIN messages m ON esl.message_id = m.id "
+    "JOIN campaign_contacts cc ON m.campaign_contact_id = cc.id "
+    "WHERE cc.campaign_id = :cid AND cc.tenant_id = :t",
+]
+
+
+def _insert(sql, rows):
+    for i in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(sa_text(sql), rows[i : i + BATCH_SIZE])
+        db.session.commit()
+
+
+def seed(tenant_id, message_count):
+    started = time.perf_counter()
+    contact_count = max(1, message_count // len(STEPS))
+    campaign_id = db.session.execute(
+        sa_text(
+            "INSERT INTO campaigns (tenant_id, name, status) "
+            "VALUES (:tid, :name, 'review') RETURNING id"
+        ),
+        {"tid": tenant_id, "name": BENCH_PREFIX + "campaign"},
+    ).scalar()
+    db.session.commit()
+
+    contacts, links, messages, logs = [], [], [], []
+    for i in range(contact_count):
+        contact_id = str(uuid.uuid4())
+        cc_id = str(uuid.uuid4())
+        contacts.append(
+            {
+                "id": contact_id,
+                "tid": tenant_id,
+                "fn": "Bench{}".format(i),
+                "email": "bench{}@{}".format(i, BENCH_DOMAIN),
+                "li": "https://linkedin.com/in/bench{}".format(i) if i % 2 else None,
+            }
+        )
+        links.append(
+            {"id": cc_id, "cid": campaign_id, "ct": contact_id, "tid": tenant_id}
+        )
+        for step, (channel, status) in enumerate(STEPS, start=1):
+            message_id = str(uuid.uuid4())
+            messages.append(
+                {
+                    "id": message_id,
+                    "tid": tenant_id,
+                    "ct": contact_id,
+                    "cc": cc_id,
+                    "ch": channel,
+                    "step": step,
+                    "st": status,
+                }
+            )
+            if channel == "email" and status == "sent":
+                logs.append(
+                    {
+                        "tid": tenant_id,
+                        "mid": message_id,
+                        "st": "delivered" if i % 3 else "sent",
+                        "opened": i % 4 == 0,
+                    }
+                )
+
+    _insert(
+        "INSERT INTO contacts (id, tenant_id, first_name, last_name, "
+        "email_address, linkedin_url) VALUES (:id, :tid, :fn, '', :email, :li)",
+        contacts,
+    )
+    _insert(
+        "INSERT INTO campaign_contacts (id, campaign_id, contact_id, tenant_id, "
+        "status) VALUES (:id, :cid, :ct, :tid, 'generated')",
+        links,
+    )
+    _insert(
+        "INSERT INTO messages (id, tenant_id, contact_id, campaign_contact_id, "
+        "channel, sequence_step, body, status, generation_cost_usd) "
+        "VALUES (:id, :tid, :ct, :cc, :ch, :step, 'Hello', :st, 0.002)",
+        messages,
+    )
+    _insert(
+        "INSERT INTO email_send_log (tenant_id, message_id, status, sent_at, "
+        "opened_at, open_count) VALUES (:tid, :mid, :st, now(), "
+        "CASE WHEN :opened THEN now() END, CASE WHEN :opened THEN 1 ELSE 0 END)",
+        logs,
+    )
+    for table in ("messages", "campaign_contacts", "email_send_log"):
+        db.session.execute(sa_text(f"ANALYZE {table}"))
+    db.session.commit()
+    print(
+        f"Seeded {len(messages)} messages for {contact_count} contacts "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return str(campaign_id)
+
+
+def cleanup(tenant_id):
+    scope = (
+        "SELECT m.id FROM messages m JOIN contacts ct ON m.contact_id = ct.id "
+        "WHERE ct.tenant_id = :tid AND ct.email_address LIKE :pat"
+    )
+    params = {"tid": tenant_id, "pat": "%@" + BENCH_DOMAIN}
+    db.session.execute(
+        sa_text(f"DELETE FROM email_send_log WHERE message_id IN ({scope})"), params
+    )
+    db.session.execute(sa_text(f"DELETE FROM messages WHERE id IN ({scope})"), params)
+    db.session.execute(
+        sa_text(
+            "DELETE FROM contacts WHERE tenant_id = :tid AND email_address LIKE :pat"
+        ),
+        params,
+    )
+    db.session.execute(
+        sa_text("DELETE FROM campaigns WHERE tenant_id = :tid AND name LIKE :pat"),
+        {"tid": tenant_id, "pat": BENCH_PREFIX + "%"},
+    )
+    db.session.commit()
+    print("Removed benchmark contacts, messages and campaign")
+
+
+def _timed(label, fn):
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    db.session.rollback()
+    timings.sort()
+    print(
+        f"{label:<26} median {timings[len(timings) // 2] * 1000:8.1f}ms  "
+        f"min {timings[0] * 1000:8.1f}ms"
+    )
+
+
+def bench(tenant_id, campaign_id):
+    params = {"cid": campaign_id, "t": tenant_id}
+
+    def legacy():
+        for sql in LEGACY_QUERIES:
+            db.session.execute(sa_text(sql), params).fetchall()
+
+    def cached():
+        if get_cached_analytics(tenant_id, campaign_id) is None:
+            store_analytics(
+                tenant_id,
+                campaign_id,
+                compute_campaign_analytics(campaign_id, tenant_id),
+            )
+
+    stats = compute_campaign_analytics(campaign_id, tenant_id)
+    print(f"Benchmarking campaign with {stats['messages']['total']} messages")
+    _timed(f"per-section ({len(LEGACY_QUERIES)} queries)", legacy)
+    _timed("single pass", lambda: compute_campaign_analytics(campaign_id, tenant_id))
+    cached()
+    _timed("cache hit", cached)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenant-id", required=True)
+    parser.add_argument("--messages", type=int, default=50_000)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if args.cleanup:
+            cleanup(args.tenant_id)
+            return
+        campaign_id = seed(args.tenant_id, args.messages)
+        bench(args.tenant_id, campaign_id)
+
+
+if __name__ == "__main__":
+    main()
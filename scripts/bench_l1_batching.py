@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Compare batched L1 research against single-company research.
+
+Picks a tenant's batch-eligible companies (micro/small or not yet sized),
+researches every company both ways — K companies per Perplexity prompt and
+one prompt per company — and prints, per mode:
+
+  - the share of companies passing QC and the QC flags raised,
+  - cost per company (the batch call's cost split evenly),
+  - wall time per company,
+  - agreement between the two modes on industry, business type, B2B and HQ.
+
+Nothing is stored: the session is rolled back at the end. The run spends
+real Perplexity credits (about two calls per company).
+
+Usage:
+  python3 scripts/bench_l1_batching.py --tenant-id <uuid> --limit 40
+  python3 scripts/bench_l1_batching.py --tenant-id <uuid> --batch-size 8 --json
+
+Prerequisites:
+  - DATABASE_URL env var or .env file
+  - PERPLEXITY_API_KEY
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import text as sa_text  # noqa: E402
+
+from api import create_app  # noqa: E402
+from api.models import db  # noqa: E402
+from api.services.l1_enricher import (  # noqa: E402
+    BATCH_ELIGIBLE_SIZES,
+    _call_perplexity,
+    _parse_research_json,
+    _validate_research,
+    load_batch_companies,
+    research_batch,
+)
+
+COMPARED_FIELDS = ("industry", "business_type", "b2b", "hq")
+
+
+def _pick_companies(tenant_id, limit):
+    sizes = ", ".join(f"'{s}'" for s in BATCH_ELIGIBLE_SIZES)
+    rows = db.session.execute(
+        sa_text(f"""
+            SELECT id FROM companies
+            WHERE tenant_id = :t AND NOT COALESCE(is_self, false)
+              AND (company_size IS NULL OR company_size IN ({sizes}))
+            ORDER BY created_at DESC
+            LIMIT :lim
+        """),
+        {"t": tenant_id, "lim": limit},
+    ).fetchall()
+    return [str(r[0]) for r in rows]
+
+
+def _single(company):
+    started = time.perf_counter()
+    response = _call_perplexity(
+        company["name"],
+        company["domain"],
+        company["industry"],
+        company["size"],
+        company["revenue"],
+        company["contacts"],
+        website_content=company["website"],
+    )
+    elapsed = time.perf_counter() - started
+    return _parse_research_json(response.content), response.cost_usd or 0, elapsed
+
+
+def _normalize(field, value):
+    if value is None:
+        return None
+    if field == "hq":
+        # Compare the country part only
+        return str(value).rsplit(",", 1)[-1].strip().lower()
+    return str(value).strip().lower()
+
+
+def _mode_summary(rows, mode):
+    flags = Counter()
+    passed = 0
+    for row in rows:
+        row_flags = row[mode]["flags"]
+        flags.update(row_flags)
+        passed += not row_flags
+    n = len(rows) or 1
+    return {
+        "companies": len(rows),
+        "qc_pass_rate": passed / n,
+        "flags": dict(flags.most_common()),
+        "cost_per_company": sum(r[mode]["cost"] for r in rows) / n,
+        "seconds_per_company": sum(r[mode]["seconds"] for r in rows) / n,
+    }
+
+
+def run(args):
+    ids = _pick_companies(args.tenant_id, args.limit)
+    if not ids:
+        print("No batch-eligible companies for this tenant")
+        return
+
+    rows = []
+    for i in range(0, len(ids), args.batch_size):
+        companies = load_batch_companies(ids[i : i + args.batch_size])
+        started = time.perf_counter()
+        items, response = research_batch(companies)
+        share_seconds = (time.perf_counter() - started) / len(companies)
+        share_cost = (response.cost_usd or 0) / len(companies)
+
+        for company, batched in zip(companies, items):
+            single, single_cost, single_seconds = _single(company)
+            rows.append(
+                {
+                    "company": company["name"],
+                    "batch": {
+                        "research": batched,
+                        "flags": _validate_research(batched, company["name"])
+                        if batched
+                        else ["missing_item"],
+                        "cost": share_cost,
+                        "seconds": share_seconds,
+                    },
+                    "single": {
+                        "research": single,
+                        "flags": _validate_research(single, company["name"])
+                        if single
+                        else ["parse_error"],
+                        "cost": single_cost,
+                        "seconds": single_seconds,
+                    },
+                }
+            )
+        print(f"  {len(rows)}/{len(ids)} companies", file=sys.stderr)
+
+    agreement = {}
+    for field in COMPARED_FIELDS:
+        pairs = [
+            (
+                _normalize(field, r["batch"]["research"].get(field)),
+                _normalize(field, r["single"]["research"].get(field)),
+            )
+            for r in rows
+            if r["batch"]["research"] and r["single"]["research"]
+        ]
+        agreement[field] = (
+            sum(1 for a, b in pairs if a == b) / len(pairs) if pairs else None
+        )
+
+    report = {
+        "batch_size": args.batch_size,
+        "batch": _mode_summary(rows, "batch"),
+        "single": _mode_summary(rows, "single"),
+        "field_agreement": agreement,
+    }
+    db.session.rollback()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for mode in ("batch", "single"):
+        summary = report[mode]
+        print(
+            f"{mode:<7} {summary['companies']} companies  "
+            f"QC pass {summary['qc_pass_rate']:.1%}  "
+            f"${summary['cost_per_company']:.5f}/company  "
+            f"{summary['seconds_per_company']:.2f}s/company"
+        )
+        for flag, count in summary["flags"].items():
+            print(f"    {flag:<22} {count}")
+    print("agreement with single mode")
+    for field, share in agreement.items():
+        print(f"    {field:<14} {'n/a' if share is None else f'{share:.1%}'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenant-id", required=True)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=5)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    if args.batch_size < 2:
+        parser.error("--batch-size must be at least 2")
+
+    app = create_app()
+    with app.app_context():
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
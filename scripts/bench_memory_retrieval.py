@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark MemoryStore.retrieve() against a large per-tenant fact corpus.
+
+Seeds synthetic facts for an existing tenant (bulk inserts into
+memory_facts + memory_fact_keywords), then times retrieval for a set of
+queries and prints p50/p95/max latency. Seeded rows are tagged with a
+session_id so --cleanup removes only them.
+
+Usage (against a disposable/staging database with migration 050 applied):
+  python3 scripts/bench_memory_retrieval.py --tenant-id <uuid> --facts 100000
+  python3 scripts/bench_memory_retrieval.py --tenant-id <uuid> --cleanup
+
+Prerequisites:
+  - DATABASE_URL env var or .env file
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import text as sa_text  # noqa: E402
+
+from api import create_app  # noqa: E402
+from api.models import db  # noqa: E402
+from api.services.memory.rag_store import MemoryStore, extract_keywords  # noqa: E402
+
+BENCH_SESSION = "bench-memory-retrieval"
+
+VOCABULARY = (
+    "saas fintech biotech logistics retail manufacturing healthcare insurance "
+    "enterprise midmarket startup founder cto cfo procurement compliance gdpr "
+    "pricing objection discount pilot rollout integration salesforce hubspot "
+    "linkedin email cadence followup webinar conference prague berlin vienna "
+    "warsaw nordics dach benelux revenue growth hiring funding series seed "
+    "churn retention onboarding expansion upsell renewal budget quarter "
+    "consultative formal friendly tone persona champion blocker timeline"
+).split()
+
+QUERIES = [
+    "fintech pricing objection",
+    "DACH enterprise procurement timeline",
+    "preferred tone for founders",
+    "biotech compliance gdpr",
+    "hubspot integration rollout pilot",
+]
+
+BATCH_SIZE = 5000
+
+
+def seed(tenant_id, count):
+    rng = random.Random(42)
+    fact_rows, kw_rows = [], []
+    started = time.perf_counter()
+    for i in range(count):
+        text = " ".join(rng.sample(VOCABULARY, rng.randint(6, 14)))
+        keywords = extract_keywords(text)
+        fact_id = str(uuid.uuid4())
+        fact_rows.append(
+            {
+                "id": fact_id,
+                "tid": tenant_id,
+                "txt": text,
+                "kw": keywords,
+                "kwn": len(keywords),
+                "sid": BENCH_SESSION,
+            }
+        )
+        kw_rows.extend({"fid": fact_id, "tid": tenant_id, "kw": kw} for kw in keywords)
+        if len(fact_rows) >= BATCH_SIZE or i == count - 1:
+            db.session.execute(
+                sa_text(
+                    "INSERT INTO memory_facts "
+                    "(id, tenant_id, chunk_text, chunk_type, keywords, "
+                    "keyword_count, session_id) "
+                    "VALUES (:id, :tid, :txt, 'fact', :kw, :kwn, :sid)"
+                ),
+                fact_rows,
+            )
+            db.session.execute(
+                sa_text(
+                    "INSERT INTO memory_fact_keywords (fact_id, tenant_id, keyword) "
+                    "VALUES (:fid, :tid, :kw)"
+                ),
+                kw_rows,
+            )
+            db.session.commit()
+            fact_rows, kw_rows = [], []
+            print(f"  seeded {i + 1}/{count}", end="\r")
+    db.session.execute(sa_text("ANALYZE memory_facts"))
+    db.session.execute(sa_text("ANALYZE memory_fact_keywords"))
+    db.session.commit()
+    print(f"\nSeeded {count} facts in {time.perf_counter() - started:.1f}s")
+
+
+def cleanup(tenant_id):
+    db.session.execute(
+        sa_text(
+            "DELETE FROM memory_facts WHERE tenant_id = :tid AND session_id = :sid"
+        ),
+        {"tid": tenant_id, "sid": BENCH_SESSION},
+    )
+    db.session.commit()
+    print("Removed benchmark facts")
+
+
+def bench(tenant_id, rounds):
+    store = MemoryStore()
+    timings = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            started = time.perf_counter()
+            store.retrieve(tenant_id, query)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"retrieve(): n={len(timings)} p50={statistics.median(timings):.1f}ms "
+        f"p95={p95:.1f}ms max={timings[-1]:.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenant-id", required=True)
+    parser.add_argument("--facts", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if args.cleanup:
+            cleanup(args.tenant_id)
+            return
+        if not args.skip_seed:
+            seed(args.tenant_id, args.facts)
+        bench(args.tenant_id, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Evaluate the local classifiers against the Haiku baseline.
+
+Scores each trained <task>.json model on Haiku-labelled decisions from the
+route_decisions table (or a JSONL export) and prints, per task:
+
+  - agreement with Haiku overall and on the messages above the threshold,
+  - coverage: the share of Haiku calls the local model would replace,
+  - local prediction latency (p50/p95) next to the logged Haiku latency.
+
+Use --since-days with a window that starts after the model's training data
+to measure it on unseen messages.
+
+Usage:
+  python3 scripts/eval_route_classifier.py --model-dir models/classifiers
+  python3 scripts/eval_route_classifier.py --task route --since-days 7 --json
+  python3 scripts/eval_route_classifier.py --jsonl holdout.jsonl --threshold 0.8
+
+Prerequisites:
+  - DATABASE_URL env var or .env file (unless --jsonl is given)
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from api.agents.local_classifier import (  # noqa: E402
+    TASKS,
+    LocalClassifier,
+    evaluate,
+    load_logged_examples,
+    read_jsonl_examples,
+)
+
+
+def _percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+def _haiku_latencies(task, since):
+    from sqlalchemy import text as sa_text
+
+    from api.models import db
+
+    sql = (
+        "SELECT latency_ms FROM route_decisions WHERE task = :task "
+        "AND source = 'haiku' AND latency_ms IS NOT NULL"
+    )
+    params = {"task": task}
+    if since is not None:
+        sql += " AND created_at >= :since"
+        params["since"] = since
+    return [r[0] for r in db.session.execute(sa_text(sql), params)]
+
+
+def run(args):
+    since = None
+    if args.since_days:
+        since = datetime.now(timezone.utc) - timedelta(days=args.since_days)
+    tasks = TASKS if args.task == "all" else (args.task,)
+    report = {}
+    for task in tasks:
+        path = os.path.join(args.model_dir, f"{task}.json")
+        if not os.path.exists(path):
+            print(f"{task:<10} no model at {path}")
+            continue
+        model = LocalClassifier.load(path)
+        if args.jsonl:
+            examples = read_jsonl_examples(args.jsonl, task)
+            haiku_ms = []
+        else:
+            examples = load_logged_examples(task, sources=("haiku",), since=since)
+            haiku_ms = _haiku_latencies(task, since)
+        if not examples:
+            print(f"{task:<10} no Haiku-labelled examples")
+            continue
+        result = evaluate(model, examples, args.threshold)
+        result["haiku_latency_ms"] = {
+            "p50": _percentile(haiku_ms, 0.5),
+            "p95": _percentile(haiku_ms, 0.95),
+        }
+        report[task] = result
+        if args.json:
+            continue
+        local = result["latency_ms"]
+        haiku = result["haiku_latency_ms"]
+        print(
+            f"{task:<10} {result['examples']} examples  threshold "
+            f"{result['threshold']:.3f}\n"
+            f"  agreement with Haiku   {result['accuracy']:.1%} overall, "
+            f"{result['accuracy_at_threshold']:.1%} above threshold\n"
+            f"  Haiku calls replaced   {result['coverage']:.1%}\n"
+            f"  latency p50/p95        local {local['p50']:.2f}/{local['p95']:.2f}ms"
+            + (
+                f", Haiku {haiku['p50']}/{haiku['p95']}ms"
+                if haiku["p50"] is not None
+                else ""
+            )
+        )
+        for label, stats in sorted(result["labels"].items()):
+            print(
+                f"    {label:<14} precision {stats['precision']:.1%}  "
+                f"recall {stats['recall']:.1%}  support {stats['support']}"
+            )
+    if args.json:
+        print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--task", choices=TASKS + ("all",), default="all")
+    parser.add_argument("--model-dir", default=os.environ.get("LOCAL_CLASSIFIER_DIR"))
+    parser.add_argument("--jsonl", help="read examples from a JSONL export")
+    parser.add_argument("--since-days", type=int, default=0)
+    parser.add_argument(
+        "--threshold", type=float, help="override the model's threshold"
+    )
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    if not args.model_dir:
+        parser.error("--model-dir is required when LOCAL_CLASSIFIER_DIR is not set")
+
+    if args.jsonl:
+        run(args)
+        return
+
+    from api import create_app
+
+    app = create_app()
+    with app.app_context():
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
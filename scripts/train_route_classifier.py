@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Train the local router / intent / interrupt classifiers.
+
+Reads labelled decisions from the route_decisions table (keyword and Haiku
+rows; migration 058) or from a JSONL export, fits a hashed-feature
+logistic regression per task and writes <task>.json model files. The
+confidence threshold is chosen on a held-out split so that the messages the
+model answers on its own reach --target-accuracy; everything below it
+still goes to Haiku.
+
+Usage:
+  python3 scripts/train_route_classifier.py --out-dir models/classifiers
+  python3 scripts/train_route_classifier.py --task route --since-days 30
+  python3 scripts/train_route_classifier.py --jsonl decisions.jsonl --out-dir /tmp/m
+
+Deploy by pointing LOCAL_CLASSIFIER_DIR at --out-dir; workers pick up new
+files without a restart.
+
+Prerequisites:
+  - DATABASE_URL env var or .env file (unless --jsonl is given)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from api.agents.local_classifier import (  # noqa: E402
+    TASKS,
+    evaluate,
+    load_logged_examples,
+    read_jsonl_examples,
+    train,
+)
+
+MIN_EXAMPLES = 50
+
+
+def _examples(task, args):
+    if args.jsonl:
+        return read_jsonl_examples(args.jsonl, task)
+    since = None
+    if args.since_days:
+        since = datetime.now(timezone.utc) - timedelta(days=args.since_days)
+    return load_logged_examples(task, since=since)
+
+
+def run(args):
+    os.makedirs(args.out_dir, exist_ok=True)
+    tasks = TASKS if args.task == "all" else (args.task,)
+    for task in tasks:
+        examples = _examples(task, args)
+        labels = {label for _, _, label in examples}
+        if len(examples) < args.min_examples or len(labels) < 2:
+            print(
+                f"{task:<10} skipped: {len(examples)} examples, "
+                f"{len(labels)} labels (need {args.min_examples} and 2)"
+            )
+            continue
+        started = time.perf_counter()
+        model = train(
+            task,
+            examples,
+            target_accuracy=args.target_accuracy,
+            epochs=args.epochs,
+        )
+        path = os.path.join(args.out_dir, f"{task}.json")
+        model.save(path)
+        fit = evaluate(model, examples)
+        print(
+            f"{task:<10} {len(examples)} examples, labels {sorted(labels)}, "
+            f"threshold {model.threshold:.3f}, training-set coverage "
+            f"{fit['coverage']:.1%} at {fit['accuracy_at_threshold']:.1%} accuracy "
+            f"({time.perf_counter() - started:.1f}s) -> {path}"
+        )
+        if args.verbose:
+            print(json.dumps(fit, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--task", choices=TASKS + ("all",), default="all")
+    parser.add_argument("--out-dir", default=os.environ.get("LOCAL_CLASSIFIER_DIR"))
+    parser.add_argument("--jsonl", help="read examples from a JSONL export")
+    parser.add_argument("--since-days", type=int, default=0)
+    parser.add_argument("--target-accuracy", type=float, default=0.95)
+    parser.add_argument("--epochs", type=int, default=15)
+    parser.add_argument("--min-examples", type=int, default=MIN_EXAMPLES)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    if not args.out_dir:
+        parser.error("--out-dir is required when LOCAL_CLASSIFIER_DIR is not set")
+
+    if args.jsonl:
+        run(args)
+        return
+
+    from api import create_app
+
+    app = create_app()
+    with app.app_context():
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-do-not-use-in-prod")
 os.environ.setdefault("CORS_ORIGINS", "*")
 
 from api import create_app
+from api.agents.local_classifier import clear_cache as clear_classifier_cache
 from api.models import db as _db
 from api.services.tool_registry import clear_registry
 
@@ -95,6 +96,26 @@ def clean_tool_registry():
     clear_registry()
 
 
+@pytest.fixture(autouse=True)
+def clean_classifier_cache():
+    """Clear cached router/intent/interrupt decisions between tests so a
+    mocked Haiku call in one test is not answered from another's cache."""
+    clear_classifier_cache()
+    yield
+    clear_classifier_cache()
+
+
+@pytest.fixture(autouse=True)
+def no_multimodal_cache(monkeypatch):
+    """Disable the shared on-disk multimodal result cache; tests that cover
+    it install their own under tmp_path."""
+    from api.services.multimodal import result_cache
+
+    monkeypatch.setattr(
+        result_cache, "_default_cache", result_cache.ResultCache("", max_bytes=0)
+    )
+
+
 @pytest.fixture(autouse=True)
 def _patch_decode_token_for_tests(app, monkeypatch):
     """Patch decode_token to accept HS256 test tokens (no JWKS needed)."""
@@ -5,7 +5,10 @@ and state management without requiring actual LLM calls.
 """
 
 import json
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
 
 
 from api.agents.events import (
@@ -21,7 +24,7 @@ from api.agents.events import (
     tool_call_end,
     tool_call_start,
 )
-from api.agents.graph import SSEEvent
+from api.agents.graph import SSEEvent, _estimate_cost, _usage_tokens
 from api.agents.subgraphs.strategy import (
     build_strategy_subgraph,
     strategy_should_continue,
@@ -263,3 +266,78 @@ class TestSSEEvent:
         ev = SSEEvent(type="chunk", data={"text": "hi"})
         assert ev.type == "chunk"
         assert ev.data["text"] == "hi"
+
+
+# ---------------------------------------------------------------
+# Prompt-cache usage accounting
+# ---------------------------------------------------------------
+
+
+class TestCacheUsage:
+    def test_usage_tokens_split_cache_from_input(self):
+        response = AIMessage(content="ok")
+        # LangChain reports input_tokens including cache reads and writes
+        response.usage_metadata = {
+            "input_tokens": 1300,
+            "output_tokens": 40,
+            "total_tokens": 1340,
+            "input_token_details": {"cache_read": 1000, "cache_creation": 200},
+        }
+        assert _usage_tokens(response) == (100, 40, 1000, 200)
+
+    def test_usage_tokens_without_cache_details(self):
+        response = AIMessage(content="ok")
+        response.usage_metadata = {"input_tokens": 50, "output_tokens": 5}
+        assert _usage_tokens(response) == (50, 5, 0, 0)
+        assert _usage_tokens(AIMessage(content="ok")) == (0, 0, 0, 0)
+
+    def test_estimate_cost_prices_cache_tokens(self):
+        model = "claude-sonnet-4-5-20241022"  # $3/M input
+        assert _estimate_cost(model, 0, 0, cache_read_tokens=1_000_000) == pytest.approx(0.3)
+        assert _estimate_cost(
+            model, 0, 0, cache_creation_tokens=1_000_000
+        ) == pytest.approx(3.75)
+        assert _estimate_cost(model, 1_000_000, 0) == pytest.approx(3.0)
+
+    def test_done_event_carries_cache_tokens(self):
+        events = sse_to_agui(
+            "done",
+            {"total_cache_read_tokens": 900, "total_cache_creation_tokens": 100},
+            run_id="r1",
+        )
+        assert events[0].data["total_cache_read_tokens"] == 900
+        assert events[0].data["total_cache_creation_tokens"] == 100
+
+    def test_agent_turn_logs_cache_tokens(self, app):
+        from api.routes import playbook_routes
+
+        done = SSEEvent(
+            type="done",
+            data={
+                "tool_calls": [],
+                "model": "claude-haiku-4-5-20251001",
+                "total_input_tokens": 120,
+                "total_output_tokens": 30,
+                "total_cache_read_tokens": 4000,
+                "total_cache_creation_tokens": 500,
+                "total_cost_usd": "0.001",
+            },
+        )
+        user_msg = MagicMock()
+        user_msg.to_dict.return_value = {}
+        with app.test_request_context(), \
+                patch.object(playbook_routes, "execute_graph_turn", return_value=[done]), \
+                patch.object(playbook_routes, "StrategyChatMessage") as message, \
+                patch.object(playbook_routes, "db"), \
+                patch.object(playbook_routes, "log_llm_usage") as log:
+            message.return_value.to_dict.return_value = {}
+            playbook_routes._sync_agent_response(
+                MagicMock(), "system", [], "t1", "d1", user_msg, None
+            )
+
+        kwargs = log.call_args.kwargs
+        assert kwargs["input_tokens"] == 120
+        assert kwargs["cache_read_tokens"] == 4000
+        assert kwargs["cache_creation_tokens"] == 500
+        # The turn's own duration, not a stale one from an earlier LLM span
+        assert isinstance(kwargs["duration_ms"], int)
@@ -5,7 +5,13 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from api.services.anthropic_client import AnthropicClient, AnthropicResponse
+from api.services.anthropic_client import (
+    AnthropicClient,
+    AnthropicResponse,
+    apply_prompt_cache,
+    build_cached_system,
+    build_cached_tools,
+)
 
 
 class TestModelSelection:
@@ -216,3 +222,101 @@ class TestAnthropicHeaders:
             # Messages should only have user message
             assert len(payload["messages"]) == 1
             assert payload["messages"][0]["role"] == "user"
+
+
+class TestPromptCaching:
+    """Test prompt-cache breakpoints and cache token accounting."""
+
+    def test_string_system_becomes_cached_block(self):
+        blocks = build_cached_system("Be helpful")
+        assert blocks == [
+            {
+                "type": "text",
+                "text": "Be helpful",
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+
+    def test_block_system_with_breakpoints_is_preserved(self):
+        blocks = [
+            {"type": "text", "text": "a", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "b"},
+        ]
+        assert build_cached_system(blocks) == blocks
+
+    def test_tools_breakpoint_on_last_only(self):
+        tools = [{"name": "a"}, {"name": "b"}]
+        cached = build_cached_tools(tools)
+        assert "cache_control" not in cached[0]
+        assert cached[1]["cache_control"] == {"type": "ephemeral"}
+        # Input is not mutated
+        assert "cache_control" not in tools[1]
+
+    def test_apply_prompt_cache_marks_last_message(self):
+        messages = [
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "Hello"},
+            {"role": "user", "content": "More"},
+        ]
+        payload = {"system": "s", "messages": messages, "tools": [{"name": "t"}]}
+        apply_prompt_cache(payload)
+        last = payload["messages"][-1]["content"]
+        assert last[-1]["cache_control"] == {"type": "ephemeral"}
+        assert payload["messages"][0] == {"role": "user", "content": "Hi"}
+        assert messages[-1] == {"role": "user", "content": "More"}
+
+    def test_apply_prompt_cache_respects_breakpoint_limit(self):
+        system = [
+            {"type": "text", "text": str(i), "cache_control": {"type": "ephemeral"}}
+            for i in range(3)
+        ]
+        messages = [{"role": "user", "content": "Hi"}]
+        payload = {"system": system, "messages": messages, "tools": [{"name": "t"}]}
+        apply_prompt_cache(payload)
+        assert payload["messages"] == messages
+
+    def test_query_with_tools_sends_cache_breakpoints(self):
+        client = AnthropicClient(api_key="test-key")
+
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.json.return_value = {
+            "content": [{"type": "text", "text": "ok"}],
+            "usage": {"input_tokens": 10, "output_tokens": 5},
+            "stop_reason": "end_turn",
+        }
+        mock_resp.raise_for_status = MagicMock()
+
+        with patch("api.services.anthropic_client.requests.post", return_value=mock_resp) as mock_post:
+            client.query_with_tools(
+                messages=[{"role": "user", "content": "Hi"}],
+                system_prompt="Be helpful",
+                tools=[{"name": "a"}, {"name": "b"}],
+                cache_prompt=True,
+            )
+            payload = mock_post.call_args[1]["json"]
+            assert payload["system"][0]["cache_control"] == {"type": "ephemeral"}
+            assert payload["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+
+    def test_query_captures_cache_tokens_and_cost(self):
+        client = AnthropicClient(api_key="test-key")
+
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.json.return_value = {
+            "content": [{"type": "text", "text": "ok"}],
+            "usage": {
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cache_creation_input_tokens": 1_000_000,
+                "cache_read_input_tokens": 1_000_000,
+            },
+        }
+        mock_resp.raise_for_status = MagicMock()
+
+        with patch("api.services.anthropic_client.requests.post", return_value=mock_resp):
+            result = client.query(system_prompt="s", user_prompt="u", cache_prompt=True)
+            assert result.cache_creation_input_tokens == 1_000_000
+            assert result.cache_read_input_tokens == 1_000_000
+            # Haiku: 0.80 * 1.25 (write) + 0.80 * 0.1 (read)
+            assert result.cost_usd == pytest.approx(1.08)
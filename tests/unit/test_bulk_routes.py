@@ -85,6 +85,41 @@ class TestBulkAddTags:
         assert resp.status_code == 400
 
 
+    def test_add_tags_counts_existing(self, client, seed_companies_contacts):
+        data = seed_companies_contacts
+        contacts = data["contacts"]
+        tag2 = data["tags"][1]
+        ids = [str(c.id) for c in contacts[:3]]
+        payload = {"entity_type": "contact", "ids": ids, "tag_ids": [str(tag2.id)]}
+
+        first = client.post("/api/bulk/add-tags", json=payload, headers=_headers(client))
+        assert first.get_json()["new_assignments"] == 3
+        assert first.get_json()["already_tagged"] == 0
+
+        second = client.post("/api/bulk/add-tags", json=payload, headers=_headers(client))
+        body = second.get_json()
+        assert body["new_assignments"] == 0
+        assert body["already_tagged"] == 3
+
+    def test_add_tags_chunked(self, client, seed_companies_contacts, monkeypatch):
+        from api.models import ContactTagAssignment
+        from api.services import bulk_assignments
+
+        # Force several statements per request
+        monkeypatch.setattr(bulk_assignments, "MAX_PARAMS", 8)
+        data = seed_companies_contacts
+        ids = [str(c.id) for c in data["contacts"]]
+        tag_ids = [str(t.id) for t in data["tags"]]
+        before = ContactTagAssignment.query.count()
+
+        resp = client.post("/api/bulk/add-tags", json={
+            "entity_type": "contact", "ids": ids, "tag_ids": tag_ids,
+        }, headers=_headers(client))
+        body = resp.get_json()
+        assert body["new_assignments"] + body["already_tagged"] == len(ids) * 2
+        assert ContactTagAssignment.query.count() - before == body["new_assignments"]
+
+
 class TestBulkRemoveTags:
     """POST /api/bulk/remove-tags"""
 
@@ -135,6 +170,25 @@ class TestBulkAssignCampaign:
         body = resp.get_json()
         assert body["affected"] == 2
 
+    def test_assign_campaign_counts_existing(
+        self, client, seed_companies_contacts, seed_campaign
+    ):
+        ids = [str(c.id) for c in seed_companies_contacts["contacts"][:2]]
+        payload = {
+            "entity_type": "contact",
+            "ids": ids,
+            "campaign_id": str(seed_campaign.id),
+        }
+        client.post("/api/bulk/assign-campaign", json=payload, headers=_headers(client))
+        resp = client.post(
+            "/api/bulk/assign-campaign", json=payload, headers=_headers(client)
+        )
+        body = resp.get_json()
+        assert body["affected"] == 0
+        assert body["already_assigned"] == 2
+        db.session.refresh(seed_campaign)
+        assert seed_campaign.total_contacts == 2
+
     def test_assign_campaign_requires_campaign_id(self, client, seed_companies_contacts):
         resp = client.post("/api/bulk/assign-campaign", json={
             "entity_type": "contact",
@@ -347,3 +347,149 @@ class TestCampaignAnalyticsLinkedIn:
         assert li["total"] == 2
         assert li["sent"] == 1
         assert li["queued"] == 1
+
+
+class TestCampaignAnalyticsTimeline:
+    """First/last send spans email and LinkedIn sends."""
+
+    def test_send_window_across_channels(self, client, seed_companies_contacts, db):
+        from datetime import datetime, timezone
+
+        headers = auth_header(client)
+        headers["X-Namespace"] = "test-corp"
+        tenant = seed_companies_contacts["tenant"]
+        owner = seed_companies_contacts["owners"][0]
+
+        campaign = _make_campaign(db, tenant.id)
+        ct1 = _make_contact(db, tenant.id, "Alice", email="a@test.com",
+                            linkedin_url="https://linkedin.com/in/alice")
+        cc1 = _make_campaign_contact(db, campaign.id, ct1.id, tenant.id)
+        m1 = _make_message(db, tenant.id, ct1.id, cc1.id, status="sent")
+        m2 = _make_message(db, tenant.id, ct1.id, cc1.id, channel="linkedin_message",
+                           status="sent", step=2)
+        db.session.add(EmailSendLog(
+            tenant_id=tenant.id, message_id=m1.id, status="sent",
+            from_email="s@test.com", to_email="a@test.com",
+            sent_at=datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc),
+            opened_at=datetime(2026, 3, 2, 10, 0, tzinfo=timezone.utc),
+            open_count=3,
+        ))
+        db.session.add(LinkedInSendQueue(
+            tenant_id=str(tenant.id), message_id=str(m2.id), contact_id=str(ct1.id),
+            owner_id=str(owner.id), action_type="message",
+            linkedin_url="https://linkedin.com/in/alice", body="Hi", status="sent",
+            sent_at=datetime(2026, 3, 5, 9, 0, tzinfo=timezone.utc),
+        ))
+        db.session.commit()
+
+        resp = client.get(f"/api/campaigns/{campaign.id}/analytics", headers=headers)
+        data = resp.get_json()
+
+        assert data["timeline"]["first_send_at"].startswith("2026-03-02")
+        assert data["timeline"]["last_send_at"].startswith("2026-03-05")
+        assert data["engagement"]["opened"] == 1
+        assert data["engagement"]["total_opens"] == 3
+        assert data["engagement"]["open_rate"] == 100.0
+
+
+class TestCampaignAnalyticsCache:
+    """Payloads are cached per campaign and dropped when messages change."""
+
+    def _seed(self, db, tenant):
+        campaign = _make_campaign(db, tenant.id)
+        ct1 = _make_contact(db, tenant.id, "Alice", email="a@test.com")
+        cc1 = _make_campaign_contact(db, campaign.id, ct1.id, tenant.id)
+        msg = _make_message(db, tenant.id, ct1.id, cc1.id, status="draft")
+        db.session.commit()
+        return campaign, msg
+
+    def test_repeat_request_served_from_cache(self, client, seed_companies_contacts, db):
+        from unittest.mock import patch
+
+        headers = auth_header(client)
+        headers["X-Namespace"] = "test-corp"
+        campaign, _ = self._seed(db, seed_companies_contacts["tenant"])
+        url = f"/api/campaigns/{campaign.id}/analytics"
+
+        first = client.get(url, headers=headers).get_json()
+        with patch(
+            "api.routes.campaign_routes.compute_campaign_analytics"
+        ) as compute:
+            second = client.get(url, headers=headers).get_json()
+        compute.assert_not_called()
+        assert second == first
+
+    def test_message_update_invalidates(self, client, seed_companies_contacts, db):
+        headers = auth_header(client)
+        headers["X-Namespace"] = "test-corp"
+        campaign, msg = self._seed(db, seed_companies_contacts["tenant"])
+        url = f"/api/campaigns/{campaign.id}/analytics"
+
+        assert client.get(url, headers=headers).get_json()["messages"]["by_status"] == {"draft": 1}
+        resp = client.patch(
+            "/api/messages/batch", headers=headers,
+            json={"ids": [str(msg.id)], "fields": {"status": "approved"}},
+        )
+        assert resp.status_code == 200
+        assert client.get(url, headers=headers).get_json()["messages"]["by_status"] == {"approved": 1}
+
+    def test_regenerate_invalidates_but_estimate_does_not(
+        self, client, seed_companies_contacts, db
+    ):
+        from unittest.mock import patch
+
+        from api.services.campaign_analytics import get_cached_analytics
+
+        headers = auth_header(client)
+        headers["X-Namespace"] = "test-corp"
+        tenant = seed_companies_contacts["tenant"]
+        campaign, msg = self._seed(db, tenant)
+        client.get(f"/api/campaigns/{campaign.id}/analytics", headers=headers)
+
+        with patch(
+            "api.routes.message_routes.estimate_regeneration_cost",
+            return_value={"estimated_cost": 0.01},
+        ):
+            resp = client.get(
+                f"/api/messages/{msg.id}/regenerate/estimate", headers=headers
+            )
+        assert resp.status_code == 200
+        assert get_cached_analytics(tenant.id, campaign.id) is not None
+
+        with patch(
+            "api.routes.message_routes.regenerate_message",
+            return_value={"id": str(msg.id)},
+        ):
+            resp = client.post(
+                f"/api/messages/{msg.id}/regenerate", headers=headers, json={}
+            )
+        assert resp.status_code == 200
+        assert get_cached_analytics(tenant.id, campaign.id) is None
+
+    def test_campaign_write_invalidates(self, client, seed_companies_contacts, db):
+        from api.services.campaign_analytics import get_cached_analytics
+
+        headers = auth_header(client)
+        headers["X-Namespace"] = "test-corp"
+        tenant = seed_companies_contacts["tenant"]
+        campaign, _ = self._seed(db, tenant)
+
+        client.get(f"/api/campaigns/{campaign.id}/analytics", headers=headers)
+        assert get_cached_analytics(tenant.id, campaign.id) is not None
+
+        resp = client.patch(
+            f"/api/campaigns/{campaign.id}", headers=headers, json={"description": "x"},
+        )
+        assert resp.status_code == 200
+        assert get_cached_analytics(tenant.id, campaign.id) is None
+
+    def test_expired_entry_recomputed(self):
+        from unittest.mock import patch
+
+        from api.services import campaign_analytics as ca
+
+        ca.store_analytics("t1", "c1", {"messages": {}}, ttl=5)
+        assert ca.get_cached_analytics("t1", "c1") == {"messages": {}}
+        with patch.object(ca.time, "monotonic", return_value=ca.time.monotonic() + 6):
+            assert ca.get_cached_analytics("t1", "c1") is None
+        ca.invalidate_tenant_analytics("t1")
@@ -1,4 +1,7 @@
 """Unit tests for company routes."""
+import csv
+import io
+
 from tests.conftest import auth_header
 
 
@@ -135,6 +138,33 @@ class TestListCompanies:
         assert "Other Co" not in names
 
 
+class TestExportCompaniesCsv:
+    def test_exports_filtered_companies(self, client, seed_companies_contacts):
+        headers = auth_header(client)
+        headers["X-Namespace"] = "test-corp"
+        resp = client.get(
+            "/api/companies/export-csv?status=triage_passed&sort=name", headers=headers
+        )
+        assert resp.status_code == 200
+        assert resp.content_type == "text/csv; charset=utf-8"
+        rows = list(csv.reader(io.StringIO(resp.data.decode("utf-8"))))
+        assert rows[0][:3] == ["Name", "Domain", "Status"]
+        assert len(rows) == 3
+        assert all(r[2] == "Triage: Passed" for r in rows[1:])
+        assert [r[0] for r in rows[1:]] == sorted(r[0] for r in rows[1:])
+
+    def test_exports_all_without_pagination(self, client, seed_companies_contacts):
+        headers = auth_header(client)
+        headers["X-Namespace"] = "test-corp"
+        resp = client.get("/api/companies/export-csv?page_size=1", headers=headers)
+        rows = list(csv.reader(io.StringIO(resp.data.decode("utf-8"))))
+        assert len(rows) == 6  # header + 5 companies
+
+    def test_no_auth_returns_401(self, client, seed_companies_contacts):
+        resp = client.get("/api/companies/export-csv")
+        assert resp.status_code == 401
+
+
 class TestGetCompany:
     def test_get_detail(self, client, seed_companies_contacts):
         headers = auth_header(client)
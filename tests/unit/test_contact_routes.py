@@ -1,5 +1,9 @@
 """Unit tests for contact routes."""
 
+import csv
+import gzip
+import io
+
 from tests.conftest import auth_header
 
 
@@ -132,6 +136,60 @@ class TestListContacts:
         assert "Hidden Person" not in names
 
 
+class TestExportContactsCsv:
+    def _rows(self, resp):
+        return list(csv.reader(io.StringIO(resp.data.decode("utf-8"))))
+
+    def test_exports_all_matching_contacts(self, client, seed_companies_contacts):
+        headers = auth_header(client)
+        headers["X-Namespace"] = "test-corp"
+        resp = client.get("/api/contacts/export-csv", headers=headers)
+        assert resp.status_code == 200
+        assert resp.content_type == "text/csv; charset=utf-8"
+        assert 'filename="contacts.csv"' in resp.headers["Content-Disposition"]
+        rows = self._rows(resp)
+        assert rows[0][:3] == ["First Name", "Last Name", "Email"]
+        assert len(rows) == 11  # header + 10 contacts, no pagination
+
+    def test_applies_list_filters(self, client, seed_companies_contacts):
+        headers = auth_header(client)
+        headers["X-Namespace"] = "test-corp"
+        resp = client.get(
+            "/api/contacts/export-csv?tag_name=batch-2", headers=headers
+        )
+        rows = self._rows(resp)
+        assert len(rows) == 5  # Eve, Frank, Grace, Hank
+        tags_col = rows[0].index("Tags")
+        assert all("batch-2" in r[tags_col] for r in rows[1:])
+
+    def test_sanitizes_formula_cells(self, client, db, seed_companies_contacts):
+        from api.models import Contact
+
+        ct = Contact.query.filter_by(first_name="John").first()
+        ct.job_title = "=HYPERLINK(\"http://evil\")"
+        db.session.commit()
+
+        headers = auth_header(client)
+        headers["X-Namespace"] = "test-corp"
+        resp = client.get("/api/contacts/export-csv?search=John", headers=headers)
+        rows = self._rows(resp)
+        assert rows[1][rows[0].index("Job Title")].startswith("'=")
+
+    def test_gzip(self, client, seed_companies_contacts):
+        headers = auth_header(client)
+        headers["X-Namespace"] = "test-corp"
+        resp = client.get("/api/contacts/export-csv?gzip=1", headers=headers)
+        assert resp.status_code == 200
+        assert resp.content_type == "application/gzip"
+        assert "contacts.csv.gz" in resp.headers["Content-Disposition"]
+        text = gzip.decompress(resp.data).decode("utf-8")
+        assert len(list(csv.reader(io.StringIO(text)))) == 11
+
+    def test_no_auth_returns_401(self, client, seed_companies_contacts):
+        resp = client.get("/api/contacts/export-csv")
+        assert resp.status_code == 401
+
+
 class TestGetContact:
     def test_get_detail(self, client, seed_companies_contacts):
         headers = auth_header(client)
@@ -0,0 +1,214 @@
+"""Unit tests for materialized enrichment-context bundles."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from api.services import context_bundles
+from api.services.context_bundles import (
+    BUNDLE_VERSION,
+    build_company_bundles,
+    build_contact_bundles,
+    enrichment_context,
+    load_bundles,
+    refresh_contact_bundles,
+)
+
+
+@pytest.fixture
+def maintained(monkeypatch):
+    """Pretend the database invalidates bundles (PostgreSQL triggers)."""
+    monkeypatch.setattr(context_bundles, "bundles_maintained", lambda: True)
+
+
+@pytest.fixture
+def company_contact(db, seed_tenant):
+    from api.models import Company, Contact, ContactEnrichment
+
+    company = Company(
+        tenant_id=seed_tenant.id,
+        name="Acme",
+        domain="acme.com",
+        verified_employees=120,
+        verified_revenue_eur_m=4.25,
+    )
+    db.session.add(company)
+    db.session.flush()
+    contact = Contact(
+        tenant_id=seed_tenant.id,
+        company_id=company.id,
+        first_name="Jane",
+        last_name="Doe",
+    )
+    db.session.add(contact)
+    db.session.flush()
+    db.session.add(
+        ContactEnrichment(
+            contact_id=contact.id, person_summary="Builder", authority_score=7
+        )
+    )
+    db.session.commit()
+    return str(company.id), str(contact.id)
+
+
+def _stored(db):
+    return {
+        (r[0], str(r[1])): (r[2], r[3])
+        for r in db.session.execute(
+            db.text(
+                "SELECT entity_type, entity_id, version, bundle "
+                "FROM enrichment_context_bundles"
+            )
+        ).fetchall()
+    }
+
+
+class TestBuildBundles:
+    def test_company_without_enrichment(self, db, company_contact):
+        company_id, _ = company_contact
+        built = build_company_bundles([company_id])
+
+        tenant_id, bundle = built[company_id]
+        assert bundle["company"]["name"] == "Acme"
+        assert bundle["company"]["employee_count"] == "120"
+        assert bundle["company"]["revenue_eur_m"] == "4.2"
+        assert bundle["l2"] == {}
+        assert tenant_id
+
+    def test_modules_fill_missing_l2_fields(self, db, company_contact):
+        from api.models import CompanyEnrichmentL2, CompanyEnrichmentSignals
+
+        company_id, _ = company_contact
+        db.session.add(
+            CompanyEnrichmentL2(company_id=company_id, company_intel="Legacy intel")
+        )
+        db.session.add(
+            CompanyEnrichmentSignals(
+                company_id=company_id,
+                hiring_signals="Hiring 10 engineers",
+                digital_initiatives="Cloud migration",
+            )
+        )
+        db.session.commit()
+
+        _, bundle = build_company_bundles([company_id])[company_id]
+        assert bundle["l2"]["company_intel"] == "Legacy intel"
+        assert bundle["l2"]["hiring_signals"] == "Hiring 10 engineers"
+        assert bundle["l2"]["digital_initiatives"] == "Cloud migration"
+        assert bundle["l2"]["pitch_framing"] is None
+
+    def test_contact_person_fields(self, db, company_contact):
+        _, contact_id = company_contact
+        _, bundle = build_contact_bundles([contact_id])[contact_id]
+        assert bundle["person"]["person_summary"] == "Builder"
+        assert bundle["person"]["authority_score"] == 7
+
+    def test_enrichment_context_shape(self, db, company_contact):
+        company_id, contact_id = company_contact
+        companies, contacts = load_bundles([company_id], [contact_id])
+        company_data, enrichment_data = enrichment_context(
+            companies[company_id], contacts[contact_id]
+        )
+        assert company_data["domain"] == "acme.com"
+        assert set(enrichment_data) == {"l2", "person"}
+        assert enrichment_data["person"]["authority_score"] == 7
+
+        company_data["name"] = "Changed"
+        assert companies[company_id]["company"]["name"] == "Acme"
+
+
+class TestStoredBundles:
+    def test_not_stored_without_triggers(self, db, company_contact):
+        company_id, contact_id = company_contact
+        load_bundles([company_id], [contact_id])
+        refresh_contact_bundles([contact_id])
+        assert _stored(db) == {}
+
+    def test_load_stores_then_reuses(self, db, company_contact, maintained):
+        company_id, contact_id = company_contact
+        first = load_bundles([company_id], [contact_id])
+
+        stored = _stored(db)
+        assert set(stored) == {("company", company_id), ("contact", contact_id)}
+        assert all(version == BUNDLE_VERSION for version, _ in stored.values())
+
+        with patch.object(context_bundles, "build_company_bundles") as build_co, \
+                patch.object(context_bundles, "build_contact_bundles") as build_ct:
+            second = load_bundles([company_id], [contact_id])
+        build_co.assert_not_called()
+        build_ct.assert_not_called()
+        assert second == first
+
+    def test_outdated_version_is_rebuilt(self, db, company_contact, maintained):
+        company_id, contact_id = company_contact
+        load_bundles([company_id], [contact_id])
+        db.session.execute(
+            db.text(
+                "UPDATE enrichment_context_bundles SET version = :v, bundle = :b"
+            ),
+            {"v": BUNDLE_VERSION - 1, "b": json.dumps({"person": {}})},
+        )
+        db.session.commit()
+
+        _, contacts = load_bundles([], [contact_id])
+        assert contacts[contact_id]["person"]["person_summary"] == "Builder"
+        assert _stored(db)[("contact", contact_id)][0] == BUNDLE_VERSION
+
+    def test_refresh_on_write(self, db, company_contact, maintained):
+        from api.models import ContactEnrichment
+
+        _, contact_id = company_contact
+        load_bundles([], [contact_id])
+        db.session.get(ContactEnrichment, contact_id).person_summary = "Updated"
+        refresh_contact_bundles([contact_id])
+        db.session.commit()
+
+        bundle = _stored(db)[("contact", contact_id)][1]
+        if isinstance(bundle, str):
+            bundle = json.loads(bundle)
+        assert bundle["person"]["person_summary"] == "Updated"
+
+
+    def test_read_path_never_clobbers_writer(self, db, company_contact, maintained):
+        from api.models import ContactEnrichment
+
+        _, contact_id = company_contact
+        # A reader builds from the rows it saw ...
+        stale = build_contact_bundles([contact_id])
+        # ... while an enricher rewrites the source and stores a fresh bundle
+        db.session.get(ContactEnrichment, contact_id).person_summary = "Updated"
+        refresh_contact_bundles([contact_id])
+        db.session.commit()
+
+        context_bundles._store("contact", stale, replace=False)
+        db.session.commit()
+
+        bundle = _stored(db)[("contact", contact_id)][1]
+        if isinstance(bundle, str):
+            bundle = json.loads(bundle)
+        assert bundle["person"]["person_summary"] == "Updated"
+
+
+class TestMessageGeneratorContext:
+    def test_preloaded_bundles_skip_lookup(self, db, company_contact):
+        from api.services import message_generator
+
+        company_id, contact_id = company_contact
+        bundles = load_bundles([company_id], [contact_id])
+        with patch.object(message_generator, "load_bundles") as load:
+            company_data, enrichment_data = message_generator._load_enrichment_context(
+                contact_id, company_id, bundles
+            )
+        load.assert_not_called()
+        assert company_data["name"] == "Acme"
+        assert enrichment_data["person"]["person_summary"] == "Builder"
+
+    def test_contact_without_company(self, db, company_contact):
+        from api.services.message_generator import _load_enrichment_context
+
+        _, contact_id = company_contact
+        company_data, enrichment_data = _load_enrichment_context(contact_id, None)
+        assert company_data == {}
+        assert enrichment_data["l2"] == {}
+        assert enrichment_data["person"]["authority_score"] == 7
@@ -1,11 +1,16 @@
 """Tests for conversation summarization (BL-263)."""
 
+from datetime import datetime, timedelta
+
 from api.services.memory.conversation_manager import (
     RECENT_WINDOW,
+    RESUMMARIZE_THRESHOLD,
+    SummaryCheckpoint,
     apply_floating_window,
     build_summarization_request,
     extract_facts_for_memory,
     needs_summarization,
+    roll_summary,
 )
 
 
@@ -124,3 +129,63 @@ class TestExtractFactsForMemory:
     def test_returns_list(self):
         facts = extract_facts_for_memory("test", "test response")
         assert isinstance(facts, list)
+
+
+def _make_delta(count, start=0):
+    base = datetime(2026, 1, 1)
+    return [
+        {
+            "id": "m{}".format(i),
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": "Message {}".format(i + 1),
+            "created_at": base + timedelta(minutes=i),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+class TestIncrementalSummary:
+    def test_prompt_includes_previous_summary_and_delta_only(self):
+        delta = _make_delta(RECENT_WINDOW + 3, start=40)
+        prompt = build_summarization_request(
+            delta, previous_summary="User picked fintech."
+        )
+        assert "User picked fintech." in prompt
+        assert "Message 41" in prompt
+        assert "Message 1\n" not in prompt
+        # Recent window stays verbatim, not summarized
+        assert "Message {}".format(40 + RECENT_WINDOW + 3) not in prompt
+
+    def test_below_threshold_not_rolled(self):
+        calls = []
+        delta = _make_delta(RECENT_WINDOW + RESUMMARIZE_THRESHOLD - 1)
+        assert roll_summary(delta, None, calls.append) is None
+        assert calls == []
+
+    def test_rolls_and_advances_checkpoint(self):
+        delta = _make_delta(RECENT_WINDOW + RESUMMARIZE_THRESHOLD)
+        checkpoint = roll_summary(delta, None, lambda prompt: " New summary ")
+        assert checkpoint.summary == "New summary"
+        covered = delta[RESUMMARIZE_THRESHOLD - 1]
+        assert checkpoint.last_message_id == covered["id"]
+        assert checkpoint.covered_until == covered["created_at"]
+        assert checkpoint.message_count == RESUMMARIZE_THRESHOLD
+
+    def test_builds_on_previous_checkpoint(self):
+        prompts = []
+        previous = SummaryCheckpoint(
+            summary="Earlier: DACH focus.",
+            last_message_id="m0",
+            covered_until=datetime(2026, 1, 1),
+            message_count=30,
+        )
+        delta = _make_delta(RECENT_WINDOW + RESUMMARIZE_THRESHOLD, start=1)
+        checkpoint = roll_summary(
+            delta, previous, lambda p: prompts.append(p) or "Merged"
+        )
+        assert "Earlier: DACH focus." in prompts[0]
+        assert checkpoint.message_count == 30 + RESUMMARIZE_THRESHOLD
+
+    def test_summarizer_failure_keeps_old_checkpoint(self):
+        delta = _make_delta(RECENT_WINDOW + RESUMMARIZE_THRESHOLD)
+        assert roll_summary(delta, None, lambda prompt: None) is None
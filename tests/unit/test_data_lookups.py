@@ -0,0 +1,218 @@
+"""Unit tests for chat-tier aggregate data lookups and the ORM load guard."""
+
+import pytest
+
+from api.agents import data_lookups
+from api.agents.chat_tier import _execute_tool, execute_data_lookup
+from api.agents.orm_guard import OrmLoadLimitExceeded, limit_orm_loads
+
+
+@pytest.fixture
+def tenant_data(db, seed_tenant):
+    from api.models import Campaign, Company, Contact, Owner, Tag
+
+    tid = seed_tenant.id
+    alice = Owner(tenant_id=tid, name="Alice")
+    db.session.add(alice)
+    db.session.flush()
+    for i, (tier, status) in enumerate(
+        [
+            ("Tier 1", "triage_passed"),
+            ("Tier 1", "enriched_l2"),
+            ("Tier 2", "triage_passed"),
+            (None, "new"),
+        ]
+    ):
+        db.session.add(
+            Company(
+                tenant_id=tid,
+                name="Co {}".format(i),
+                tier=tier,
+                status=status,
+                owner_id=alice.id if i < 2 else None,
+            )
+        )
+    for i in range(3):
+        db.session.add(
+            Contact(
+                tenant_id=tid,
+                first_name="C{}".format(i),
+                owner_id=alice.id if i else None,
+            )
+        )
+    for name in ("zeta", "alpha", "mid"):
+        db.session.add(Tag(tenant_id=tid, name=name))
+    db.session.add(Campaign(tenant_id=tid, name="Q1", status="review"))
+    db.session.add(Campaign(tenant_id=tid, name="Q2", status="draft"))
+    db.session.commit()
+    return str(tid)
+
+
+def _lookup(query_type, tenant_id, filters=None):
+    return execute_data_lookup(query_type, filters or {}, {"tenant_id": tenant_id})
+
+
+class TestAggregateLookups:
+    def test_counts(self, tenant_data):
+        assert _lookup("company_count", tenant_data) == {
+            "count": 4,
+            "type": "companies",
+        }
+        assert _lookup("contact_count", tenant_data)["count"] == 3
+        assert _lookup("campaign_count", tenant_data)["count"] == 2
+
+    def test_filtered_count(self, tenant_data):
+        result = _lookup(
+            "company_count", tenant_data, {"status": "triage_passed", "bogus": 1}
+        )
+        assert result["count"] == 2
+        assert result["ignored_filters"] == ["bogus"]
+
+    def test_filter_values_coerced_to_column_type(self, db, tenant_data):
+        from api.models import Owner
+
+        alice = Owner.query.filter_by(tenant_id=tenant_data).one()
+        result = _lookup(
+            "company_count",
+            tenant_data,
+            {"owner_id": str(alice.id).upper(), "status": "triage_passed"},
+        )
+        assert result == {"count": 1, "type": "companies"}
+        assert _lookup("message_count", tenant_data, {"sequence_step": "2"}) == {
+            "count": 0,
+            "type": "messages",
+        }
+
+    def test_invalid_filter_values_are_ignored(self, tenant_data):
+        result = _lookup(
+            "contact_count",
+            tenant_data,
+            {
+                "owner_id": "alice",
+                "company_id": 42,
+                "processed_enrich": "maybe",
+                "icp_fit": "strong_fit",
+            },
+        )
+        assert result["count"] == 0
+        assert result["ignored_filters"] == ["company_id", "owner_id", "processed_enrich"]
+        result = _lookup(
+            "message_count", tenant_data, {"sequence_step": "first", "tag_id": [1]}
+        )
+        assert result["ignored_filters"] == ["sequence_step", "tag_id"]
+        assert _lookup("message_count", tenant_data, {"sequence_step": 70000})[
+            "ignored_filters"
+        ] == ["sequence_step"]
+
+    def test_failed_lookup_rolls_back(self, db, tenant_data, monkeypatch):
+        from unittest.mock import patch
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("statement failed")
+
+        monkeypatch.setattr("api.agents.chat_tier.run_lookup", fail)
+        with patch.object(db.session, "rollback") as rollback:
+            result = _lookup("company_count", tenant_data)
+        assert result["error"] == "Data lookup failed: statement failed"
+        rollback.assert_called_once_with()
+
+    def test_icp_summary(self, tenant_data):
+        result = _lookup("icp_summary", tenant_data)
+        assert result["tiers"] == {"Tier 1": 2, "Tier 2": 1, "Unclassified": 1}
+        assert result["total"] == 4
+
+    def test_companies_by_stage(self, tenant_data):
+        result = _lookup("companies_by_stage", tenant_data)
+        assert result["stages"] == {"triage_passed": 2, "enriched_l2": 1, "new": 1}
+
+    def test_by_owner(self, tenant_data):
+        assert _lookup("companies_by_owner", tenant_data)["owners"] == {
+            "Alice": 2,
+            "Unassigned": 2,
+        }
+        assert _lookup("contacts_by_owner", tenant_data)["owners"] == {
+            "Alice": 2,
+            "Unassigned": 1,
+        }
+
+    def test_campaigns_by_status(self, tenant_data):
+        result = _lookup("campaigns_by_status", tenant_data)
+        assert result["statuses"] == {"review": 1, "draft": 1}
+        assert result["total"] == 2
+
+    def test_grouped_lookup_truncates(self, tenant_data, monkeypatch):
+        monkeypatch.setattr(data_lookups, "GROUP_LIMIT", 1)
+        result = _lookup("icp_summary", tenant_data)
+        assert result["tiers"] == {"Tier 1": 2}
+        assert result["truncated"] is True
+        assert result["total"] == 4
+
+    def test_batch_list(self, tenant_data, monkeypatch):
+        monkeypatch.setattr(data_lookups, "BATCH_LIST_LIMIT", 2)
+        result = _lookup("batch_list", tenant_data)
+        assert [t["name"] for t in result["tags"]] == ["alpha", "mid"]
+        assert result["total"] == 3
+
+    def test_empty_tenant(self, db, seed_tenant):
+        result = _lookup("icp_summary", str(seed_tenant.id))
+        assert result == {"tiers": {}, "total": 0, "type": "companies"}
+
+    def test_lookups_load_no_orm_rows(self, db, tenant_data, monkeypatch):
+        from api.agents import chat_tier
+
+        monkeypatch.setattr(chat_tier, "_MAX_TOOL_ORM_ROWS", 1)
+        db.session.expunge_all()
+        for query_type in data_lookups.QUERY_TYPES:
+            result = _execute_tool(
+                "data_lookup", {"query_type": query_type}, {"tenant_id": tenant_data}
+            )
+            assert "error" not in result, query_type
+
+
+class TestOrmLoadGuard:
+    def test_rejects_full_table_load(self, db, tenant_data):
+        from api.models import Company
+
+        db.session.expunge_all()
+        with pytest.raises(OrmLoadLimitExceeded, match="Company"):
+            with limit_orm_loads("some_tool", max_rows=2):
+                Company.query.filter_by(tenant_id=tenant_data).all()
+
+    def test_allows_bounded_and_aggregate_queries(self, db, tenant_data):
+        from api.models import Company
+
+        db.session.expunge_all()
+        with limit_orm_loads("some_tool", max_rows=2):
+            assert (
+                len(Company.query.filter_by(tenant_id=tenant_data).limit(2).all()) == 2
+            )
+            assert Company.query.filter_by(tenant_id=tenant_data).count() == 4
+            assert len(db.session.query(Company.name).all()) == 4
+
+    def test_budget_is_scoped_to_block(self, db, tenant_data):
+        from api.models import Company
+
+        db.session.expunge_all()
+        with pytest.raises(OrmLoadLimitExceeded):
+            with limit_orm_loads("some_tool", max_rows=2):
+                Company.query.all()
+        db.session.expunge_all()
+        assert len(Company.query.all()) == 4
+
+    def test_zero_disables_guard(self, db, tenant_data):
+        from api.models import Company
+
+        with limit_orm_loads("some_tool", max_rows=0):
+            assert len(Company.query.all()) == 4
+
+    def test_limit_read_from_given_app_config(self, db, tenant_data):
+        from types import SimpleNamespace
+
+        from api.models import Company
+
+        # Subgraph tool loops enter the guard before pushing the app context
+        tool_app = SimpleNamespace(config={"TOOL_MAX_ORM_ROWS": 2})
+        db.session.expunge_all()
+        with pytest.raises(OrmLoadLimitExceeded):
+            with limit_orm_loads("some_tool", app=tool_app):
+                Company.query.all()
@@ -0,0 +1,222 @@
+"""Tests for PDF extraction and duplicate reuse in the document store."""
+
+from unittest.mock import patch
+
+import pytest
+
+from api.services.multimodal.document_store import DocumentStore
+from api.services.multimodal.pdf_processor import PageResult, PDFExtractionResult
+
+TENANT = "00000000-0000-0000-0000-0000000000a1"
+OTHER_TENANT = "00000000-0000-0000-0000-0000000000b2"
+
+EXTRACT = "api.services.multimodal.pdf_processor.extract_text_from_pdf"
+
+
+@pytest.fixture
+def upload_tables(db):
+    """Create file_uploads + extracted_content (raw-SQL tables, not ORM models)."""
+    db.session.execute(
+        db.text(
+            "CREATE TABLE IF NOT EXISTS file_uploads ("
+            "id VARCHAR(36) PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))), "
+            "tenant_id VARCHAR(36) NOT NULL, "
+            "filename TEXT NOT NULL, "
+            "mime_type VARCHAR(100) NOT NULL, "
+            "size_bytes INTEGER NOT NULL, "
+            "storage_path TEXT NOT NULL, "
+            "status VARCHAR(20) NOT NULL DEFAULT 'pending', "
+            "page_count INTEGER, "
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, "
+            "created_by VARCHAR(36), "
+            "content_sha256 VARCHAR(64), "
+            "processor VARCHAR(20), "
+            "processor_version VARCHAR(20), "
+            "cache_hit BOOLEAN, "
+            "processed_at TIMESTAMP"
+            ")"
+        )
+    )
+    db.session.execute(
+        db.text(
+            "CREATE TABLE IF NOT EXISTS extracted_content ("
+            "id VARCHAR(36) PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))), "
+            "file_id VARCHAR(36) NOT NULL, "
+            "content_type VARCHAR(20) NOT NULL DEFAULT 'text', "
+            "content_text TEXT NOT NULL, "
+            "content_summary TEXT, "
+            "page_number INTEGER, "
+            "token_count INTEGER NOT NULL DEFAULT 0, "
+            "model_used VARCHAR(50), "
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+            ")"
+        )
+    )
+    db.session.commit()
+    yield
+    db.session.execute(db.text("DROP TABLE IF EXISTS extracted_content"))
+    db.session.execute(db.text("DROP TABLE IF EXISTS file_uploads"))
+    db.session.commit()
+
+
+@pytest.fixture
+def store(tmp_path, upload_tables):
+    return DocumentStore(upload_dir=str(tmp_path))
+
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    path = tmp_path / "deck.pdf"
+    path.write_bytes(b"%PDF-1.4 same bytes")
+    return str(path)
+
+
+def _pages():
+    return [
+        PageResult(page_number=1, text="Quarterly revenue grew " * 10),
+        PageResult(page_number=2, text="Logo", needs_vision=True),
+        PageResult(
+            page_number=3,
+            text="Pricing for every team size " * 5,
+            tables=[[["Plan", "Price"], ["Pro", "99"]]],
+        ),
+    ]
+
+
+def _fake_extract(seen=None):
+    """Extractor stub that hands each page to ``on_page`` like the real one."""
+
+    def extract(file_path, workers=None, on_page=None):
+        pages = _pages()
+        for page in pages:
+            on_page(page)
+            if seen is not None:
+                seen.append(page.page_number)
+        return PDFExtractionResult(pages=pages, total_pages=len(pages))
+
+    return extract
+
+
+def _upload(store, tenant_id, path):
+    return store.save_upload(tenant_id, "deck.pdf", "application/pdf", 20, path)
+
+
+def _rows(db, file_id):
+    return sorted(
+        (r[0], r[1], r[2])
+        for r in db.session.execute(
+            db.text(
+                "SELECT content_type, page_number, content_text "
+                "FROM extracted_content WHERE file_id = :fid"
+            ),
+            {"fid": file_id},
+        ).fetchall()
+    )
+
+
+class TestExtractPdf:
+    def test_pages_persisted_through_on_page(self, db, store, pdf_file):
+        file_id = _upload(store, TENANT, pdf_file)
+        readable = []
+
+        def extract(file_path, workers=None, on_page=None):
+            pages = _pages()
+            for page in pages:
+                on_page(page)
+                # Each page is readable as soon as its callback returns
+                readable.append(len(_rows(db, file_id)))
+            return PDFExtractionResult(pages=pages, total_pages=len(pages))
+
+        with patch(EXTRACT, side_effect=extract):
+            result = store.extract_pdf(file_id, TENANT, pdf_file)
+
+        assert readable == [1, 2, 4]
+        assert [(t, p) for t, p, _ in _rows(db, file_id)] == [
+            ("table", 3),
+            ("text", 1),
+            ("text", 2),
+            ("text", 3),
+        ]
+        assert result == {
+            "page_count": 3,
+            "vision_pages": [2],
+            "reused_from": None,
+            "errors": [],
+        }
+        info = store.get_upload_info(file_id, TENANT)
+        assert info["status"] == "done"
+        assert info["page_count"] == 3
+
+    def test_reupload_copies_rows_including_vision(self, db, store, pdf_file):
+        first = _upload(store, TENANT, pdf_file)
+        with patch(EXTRACT, side_effect=_fake_extract()):
+            store.extract_pdf(first, TENANT, pdf_file)
+        store.save_extracted_content(first, "image_desc", "A logo", page_number=2)
+        store.save_extracted_content(first, "summary", "Deck", content_summary="S")
+
+        second = _upload(store, TENANT, pdf_file)
+        with patch(EXTRACT) as extract:
+            result = store.extract_pdf(second, TENANT, pdf_file)
+
+        extract.assert_not_called()
+        assert result["reused_from"] == first
+        assert result["page_count"] == 3
+        # The copied vision description covers the sparse page
+        assert result["vision_pages"] == []
+        assert _rows(db, second) == _rows(db, first)
+        assert store.get_file_summary(second, TENANT) == "S"
+        assert store.get_upload_info(second, TENANT)["status"] == "done"
+        cache_hit = db.session.execute(
+            db.text("SELECT cache_hit FROM file_uploads WHERE id = :fid"),
+            {"fid": second},
+        ).scalar()
+        assert cache_hit
+
+    def test_pending_vision_pages_after_copy(self, db, store, pdf_file):
+        first = _upload(store, TENANT, pdf_file)
+        with patch(EXTRACT, side_effect=_fake_extract()):
+            store.extract_pdf(first, TENANT, pdf_file)
+
+        second = _upload(store, TENANT, pdf_file)
+        with patch(EXTRACT) as extract:
+            result = store.extract_pdf(second, TENANT, pdf_file)
+
+        extract.assert_not_called()
+        # Only the sparse page still needs a vision pass
+        assert result["vision_pages"] == [2]
+        assert store._pending_vision_pages(second) == [2]
+
+    def test_no_reuse_across_tenants(self, db, store, pdf_file):
+        first = _upload(store, TENANT, pdf_file)
+        with patch(EXTRACT, side_effect=_fake_extract()):
+            store.extract_pdf(first, TENANT, pdf_file)
+        sha = db.session.execute(
+            db.text("SELECT content_sha256 FROM file_uploads WHERE id = :fid"),
+            {"fid": first},
+        ).scalar()
+
+        other = _upload(store, OTHER_TENANT, pdf_file)
+        assert store.find_processed_duplicate(OTHER_TENANT, sha, other) is None
+
+        seen = []
+        with patch(EXTRACT, side_effect=_fake_extract(seen)):
+            result = store.extract_pdf(other, OTHER_TENANT, pdf_file)
+
+        assert seen == [1, 2, 3]
+        assert result["reused_from"] is None
+        assert store.find_processed_duplicate(TENANT, sha, first) is None
+        assert store.find_processed_duplicate(OTHER_TENANT, sha, first) == other
+
+    def test_unfinished_upload_not_reused(self, db, store, pdf_file):
+        first = _upload(store, TENANT, pdf_file)
+        store.save_extracted_content(first, "text", "partial", page_number=1)
+        store.update_status(first, "processing", TENANT)
+
+        second = _upload(store, TENANT, pdf_file)
+        seen = []
+        with patch(EXTRACT, side_effect=_fake_extract(seen)):
+            result = store.extract_pdf(second, TENANT, pdf_file)
+
+        assert seen == [1, 2, 3]
+        assert result["reused_from"] is None
+        assert store.copy_extracted_content(first, second) == 1
@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from unittest.mock import MagicMock, patch
 
+import pytest
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
 
@@ -263,6 +264,49 @@ class TestEnrichmentAgentNode:
         assert result["iteration"] == 6
         assert result["active_agent"] == "enrichment"
 
+    def test_tracks_prompt_cache_tokens(self):
+        from api.agents.subgraphs.enrichment import enrichment_agent_node
+
+        mock_response = AIMessage(content="Done.")
+        mock_response.usage_metadata = {
+            "input_tokens": 3200,
+            "output_tokens": 100,
+            "input_token_details": {"cache_read": 3000, "cache_creation": 0},
+        }
+
+        with (
+            patch("api.agents.subgraphs.enrichment.ChatAnthropic") as MockModel,
+            patch("api.agents.subgraphs.enrichment.get_stream_writer") as mock_writer,
+            patch(
+                "api.agents.subgraphs.enrichment._get_enrichment_tool_defs",
+                return_value=[],
+            ),
+        ):
+            mock_writer.return_value = MagicMock()
+            mock_instance = MagicMock()
+            mock_instance.invoke.return_value = mock_response
+            MockModel.return_value = mock_instance
+
+            state = {
+                "messages": [HumanMessage(content="test")],
+                "iteration": 1,
+                "total_input_tokens": 500,
+                "total_output_tokens": 200,
+                "total_cache_read_tokens": 3000,
+                "total_cache_creation_tokens": 3000,
+                "total_cost_usd": "0",
+                "model": "claude-haiku-4-5-20251001",
+            }
+
+            result = enrichment_agent_node(state)
+
+        # Cache reads are not billed as uncached input
+        assert result["total_input_tokens"] == 700
+        assert result["total_cache_read_tokens"] == 6000
+        assert result["total_cache_creation_tokens"] == 3000
+        # 200 uncached input at $0.80/M + 3000 reads at 0.1x + 100 output at $4/M
+        assert float(result["total_cost_usd"]) == pytest.approx(0.00080)
+
 
 # ---------------------------------------------------------------------------
 # Tests: tool name constants
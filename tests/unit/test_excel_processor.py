@@ -493,3 +493,92 @@ class TestNumericStats:
         assert stats["Val"]["min"] == 10
         assert stats["Val"]["max"] == 30
         assert stats["Val"]["count"] == 3
+
+
+class TestStreamingSketch:
+    """Tests for one-pass, bounded-memory sheet sketches."""
+
+    def test_column_profile(self):
+        from api.services.multimodal.excel_processor import sketch_rows
+
+        rows = [["Name", "Score", "Note"]]
+        rows += [["co{}".format(i), i % 7, "" if i % 4 else "x"] for i in range(100)]
+        sketch = sketch_rows("CSV", rows)
+
+        assert sketch.row_count == 100
+        name, score, note = sketch.columns
+        assert name.distinct == 100 and name.distinct_exact
+        assert name.dominant_type == "text"
+        assert score.dominant_type == "number"
+        assert (score.numeric_min, score.numeric_max) == (0, 6)
+        assert score.distinct == 7
+        assert note.null_rate == pytest.approx(0.75)
+
+    def test_distinct_estimate_past_exact_limit(self, monkeypatch):
+        from api.services.multimodal import excel_processor
+
+        monkeypatch.setattr(excel_processor, "DISTINCT_EXACT_LIMIT", 100)
+        column = excel_processor.ColumnSketch("id")
+        for i in range(20000):
+            column.add("id-{}".format(i % 5000))
+
+        assert not column.distinct_exact
+        assert len(column._kmv) == excel_processor.DISTINCT_SKETCH_K
+        assert 4000 < column.distinct < 6000
+
+    def test_large_csv_keeps_bounded_rows(self, tmp_path):
+        from api.services.multimodal.excel_processor import (
+            SAMPLE_TAIL_ROWS,
+            SMALL_SHEET_THRESHOLD,
+            extract_from_file,
+            sketch_csv,
+        )
+
+        path = tmp_path / "big.csv"
+        with open(path, "w") as f:
+            f.write("id,amount\n")
+            for i in range(5000):
+                f.write("row_{},{}\n".format(i, i))
+
+        sketch = sketch_csv(str(path))
+        assert sketch.row_count == 5000
+        assert len(sketch.rows) == SMALL_SHEET_THRESHOLD
+        assert [r[0] for r in sketch.tail] == ["row_4997", "row_4998", "row_4999"]
+        assert len(sketch.tail) == SAMPLE_TAIL_ROWS
+
+        result = extract_from_file(str(path))
+        assert "5000 rows" in result.markdown
+        assert "**Column profile:**" in result.markdown
+        assert "min=0, max=4999" in result.markdown
+        assert "row_4999" in result.markdown
+
+    def test_latin1_csv_file(self, tmp_path):
+        from api.services.multimodal.excel_processor import read_csv_data
+
+        path = tmp_path / "latin.csv"
+        path.write_bytes("name,city\nJos\xe9,M\xfcnchen\n".encode("latin-1"))
+
+        data = read_csv_data(str(path))
+        assert data.rows == [["Jos\xe9", "M\xfcnchen"]]
+
+    def test_large_xlsx_streams_each_sheet(self, tmp_path):
+        openpyxl = pytest.importorskip("openpyxl")
+        from api.services.multimodal.excel_processor import extract_from_file
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "Deals"
+        ws.append(["Deal", "Value"])
+        for i in range(300):
+            ws.append(["deal_{}".format(i), i * 10])
+        wb.create_sheet("Notes").append(["Note"])
+        path = tmp_path / "deals.xlsx"
+        wb.save(path)
+
+        result = extract_from_file(str(path))
+
+        assert not result.errors
+        assert "300 rows x 2 columns" in result.markdown
+        assert "deal_299" in result.markdown
+        assert "- **Value**: number, 0% null, 300 distinct" in result.markdown
+        assert "## Notes" in result.markdown
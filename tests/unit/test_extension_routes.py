@@ -84,6 +84,89 @@ class TestUploadLeads:
         assert data["created_contacts"] == 1
         assert data["created_companies"] == 0  # reused existing
 
+    def test_intra_batch_company_and_contact_dedup(
+        self, client, seed_companies_contacts
+    ):
+        """Leads from the same new company share it; repeated URLs are skipped."""
+        from api.models import Company, Contact
+
+        headers = auth_header(client)
+        headers["X-Namespace"] = "test-corp"
+        leads = [
+            {
+                "name": "Ann One",
+                "company_name": "Batchco",
+                "linkedin_url": "https://www.linkedin.com/in/ann-one",
+            },
+            {
+                "name": "Bob Two",
+                "company_name": "BATCHCO",
+                "linkedin_url": "https://www.linkedin.com/in/bob-two",
+            },
+            {
+                "name": "Ann Again",
+                "company_name": "Batchco",
+                "linkedin_url": "https://www.linkedin.com/in/ann-one/",
+            },
+        ]
+        resp = client.post(
+            "/api/extension/leads",
+            json={"leads": leads, "source": "sales_navigator"},
+            headers=headers,
+        )
+        data = resp.get_json()
+        assert data["created_contacts"] == 2
+        assert data["created_companies"] == 1
+        assert data["skipped_duplicates"] == 1
+
+        company = Company.query.filter_by(name="Batchco").one()
+        linked = Contact.query.filter_by(company_id=company.id).count()
+        assert linked == 2
+
+    def test_resolves_page_in_constant_queries(
+        self, app, client, seed_companies_contacts
+    ):
+        """Query count does not grow with the number of leads."""
+        from sqlalchemy import event
+
+        from api.models import db
+
+        headers = auth_header(client)
+        headers["X-Namespace"] = "test-corp"
+
+        def _count(leads):
+            statements = []
+
+            def _track(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            with app.app_context():
+                engine = db.engine
+            event.listen(engine, "before_cursor_execute", _track)
+            try:
+                client.post(
+                    "/api/extension/leads",
+                    json={"leads": leads, "source": "sales_navigator"},
+                    headers=headers,
+                )
+            finally:
+                event.remove(engine, "before_cursor_execute", _track)
+            return len(statements)
+
+        def _page(prefix, n):
+            return [
+                {
+                    "name": "Lead {}".format(i),
+                    "company_name": "{} Co {}".format(prefix, i),
+                    "linkedin_url": "https://www.linkedin.com/in/{}-{}".format(
+                        prefix, i
+                    ),
+                }
+                for i in range(n)
+            ]
+
+        assert _count(_page("small", 2)) == _count(_page("large", 25))
+
     def test_requires_auth(self, client, db):
         """Given no auth header, returns 401."""
         resp = client.post(
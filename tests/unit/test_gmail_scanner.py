@@ -6,7 +6,11 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from api.services.gmail_scanner import GmailScanner, start_gmail_scan
+from api.services.gmail_scanner import (
+    GmailScanner,
+    _deserialize_contacts,
+    start_gmail_scan,
+)
 
 
 # ---- Fixtures ----
@@ -458,6 +462,253 @@ class TestBatchExtractWithClaude:
             assert scanner.contacts["carol@test.com"]["job_title"] == "CTO"
 
 
+# ---- Batched scanning ----
+
+
+class _FakeHttpError(Exception):
+    def __init__(self, status, content=b""):
+        super().__init__("HTTP {}".format(status))
+        self.resp = MagicMock(status=status)
+        self.content = content
+
+
+class _FakeExecutable:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+
+class _FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.items = []
+
+    def add(self, request, request_id=None):
+        self.items.append(request_id)
+
+    def execute(self):
+        self.service.batch_calls.append(list(self.items))
+        for rid in self.items:
+            errors = self.service.errors.get(rid)
+            if errors:
+                self.callback(rid, None, errors.pop(0))
+            else:
+                self.callback(rid, self.service.messages_by_id[rid], None)
+
+
+class _FakeGmail:
+    """Minimal stand-in for the Gmail API client used by the scanner."""
+
+    def __init__(self, messages, errors=None, page_size=None):
+        self.messages_by_id = {m["id"]: m for m in messages}
+        self.order = [m["id"] for m in messages]
+        self.errors = errors or {}
+        self.page_size = page_size
+        self.batch_calls = []
+        self.list_calls = 0
+        self.list_queries = []
+        self.history_id = "1000"
+        self.history_records = []
+        self.history_error = None
+
+    def users(self):
+        return self
+
+    def getProfile(self, userId):
+        return _FakeExecutable(lambda: {"historyId": self.history_id})
+
+    def history(self):
+        return _FakeHistory(self)
+
+    def messages(self):
+        return self
+
+    def list(self, userId, maxResults, q=None, pageToken=None):
+        def _page():
+            self.list_calls += 1
+            self.list_queries.append(q)
+            start = int(pageToken or 0)
+            size = min(maxResults, self.page_size or maxResults)
+            ids = self.order[start : start + size]
+            page = {"messages": [{"id": i} for i in ids]}
+            if start + size < len(self.order):
+                page["nextPageToken"] = str(start + size)
+            return page
+
+        return _FakeExecutable(_page)
+
+    def get(self, id, **kwargs):
+        return ("get", id)
+
+    def new_batch_http_request(self, callback):
+        return _FakeBatch(self, callback)
+
+
+class _FakeHistory:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, userId, startHistoryId, historyTypes, maxResults, pageToken=None):
+        def _page():
+            if self.service.history_error is not None:
+                raise self.service.history_error
+            start = int(pageToken or 0)
+            records = self.service.history_records[start : start + 2]
+            page = {"history": records, "historyId": self.service.history_id}
+            if start + 2 < len(self.service.history_records):
+                page["nextPageToken"] = str(start + 2)
+            return page
+
+        return _FakeExecutable(_page)
+
+
+def _header_msg(i, sender=None):
+    return {
+        "id": "m{}".format(i),
+        "internalDate": str(1700000000000 + i * 1000),
+        "payload": {
+            "mimeType": "text/plain",
+            "headers": [
+                {"name": "From", "value": sender or "Person {0} <p{0}@corp.com>".format(i)},
+                {"name": "Date", "value": "Mon, 15 Jan 2024 10:30:00 +0000"},
+            ],
+            "body": {
+                "data": base64.urlsafe_b64encode(
+                    "Hi\n--\nPerson {0}\nCTO | Corp\n+1 555 0100".format(i).encode()
+                ).decode()
+            },
+        },
+    }
+
+
+class TestBatchGetMessages:
+    def test_single_request_per_batch(self):
+        from api.services.gmail_scanner import batch_get_messages
+
+        service = _FakeGmail([_header_msg(i) for i in range(5)])
+        results, failed = batch_get_messages(service, ["m0", "m1", "m2"], "metadata")
+        assert set(results) == {"m0", "m1", "m2"}
+        assert failed == []
+        assert service.batch_calls == [["m0", "m1", "m2"]]
+
+    def test_retries_quota_errors_with_backoff(self):
+        from api.services.gmail_scanner import batch_get_messages
+
+        service = _FakeGmail(
+            [_header_msg(i) for i in range(3)],
+            errors={
+                "m1": [_FakeHttpError(429)],
+                "m2": [_FakeHttpError(403, b"userRateLimitExceeded")],
+            },
+        )
+        delays = []
+        results, failed = batch_get_messages(
+            service, ["m0", "m1", "m2"], "metadata", sleep=delays.append
+        )
+        assert set(results) == {"m0", "m1", "m2"}
+        assert failed == []
+        # Only the throttled messages are re-sent
+        assert service.batch_calls == [["m0", "m1", "m2"], ["m1", "m2"]]
+        assert len(delays) == 1
+
+    def test_drops_permanent_errors(self):
+        from api.services.gmail_scanner import batch_get_messages
+
+        service = _FakeGmail(
+            [_header_msg(i) for i in range(2)], errors={"m1": [_FakeHttpError(404)]}
+        )
+        results, failed = batch_get_messages(
+            service, ["m0", "m1"], "metadata", sleep=lambda _s: None
+        )
+        assert set(results) == {"m0"}
+        assert failed == ["m1"]
+        assert len(service.batch_calls) == 1
+
+
+class TestScanMessages:
+    def test_batched_scan_with_incremental_progress(self, scanner, monkeypatch):
+        from api.services import gmail_scanner
+
+        monkeypatch.setattr(gmail_scanner, "METADATA_BATCH_SIZE", 10)
+        service = _FakeGmail([_header_msg(i) for i in range(45)], page_size=20)
+        scanner.config = {"max_messages": 45}
+        scanner._get_gmail_service = lambda: service
+        scanner._thread_service = lambda: service
+        scanner._update_progress = MagicMock()
+        seen = []
+
+        scanner._scan_messages(on_new_sender=lambda addr, mid: seen.append(addr))
+
+        assert scanner.messages_scanned == 45
+        assert len(scanner.contacts) == 45
+        assert sorted(seen) == sorted(scanner.contacts)
+        assert len(service.batch_calls) == 5
+        assert all(len(call) <= 10 for call in service.batch_calls)
+        # One progress update per completed batch, never past the header share
+        assert scanner._update_progress.call_count == 5
+        assert all(c.args[1] <= 80 for c in scanner._update_progress.call_args_list)
+
+    def test_respects_max_messages(self, scanner):
+        service = _FakeGmail([_header_msg(i) for i in range(30)])
+        scanner.config = {"max_messages": 12}
+        scanner._get_gmail_service = lambda: service
+        scanner._thread_service = lambda: service
+        scanner._update_progress = MagicMock()
+
+        scanner._scan_messages()
+        assert scanner.messages_scanned == 12
+        assert sum(len(c) for c in service.batch_calls) == 12
+
+    def test_first_list_error_surfaces(self, scanner):
+        service = MagicMock()
+        service.users().messages().list().execute.side_effect = _FakeHttpError(401)
+        scanner._get_gmail_service = lambda: service
+        scanner._update_progress = MagicMock()
+        with pytest.raises(_FakeHttpError):
+            scanner._scan_messages()
+
+
+class TestSignaturePipeline:
+    def test_extracts_while_scanning_in_claude_sized_batches(
+        self, scanner, app, monkeypatch
+    ):
+        from api.services import gmail_scanner
+        from api.services.gmail_scanner import SignaturePipeline
+
+        monkeypatch.setattr(gmail_scanner, "SIGNATURE_BATCH_SIZE", 4)
+        service = _FakeGmail([_header_msg(i) for i in range(10)])
+        scanner._thread_service = lambda: service
+        batches = []
+        scanner._batch_extract_with_claude = lambda _app, sigs: batches.append(
+            sorted(sigs)
+        )
+
+        pipeline = SignaturePipeline(scanner, app)
+        pipeline.start()
+        for i in range(10):
+            pipeline.submit("p{}@corp.com".format(i), "m{}".format(i))
+        pipeline.finish()
+
+        sizes = [len(b) for b in batches]
+        assert sum(sizes) == 10
+        assert all(size == 4 for size in sizes[:-1])
+        assert any(call and call[0].startswith("m") for call in service.batch_calls)
+
+    def test_cancel_stops_pipeline(self, scanner, app):
+        from api.services.gmail_scanner import SignaturePipeline
+
+        scanner._batch_extract_with_claude = MagicMock()
+        pipeline = SignaturePipeline(scanner, app)
+        pipeline.start()
+        pipeline.cancel()
+        pipeline._thread.join(timeout=2)
+        assert not pipeline._thread.is_alive()
+        scanner._batch_extract_with_claude.assert_not_called()
+
+
 # ---- Scan route tests ----
 
 class TestScanRoutes:
@@ -572,3 +823,197 @@ class TestScanRoutes:
 
         resp = client.get("/api/gmail/scan/nonexistent-id/status", headers=headers)
         assert resp.status_code == 404
+
+
+# ---- Incremental re-scan ----
+
+
+def _added(*ids, labels=None):
+    return {
+        "id": "h-" + "-".join(ids),
+        "messagesAdded": [
+            {"message": {"id": i, "labelIds": labels or ["INBOX"]}} for i in ids
+        ],
+    }
+
+
+@pytest.fixture
+def gmail_job(db, seed_super_admin, seed_tenant):
+    from api.models import ImportJob, OAuthConnection
+
+    conn = OAuthConnection(
+        user_id=seed_super_admin.id,
+        tenant_id=str(seed_tenant.id),
+        provider="google",
+        provider_email="test@gmail.com",
+        status="active",
+    )
+    db.session.add(conn)
+    db.session.flush()
+
+    def _new_job():
+        job = ImportJob(
+            tenant_id=str(seed_tenant.id),
+            user_id=seed_super_admin.id,
+            filename="gmail-scan",
+            total_rows=0,
+            headers=json.dumps([]),
+            source="gmail_scan",
+            oauth_connection_id=str(conn.id),
+            status="scanning",
+        )
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    return conn, _new_job
+
+
+def _run_scan(app, conn, job, service, config=None):
+    scanner = GmailScanner(str(conn.id), job.id, config or {"max_messages": 100})
+    scanner._get_gmail_service = lambda: service
+    scanner._thread_service = lambda: service
+    scanner._batch_extract_with_claude = MagicMock()
+    scanner.run(app)
+    return scanner
+
+
+class TestHistoryMessageIds:
+    def test_newest_first_skipping_spam_and_duplicates(self, scanner):
+        service = _FakeGmail([])
+        service.history_records = [
+            _added("m1"),
+            _added("m2", "m1"),
+            _added("m3", labels=["SPAM"]),
+            _added("m4"),
+        ]
+        ids = scanner._history_message_ids(service, "500", 100)
+        assert ids == ["m4", "m1", "m2"]
+
+    def test_expired_history_returns_none(self, scanner):
+        service = _FakeGmail([])
+        service.history_error = _FakeHttpError(404)
+        assert scanner._history_message_ids(service, "500", 100) is None
+
+    def test_other_errors_surface(self, scanner):
+        service = _FakeGmail([])
+        service.history_error = _FakeHttpError(401)
+        with pytest.raises(_FakeHttpError):
+            scanner._history_message_ids(service, "500", 100)
+
+
+class TestIncrementalScan:
+    def test_first_scan_stores_checkpoint(self, app, db, gmail_job):
+        from api.models import GmailScanCheckpoint
+
+        conn, new_job = gmail_job
+        service = _FakeGmail([_header_msg(i) for i in range(5)])
+        scanner = _run_scan(app, conn, new_job(), service)
+
+        assert scanner.scan_mode == "full"
+        checkpoint = db.session.get(GmailScanCheckpoint, str(conn.id))
+        assert checkpoint.history_id == "1000"
+        assert checkpoint.last_internal_date == 1700000004000
+        assert checkpoint.messages_scanned == 5
+        assert len(_deserialize_contacts(checkpoint.contacts)) == 5
+
+    def test_rescan_fetches_only_new_messages_and_merges(self, app, db, gmail_job):
+        from api.models import GmailScanCheckpoint, ImportJob
+
+        conn, new_job = gmail_job
+        messages = [_header_msg(i) for i in range(5)]
+        service = _FakeGmail(messages)
+        _run_scan(app, conn, new_job(), service)
+
+        # Two new messages: a new sender and a repeat sender
+        messages.append(_header_msg(5))
+        messages.append(_header_msg(6, sender="Person 0 <p0@corp.com>"))
+        service = _FakeGmail(messages)
+        service.history_id = "1010"
+        service.history_records = [_added("m5"), _added("m6")]
+        job = new_job()
+        scanner = _run_scan(app, conn, job, service)
+
+        assert scanner.scan_mode == "incremental"
+        assert service.list_calls == 0
+        # Header batch plus the new sender's signature body, nothing older
+        assert {i for call in service.batch_calls for i in call} == {"m5", "m6"}
+        assert scanner.contacts["p0@corp.com"]["message_count"] == 2
+        assert len(scanner.contacts) == 6
+
+        db.session.refresh(job)
+        assert job.total_rows == 6
+        assert json.loads(job.scan_progress)["mode"] == "incremental"
+        checkpoint = db.session.get(GmailScanCheckpoint, str(conn.id))
+        assert checkpoint.history_id == "1010"
+        assert checkpoint.last_internal_date == 1700000006000
+        assert checkpoint.messages_scanned == 7
+        assert ImportJob.query.count() == 2
+
+    def test_watermark_skips_already_merged_messages(self, app, db, gmail_job):
+        conn, new_job = gmail_job
+        messages = [_header_msg(i) for i in range(3)]
+        service = _FakeGmail(messages)
+        _run_scan(app, conn, new_job(), service)
+
+        # m2 arrived during the first scan and shows up in history again
+        service = _FakeGmail(messages + [_header_msg(3)])
+        service.history_records = [_added("m2", "m3")]
+        scanner = _run_scan(app, conn, new_job(), service)
+
+        assert scanner.contacts["p2@corp.com"]["message_count"] == 1
+        assert scanner.contacts["p3@corp.com"]["message_count"] == 1
+
+    def test_expired_history_lists_after_watermark(self, app, db, gmail_job):
+        conn, new_job = gmail_job
+        messages = [_header_msg(i) for i in range(3)]
+        _run_scan(app, conn, new_job(), _FakeGmail(messages))
+
+        service = _FakeGmail(messages + [_header_msg(3)])
+        service.history_error = _FakeHttpError(404)
+        scanner = _run_scan(app, conn, new_job(), service)
+
+        assert scanner.scan_mode == "watermark"
+        assert service.list_queries == ["after:1700000002"]
+        # Listed messages at or before the watermark are not counted twice
+        assert all(c["message_count"] == 1 for c in scanner.contacts.values())
+        assert len(scanner.contacts) == 4
+
+    def test_full_rescan_and_changed_config_ignore_checkpoint(
+        self, app, db, gmail_job
+    ):
+        conn, new_job = gmail_job
+        messages = [_header_msg(i) for i in range(3)]
+        _run_scan(app, conn, new_job(), _FakeGmail(messages))
+
+        service = _FakeGmail(messages)
+        scanner = _run_scan(
+            app, conn, new_job(), service, {"max_messages": 100, "full_rescan": True}
+        )
+        assert scanner.scan_mode == "full"
+        assert all(c["message_count"] == 1 for c in scanner.contacts.values())
+
+        service = _FakeGmail(messages)
+        scanner = _run_scan(
+            app, conn, new_job(), service, {"exclude_domains": ["other.com"]}
+        )
+        assert scanner.scan_mode == "full"
+        assert service.list_calls == 1
+
+    def test_changed_scope_ignores_checkpoint(self, app, db, gmail_job):
+        conn, new_job = gmail_job
+        messages = [_header_msg(i) for i in range(3)]
+        scope = {"max_messages": 100, "date_range": 30}
+        _run_scan(app, conn, new_job(), _FakeGmail(messages), scope)
+
+        scanner = _run_scan(app, conn, new_job(), _FakeGmail(messages), scope)
+        assert scanner.scan_mode != "full"
+
+        widened = {"max_messages": 100, "date_range": 365}
+        scanner = _run_scan(app, conn, new_job(), _FakeGmail(messages), widened)
+        assert scanner.scan_mode == "full"
+
+        scanner = _run_scan(
+            app, conn, new_job(), _FakeGmail(messages), dict(widened, max_messages=500)
+        )
+        assert scanner.scan_mode == "full"
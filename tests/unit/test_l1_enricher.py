@@ -1167,3 +1167,135 @@ class TestPerplexityClientIntegration:
 
             # Cost should match the client's cost_usd
             assert result["enrichment_cost_usd"] == 0.123
+
+
+# ---------------------------------------------------------------------------
+# Batched research
+# ---------------------------------------------------------------------------
+
+
+class TestParseResearchArray:
+    def test_fenced_array(self):
+        from api.services.l1_enricher import _parse_research_array
+        content = '```json\n[{"ref": 1, "company_name": "A"}]\n```'
+        assert _parse_research_array(content) == [{"ref": 1, "company_name": "A"}]
+
+    def test_wrapped_and_embedded(self):
+        from api.services.l1_enricher import _parse_research_array
+        assert _parse_research_array('{"companies": [{"ref": 2}]}') == [{"ref": 2}]
+        assert _parse_research_array('Here you go: [{"ref": 1}] done') == [{"ref": 1}]
+
+    def test_garbage(self):
+        from api.services.l1_enricher import _parse_research_array
+        assert _parse_research_array("no results") is None
+        assert _parse_research_array('{"company_name": "A"}') is None
+        assert _parse_research_array("") is None
+
+    def test_match_by_ref_then_order(self):
+        from api.services.l1_enricher import _match_batch_items
+        items = [{"ref": "2", "n": "b"}, {"ref": 1, "n": "a"}, {"ref": 9}]
+        assert _match_batch_items(items, 3) == [items[1], items[0], None]
+        assert _match_batch_items([{"n": "a"}, {"n": "b"}], 2) == [{"n": "a"}, {"n": "b"}]
+        # No refs and a count mismatch: nothing can be trusted
+        assert _match_batch_items([{"n": "a"}], 2) == [None, None]
+
+
+def _batch_item(ref, name, **overrides):
+    item = dict(MOCK_PERPLEXITY_RESPONSE, ref=ref, company_name=name)
+    item.update(overrides)
+    return item
+
+
+class TestEnrichL1Batch:
+    def test_batch_size_from_tenant_settings(self, app, db, seed_tenant):
+        from api.services.l1_enricher import BATCH_MAX_SIZE, get_batch_size
+
+        assert get_batch_size(str(seed_tenant.id)) == 0
+        seed_tenant.settings = json.dumps({"l1_batch_size": 4})
+        db.session.commit()
+        assert get_batch_size(str(seed_tenant.id)) == 4
+        seed_tenant.settings = json.dumps({"l1_batch_size": 100})
+        db.session.commit()
+        assert get_batch_size(str(seed_tenant.id)) == BATCH_MAX_SIZE
+
+    def test_candidates_skip_large_and_enriched(self, app, db, seed_companies_contacts):
+        from sqlalchemy import text as sa_text
+
+        from api.services.l1_enricher import select_batch_candidates
+
+        acme, beta, gamma = seed_companies_contacts["companies"][:3]
+        db.session.execute(
+            sa_text("UPDATE companies SET company_size = 'enterprise' WHERE id = :id"),
+            {"id": str(beta.id)},
+        )
+        db.session.execute(
+            sa_text("INSERT INTO company_enrichment_l1 (company_id) VALUES (:id)"),
+            {"id": str(gamma.id)},
+        )
+        db.session.commit()
+
+        ids = [str(gamma.id), str(beta.id), str(acme.id)]
+        assert select_batch_candidates(ids) == [str(acme.id)]
+
+    def test_valid_items_stored_and_flagged_items_fall_back(
+        self, app, db, seed_companies_contacts
+    ):
+        from sqlalchemy import text as sa_text
+
+        from api.services.l1_enricher import enrich_l1_batch
+
+        data = seed_companies_contacts
+        acme, beta = data["companies"][:2]
+        app.config["PERPLEXITY_API_KEY"] = "test-key"
+        response = _make_mock_pplx_response(
+            [
+                _batch_item(2, "Beta Inc", confidence=0.1),
+                _batch_item(1, "Acme Corp"),
+            ],
+            cost=0.002,
+        )
+
+        with patch("api.services.l1_enricher.PerplexityClient") as MockClient, \
+             patch("api.services.l1_enricher.scrape_website", return_value=None):
+            MockClient.return_value.query.return_value = response
+            results = enrich_l1_batch(
+                [str(acme.id), str(beta.id)], str(data["tenant"].id)
+            )
+            prompt = MockClient.return_value.query.call_args[1]["user_prompt"]
+
+        assert "[1] Company: Acme Corp" in prompt
+        assert "[2] Company: Beta Inc" in prompt
+        assert results[str(acme.id)]["batched"] is True
+        assert results[str(acme.id)]["enrichment_cost_usd"] == pytest.approx(0.001)
+        assert results[str(beta.id)] == {
+            "fallback": "qc_flags",
+            "enrichment_cost_usd": pytest.approx(0.001),
+        }
+
+        rows = dict(
+            db.session.execute(
+                sa_text("SELECT id, status FROM companies WHERE id IN (:a, :b)"),
+                {"a": str(acme.id), "b": str(beta.id)},
+            ).fetchall()
+        )
+        assert rows[str(acme.id)] == "triage_passed"
+        # Left for single-company enrichment
+        assert rows[str(beta.id)] == "triage_passed"
+        stored = db.session.execute(
+            sa_text("SELECT company_id FROM company_enrichment_l1")
+        ).fetchall()
+        assert [str(r[0]) for r in stored] == [str(acme.id)]
+
+    def test_api_error_falls_back_for_all(self, app, db, seed_companies_contacts):
+        from api.services.l1_enricher import enrich_l1_batch
+
+        data = seed_companies_contacts
+        ids = [str(c.id) for c in data["companies"][:2]]
+        app.config["PERPLEXITY_API_KEY"] = "test-key"
+
+        with _mock_perplexity_error_client(), \
+             patch("api.services.l1_enricher.scrape_website", return_value=None):
+            results = enrich_l1_batch(ids, str(data["tenant"].id))
+
+        assert {r["fallback"] for r in results.values()} == {"api_error"}
+        assert set(results) == set(ids)
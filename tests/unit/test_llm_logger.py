@@ -79,6 +79,18 @@ class TestComputeCost:
         expected = (input_cost + output_cost).quantize(Decimal("0.000001"))
         assert cost == expected
 
+    def test_cache_tokens_priced_relative_to_input(self):
+        """Cache writes cost 1.25x input, cache reads 0.1x input."""
+        cost = compute_cost(
+            "anthropic",
+            "claude-sonnet-4-5-20250929",
+            0,
+            0,
+            cache_creation_tokens=1000000,
+            cache_read_tokens=1000000,
+        )
+        assert cost == Decimal("4.050000")
+
 
 class TestLogLlmUsage:
     def test_creates_entry_with_correct_cost(self, app, db, seed_tenant):
@@ -160,6 +172,26 @@ class TestLogLlmUsage:
         db.session.flush()
 
 
+class TestCacheUsageLogging:
+    def test_records_cache_tokens(self, app, db, seed_tenant):
+        entry = log_llm_usage(
+            tenant_id=seed_tenant.id,
+            operation="playbook_chat",
+            model="claude-haiku-4-5-20251001",
+            input_tokens=100,
+            output_tokens=50,
+            cache_creation_tokens=2000,
+            cache_read_tokens=8000,
+        )
+        db.session.flush()
+
+        assert entry.cache_creation_tokens == 2000
+        assert entry.cache_read_tokens == 8000
+        assert entry.cost_usd == compute_cost(
+            "anthropic", "claude-haiku-4-5-20251001", 100, 50, 2000, 8000
+        )
+
+
 class TestStreamingUsage:
     """Tests for AnthropicClient streaming token capture."""
 
@@ -237,3 +269,39 @@ class TestStreamingUsage:
         assert chunks == ["test"]
         assert client.last_stream_usage["input_tokens"] == 0
         assert client.last_stream_usage["output_tokens"] == 0
+
+    def test_stream_query_captures_cache_usage(self):
+        """Cache token counts from message_start land in last_stream_usage."""
+        from unittest.mock import MagicMock, patch
+
+        from api.services.anthropic_client import AnthropicClient
+
+        lines = [
+            b"event: message_start",
+            b'data: {"type":"message_start","message":{"usage":{"input_tokens":20,'
+            b'"cache_creation_input_tokens":0,"cache_read_input_tokens":3000}}}',
+            b"",
+            b"event: message_stop",
+            b"data: {}",
+            b"",
+        ]
+
+        mock_resp = MagicMock()
+        mock_resp.raise_for_status = MagicMock()
+        mock_resp.iter_lines = MagicMock(return_value=iter(lines))
+
+        with patch("requests.post", return_value=mock_resp) as mock_post:
+            client = AnthropicClient(api_key="test-key")
+            list(
+                client.stream_query(
+                    messages=[{"role": "user", "content": "hi"}],
+                    system_prompt="test",
+                    cache_prompt=True,
+                )
+            )
+
+        payload = mock_post.call_args[1]["json"]
+        assert payload["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert client.last_stream_usage["input_tokens"] == 20
+        assert client.last_stream_usage["cache_read_input_tokens"] == 3000
+        assert client.last_stream_usage["cache_creation_input_tokens"] == 0
@@ -0,0 +1,146 @@
+"""Unit tests for incremental LLM usage rollups."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.models import LlmUsageLog, LlmUsageRollup, db
+from api.services.llm_usage_rollups import (
+    compact_usage_rollups,
+    get_watermark,
+    maybe_reconcile,
+    reconcile_usage_rollups,
+    usage_source,
+)
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def _log(tenant_id, created_at, operation="l1_enrichment", cost=0.01, tokens=100):
+    entry = LlmUsageLog(
+        tenant_id=str(tenant_id),
+        operation=operation,
+        provider="anthropic",
+        model="claude-haiku-4-5-20251001",
+        input_tokens=tokens,
+        output_tokens=tokens // 2,
+        cost_usd=cost,
+        created_at=created_at,
+    )
+    db.session.add(entry)
+    return entry
+
+
+def _totals():
+    source, params = usage_source("day")
+    row = db.session.execute(
+        db.text(
+            "SELECT SUM(l.calls), SUM(l.cost_usd), SUM(l.input_tokens) FROM " + source
+        ),
+        params,
+    ).fetchone()
+    return int(row[0] or 0), round(float(row[1] or 0), 6), int(row[2] or 0)
+
+
+@pytest.fixture
+def tenant_id(seed_tenant):
+    return seed_tenant.id
+
+
+class TestCompaction:
+    def test_folds_rows_into_hour_and_day_buckets(self, app, tenant_id):
+        _log(tenant_id, NOW - timedelta(days=1, hours=3))
+        _log(tenant_id, NOW - timedelta(days=1, hours=3, minutes=10))
+        _log(tenant_id, NOW - timedelta(days=1, hours=1), operation="chat")
+        db.session.commit()
+
+        result = compact_usage_rollups(now=NOW)
+        assert result["rows_compacted"] == 3
+
+        day_rows = LlmUsageRollup.query.filter_by(granularity="day").all()
+        assert sorted(r.calls for r in day_rows) == [1, 2]
+        hour_rows = LlmUsageRollup.query.filter_by(granularity="hour").all()
+        assert sum(r.calls for r in hour_rows) == 3
+        assert get_watermark() == NOW - timedelta(minutes=5)
+
+    def test_incremental_compaction_adds_to_existing_buckets(self, app, tenant_id):
+        _log(tenant_id, NOW - timedelta(hours=2))
+        db.session.commit()
+        compact_usage_rollups(now=NOW - timedelta(hours=1))
+
+        _log(tenant_id, NOW - timedelta(minutes=30))
+        db.session.commit()
+        result = compact_usage_rollups(now=NOW)
+        assert result["rows_compacted"] == 1
+
+        day = LlmUsageRollup.query.filter_by(granularity="day").one()
+        assert day.calls == 2
+
+    def test_recent_rows_stay_in_tail(self, app, tenant_id):
+        _log(tenant_id, NOW - timedelta(minutes=1))
+        db.session.commit()
+        assert compact_usage_rollups(now=NOW)["rows_compacted"] == 0
+        assert LlmUsageRollup.query.count() == 0
+
+
+class TestReconciliation:
+    def test_rollups_plus_tail_match_raw(self, app, tenant_id):
+        for i in range(6):
+            _log(tenant_id, NOW - timedelta(hours=30 - i * 5), cost=0.001 * (i + 1))
+        db.session.commit()
+        before = _totals()
+
+        compact_usage_rollups(now=NOW - timedelta(hours=10))
+        assert _totals() == before
+        compact_usage_rollups(now=NOW)
+        assert _totals() == before
+
+        report = reconcile_usage_rollups()
+        assert report["mismatches"] == []
+        assert report["days_checked"] == 2
+
+    def test_late_row_detected_and_repaired(self, app, tenant_id):
+        _log(tenant_id, NOW - timedelta(days=1))
+        db.session.commit()
+        compact_usage_rollups(now=NOW)
+
+        # Row committed after compaction with a timestamp before the watermark
+        _log(tenant_id, NOW - timedelta(days=1, minutes=5))
+        db.session.commit()
+
+        report = reconcile_usage_rollups()
+        assert len(report["mismatches"]) == 1
+        assert report["mismatches"][0]["raw"]["calls"] == 2
+        assert report["mismatches"][0]["rollup"]["calls"] == 1
+
+        repaired = reconcile_usage_rollups(repair=True)
+        assert repaired["repaired"] == 1
+        assert reconcile_usage_rollups()["mismatches"] == []
+        day = LlmUsageRollup.query.filter_by(granularity="day").one()
+        assert day.calls == 2
+
+    def test_scheduled_pass_repairs_recent_days_only(self, app, tenant_id):
+        from api.services import llm_usage_rollups
+
+        _log(tenant_id, NOW - timedelta(days=5))
+        _log(tenant_id, NOW - timedelta(days=1))
+        db.session.commit()
+        compact_usage_rollups(now=NOW)
+
+        # Late commits below the watermark: one inside the window, one before
+        _log(tenant_id, NOW - timedelta(days=5, minutes=5))
+        _log(tenant_id, NOW - timedelta(days=1, minutes=5))
+        db.session.commit()
+
+        llm_usage_rollups._last_reconcile = 0.0
+        report = maybe_reconcile(now=NOW)
+        assert report["repaired"] == 1
+        assert maybe_reconcile(now=NOW) is None  # rate-limited
+        llm_usage_rollups._last_reconcile = 0.0
+
+        mismatches = reconcile_usage_rollups()["mismatches"]
+        assert len(mismatches) == 1
+        assert mismatches[0]["day"].startswith("2026-03-05")
+
+    def test_no_watermark(self, app, tenant_id):
+        assert reconcile_usage_rollups()["compacted_until"] is None
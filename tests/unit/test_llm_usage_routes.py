@@ -1,6 +1,7 @@
 """Unit tests for LLM usage API routes."""
 
 import json
+from unittest.mock import patch
 
 import pytest
 
@@ -165,3 +166,85 @@ class TestLogsData:
         resp = client.get("/api/llm-usage/logs", headers=headers)
         body = resp.get_json()
         assert body["logs"][0]["tenant_slug"] == "test-corp"
+
+
+class TestCacheReport:
+    def test_requires_super_admin(self, client, seed_user_with_role):
+        headers = auth_header(client, email="user@test.com")
+        resp = client.get("/api/llm-usage/cache", headers=headers)
+        assert resp.status_code == 403
+
+    def test_hit_rate_per_operation(self, client, seed_companies_contacts):
+        """Hit rate = cache_read / (input + cache_creation + cache_read)."""
+        tenant = seed_companies_contacts["tenant"]
+        for write, read in [(900, 0), (0, 900)]:
+            db.session.add(
+                LlmUsageLog(
+                    tenant_id=str(tenant.id),
+                    operation="playbook_chat",
+                    provider="anthropic",
+                    model="claude-haiku-4-5-20251001",
+                    input_tokens=100,
+                    output_tokens=50,
+                    cache_creation_tokens=write,
+                    cache_read_tokens=read,
+                    cost_usd=0.001,
+                )
+            )
+        _seed_llm_logs(db.session, tenant.id, count=1)
+        db.session.commit()
+
+        headers = auth_header(client)
+        resp = client.get("/api/llm-usage/cache", headers=headers)
+        assert resp.status_code == 200
+        body = resp.get_json()
+
+        ops = {r["operation"]: r for r in body["by_operation"]}
+        chat = ops["playbook_chat"]
+        assert chat["calls"] == 2
+        assert chat["calls_with_cache_hit"] == 1
+        assert chat["cache_read_tokens"] == 900
+        assert chat["cache_hit_rate"] == pytest.approx(0.45)
+        assert ops["csv_column_mapping"]["cache_hit_rate"] == 0
+        assert body["total_cache_read_tokens"] == 900
+
+
+class TestSummaryRollups:
+    def test_summary_reconciles_after_compaction(self, client, seed_companies_contacts):
+        """Summary numbers are identical whether rows are raw or rolled up."""
+        from datetime import datetime, timedelta, timezone
+
+        from api.services.llm_usage_rollups import compact_usage_rollups
+
+        tenant = seed_companies_contacts["tenant"]
+        entries = _seed_llm_logs(db.session, tenant.id, count=3)
+        for i, entry in enumerate(entries):
+            entry.created_at = datetime.now(timezone.utc) - timedelta(days=2, hours=i)
+        db.session.commit()
+
+        headers = auth_header(client)
+        with patch("api.routes.llm_usage_routes.maybe_compact"):
+            raw = client.get("/api/llm-usage/summary", headers=headers).get_json()
+
+        assert compact_usage_rollups()["rows_compacted"] == 3
+        rolled = client.get("/api/llm-usage/summary", headers=headers).get_json()
+
+        assert rolled["total_calls"] == raw["total_calls"] == 3
+        assert rolled["total_cost_usd"] == pytest.approx(raw["total_cost_usd"])
+        assert rolled["by_operation"] == raw["by_operation"]
+        assert rolled["by_tenant"] == raw["by_tenant"]
+
+    def test_compact_and_reconcile_endpoints(self, client, seed_companies_contacts):
+        headers = auth_header(client)
+        resp = client.post("/api/llm-usage/rollups/compact", headers=headers)
+        assert resp.status_code == 200
+        assert "compacted_until" in resp.get_json()
+
+        resp = client.get("/api/llm-usage/rollups/reconcile", headers=headers)
+        assert resp.status_code == 200
+        assert resp.get_json()["mismatches"] == []
+
+    def test_compact_requires_super_admin(self, client, seed_user_with_role):
+        headers = auth_header(client, email="user@test.com")
+        resp = client.post("/api/llm-usage/rollups/compact", headers=headers)
+        assert resp.status_code == 403
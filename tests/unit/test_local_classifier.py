@@ -0,0 +1,287 @@
+"""Unit tests for the local router/intent/interrupt classifier and its cache."""
+
+from unittest.mock import patch
+
+import pytest
+
+from api.agents import local_classifier
+from api.agents.local_classifier import (
+    LocalClassifier,
+    ResultCache,
+    choose_threshold,
+    evaluate,
+    normalize_message,
+    train,
+)
+from api.agents.router import RouteDecision, route_message
+
+_CHAT = [
+    "where do i find the {} settings",
+    "which {} did we import last week",
+    "is the {} sync finished yet",
+    "remind me what the {} column means",
+    "quick status on the {} import",
+    "where is the {} export button",
+]
+_PLANNER = [
+    "put together a positioning plan for the {} segment",
+    "i want a full outreach sequence for {} buyers",
+    "let's rework our messaging for {} prospects",
+    "come up with personas for the {} market",
+    "we need a go to market approach for {} companies",
+    "develop the icp for {} accounts",
+]
+_TOPICS = ["saas", "fintech", "logistics", "retail", "healthcare", "energy"]
+
+CONTEXT = {"page": "playbook", "strategy": False}
+
+
+def _examples():
+    examples = []
+    for topic in _TOPICS:
+        examples += [(t.format(topic), CONTEXT, "chat") for t in _CHAT]
+        examples += [(t.format(topic), CONTEXT, "planner") for t in _PLANNER]
+    return examples
+
+
+@pytest.fixture(scope="module")
+def route_model():
+    return train("route", _examples(), holdout=0, epochs=10)
+
+
+@pytest.fixture
+def model_dir(tmp_path, monkeypatch, route_model):
+    route_model.threshold = 0.6
+    route_model.save(str(tmp_path / "route.json"))
+    monkeypatch.setenv("LOCAL_CLASSIFIER_DIR", str(tmp_path))
+    monkeypatch.delenv("LOCAL_CLASSIFIER_THRESHOLD", raising=False)
+    local_classifier.reset_models()
+    yield tmp_path
+    local_classifier.reset_models()
+
+
+class TestFeatures:
+    def test_normalize_message(self):
+        assert normalize_message("  Show  TOP 25 Leads!! ") == "show top 0 leads"
+        assert normalize_message("Show top 10 leads.") == "show top 0 leads"
+
+    def test_context_changes_features(self):
+        a = local_classifier.extract_features("rework messaging", {"page": "a"})
+        b = local_classifier.extract_features("rework messaging", {"page": "b"})
+        assert a != b
+
+
+class TestModel:
+    def test_learns_training_examples(self, route_model):
+        result = evaluate(route_model, _examples(), threshold=0.0)
+        assert result["accuracy"] >= 0.95
+        assert result["coverage"] == 1.0
+        assert set(result["labels"]) == {"chat", "planner"}
+        assert result["latency_ms"]["p50"] < 50
+
+    def test_generalizes_to_unseen_topic(self, route_model):
+        label, _ = route_model.predict(
+            "come up with personas for the automotive market", CONTEXT
+        )
+        assert label == "planner"
+        label, _ = route_model.predict("is the crm sync finished yet", CONTEXT)
+        assert label == "chat"
+
+    def test_save_load_roundtrip(self, route_model, tmp_path):
+        path = str(tmp_path / "route.json")
+        route_model.save(path)
+        loaded = LocalClassifier.load(path)
+        text = "let's rework our messaging for dach prospects"
+        assert loaded.predict(text, CONTEXT)[0] == route_model.predict(text, CONTEXT)[0]
+        assert loaded.threshold == route_model.threshold
+
+    def test_rejects_unknown_format(self):
+        with pytest.raises(ValueError):
+            LocalClassifier.from_dict({"format": "other"})
+
+    def test_needs_two_labels(self):
+        with pytest.raises(ValueError):
+            train("route", [("hi there", None, "chat")] * 5)
+
+    def test_choose_threshold(self, route_model):
+        examples = _examples()
+        assert choose_threshold(route_model, examples, 0.9) < 1.0
+        # Impossible target: never answer locally
+        flipped = [(t, c, "chat" if lbl == "planner" else "planner") for t, c, lbl in examples]
+        assert choose_threshold(route_model, flipped, 0.99) == 1.0
+
+
+class TestResultCache:
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert (cache.hits, cache.misses) == (2, 1)
+
+
+class TestRouterIntegration:
+    _AMBIGUOUS = "let's rework our messaging for automotive prospects"
+
+    def test_no_model_falls_back_to_haiku(self, monkeypatch):
+        monkeypatch.setenv("LOCAL_CLASSIFIER_DIR", "")
+        with patch("api.agents.router._haiku_classify") as haiku:
+            haiku.return_value = RouteDecision(
+                target="planner", reason="haiku_classification"
+            )
+            decision = route_message(self._AMBIGUOUS, "playbook", "t1", {}, {})
+        assert decision.reason == "haiku_classification"
+
+    def test_confident_local_prediction_skips_haiku(self, model_dir):
+        with patch("api.agents.router._haiku_classify") as haiku:
+            decision = route_message(self._AMBIGUOUS, "playbook", "t1", {}, {})
+        haiku.assert_not_called()
+        assert decision.target == "planner"
+        assert decision.reason == "local_classification"
+
+    def test_threshold_override_defers_to_haiku(self, model_dir, monkeypatch):
+        monkeypatch.setenv("LOCAL_CLASSIFIER_THRESHOLD", "1.01")
+        with patch("api.agents.router._haiku_classify") as haiku:
+            haiku.return_value = RouteDecision(
+                target="chat", reason="haiku_classification"
+            )
+            decision = route_message(self._AMBIGUOUS, "playbook", "t1", {}, {})
+        haiku.assert_called_once()
+        assert decision.target == "chat"
+
+    def test_haiku_result_is_cached(self, monkeypatch):
+        monkeypatch.setenv("LOCAL_CLASSIFIER_DIR", "")
+        with patch("api.agents.router._haiku_classify") as haiku:
+            haiku.return_value = RouteDecision(
+                target="planner", reason="haiku_classification"
+            )
+            route_message(self._AMBIGUOUS, "playbook", "t1", {}, {})
+            decision = route_message(
+                "  Let's rework our messaging for AUTOMOTIVE prospects!",
+                "playbook",
+                "t2",
+                {},
+                {},
+            )
+        haiku.assert_called_once()
+        assert decision.target == "planner"
+        assert decision.reason == "cached_classification"
+
+    def test_haiku_fallback_is_not_cached(self, monkeypatch):
+        monkeypatch.setenv("LOCAL_CLASSIFIER_DIR", "")
+        with patch("api.agents.router._haiku_classify") as haiku:
+            haiku.return_value = RouteDecision(target="chat", reason="haiku_fallback")
+            route_message(self._AMBIGUOUS, "playbook", "t1", {}, {})
+            route_message(self._AMBIGUOUS, "playbook", "t1", {}, {})
+        assert haiku.call_count == 2
+
+    def test_cache_is_keyed_on_context(self, monkeypatch):
+        monkeypatch.setenv("LOCAL_CLASSIFIER_DIR", "")
+        with patch("api.agents.router._haiku_classify") as haiku:
+            haiku.return_value = RouteDecision(
+                target="planner", reason="haiku_classification"
+            )
+            route_message(self._AMBIGUOUS, "playbook", "t1", {}, {})
+            route_message(self._AMBIGUOUS, "contacts", "t1", {}, {})
+        assert haiku.call_count == 2
+
+
+class TestInterruptIntegration:
+    def test_local_interrupt_gets_default_extracted_info(self, tmp_path, monkeypatch):
+        from api.agents.interrupt_classifier import classify_interrupt
+
+        examples = []
+        for phase in ("research_market", "strategy"):
+            ctx = {"phase": phase}
+            for topic in _TOPICS:
+                examples.append(("the {} numbers look off".format(topic), ctx, "correction"))
+                examples.append(("let me see {} progress".format(topic), ctx, "question"))
+        model = train("interrupt", examples, holdout=0, epochs=10)
+        model.threshold = 0.5
+        model.save(str(tmp_path / "interrupt.json"))
+        monkeypatch.setenv("LOCAL_CLASSIFIER_DIR", str(tmp_path))
+        local_classifier.reset_models()
+
+        with patch("api.agents.interrupt_classifier._haiku_classify") as haiku:
+            result = classify_interrupt(
+                "the automotive numbers look off", "strategy", {}
+            )
+        local_classifier.reset_models()
+        haiku.assert_not_called()
+        assert result.type == "correction"
+        assert result.extracted_info == {
+            "correction": "the automotive numbers look off"
+        }
+
+
+    def test_cached_interrupt_keeps_this_messages_values(self, monkeypatch):
+        from api.agents.interrupt_classifier import (
+            InterruptClassification,
+            classify_interrupt,
+        )
+
+        monkeypatch.setenv("LOCAL_CLASSIFIER_DIR", "")
+        first, second = "Limit it to 10 companies", "limit it to 250 companies!"
+        assert local_classifier.cache_key(
+            "interrupt", first
+        ) == local_classifier.cache_key("interrupt", second)
+
+        with patch("api.agents.interrupt_classifier._keyword_classify", return_value=None), \
+                patch("api.agents.interrupt_classifier._haiku_classify") as haiku:
+            haiku.return_value = InterruptClassification(
+                type="correction", confidence=0.9, extracted_info={"correction": first}
+            )
+            classify_interrupt(first, "strategy", {})
+            result = classify_interrupt(second, "strategy", {})
+
+        assert haiku.call_count == 1
+        assert result.type == "correction"
+        assert result.extracted_info == {"correction": second}
+
+
+@pytest.mark.usefixtures("no_active_plan")
+class TestDecisionLog:
+    @pytest.fixture
+    def no_active_plan(self):
+        with patch("api.agents.planner_bridge.get_active_plan", return_value=None):
+            yield
+
+    def test_records_route_decisions(self, app, db, monkeypatch):
+        from api.models import RouteDecisionLog
+
+        monkeypatch.setitem(app.config, "LOCAL_CLASSIFIER_DIR", "")
+        monkeypatch.setitem(app.config, "ROUTE_DECISION_LOG", True)
+        with patch("api.agents.router._haiku_classify") as haiku:
+            haiku.return_value = RouteDecision(
+                target="planner", reason="haiku_classification"
+            )
+            route_message("Let's rework our ICP", "playbook", "t1", {}, {})
+            route_message("show me the companies", "contacts", "t1", {}, {})
+        db.session.commit()
+
+        rows = {r.source: r for r in RouteDecisionLog.query.all()}
+        assert set(rows) == {"haiku", "keyword"}
+        assert rows["haiku"].message == "let's rework our icp"
+        assert rows["haiku"].label == "planner"
+        assert rows["keyword"].label == "chat"
+
+        examples = local_classifier.load_logged_examples("route")
+        assert ("let's rework our icp", {"page": "playbook", "strategy": False},
+                "planner") in examples
+        assert local_classifier.load_logged_examples("route", sources=("local",)) == []
+
+    def test_logging_is_off_by_default(self, app):
+        from api.config import Config
+
+        assert Config.ROUTE_DECISION_LOG is False
+
+    def test_logging_can_be_disabled(self, app, db, monkeypatch):
+        from api.models import RouteDecisionLog
+
+        monkeypatch.setitem(app.config, "ROUTE_DECISION_LOG", False)
+        route_message("show me the companies", "contacts", "t1", {}, {})
+        db.session.commit()
+        assert RouteDecisionLog.query.count() == 0
@@ -0,0 +1,82 @@
+"""Tests for local memory embeddings (hashing-trick vectorizer)."""
+
+import math
+
+import pytest
+
+from api.services.memory import embeddings
+from api.services.memory.embeddings import (
+    EMBEDDING_DIM,
+    embed_text,
+    quantize,
+    to_pgvector,
+    top_k_cosine,
+)
+
+
+def _cos(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+class TestEmbedText:
+    def test_normalised(self):
+        vec = embed_text("Enterprise SaaS companies in Germany")
+        assert len(vec) == EMBEDDING_DIM
+        assert math.sqrt(sum(v * v for v in vec)) == pytest.approx(1.0)
+
+    def test_deterministic(self):
+        assert embed_text("fintech founders") == embed_text("fintech founders")
+
+    def test_empty(self):
+        assert embed_text("") is None
+        assert embed_text("the of and") is None
+
+    def test_alias_expansion(self):
+        icp = embed_text("ICP")
+        related = embed_text("ideal customer profile")
+        unrelated = embed_text("webinar follow-up cadence")
+        assert _cos(icp, related) > _cos(icp, unrelated)
+
+    def test_inflections_close(self):
+        base = embed_text("targeting")
+        assert _cos(base, embed_text("target")) > _cos(base, embed_text("budget"))
+
+
+class TestQuantize:
+    def test_int8_size(self):
+        assert len(quantize(embed_text("fintech"))) == EMBEDDING_DIM
+
+    def test_similarity_preserved(self):
+        a = embed_text("enterprise saas pricing")
+        b = embed_text("saas pricing objections")
+        exact = _cos(a, b)
+        ((fid, approx),) = top_k_cosine(a, [("b", quantize(b))], k=1)
+        assert fid == "b"
+        assert approx == pytest.approx(exact, abs=0.02)
+
+    def test_pgvector_literal(self):
+        assert to_pgvector([0.5, -0.25]) == "[0.50000,-0.25000]"
+
+
+class TestTopK:
+    def _rows(self):
+        texts = {
+            "a": "fintech founders in prague",
+            "b": "logistics companies in poland",
+            "c": "fintech startups raising seed",
+        }
+        return [(k, quantize(embed_text(v))) for k, v in texts.items()]
+
+    def test_ranked(self):
+        hits = top_k_cosine(embed_text("fintech founders"), self._rows(), k=2)
+        assert [h[0] for h in hits] == ["a", "c"]
+
+    def test_pure_python_matches_numpy_path(self, monkeypatch):
+        query = embed_text("fintech founders")
+        expected = top_k_cosine(query, self._rows(), k=3)
+        monkeypatch.setattr(embeddings, "np", None)
+        fallback = top_k_cosine(query, self._rows(), k=3)
+        assert [h[0] for h in fallback] == [h[0] for h in expected]
+
+    def test_empty(self):
+        assert top_k_cosine(embed_text("fintech"), [], k=5) == []
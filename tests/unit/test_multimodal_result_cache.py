@@ -0,0 +1,142 @@
+"""Tests for the shared multimodal result cache."""
+
+import os
+import time
+
+import pytest
+
+from api.services.multimodal import result_cache
+from api.services.multimodal.result_cache import ResultCache, cache_key
+
+
+@pytest.fixture
+def shared_cache(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=1 << 20)
+    monkeypatch.setattr(result_cache, "_default_cache", cache)
+    return cache
+
+
+class TestCacheKey:
+    def test_depends_on_every_part(self):
+        base = cache_key("abc", "pdf", "1", {"max_pages": 50})
+        assert base == cache_key("abc", "pdf", "1", {"max_pages": 50})
+        assert base != cache_key("abd", "pdf", "1", {"max_pages": 50})
+        assert base != cache_key("abc", "word", "1", {"max_pages": 50})
+        assert base != cache_key("abc", "pdf", "2", {"max_pages": 50})
+        assert base != cache_key("abc", "pdf", "1", {"max_pages": 10})
+
+    def test_option_order_does_not_matter(self):
+        assert cache_key("h", "excel", "1", {"a": 1, "b": 2}) == cache_key(
+            "h", "excel", "1", {"b": 2, "a": 1}
+        )
+
+
+class TestResultCache:
+    def test_roundtrip_and_miss(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        assert cache.get("k" * 64) is None
+        cache.put("k" * 64, {"markdown": "hello", "pages": [1, 2]})
+        assert cache.get("k" * 64) == {"markdown": "hello", "pages": [1, 2]}
+
+    def test_disabled(self, tmp_path):
+        cache = ResultCache(str(tmp_path), max_bytes=0)
+        cache.put("a" * 64, {"x": 1})
+        assert cache.get("a" * 64) is None
+        assert os.listdir(tmp_path) == []
+
+    def test_corrupt_entry_is_dropped(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        cache.put("b" * 64, {"x": 1})
+        path = cache._path("b" * 64)
+        with open(path, "w") as f:
+            f.write("{not json")
+        assert cache.get("b" * 64) is None
+        assert not os.path.exists(path)
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = ResultCache(str(tmp_path), max_bytes=2500)
+        blob = "x" * 900
+        keys = ["{:064d}".format(i) for i in range(3)]
+        for i, key in enumerate(keys[:2]):
+            cache.put(key, {"v": blob})
+            past = time.time() - 100 + i
+            os.utime(cache._path(key), (past, past))
+        # Reading the oldest entry makes it the most recently used
+        assert cache.get(keys[0]) is not None
+
+        cache.put(keys[2], {"v": blob})
+
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is not None
+
+
+class TestProcessorCaching:
+    def test_word_extraction_is_cached(self, shared_cache, monkeypatch):
+        from api.services.multimodal import word_processor
+
+        calls = []
+
+        def _extract(data):
+            calls.append(data)
+            return word_processor.WordExtractionResult(markdown="# Deck", word_count=2)
+
+        monkeypatch.setattr(word_processor, "_extract", _extract)
+        first = word_processor.extract_from_bytes(b"docx bytes")
+        second = word_processor.extract_from_bytes(b"docx bytes")
+
+        assert len(calls) == 1
+        assert first.cached is False
+        assert second.cached is True
+        assert second.markdown == "# Deck"
+
+    def test_errors_are_not_cached(self, shared_cache, monkeypatch):
+        from api.services.multimodal import word_processor
+
+        monkeypatch.setattr(
+            word_processor,
+            "_extract",
+            lambda data: word_processor.WordExtractionResult(error="broken"),
+        )
+        word_processor.extract_from_bytes(b"bad")
+        assert (
+            result_cache.load("word", word_processor.PROCESSOR_VERSION, "bad") is None
+        )
+        assert not os.path.exists(shared_cache.cache_dir)
+
+    def test_csv_extraction_is_cached(self, shared_cache, tmp_path, monkeypatch):
+        from api.services.multimodal import excel_processor
+
+        path = tmp_path / "leads.csv"
+        path.write_text("name,score\nAcme,3\nGlobex,5\n")
+
+        first = excel_processor.extract_from_file(str(path))
+        monkeypatch.setattr(
+            excel_processor,
+            "_extract_csv",
+            lambda p: pytest.fail("should be served from cache"),
+        )
+        second = excel_processor.extract_from_file(str(path))
+
+        assert first.cached is False
+        assert second.cached is True
+        assert second.markdown == first.markdown
+        assert second.sheets[0].headers == ["name", "score"]
+
+    def test_video_cache_is_keyed_on_options(self, shared_cache):
+        from api.services.multimodal.video_processor import (
+            VideoProcessingResult,
+            _load_from_cache,
+            _save_to_cache,
+        )
+
+        options = {"skip_transcription": False, "skip_keyframes": False}
+        _save_to_cache(
+            "hash", VideoProcessingResult(transcript_text="hi"), options=options
+        )
+
+        assert _load_from_cache("hash", options=options).transcript_text == "hi"
+        assert (
+            _load_from_cache("hash", options=dict(options, skip_transcription=True))
+            is None
+        )
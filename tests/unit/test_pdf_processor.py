@@ -1,5 +1,11 @@
 """Tests for PDF processor (BL-265)."""
 
+import hashlib
+import sys
+import types
+
+import pytest
+
 from api.services.multimodal.pdf_processor import (
     PageResult,
     PDFExtractionResult,
@@ -89,3 +95,131 @@ class TestExtractTextFromPdf:
         assert result.total_pages == 0
         assert result.truncated is False
         assert result.errors == []
+
+
+class _FakePage:
+    def __init__(self, number, text):
+        self.number = number
+        self.text = text
+        self.closed = False
+
+    def extract_text(self):
+        return self.text
+
+    def extract_tables(self):
+        return [[["Page", "N"], ["p", str(self.number)]]] if self.number == 3 else []
+
+    def close(self):
+        self.closed = True
+
+
+class _FakePdf:
+    def __init__(self, texts):
+        self.pages = [_FakePage(i + 1, t) for i, t in enumerate(texts)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def fake_pdfplumber(monkeypatch):
+    """In-memory stand-in for pdfplumber; sources are page-count strings."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from api.services.multimodal import pdf_processor
+
+    def _open(source):
+        if hasattr(source, "read"):
+            source = source.read().decode()
+        count = int(source)
+        return _FakePdf(
+            [
+                "sparse" if n % 5 == 0 else "text of page {} ".format(n) * 10
+                for n in range(1, count + 1)
+            ]
+        )
+
+    module = types.ModuleType("pdfplumber")
+    module.open = _open
+    monkeypatch.setitem(sys.modules, "pdfplumber", module)
+    monkeypatch.setattr(pdf_processor, "_executor_factory", ThreadPoolExecutor)
+    return pdf_processor
+
+
+class TestParallelExtraction:
+    def test_pages_stream_in_order(self, fake_pdfplumber):
+        streamed = []
+        result = fake_pdfplumber.extract_text_from_pdf(
+            "40", workers=4, on_page=lambda p: streamed.append(p.page_number)
+        )
+        assert result.errors == []
+        assert result.total_pages == 40
+        assert streamed == list(range(1, 41))
+        assert [p.page_number for p in result.pages] == streamed
+        assert get_vision_pages(result) == [5, 10, 15, 20, 25, 30, 35, 40]
+        assert result.pages[2].tables == [[["Page", "N"], ["p", "3"]]]
+
+    def test_truncates_to_max_pages(self, fake_pdfplumber):
+        result = fake_pdfplumber.extract_text_from_bytes(b"60", max_pages=20)
+        assert result.total_pages == 60
+        assert result.truncated is True
+        assert len(result.pages) == 20
+
+    def test_small_documents_run_in_process(self, fake_pdfplumber, monkeypatch):
+        def _no_pool(**kwargs):
+            raise AssertionError("pool should not be used")
+
+        monkeypatch.setattr(fake_pdfplumber, "_executor_factory", _no_pool)
+        result = fake_pdfplumber.extract_text_from_pdf("10", workers=4)
+        assert len(result.pages) == 10
+
+    def test_failed_range_is_retried_in_process(self, fake_pdfplumber, monkeypatch):
+        real_extract = fake_pdfplumber._extract_range
+        calls = []
+
+        def _flaky(source, start, end):
+            calls.append(start)
+            if start == 8 and calls.count(8) == 1:
+                raise RuntimeError("worker died")
+            return real_extract(source, start, end)
+
+        monkeypatch.setattr(fake_pdfplumber, "_extract_range", _flaky)
+        result = fake_pdfplumber.extract_text_from_pdf("24", workers=2)
+        assert [p.page_number for p in result.pages] == list(range(1, 25))
+        assert calls.count(8) == 2
+
+    def test_file_sha256(self, tmp_path):
+        from api.services.multimodal.result_cache import file_sha256
+
+        path = tmp_path / "deck.pdf"
+        path.write_bytes(b"%PDF-1.4 same bytes")
+        assert (
+            file_sha256(str(path)) == hashlib.sha256(b"%PDF-1.4 same bytes").hexdigest()
+        )
+
+    def test_cache_hit_replays_pages(self, fake_pdfplumber, tmp_path, monkeypatch):
+        from api.services.multimodal import result_cache
+
+        monkeypatch.setattr(
+            result_cache,
+            "_default_cache",
+            result_cache.ResultCache(str(tmp_path), max_bytes=1 << 20),
+        )
+        first = fake_pdfplumber.extract_text_from_bytes(b"12")
+        monkeypatch.setattr(
+            fake_pdfplumber,
+            "_extract_range",
+            lambda *a: pytest.fail("should be served from cache"),
+        )
+        streamed = []
+        second = fake_pdfplumber.extract_text_from_bytes(
+            b"12", on_page=lambda p: streamed.append(p.page_number)
+        )
+
+        assert first.cached is False
+        assert second.cached is True
+        assert second.pages == first.pages
+        assert streamed == list(range(1, 13))
@@ -0,0 +1,241 @@
+"""Unit tests for the shared planner state store."""
+
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from api.agents.plan_store import (
+    DbPlanStore,
+    MemoryPlanStore,
+    PlanConflictError,
+    deserialize_state,
+    serialize_state,
+)
+
+
+@pytest.fixture
+def planner_states_table(db):
+    """Create the planner_states table (raw-SQL table, not an ORM model)."""
+    db.session.execute(
+        db.text(
+            "CREATE TABLE IF NOT EXISTS planner_states ("
+            "thread_id TEXT PRIMARY KEY, "
+            "tenant_id VARCHAR(36), "
+            "plan_id TEXT, "
+            "state BLOB NOT NULL, "
+            "state_bytes INTEGER NOT NULL DEFAULT 0, "
+            "version INTEGER NOT NULL DEFAULT 1, "
+            "updated_at TIMESTAMP, "
+            "expires_at TIMESTAMP NOT NULL"
+            ")"
+        )
+    )
+    db.session.commit()
+    yield
+    db.session.execute(db.text("DROP TABLE IF EXISTS planner_states"))
+    db.session.commit()
+
+
+def _state(plan_id="p1", **extra):
+    state = {
+        "plan_id": plan_id,
+        "current_phase": "research_company",
+        "messages": [
+            SystemMessage(content="You are a strategist."),
+            HumanMessage(content="Build a strategy"),
+            AIMessage(content="On it."),
+        ],
+        "tool_context": {"tenant_id": "t1", "_app": object()},
+    }
+    state.update(extra)
+    return state
+
+
+class TestSerialization:
+    def test_round_trip_preserves_messages(self):
+        restored = deserialize_state(serialize_state(_state()))
+        assert restored["plan_id"] == "p1"
+        assert [type(m) for m in restored["messages"]] == [
+            SystemMessage,
+            HumanMessage,
+            AIMessage,
+        ]
+        assert restored["messages"][1].content == "Build a strategy"
+
+    def test_private_keys_dropped(self):
+        restored = deserialize_state(serialize_state(_state()))
+        assert restored["tool_context"] == {"tenant_id": "t1"}
+
+    def test_compressed(self):
+        big = _state(research_data={"notes": "lorem ipsum " * 2000})
+        assert len(serialize_state(big)) < 2000
+
+
+class TestMemoryPlanStore:
+    def test_versions_increment(self):
+        store = MemoryPlanStore()
+        assert store.save("t", _state()) == 1
+        assert store.save("t", _state(), expected_version=1) == 2
+        assert store.load("t", "t1").version == 2
+
+    def test_stale_version_conflicts(self):
+        store = MemoryPlanStore()
+        store.save("t", _state())
+        store.save("t", _state(), expected_version=1)
+        with pytest.raises(PlanConflictError):
+            store.save("t", _state(), expected_version=1)
+
+    def test_scoped_to_tenant(self):
+        store = MemoryPlanStore()
+        store.save("t", _state())
+        assert store.load("t", "t2") is None
+        with pytest.raises(PlanConflictError):
+            store.save("t", _state(tool_context={"tenant_id": "t2"}))
+        store.delete("t", "t2")
+        assert store.load("t", "t1").version == 1
+
+    def test_lru_eviction(self):
+        store = MemoryPlanStore(max_entries=2)
+        store.save("a", _state("pa"))
+        store.save("b", _state("pb"))
+        store.load("a", "t1")  # touch a so b is least recently used
+        store.save("c", _state("pc"))
+        assert set(store.list_active()) == {"a", "c"}
+
+    def test_ttl_eviction(self):
+        store = MemoryPlanStore(ttl_seconds=0)
+        store.save("t", _state())
+        time.sleep(0.01)
+        assert store.load("t", "t1") is None
+        assert store.stats()["active_plans"] == 0
+
+    def test_stats(self):
+        store = MemoryPlanStore()
+        store.save("a", _state())
+        store.save("b", _state())
+        stats = store.stats()
+        assert stats["backend"] == "memory"
+        assert stats["active_plans"] == 2
+        assert stats["state_bytes_total"] >= stats["state_bytes_max"] > 0
+
+
+class TestDbPlanStore:
+    def test_save_load_delete(self, app, planner_states_table):
+        store = DbPlanStore()
+        assert store.save("thread-1", _state()) == 1
+        loaded = store.load("thread-1", "t1")
+        assert loaded.version == 1
+        assert loaded.state["current_phase"] == "research_company"
+        assert store.list_active() == {"thread-1": "p1"}
+
+        store.delete("thread-1", "t1")
+        assert store.load("thread-1", "t1") is None
+
+    def test_optimistic_concurrency(self, app, planner_states_table):
+        store = DbPlanStore()
+        store.save("thread-1", _state())
+        # Two requests load version 1; the first write wins.
+        assert store.save("thread-1", _state(), expected_version=1) == 2
+        with pytest.raises(PlanConflictError):
+            store.save("thread-1", _state(), expected_version=1)
+
+    def test_fresh_plan_bumps_version(self, app, planner_states_table):
+        store = DbPlanStore()
+        store.save("thread-1", _state("p1"))
+        assert store.save("thread-1", _state("p2")) == 2
+        assert store.load("thread-1", "t1").state["plan_id"] == "p2"
+
+    def test_scoped_to_tenant(self, app, planner_states_table):
+        store = DbPlanStore()
+        store.save("thread-1", _state())
+        other = _state("p2", tool_context={"tenant_id": "t2"})
+
+        assert store.load("thread-1", "t2") is None
+        with pytest.raises(PlanConflictError):
+            store.save("thread-1", other)
+        with pytest.raises(PlanConflictError):
+            store.save("thread-1", other, expected_version=1)
+        store.delete("thread-1", "t2")
+
+        loaded = store.load("thread-1", "t1")
+        assert loaded.version == 1
+        assert loaded.state["plan_id"] == "p1"
+
+    def test_writes_leave_request_session_alone(self, app, db, planner_states_table):
+        from api.models import Tenant
+
+        db.session.add(Tenant(name="Pending", slug="pending"))
+        DbPlanStore().save("thread-1", _state())
+        db.session.rollback()
+
+        assert Tenant.query.filter_by(slug="pending").first() is None
+        assert DbPlanStore().load("thread-1", "t1").version == 1
+
+    def test_expired_rows_hidden_and_evicted(self, app, db, planner_states_table):
+        expired = DbPlanStore(ttl_seconds=-1)
+        expired.save("old", _state())
+        assert expired.load("old", "t1") is None
+        # Writing a fresh plan purges expired rows
+        DbPlanStore().save("live", _state())
+        count = db.session.execute(
+            db.text("SELECT COUNT(*) FROM planner_states")
+        ).scalar()
+        assert count == 1
+
+    def test_stats(self, app, planner_states_table):
+        store = DbPlanStore()
+        store.save("a", _state())
+        stats = store.stats()
+        assert stats["backend"] == "db"
+        assert stats["active_plans"] == 1
+        assert stats["state_bytes_total"] > 0
+
+
+class TestPlannerCheckpointing:
+    @pytest.fixture
+    def plan_config(self):
+        return {"id": "plan-x", "name": "X", "phases": ["research_company"]}
+
+    def test_finished_plan_is_cleared(self, plan_config):
+        from api.agents.planner_bridge import execute_planner_turn, get_active_plan
+
+        list(
+            execute_planner_turn(
+                message="Go",
+                plan_config=plan_config,
+                tool_context={"tenant_id": "test"},
+                thread_id="ckpt-1",
+            )
+        )
+        assert get_active_plan("ckpt-1", "test") is None
+
+    def test_superseded_plan_stops(self, plan_config):
+        from api.agents.planner_bridge import (
+            clear_active_plan,
+            execute_planner_turn,
+            load_active_plan,
+            save_active_plan,
+        )
+
+        tool_context = {"tenant_id": "test"}
+        save_active_plan(
+            "ckpt-2",
+            {"plan_id": "plan-x", "plan_config": plan_config, "tool_context": tool_context},
+        )
+        stored = load_active_plan("ckpt-2", "test")
+        # Another request resumes first and bumps the version
+        save_active_plan("ckpt-2", stored.state, expected_version=stored.version)
+
+        events = list(
+            execute_planner_turn(
+                message="Actually, focus on DACH",
+                plan_config=plan_config,
+                tool_context=tool_context,
+                existing_state=stored.state,
+                thread_id="ckpt-2",
+                state_version=stored.version,
+            )
+        )
+        assert events[-1].type == "plan_superseded"
+        clear_active_plan("ckpt-2", "test")
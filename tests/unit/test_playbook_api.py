@@ -184,6 +184,66 @@ class TestPlaybookChat:
         msgs = call_kwargs.kwargs["messages"]
         assert msgs[-1] == {"role": "user", "content": "What is our ICP?"}
 
+    @patch("api.routes.playbook_routes._get_anthropic_client")
+    def test_long_thread_uses_rolling_summary(self, mock_get_client, client, seed_tenant, seed_super_admin, db):
+        """Older messages are folded into a stored summary; later turns load only the delta."""
+        from datetime import datetime, timedelta, timezone
+
+        from api.models import ConversationSummary, StrategyChatMessage, StrategyDocument
+        from api.services.anthropic_client import AnthropicResponse
+
+        doc = StrategyDocument(tenant_id=seed_tenant.id, status="draft")
+        db.session.add(doc)
+        db.session.flush()
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        for i in range(24):
+            db.session.add(
+                StrategyChatMessage(
+                    tenant_id=seed_tenant.id,
+                    document_id=doc.id,
+                    role="user" if i % 2 == 0 else "assistant",
+                    content="Old message {}".format(i),
+                    created_at=base + timedelta(minutes=i),
+                )
+            )
+        db.session.commit()
+
+        mock_client = MagicMock()
+        mock_client.query.return_value = AnthropicResponse(
+            content="User chose fintech in DACH.",
+            model="claude-haiku-4-5-20251001",
+            input_tokens=500,
+            output_tokens=40,
+            cost_usd=0.0006,
+        )
+        mock_client.stream_query.side_effect = lambda **kw: iter(["OK"])
+        mock_client.last_stream_usage = {"input_tokens": 10, "output_tokens": 5, "model": "claude-haiku-4-5-20251001"}
+        mock_client.default_model = "claude-haiku-4-5-20251001"
+        mock_get_client.return_value = mock_client
+
+        headers = auth_header(client)
+        headers["X-Namespace"] = seed_tenant.slug
+        resp = client.post("/api/playbook/chat", json={"message": "Next?"}, headers=headers)
+        assert resp.status_code == 201
+
+        mock_client.query.assert_called_once()
+        row = ConversationSummary.query.filter_by(document_id=doc.id).one()
+        assert row.summary == "User chose fintech in DACH."
+        assert row.message_count == 14
+
+        msgs = mock_client.stream_query.call_args.kwargs["messages"]
+        assert msgs[0]["content"].endswith("User chose fintech in DACH.")
+        assert msgs[1]["content"] == "Old message 14"
+        assert len(msgs) == 12  # summary + 10 recent + new user message
+
+        # Next turn reuses the stored summary without summarizing again
+        resp = client.post("/api/playbook/chat", json={"message": "And then?"}, headers=headers)
+        assert resp.status_code == 201
+        mock_client.query.assert_called_once()
+        msgs = mock_client.stream_query.call_args.kwargs["messages"]
+        assert msgs[0]["content"].endswith("User chose fintech in DACH.")
+        assert msgs[1]["content"] == "Old message 14"
+
     @patch("api.routes.playbook_routes._get_anthropic_client")
     def test_post_message_streaming(self, mock_get_client, client, seed_tenant, seed_super_admin):
         """POST /api/playbook/chat with Accept: text/event-stream returns SSE."""
@@ -6,9 +6,59 @@ from api.services.memory.rag_store import (
     MemoryStore,
     extract_keywords,
     _parse_keywords,
+    _recency_weight,
 )
 
 
+@pytest.fixture
+def memory_tables(db):
+    """Create memory_facts + keyword index (raw-SQL tables, not ORM models)."""
+    db.session.execute(
+        db.text(
+            "CREATE TABLE IF NOT EXISTS memory_facts ("
+            "id VARCHAR(36) PRIMARY KEY, "
+            "tenant_id VARCHAR(36) NOT NULL, "
+            "playbook_id VARCHAR(36), "
+            "source_message_id VARCHAR(36), "
+            "chunk_text TEXT NOT NULL, "
+            "chunk_type VARCHAR(20) NOT NULL DEFAULT 'fact', "
+            "keywords TEXT DEFAULT '[]', "
+            "keyword_count INTEGER NOT NULL DEFAULT 0, "
+            "session_id VARCHAR(36), "
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+            ")"
+        )
+    )
+    db.session.execute(
+        db.text(
+            "CREATE TABLE IF NOT EXISTS memory_fact_keywords ("
+            "fact_id VARCHAR(36) NOT NULL, "
+            "tenant_id VARCHAR(36) NOT NULL, "
+            "keyword TEXT NOT NULL, "
+            "PRIMARY KEY (fact_id, keyword)"
+            ")"
+        )
+    )
+    db.session.execute(
+        db.text(
+            "CREATE TABLE IF NOT EXISTS memory_fact_embeddings ("
+            "fact_id VARCHAR(36) PRIMARY KEY, "
+            "tenant_id VARCHAR(36) NOT NULL, "
+            "playbook_id VARCHAR(36), "
+            "model VARCHAR(32) NOT NULL, "
+            "embedding BLOB NOT NULL, "
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+            ")"
+        )
+    )
+    db.session.commit()
+    yield
+    db.session.execute(db.text("DROP TABLE IF EXISTS memory_fact_embeddings"))
+    db.session.execute(db.text("DROP TABLE IF EXISTS memory_fact_keywords"))
+    db.session.execute(db.text("DROP TABLE IF EXISTS memory_facts"))
+    db.session.commit()
+
+
 class TestExtractKeywords:
     def test_removes_stop_words(self):
         kws = extract_keywords("the quick brown fox is very fast")
@@ -64,7 +114,7 @@ class TestMemoryStore:
     def tenant_id(self):
         return "11111111-1111-1111-1111-111111111111"
 
-    def test_store_and_retrieve(self, app, db, store, tenant_id):
+    def test_store_and_retrieve(self, app, db, memory_tables, store, tenant_id):
         """Store a fact and retrieve it by keyword."""
         # Create tenant first
         from sqlalchemy import text as sa_text
@@ -78,24 +128,6 @@ class TestMemoryStore:
             )
             db.session.commit()
 
-            # We need the memory_facts table — create it manually for SQLite
-            db.session.execute(
-                sa_text(
-                    "CREATE TABLE IF NOT EXISTS memory_facts ("
-                    "id VARCHAR(36) PRIMARY KEY, "
-                    "tenant_id VARCHAR(36) NOT NULL, "
-                    "playbook_id VARCHAR(36), "
-                    "source_message_id VARCHAR(36), "
-                    "chunk_text TEXT NOT NULL, "
-                    "chunk_type VARCHAR(20) NOT NULL DEFAULT 'fact', "
-                    "keywords TEXT DEFAULT '[]', "
-                    "session_id VARCHAR(36), "
-                    "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
-                    ")"
-                )
-            )
-            db.session.commit()
-
             fact_id = store.store_fact(
                 tenant_id=tenant_id,
                 text="We target enterprise SaaS companies with 500+ employees",
@@ -107,7 +139,7 @@ class TestMemoryStore:
             assert len(results) >= 1
             assert "enterprise" in results[0]["text"].lower()
 
-    def test_tenant_isolation(self, app, db, store, tenant_id):
+    def test_tenant_isolation(self, app, db, memory_tables, store, tenant_id):
         """Tenant A's facts should not be visible to tenant B."""
         tenant_b = "22222222-2222-2222-2222-222222222222"
 
@@ -123,21 +155,6 @@ class TestMemoryStore:
                     {"id": tid, "name": name, "slug": name.lower()},
                 )
 
-            db.session.execute(
-                sa_text(
-                    "CREATE TABLE IF NOT EXISTS memory_facts ("
-                    "id VARCHAR(36) PRIMARY KEY, "
-                    "tenant_id VARCHAR(36) NOT NULL, "
-                    "playbook_id VARCHAR(36), "
-                    "source_message_id VARCHAR(36), "
-                    "chunk_text TEXT NOT NULL, "
-                    "chunk_type VARCHAR(20) NOT NULL DEFAULT 'fact', "
-                    "keywords TEXT DEFAULT '[]', "
-                    "session_id VARCHAR(36), "
-                    "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
-                    ")"
-                )
-            )
             db.session.commit()
 
             store.store_fact(
@@ -150,6 +167,79 @@ class TestMemoryStore:
             results = store.retrieve(tenant_b, "fintech companies")
             assert len(results) == 0
 
+    def test_keyword_index_written(self, app, db, memory_tables, store, tenant_id):
+        fact_id = store.store_fact(tenant_id, "Prefer fintech founders in Prague")
+        rows = db.session.execute(
+            db.text("SELECT keyword FROM memory_fact_keywords WHERE fact_id = :id"),
+            {"id": fact_id},
+        ).fetchall()
+        assert {r[0] for r in rows} == {"prefer", "fintech", "founders", "prague"}
+        count = db.session.execute(
+            db.text("SELECT keyword_count FROM memory_facts WHERE id = :id"),
+            {"id": fact_id},
+        ).scalar()
+        assert count == 4
+
+    def test_old_facts_still_found(self, app, db, memory_tables, store, tenant_id):
+        """Facts older than the newest 100 are reachable through the index."""
+        target = store.store_fact(tenant_id, "Pricing objection handled with ROI")
+        for i in range(120):
+            store.store_fact(
+                tenant_id, "Filler note number {} about outreach".format(i)
+            )
+        results = store.retrieve(tenant_id, "pricing ROI")
+        assert results[0]["id"] == target
+
+    def test_rare_terms_rank_higher(self, app, db, memory_tables, store, tenant_id):
+        for i in range(5):
+            store.store_fact(tenant_id, "Companies segment {} reviewed".format(i))
+        rare = store.store_fact(tenant_id, "Companies in biotech need compliance")
+        results = store.retrieve(tenant_id, "companies biotech")
+        assert results[0]["id"] == rare
+        assert len(results) == 6
+
+    def test_playbook_scope(self, app, db, memory_tables, store, tenant_id):
+        shared = store.store_fact(tenant_id, "Fintech focus across strategies")
+        mine = store.store_fact(tenant_id, "Fintech ICP for DACH", playbook_id="pb-1")
+        store.store_fact(tenant_id, "Fintech ICP for Nordics", playbook_id="pb-2")
+        ids = {
+            f["id"] for f in store.retrieve(tenant_id, "fintech", playbook_id="pb-1")
+        }
+        assert ids == {shared, mine}
+
+    def test_recency_breaks_ties(self, app, db, memory_tables, store, tenant_id):
+        old = store.store_fact(tenant_id, "Consultative tone preferred")
+        new = store.store_fact(tenant_id, "Formal tone preferred")
+        db.session.execute(
+            db.text(
+                "UPDATE memory_facts SET created_at = '2020-01-01 00:00:00' "
+                "WHERE id = :id"
+            ),
+            {"id": old},
+        )
+        db.session.commit()
+        results = store.retrieve(tenant_id, "tone preferred")
+        assert [f["id"] for f in results] == [new, old]
+
+    def test_delete_for_tenant_clears_index(
+        self, app, db, memory_tables, store, tenant_id
+    ):
+        store.store_fact(tenant_id, "Fintech focus")
+        assert store.delete_for_tenant(tenant_id) == 1
+        remaining = db.session.execute(
+            db.text("SELECT COUNT(*) FROM memory_fact_keywords")
+        ).scalar()
+        assert remaining == 0
+
+    def test_recency_weight_bounds(self):
+        from datetime import datetime, timedelta, timezone
+
+        now = datetime.now(timezone.utc)
+        assert _recency_weight(now, now) == pytest.approx(1.0)
+        assert _recency_weight(now - timedelta(days=30), now) == pytest.approx(0.75)
+        assert _recency_weight(now - timedelta(days=3650), now) == pytest.approx(0.5)
+        assert _recency_weight(None, now) == 1.0
+
     def test_format_for_injection(self, store):
         """Formatted output should include fact type prefixes."""
         facts = [
@@ -171,3 +261,51 @@ class TestMemoryStore:
     def test_store_empty_text_returns_none(self, store):
         assert store.store_fact("tid", "") is None
         assert store.store_fact("tid", "   ") is None
+
+
+class TestSemanticRecall:
+    TENANT = "11111111-1111-1111-1111-111111111111"
+
+    def test_paraphrase_recalled(self, app, db, memory_tables):
+        store = MemoryStore(semantic=True)
+        target = store.store_fact(
+            self.TENANT, "Our ideal customer profile is mid-size logistics firms"
+        )
+        store.store_fact(self.TENANT, "Send follow-ups on Tuesday mornings")
+
+        # No shared keyword: "icp" only matches via alias expansion
+        assert MemoryStore(semantic=False).retrieve(self.TENANT, "ICP?") == []
+        results = store.retrieve(self.TENANT, "ICP?")
+        assert results[0]["id"] == target
+
+    def test_keyword_match_still_ranks_first(self, app, db, memory_tables):
+        store = MemoryStore(semantic=True)
+        exact = store.store_fact(self.TENANT, "Pricing objection: offer a pilot")
+        store.store_fact(self.TENANT, "Prices were discussed with the CFO")
+        results = store.retrieve(self.TENANT, "pricing objection")
+        assert results[0]["id"] == exact
+        assert 0 < results[0]["score"] <= 1
+
+    def test_embeddings_written_only_when_enabled(self, app, db, memory_tables):
+        MemoryStore(semantic=False).store_fact(self.TENANT, "Fintech focus")
+        MemoryStore(semantic=True).store_fact(self.TENANT, "Fintech founders")
+        count = db.session.execute(
+            db.text("SELECT COUNT(*) FROM memory_fact_embeddings")
+        ).scalar()
+        assert count == 1
+
+    def test_backfill(self, app, db, memory_tables):
+        plain = MemoryStore(semantic=False)
+        for text in ["Fintech focus", "DACH region first", "Formal tone"]:
+            plain.store_fact(self.TENANT, text)
+        store = MemoryStore(semantic=True)
+        assert store.backfill_embeddings(self.TENANT, batch_size=2) == 3
+        assert store.backfill_embeddings(self.TENANT) == 0
+
+    def test_config_flag(self, app, memory_tables):
+        app.config["MEMORY_SEMANTIC_RECALL"] = True
+        try:
+            assert MemoryStore().semantic is True
+        finally:
+            app.config["MEMORY_SEMANTIC_RECALL"] = False
+        assert MemoryStore().semantic is False
@@ -0,0 +1,36 @@
+"""Unit tests for the shared token-bucket rate limiter."""
+
+import pytest
+
+from api.services.rate_limiter import RateLimiter
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter:
+    def test_burst_then_paced(self):
+        clock = _Clock()
+        limiter = RateLimiter(2, clock=clock, sleep=clock.sleep)
+        for _ in range(4):
+            limiter.acquire()
+        # Two tokens of burst, then one request every 0.5s
+        assert clock.sleeps == [pytest.approx(0.5), pytest.approx(0.5)]
+
+    def test_refills_over_time(self):
+        clock = _Clock()
+        limiter = RateLimiter(2, clock=clock, sleep=clock.sleep)
+        limiter.acquire()
+        limiter.acquire()
+        clock.now += 1.0
+        assert limiter.acquire() == 0.0
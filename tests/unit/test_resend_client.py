@@ -0,0 +1,135 @@
+"""Unit tests for the per-tenant Resend client."""
+
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from api.services import resend_client
+from api.services.resend_client import (
+    IdempotencyConflict,
+    ResendClient,
+    get_resend_client,
+    is_rejected,
+)
+
+
+def _response(status, body=None, headers=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.headers = headers or {}
+    resp.json.return_value = body or {}
+    if status >= 400:
+        resp.raise_for_status.side_effect = requests.HTTPError(
+            str(status), response=resp
+        )
+    return resp
+
+
+class TestResendClient:
+    def test_maps_permissive_batch_errors_by_index(self):
+        client = ResendClient("re_key")
+        client._session = MagicMock()
+        client._session.post.return_value = _response(
+            200,
+            {
+                "data": [{"id": "a"}, {"id": "c"}],
+                "errors": [{"index": 1, "message": "Invalid `to` field"}],
+            },
+        )
+        results = client.send_batch([{}, {}, {}], idempotency_key="k1")
+        assert results == [
+            {"id": "a"},
+            {"error": "Invalid `to` field"},
+            {"id": "c"},
+        ]
+        headers = client._session.post.call_args.kwargs["headers"]
+        assert headers["Authorization"] == "Bearer re_key"
+        assert headers["Idempotency-Key"] == "k1"
+        assert headers["x-batch-validation"] == "permissive"
+
+    def test_retries_rate_limited_requests(self, monkeypatch):
+        monkeypatch.setattr(resend_client.time, "sleep", lambda _s: None)
+        limiter = MagicMock()
+        client = ResendClient("re_key", rate_limiter=limiter)
+        client._session = MagicMock()
+        client._session.post.side_effect = [
+            _response(429, headers={"Retry-After": "1"}),
+            _response(200, {"data": [{"id": "a"}]}),
+        ]
+        assert client.send_batch([{}]) == [{"id": "a"}]
+        # Every attempt takes a token from the tenant's limiter
+        assert limiter.acquire.call_count == 2
+
+    def test_non_retryable_error_raises(self):
+        client = ResendClient("re_key")
+        client._session = MagicMock()
+        client._session.post.return_value = _response(422)
+        with pytest.raises(requests.HTTPError):
+            client.send_batch([{}])
+
+    def test_retries_transport_errors(self, monkeypatch):
+        monkeypatch.setattr(resend_client.time, "sleep", lambda _s: None)
+        client = ResendClient("re_key")
+        client._session = MagicMock()
+        client._session.post.side_effect = [
+            requests.ReadTimeout("read timed out"),
+            requests.ConnectionError("connection reset"),
+            _response(200, {"data": [{"id": "a"}]}),
+        ]
+        assert client.send_batch([{}], idempotency_key="k1") == [{"id": "a"}]
+        keys = [
+            call.kwargs["headers"]["Idempotency-Key"]
+            for call in client._session.post.call_args_list
+        ]
+        assert keys == ["k1", "k1", "k1"]
+
+    def test_transport_error_after_retries_is_not_a_rejection(self, monkeypatch):
+        monkeypatch.setattr(resend_client.time, "sleep", lambda _s: None)
+        client = ResendClient("re_key", max_retries=1)
+        client._session = MagicMock()
+        client._session.post.side_effect = requests.ReadTimeout("read timed out")
+        with pytest.raises(requests.ReadTimeout) as exc:
+            client.send_batch([{}])
+        assert client._session.post.call_count == 2
+        assert not is_rejected(exc.value)
+
+    def test_idempotency_conflict(self):
+        client = ResendClient("re_key")
+        client._session = MagicMock()
+        client._session.post.return_value = _response(409)
+        with pytest.raises(IdempotencyConflict) as exc:
+            client.send_batch([{}], idempotency_key="k1")
+        assert not is_rejected(exc.value)
+
+    def test_only_definite_4xx_is_a_rejection(self):
+        def error(status):
+            return requests.HTTPError(str(status), response=_response(status))
+
+        assert is_rejected(error(401))
+        assert is_rejected(error(422))
+        assert not is_rejected(error(429))
+        assert not is_rejected(error(503))
+        assert not is_rejected(ValueError("bad json"))
+
+    def test_rejects_oversized_batch(self):
+        with pytest.raises(ValueError):
+            ResendClient("re_key").send_batch([{}] * 101)
+
+
+class TestGetResendClient:
+    def test_one_client_per_tenant(self, monkeypatch):
+        monkeypatch.setattr(resend_client, "_clients", {})
+        a = get_resend_client("t1", "key-a")
+        assert get_resend_client("t1", "key-a") is a
+        b = get_resend_client("t2", "key-b")
+        assert b is not a
+        assert b.rate_limiter is not a.rate_limiter
+
+    def test_key_rotation_keeps_limiter(self, monkeypatch):
+        monkeypatch.setattr(resend_client, "_clients", {})
+        old = get_resend_client("t1", "key-a", requests_per_second=5)
+        new = get_resend_client("t1", "key-b", requests_per_second=5)
+        assert new is not old
+        assert new.api_key == "key-b"
+        assert new.rate_limiter is old.rate_limiter
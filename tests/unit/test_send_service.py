@@ -3,6 +3,7 @@
 Covers:
 - Email dispatch via Resend API (mocked)
 - Idempotent send (skips already-sent messages)
+- Batched dispatch and resuming interrupted batches
 - Failure handling (one email fails, others continue)
 - Missing sender_config returns 400
 - Non-email messages excluded
@@ -109,41 +110,68 @@ def _setup_tenant_with_resend_key(db, seed):
     db.session.commit()
 
 
+class _FakeResendClient:
+    """Stand-in for ResendClient recording each batch request."""
+
+    def __init__(self, fail_at=(), error=None):
+        self.batches = []
+        self.fail_at = set(fail_at)
+        self.error = error
+        self.sent = 0
+
+    def send_batch(self, emails, idempotency_key=None):
+        self.batches.append((emails, idempotency_key))
+        if self.error:
+            raise self.error
+        results = []
+        for _email in emails:
+            self.sent += 1
+            if self.sent in self.fail_at:
+                results.append({"error": "Resend API error: invalid recipient"})
+            else:
+                results.append({"id": f"resend_msg_{self.sent:03d}"})
+        return results
+
+    @property
+    def emails(self):
+        return [e for batch, _key in self.batches for e in batch]
+
+
 class TestSendCampaignEmails:
     """Unit tests for send_campaign_emails service function."""
 
-    @patch("api.services.send_service.time.sleep")
-    @patch("api.services.send_service._send_single_email")
-    def test_send_dispatches_all_approved(
-        self, mock_send, mock_sleep, app, db, seed_companies_contacts
-    ):
+    def test_send_dispatches_all_approved(self, app, db, seed_companies_contacts):
         """Approved email messages are dispatched via Resend."""
         seed = seed_companies_contacts
         _setup_tenant_with_resend_key(db, seed)
         campaign, messages, contacts = _setup_campaign_with_approved_emails(
             db, seed, msg_count=3
         )
-
-        # Mock Resend response
-        mock_send.return_value = {"id": "resend_msg_001"}
+        client = _FakeResendClient()
 
         from api.services.send_service import send_campaign_emails
 
-        with app.app_context():
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client", return_value=client
+        ):
             result = send_campaign_emails(
                 str(campaign.id), str(seed["tenant"].id)
             )
 
-        # Only contacts with email addresses should be sent
+        # Only contacts with email addresses should be sent, in one batch
         contacts_with_email = [c for c in contacts if c.email_address]
         assert result["sent_count"] == len(contacts_with_email)
         assert result["total"] == len(contacts)
-        assert mock_send.call_count == len(contacts_with_email)
+        assert len(client.emails) == len(contacts_with_email)
+        assert len(client.batches) == 1
+        assert result["batches"] == 1
+        assert "emails_per_second" in result and "duration_seconds" in result
+        email = client.emails[0]
+        assert email["from"] == "Test Outreach <outreach@test.com>"
+        assert email["reply_to"] == ["replies@test.com"]
 
-    @patch("api.services.send_service.time.sleep")
-    @patch("api.services.send_service._send_single_email")
     def test_send_idempotent_skips_already_sent(
-        self, mock_send, mock_sleep, app, db, seed_companies_contacts
+        self, app, db, seed_companies_contacts
     ):
         """Re-sending skips messages that already have a non-failed EmailSendLog."""
         from api.models import EmailSendLog
@@ -165,12 +193,13 @@ class TestSendCampaignEmails:
         )
         db.session.add(log)
         db.session.commit()
-
-        mock_send.return_value = {"id": "resend_msg_002"}
+        client = _FakeResendClient()
 
         from api.services.send_service import send_campaign_emails
 
-        with app.app_context():
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client", return_value=client
+        ):
             result = send_campaign_emails(
                 str(campaign.id), str(seed["tenant"].id)
             )
@@ -179,32 +208,25 @@ class TestSendCampaignEmails:
         # The first message was skipped, so send_count should be less
         assert result["sent_count"] < len(messages)
 
-    @patch("api.services.send_service.time.sleep")
-    @patch("api.services.send_service._send_single_email")
     def test_send_handles_failure_gracefully(
-        self, mock_send, mock_sleep, app, db, seed_companies_contacts
+        self, app, db, seed_companies_contacts
     ):
         """Failed sends are logged but don't stop other sends."""
+        from api.models import EmailSendLog
+
         seed = seed_companies_contacts
         _setup_tenant_with_resend_key(db, seed)
         campaign, messages, contacts = _setup_campaign_with_approved_emails(
             db, seed, msg_count=3
         )
-
-        # First call succeeds, second raises, third succeeds
-        call_count = [0]
-
-        def side_effect(**kwargs):
-            call_count[0] += 1
-            if call_count[0] == 2:
-                raise Exception("Resend API error: rate limit exceeded")
-            return {"id": f"resend_msg_{call_count[0]:03d}"}
-
-        mock_send.side_effect = side_effect
+        # Second email in the batch is rejected, the others go out
+        client = _FakeResendClient(fail_at={2})
 
         from api.services.send_service import send_campaign_emails
 
-        with app.app_context():
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client", return_value=client
+        ):
             result = send_campaign_emails(
                 str(campaign.id), str(seed["tenant"].id)
             )
@@ -214,11 +236,349 @@ class TestSendCampaignEmails:
         assert result["failed_count"] >= 1
         # Total should account for all attempts
         assert result["total"] == result["sent_count"] + result["failed_count"] + result["skipped_count"]
+        failed = EmailSendLog.query.filter_by(status="failed").all()
+        assert any("invalid recipient" in (f.error or "") for f in failed)
+
+    def test_transport_error_leaves_batch_queued_for_replay(
+        self, app, db, seed_companies_contacts
+    ):
+        """A batch that may have reached Resend is replayed with its key."""
+        import requests
+
+        from api.models import EmailSendLog
+
+        seed = seed_companies_contacts
+        _setup_tenant_with_resend_key(db, seed)
+        campaign, messages, contacts = _setup_campaign_with_approved_emails(
+            db, seed, msg_count=3
+        )
+        client = _FakeResendClient(error=requests.ReadTimeout("read timed out"))
+
+        from api.services.send_service import send_campaign_emails
+
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client", return_value=client
+        ):
+            result = send_campaign_emails(
+                str(campaign.id), str(seed["tenant"].id)
+            )
+
+        with_email = len([c for c in contacts if c.email_address])
+        assert result["sent_count"] == 0
+        assert result["failed_count"] == len(contacts) - with_email
+        assert result["queued_count"] == with_email
+        assert EmailSendLog.query.filter_by(status="queued").count() == with_email
+        first_batch, first_key = client.batches[0]
+
+        retry = _FakeResendClient()
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client", return_value=retry
+        ):
+            result = send_campaign_emails(
+                str(campaign.id), str(seed["tenant"].id)
+            )
+
+        # Same payload under the same key, so Resend cannot send it twice
+        assert retry.batches == [(first_batch, first_key)]
+        assert result["resumed_count"] == with_email
+        assert result["sent_count"] == with_email
+        assert EmailSendLog.query.filter_by(status="queued").count() == 0
+
+    def test_rejected_batch_fails_its_messages(
+        self, app, db, seed_companies_contacts
+    ):
+        """A definite 4xx rejection marks each message of the batch failed."""
+        from unittest.mock import MagicMock
+
+        import requests
+
+        from api.models import EmailSendLog
+
+        seed = seed_companies_contacts
+        _setup_tenant_with_resend_key(db, seed)
+        campaign, messages, contacts = _setup_campaign_with_approved_emails(
+            db, seed, msg_count=3
+        )
+        error = requests.HTTPError(
+            "401 Unauthorized", response=MagicMock(status_code=401)
+        )
+        client = _FakeResendClient(error=error)
+
+        from api.services.send_service import send_campaign_emails
+
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client", return_value=client
+        ):
+            result = send_campaign_emails(
+                str(campaign.id), str(seed["tenant"].id)
+            )
+
+        assert result["sent_count"] == 0
+        assert result["queued_count"] == 0
+        assert result["failed_count"] == len(contacts)
+        assert EmailSendLog.query.filter_by(status="queued").count() == 0
+
+    def test_idempotency_conflict_leaves_batch_queued(
+        self, app, db, seed_companies_contacts
+    ):
+        from unittest.mock import MagicMock
+
+        from api.models import EmailSendLog
+        from api.services.resend_client import IdempotencyConflict
+
+        seed = seed_companies_contacts
+        _setup_tenant_with_resend_key(db, seed)
+        campaign, messages, contacts = _setup_campaign_with_approved_emails(
+            db, seed, msg_count=2
+        )
+        error = IdempotencyConflict("409", response=MagicMock(status_code=409))
+        client = _FakeResendClient(error=error)
+
+        from api.services.send_service import send_campaign_emails
+
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client", return_value=client
+        ):
+            result = send_campaign_emails(
+                str(campaign.id), str(seed["tenant"].id)
+            )
+
+        with_email = len([c for c in contacts if c.email_address])
+        assert result["queued_count"] == with_email
+        assert result["failed_count"] == len(contacts) - with_email
+        assert EmailSendLog.query.filter_by(status="queued").count() == with_email
+
+    def test_splits_into_resend_sized_batches(
+        self, app, db, seed_companies_contacts, monkeypatch
+    ):
+        from api.services import send_service
+
+        monkeypatch.setattr(send_service, "SEND_BATCH_SIZE", 2)
+        seed = seed_companies_contacts
+        _setup_tenant_with_resend_key(db, seed)
+        campaign, messages, contacts = _setup_campaign_with_approved_emails(
+            db, seed, msg_count=5
+        )
+        client = _FakeResendClient()
+
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client", return_value=client
+        ):
+            result = send_service.send_campaign_emails(
+                str(campaign.id), str(seed["tenant"].id)
+            )
+
+        with_email = len([c for c in contacts if c.email_address])
+        assert result["sent_count"] == with_email
+        assert all(len(batch) <= 2 for batch, _key in client.batches)
+        keys = [key for _batch, key in client.batches]
+        assert len(set(keys)) == len(keys)
+
+    def test_resumes_interrupted_batch_with_same_key(
+        self, app, db, seed_companies_contacts
+    ):
+        """Queued logs left by a crash are replayed with their idempotency key."""
+        from api.models import EmailSendLog, Message
+
+        seed = seed_companies_contacts
+        _setup_tenant_with_resend_key(db, seed)
+        campaign, messages, contacts = _setup_campaign_with_approved_emails(
+            db, seed, msg_count=2
+        )
+        db.session.add(
+            EmailSendLog(
+                tenant_id=seed["tenant"].id,
+                message_id=messages[0].id,
+                status="queued",
+                from_email="outreach@test.com",
+                to_email="resume@test.com",
+                idempotency_key="campaign-crashed-batch",
+            )
+        )
+        db.session.commit()
+        client = _FakeResendClient()
+
+        from api.services.send_service import send_campaign_emails
+
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client", return_value=client
+        ):
+            result = send_campaign_emails(
+                str(campaign.id), str(seed["tenant"].id)
+            )
+
+        assert result["resumed_count"] == 1
+        replayed = [b for b, key in client.batches if key == "campaign-crashed-batch"]
+        assert len(replayed) == 1
+        assert replayed[0][0]["to"] == ["resume@test.com"]
+        resumed_log = EmailSendLog.query.filter_by(
+            idempotency_key="campaign-crashed-batch"
+        ).one()
+        assert resumed_log.status == "sent"
+        assert db.session.get(Message, messages[0].id).sent_at is not None
+        # No second log row for the resumed message
+        assert (
+            EmailSendLog.query.filter_by(message_id=messages[0].id).count() == 1
+        )
+
+    def test_resumed_batch_replayed_whole_in_original_order(
+        self, app, db, seed_companies_contacts
+    ):
+        """Queued rows are replayed ordered by (created_at, id)."""
+        from datetime import datetime, timezone
+
+        from api.models import EmailSendLog
+
+        seed = seed_companies_contacts
+        _setup_tenant_with_resend_key(db, seed)
+        campaign, messages, contacts = _setup_campaign_with_approved_emails(
+            db, seed, msg_count=3
+        )
+        queued_at = datetime.now(timezone.utc)
+        for message, log_id in zip(messages, ["c", "a", "b"]):
+            db.session.add(
+                EmailSendLog(
+                    id=f"00000000-0000-0000-0000-00000000000{log_id}",
+                    tenant_id=seed["tenant"].id,
+                    message_id=message.id,
+                    status="queued",
+                    to_email=f"{log_id}@test.com",
+                    idempotency_key="campaign-crashed-batch",
+                    created_at=queued_at,
+                )
+            )
+        db.session.commit()
+        client = _FakeResendClient()
+
+        from api.services.send_service import send_campaign_emails
+
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client", return_value=client
+        ):
+            result = send_campaign_emails(
+                str(campaign.id), str(seed["tenant"].id)
+            )
+
+        assert result["resumed_count"] == 3
+        ((batch, key),) = client.batches
+        assert key == "campaign-crashed-batch"
+        assert [e["to"] for e in batch] == [
+            ["a@test.com"],
+            ["b@test.com"],
+            ["c@test.com"],
+        ]
+        sent = EmailSendLog.query.filter_by(to_email="a@test.com").one()
+        assert sent.resend_message_id == "resend_msg_001"
+
+    def test_partial_queued_batch_is_not_replayed(
+        self, app, db, seed_companies_contacts
+    ):
+        """A batch whose rows are not all resumable stays queued."""
+        from api.models import EmailSendLog, Message
+
+        seed = seed_companies_contacts
+        _setup_tenant_with_resend_key(db, seed)
+        campaign, messages, contacts = _setup_campaign_with_approved_emails(
+            db, seed, msg_count=2
+        )
+        for i, message in enumerate(messages):
+            db.session.add(
+                EmailSendLog(
+                    tenant_id=seed["tenant"].id,
+                    message_id=message.id,
+                    status="queued",
+                    to_email=f"r{i}@test.com",
+                    idempotency_key="campaign-crashed-batch",
+                )
+            )
+        # One message of the batch is no longer approved
+        db.session.get(Message, messages[1].id).status = "draft"
+        db.session.commit()
+        client = _FakeResendClient()
+
+        from api.services.send_service import send_campaign_emails
+
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client", return_value=client
+        ):
+            result = send_campaign_emails(
+                str(campaign.id), str(seed["tenant"].id)
+            )
+
+        assert client.batches == []
+        assert result["resumed_count"] == 0
+        assert result["queued_count"] == 1
+        assert EmailSendLog.query.filter_by(status="queued").count() == 2
+
+    def test_stale_queued_log_is_not_replayed(
+        self, app, db, seed_companies_contacts
+    ):
+        """Unconfirmed sends older than Resend's key window are marked failed."""
+        from datetime import datetime, timedelta
+
+        from api.models import EmailSendLog
+
+        seed = seed_companies_contacts
+        _setup_tenant_with_resend_key(db, seed)
+        campaign, messages, contacts = _setup_campaign_with_approved_emails(
+            db, seed, msg_count=1
+        )
+        db.session.add(
+            EmailSendLog(
+                tenant_id=seed["tenant"].id,
+                message_id=messages[0].id,
+                status="queued",
+                to_email="old@test.com",
+                idempotency_key="campaign-old-batch",
+                created_at=datetime.utcnow() - timedelta(days=2),
+            )
+        )
+        db.session.commit()
+        client = _FakeResendClient()
+
+        from api.services.send_service import send_campaign_emails
+
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client", return_value=client
+        ):
+            result = send_campaign_emails(
+                str(campaign.id), str(seed["tenant"].id)
+            )
+
+        assert result["failed_count"] == 1
+        assert result["skipped_count"] == 0
+        assert client.batches == []
+        log = EmailSendLog.query.filter_by(message_id=messages[0].id).one()
+        assert log.status == "failed"
+        assert "idempotency key has expired" in log.error
+
+    def test_uses_per_tenant_client_not_global_key(
+        self, app, db, seed_companies_contacts
+    ):
+        import resend
+
+        seed = seed_companies_contacts
+        _setup_tenant_with_resend_key(db, seed)
+        campaign, _messages, _contacts = _setup_campaign_with_approved_emails(
+            db, seed, msg_count=1
+        )
+        before = resend.api_key
+
+        from api.services.send_service import send_campaign_emails
+
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client",
+            return_value=_FakeResendClient(),
+        ) as factory:
+            send_campaign_emails(str(campaign.id), str(seed["tenant"].id))
+
+        factory.assert_called_once_with(
+            str(seed["tenant"].id), "re_test_key_123", None
+        )
+        assert resend.api_key == before
 
-    @patch("api.services.send_service.time.sleep")
-    @patch("api.services.send_service._send_single_email")
     def test_send_excludes_non_email_messages(
-        self, mock_send, mock_sleep, app, db, seed_companies_contacts
+        self, app, db, seed_companies_contacts
     ):
         """LinkedIn messages are not sent via Resend."""
         seed = seed_companies_contacts
@@ -226,20 +586,21 @@ class TestSendCampaignEmails:
         campaign, messages, contacts = _setup_campaign_with_approved_emails(
             db, seed, msg_count=2, include_linkedin=True
         )
-
-        mock_send.return_value = {"id": "resend_msg_001"}
+        client = _FakeResendClient()
 
         from api.services.send_service import send_campaign_emails
 
-        with app.app_context():
+        with app.app_context(), patch(
+            "api.services.send_service.get_resend_client", return_value=client
+        ):
             send_campaign_emails(
                 str(campaign.id), str(seed["tenant"].id)
             )
 
         # Only email messages should be sent, not linkedin
-        for call_args in mock_send.call_args_list:
+        for email in client.emails:
             # verify we never tried to send a linkedin message
-            assert "connect" not in str(call_args).lower()
+            assert "connect" not in str(email).lower()
 
     def test_send_raises_on_missing_sender_config(self, app, db, seed_companies_contacts):
         """send_campaign_emails raises when sender_config has no from_email."""
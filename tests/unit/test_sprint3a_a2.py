@@ -359,6 +359,23 @@ class TestCsvExport:
         assert len(rows) == 0
 
 
+    def test_export_csv_gzip(self, client, seed_companies_contacts):
+        """gzip=1 streams a compressed .csv.gz download."""
+        import gzip
+
+        headers = _headers(client)
+        cid = _create_ready_campaign(client, headers, seed_companies_contacts)
+
+        resp = client.get(
+            f"/api/campaigns/{cid}/messages/export-csv?gzip=1", headers=headers
+        )
+        assert resp.status_code == 200
+        assert resp.content_type == "application/gzip"
+        assert ".csv.gz" in resp.headers["Content-Disposition"]
+        text = gzip.decompress(resp.data).decode("utf-8")
+        assert next(csv.reader(io.StringIO(text)))[0] == "First Name"
+
+
 class TestCsvSanitization:
     """Formula injection sanitization for CSV cells."""
 
@@ -0,0 +1,192 @@
+"""Tests for the empirical stage cost/duration model (stage_estimates)."""
+
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.models import StageCostModel
+from api.services import stage_estimates
+from api.services.stage_estimates import (
+    estimate_stage,
+    percentile,
+    refresh_stage_model,
+    stage_run_eta,
+    summarize,
+    total_range,
+)
+
+T0 = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def _completion(db, tenant_id, stage, cost, duration_ms, minute, status="completed"):
+    db.session.execute(
+        db.text(
+            "INSERT INTO entity_stage_completions (id, tenant_id, tag_id, "
+            "entity_type, entity_id, stage, status, cost_usd, duration_ms, "
+            "completed_at) VALUES (:id, :t, :tag, 'company', :e, :s, :st, :c, "
+            ":d, :at)"
+        ),
+        {
+            "id": str(uuid.uuid4()),
+            "t": str(tenant_id),
+            "tag": str(uuid.uuid4()),
+            "e": str(uuid.uuid4()),
+            "s": stage,
+            "st": status,
+            "c": cost,
+            "d": duration_ms,
+            "at": (T0 + timedelta(minutes=minute)).strftime("%Y-%m-%d %H:%M:%S"),
+        },
+    )
+
+
+def _stats(model):
+    # JSONB columns come back as text on SQLite
+    return json.loads(model.stats) if isinstance(model.stats, str) else model.stats
+
+
+class TestStatistics:
+    def test_percentiles(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == pytest.approx(50.5)
+        assert percentile(values, 90) == pytest.approx(90.1)
+        assert percentile([], 50) is None
+
+    def test_summarize_skips_missing(self):
+        stats = summarize([1.0, None, 3.0])
+        assert stats["n"] == 2
+        assert stats["mean"] == 2.0
+        assert summarize([None]) is None
+
+    def test_total_range_scales_with_sqrt_n(self):
+        dist = {"mean": 2.0, "std": 1.0}
+        expected, p90 = total_range(dist, 100)
+        assert expected == 200.0
+        assert p90 == pytest.approx(200 + 1.2816 * 10)
+        assert total_range(dist, 100, concurrency=4)[0] == 50.0
+
+
+class TestRefresh:
+    def test_incremental_refresh(self, db, seed_tenant):
+        tid = str(seed_tenant.id)
+        for i in range(10):
+            _completion(db, tid, "l1", 0.01 * (i + 1), 1000 * (i + 1), i)
+        _completion(db, tid, "l1", 0, 50, 11, status="failed")
+        db.session.commit()
+
+        model = refresh_stage_model(tid, "l1")
+        db.session.commit()
+        stats = _stats(model)
+        assert stats["cost"]["n"] == 10
+        assert stats["cost"]["p50"] == pytest.approx(0.055)
+        assert stats["duration_ms"]["p90"] == pytest.approx(9100)
+
+        for i in range(3):
+            _completion(db, tid, "l1", 0.2, 2000, 20 + i)
+        db.session.commit()
+        model = refresh_stage_model(tid, "l1")
+        model = refresh_stage_model(tid, "l1")
+        db.session.commit()
+
+        stats = _stats(model)
+        assert stats["cost"]["n"] == 13
+        assert stats["cost"]["p90"] == pytest.approx(0.2)
+
+    def test_sample_window_is_bounded(self, db, seed_tenant, monkeypatch):
+        monkeypatch.setattr(stage_estimates, "MAX_SAMPLES", 4)
+        tid = str(seed_tenant.id)
+        for i in range(6):
+            _completion(db, tid, "news", float(i), None, i)
+        db.session.commit()
+
+        stats = refresh_stage_model(tid, "news").stats
+        assert stats["cost"]["n"] == 4
+        assert stats["cost"]["mean"] == pytest.approx(3.5)
+        assert stats["duration_ms"] is None
+
+    def test_per_model_call_stats(self, db, seed_tenant):
+        from api.models import LlmUsageLog
+
+        for i, model in enumerate(["sonar", "sonar", "sonar-pro"]):
+            db.session.add(
+                LlmUsageLog(
+                    tenant_id=seed_tenant.id,
+                    operation="l2_news_research",
+                    provider="perplexity",
+                    model=model,
+                    cost_usd=0.01 * (i + 1),
+                    duration_ms=800,
+                )
+            )
+        db.session.commit()
+
+        stats = refresh_stage_model(str(seed_tenant.id), "l2").stats
+        assert stats["models"]["sonar"]["calls"] == 2
+        assert stats["models"]["sonar-pro"]["cost"]["mean"] == pytest.approx(0.03)
+
+
+class TestEstimate:
+    def test_default_without_history(self, db, seed_tenant):
+        est = estimate_stage(seed_tenant.id, "l1", 10)
+        assert est["cost_basis"] == "default"
+        assert est["cost_per_item"] == 0.02
+        assert est["estimated_cost"] == 0.2
+        assert est["eta_seconds"] is None
+
+    def test_tenant_samples_give_range_and_eta(self, db, seed_tenant):
+        tid = str(seed_tenant.id)
+        for i in range(20):
+            _completion(db, tid, "l1", 0.01 if i % 2 else 0.03, 4000, i)
+        db.session.commit()
+
+        est = estimate_stage(tid, "l1", 100)
+
+        assert est["cost_basis"] == "tenant"
+        assert est["cost_per_item"] == 0.02
+        assert est["estimated_cost"] == 2.0
+        assert est["cost_range"][1] > 2.0
+        assert est["duration_basis"] == "tenant"
+        assert est["eta_seconds"] == 400
+        assert est["eta_p90_seconds"] == 400
+
+    def test_falls_back_to_global_model(self, db, seed_tenant):
+        other = str(uuid.uuid4())
+        for i in range(6):
+            _completion(db, other, "signals", 0.07, 3000, i)
+        db.session.commit()
+        stage_estimates.refresh_models("global", ["signals"])
+
+        est = estimate_stage(seed_tenant.id, "signals", 10)
+        assert est["cost_basis"] == "global"
+        assert est["cost_per_item"] == 0.07
+        assert est["eta_seconds"] == 30
+
+    def test_stale_tenant_model_is_refreshed(self, db, seed_tenant):
+        tid = str(seed_tenant.id)
+        estimate_stage(tid, "career", 1)
+        for i in range(5):
+            _completion(db, tid, "career", 0.05, 1000, i)
+        db.session.commit()
+        row = db.session.get(StageCostModel, (tid, "career"))
+        row.updated_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        db.session.commit()
+
+        assert estimate_stage(tid, "career", 1)["cost_basis"] == "tenant"
+
+
+class TestStageRunEta:
+    def test_uses_run_pace_once_started(self, db, seed_tenant):
+        started = datetime.now(timezone.utc) - timedelta(seconds=100)
+        eta = stage_run_eta(seed_tenant.id, "l1", "running", 30, 8, 2, started)
+        assert eta == pytest.approx(200, abs=2)
+
+    def test_uses_model_before_pace_is_known(self, db, seed_tenant):
+        tid = str(seed_tenant.id)
+        for i in range(5):
+            _completion(db, tid, "l1", 0.02, 2000, i)
+        db.session.commit()
+
+        assert stage_run_eta(tid, "l1", "pending", 10, 0, 0) == 20
+        assert stage_run_eta(tid, "l1", "completed", 10, 10, 0) is None
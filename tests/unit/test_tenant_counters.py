@@ -0,0 +1,184 @@
+"""Unit tests for per-tenant live counters."""
+
+import pytest
+
+from api.services import tenant_counters
+from api.services.tenant_counters import (
+    COUNTER_FIELDS,
+    compute_counters,
+    get_counters,
+    repair_counters,
+)
+from tests.conftest import auth_header
+
+
+def _stored(db, tenant_id):
+    row = db.session.execute(
+        db.text(
+            "SELECT " + ", ".join(COUNTER_FIELDS) + " FROM tenant_counters "
+            "WHERE tenant_id = :t"
+        ),
+        {"t": str(tenant_id)},
+    ).fetchone()
+    return dict(zip(COUNTER_FIELDS, row)) if row else None
+
+
+@pytest.fixture
+def maintained(monkeypatch):
+    """Pretend the database maintains counters (PostgreSQL triggers)."""
+    monkeypatch.setattr(tenant_counters, "counters_maintained", lambda: True)
+
+
+class TestComputeCounters:
+    def test_matches_orm_counts(self, app, db, seed_companies_contacts, seed_tenant):
+        from api.models import (
+            Campaign,
+            Company,
+            CompanyEnrichmentL1,
+            Contact,
+            Message,
+        )
+
+        db.session.add(
+            CompanyEnrichmentL1(company_id=seed_companies_contacts["companies"][0].id)
+        )
+        db.session.add_all(
+            [
+                Campaign(tenant_id=seed_tenant.id, name="A", status="draft"),
+                Campaign(tenant_id=seed_tenant.id, name="B", status="active"),
+            ]
+        )
+        db.session.commit()
+
+        counters = compute_counters(seed_tenant.id)
+        tid = seed_tenant.id
+        assert counters["contacts"] == Contact.query.filter_by(tenant_id=tid).count()
+        assert counters["companies"] == Company.query.filter_by(tenant_id=tid).count()
+        assert counters["messages"] == Message.query.filter_by(tenant_id=tid).count()
+        assert counters["l1_enriched_companies"] == 1
+        assert counters["triage_passed"] == 2
+        assert counters["triage_disqualified"] == 1
+        assert counters["campaigns"] == 2
+        assert counters["active_campaigns"] == 1
+
+    def test_empty_tenant(self, app, db, seed_tenant):
+        assert compute_counters(seed_tenant.id) == {f: 0 for f in COUNTER_FIELDS}
+
+
+class TestGetCounters:
+    def test_live_count_without_triggers(self, app, db, seed_companies_contacts):
+        tid = seed_companies_contacts["tenant"].id
+        assert get_counters(tid) == compute_counters(tid)
+        assert _stored(db, tid) is None
+
+    def test_reads_maintained_row(self, app, db, seed_tenant, maintained):
+        db.session.execute(
+            db.text(
+                "INSERT INTO tenant_counters (tenant_id, contacts, messages) "
+                "VALUES (:t, 42, 7)"
+            ),
+            {"t": seed_tenant.id},
+        )
+        db.session.commit()
+        counters = get_counters(seed_tenant.id)
+        assert counters["contacts"] == 42
+        assert counters["messages"] == 7
+
+    def test_missing_row_is_seeded(self, app, db, seed_companies_contacts, maintained):
+        tid = seed_companies_contacts["tenant"].id
+        counters = get_counters(tid)
+        assert counters == compute_counters(tid)
+        assert _stored(db, tid) == counters
+
+
+class TestRepairCounters:
+    def test_reports_and_fixes_drift(
+        self, app, db, seed_companies_contacts, maintained
+    ):
+        tid = seed_companies_contacts["tenant"].id
+        actual = compute_counters(tid)
+        db.session.execute(
+            db.text(
+                "INSERT INTO tenant_counters (tenant_id, "
+                + ", ".join(COUNTER_FIELDS)
+                + ") VALUES (:t, "
+                + ", ".join(":" + f for f in COUNTER_FIELDS)
+                + ")"
+            ),
+            dict(actual, t=tid, contacts=actual["contacts"] + 5),
+        )
+        db.session.commit()
+
+        result = repair_counters(tid)
+        assert result["tenants_checked"] == 1
+        assert result["drift"] == [
+            {
+                "tenant_id": tid,
+                "field": "contacts",
+                "stored": actual["contacts"] + 5,
+                "actual": actual["contacts"],
+            }
+        ]
+        assert _stored(db, tid) == actual
+        assert repair_counters(tid)["drift"] == []
+
+    def test_all_tenants(self, app, db, seed_tenant):
+        result = repair_counters()
+        assert result["tenants_checked"] == 1
+        assert _stored(db, seed_tenant.id) == {f: 0 for f in COUNTER_FIELDS}
+
+
+class TestRepairEndpoint:
+    def test_super_admin_repairs(self, client, db, seed_companies_contacts):
+        headers = auth_header(client)
+        resp = client.post("/api/tenants/counters/repair", headers=headers, json={})
+        assert resp.status_code == 200
+        assert resp.get_json()["tenants_checked"] == 1
+
+    def test_unknown_tenant(self, client, db, seed_companies_contacts):
+        headers = auth_header(client)
+        resp = client.post(
+            "/api/tenants/counters/repair",
+            headers=headers,
+            json={"tenant_id": "00000000-0000-0000-0000-000000000000"},
+        )
+        assert resp.status_code == 404
+
+
+class TestWorkflowSuggestionsCounters:
+    def test_triage_nudge_reads_counters_row(
+        self, client, db, seed_companies_contacts, maintained
+    ):
+        from datetime import datetime, timedelta, timezone
+
+        from api.models import StageRun
+
+        tid = seed_companies_contacts["tenant"].id
+        now = datetime.now(timezone.utc)
+        db.session.add(
+            StageRun(
+                tenant_id=tid,
+                stage="triage",
+                status="completed",
+                completed_at=now - timedelta(minutes=5),
+            )
+        )
+        db.session.execute(
+            db.text(
+                "INSERT INTO tenant_counters (tenant_id, contacts, companies, "
+                "triage_passed, triage_disqualified) VALUES (:t, 10, 20, 9, 4)"
+            ),
+            {"t": tid},
+        )
+        db.session.commit()
+
+        headers = auth_header(client)
+        headers["X-Namespace"] = seed_companies_contacts["tenant"].slug
+        resp = client.get("/api/tenants/workflow-suggestions", headers=headers)
+        assert resp.status_code == 200
+        nudge = next(
+            s
+            for s in resp.get_json()["suggestions"]
+            if s["id"] == "nudge-triage-complete"
+        )
+        assert nudge["summary"] == "Triage complete: 9 passed, 4 disqualified"
@@ -0,0 +1,277 @@
+"""Unit tests for hot-path tracing spans and the profiling endpoints."""
+
+import json
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from api.services import tracing
+from tests.conftest import auth_header
+
+
+@pytest.fixture(autouse=True)
+def control_file(tmp_path, monkeypatch):
+    """Point the shared tracing control file at a per-test path."""
+    path = tmp_path / "tracing.json"
+    monkeypatch.setattr(tracing, "CONTROL_PATH", str(path))
+    monkeypatch.setattr(tracing, "_control_checked", 0.0)
+    monkeypatch.setattr(tracing, "_control_mtime", None)
+    monkeypatch.setattr(tracing, "_generation", 0)
+    return path
+
+
+@pytest.fixture
+def enabled():
+    tracing.reset()
+    tracing.set_enabled(True)
+    yield
+    tracing.set_enabled(False)
+    tracing.reset()
+
+
+class TestDisabled:
+    def test_span_is_shared_noop(self):
+        tracing.reset()
+        assert not tracing.is_enabled()
+        with tracing.span("stage.l1", entity_id="x") as s:
+            s.set_attribute("k", "v")
+        assert tracing.span("llm.perplexity") is s
+        assert tracing.snapshot()["spans"] == {}
+
+    def test_traced_calls_through(self):
+        tracing.reset()
+
+        @tracing.traced("db.test")
+        def add(a, b):
+            return a + b
+
+        assert add(1, 2) == 3
+        assert tracing.recent_spans() == []
+
+
+class TestSpans:
+    def test_nested_spans_share_trace_and_split_self_time(self, enabled):
+        with patch("api.services.tracing.time.perf_counter_ns") as clock:
+            # root start, llm start, llm end, db start, db end, root end
+            clock.side_effect = [0, 1e6, 31e6, 32e6, 37e6, 40e6]
+            with tracing.span("stage.l2", entity_id="c1"):
+                with tracing.span("llm.perplexity"):
+                    tracing.annotate(model="sonar")
+                with tracing.span("db.l2_enrichment"):
+                    pass
+
+        llm, db_span, root = tracing.recent_spans()
+        assert llm.trace_id == root.trace_id == db_span.trace_id
+        assert llm.parent is root and root.parent is None
+        assert llm.attributes == {"model": "sonar"}
+
+        snap = tracing.snapshot()
+        assert snap["spans"]["llm.perplexity"]["count"] == 1
+        assert snap["spans"]["llm.perplexity"]["total_ms"] == pytest.approx(30)
+        breakdown = snap["breakdown"]["stage.l2"]
+        assert breakdown["count"] == 1
+        assert breakdown["total_ms"] == pytest.approx(40)
+        assert breakdown["spans"]["llm.perplexity"]["total_ms"] == pytest.approx(30)
+        assert breakdown["spans"]["llm.perplexity"]["share"] == pytest.approx(0.75)
+        assert breakdown["spans"]["db.l2_enrichment"]["total_ms"] == pytest.approx(5)
+        assert breakdown["spans"][tracing.SELF_TIME]["total_ms"] == pytest.approx(5)
+
+    def test_traced_records_errors_and_reraises(self, enabled):
+        @tracing.traced("http.website")
+        def fetch():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            fetch()
+
+        (span,) = tracing.recent_spans()
+        assert span.error == "ValueError: boom"
+        assert tracing.snapshot()["spans"]["http.website"]["errors"] == 1
+
+    def test_threads_keep_separate_stacks(self, enabled):
+        def work():
+            for _ in range(200):
+                with tracing.span("stage.l1"):
+                    with tracing.span("llm.perplexity"):
+                        pass
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        snap = tracing.snapshot()
+        assert snap["spans"]["stage.l1"]["count"] == 800
+        assert snap["spans"]["llm.perplexity"]["count"] == 800
+        assert snap["breakdown"]["stage.l1"]["count"] == 800
+        assert "llm.perplexity" not in snap["breakdown"]
+
+    def test_histogram_quantiles(self):
+        hist = tracing._Histogram()
+        for ms in range(1, 101):
+            hist.add(float(ms))
+        assert hist.count == 100
+        assert 40 <= hist.quantile(0.5) <= 60
+        assert 85 <= hist.quantile(0.9) <= 100
+        assert hist.quantile(0.99) <= 100
+
+    def test_llm_duration_handed_to_usage_log(self, enabled):
+        with patch("api.services.tracing.time.perf_counter_ns") as clock:
+            clock.side_effect = [0, 1234e6]
+            with tracing.span("llm.anthropic"):
+                pass
+        assert tracing.take_llm_duration_ms() == 1234
+        assert tracing.take_llm_duration_ms() is None
+
+    def test_llm_duration_only_handed_to_same_span(self, enabled):
+        with tracing.span("stage.l2"):
+            with tracing.span("llm.perplexity"):
+                pass
+            assert tracing.take_llm_duration_ms() is not None
+
+            with tracing.span("llm.perplexity"):
+                pass
+        # The enclosing span has ended: a later log call is unrelated
+        assert tracing.take_llm_duration_ms() is None
+
+    def test_new_root_span_or_request_drops_earlier_duration(self, enabled):
+        with tracing.span("llm.anthropic"):
+            pass
+        with tracing.span("stage.l1"):
+            pass
+        assert tracing.take_llm_duration_ms() is None
+
+        with tracing.span("llm.anthropic"):
+            pass
+        tracing.clear_llm_duration()
+        assert tracing.take_llm_duration_ms() is None
+
+    def test_request_start_clears_llm_duration(self, client, enabled):
+        with tracing.span("llm.anthropic"):
+            pass
+        client.get("/api/health")
+        # Same thread served the request; the duration did not survive it
+        assert tracing.take_llm_duration_ms() is None
+
+
+class TestSharedControl:
+    def test_other_worker_switch_is_picked_up(self, control_file):
+        tracing.reset()
+        # Another worker process enabled tracing and asked for a reset
+        control_file.write_text(json.dumps({"enabled": True, "generation": 1}))
+        try:
+            tracing._control_checked = 0.0
+            assert tracing.is_enabled()
+            with tracing.span("stage.l1"):
+                pass
+            assert tracing.snapshot()["spans"]["stage.l1"]["count"] == 1
+
+            control_file.write_text(json.dumps({"enabled": False, "generation": 2}))
+            os.utime(control_file, ns=(1, 1))
+            tracing._control_checked = 0.0
+            assert not tracing.is_enabled()
+            assert tracing.snapshot()["spans"] == {}
+        finally:
+            tracing.set_enabled(False)
+            tracing.reset()
+
+    def test_configure_writes_control_file(self, control_file):
+        try:
+            tracing.configure(enabled=True)
+            assert json.loads(control_file.read_text()) == {
+                "enabled": True,
+                "generation": 0,
+            }
+            with tracing.span("stage.l1"):
+                pass
+            tracing.configure(reset_spans=True)
+            assert json.loads(control_file.read_text())["generation"] == 1
+            assert tracing.is_enabled()
+            assert tracing.snapshot()["spans"] == {}
+        finally:
+            tracing.set_enabled(False)
+            tracing.reset()
+
+    def test_snapshot_names_worker(self):
+        assert tracing.snapshot()["pid"] == os.getpid()
+
+
+class TestOtlpExport:
+    def test_resource_spans_shape(self, enabled):
+        with tracing.span("stage.l1", entity_id="c1", attempt=2):
+            with tracing.span("llm.perplexity"):
+                pass
+
+        payload = tracing.to_otlp()
+        resource = payload["resourceSpans"][0]
+        assert resource["resource"]["attributes"][0]["value"] == {
+            "stringValue": tracing.SERVICE_NAME
+        }
+        child, root = resource["scopeSpans"][0]["spans"]
+        assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+        assert child["parentSpanId"] == root["spanId"]
+        assert "parentSpanId" not in root
+        assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+        assert {"key": "attempt", "value": {"intValue": "2"}} in root["attributes"]
+        assert root["status"] == {"code": 1}
+
+
+class TestInstrumentation:
+    def test_process_entity_span_wraps_llm_call(self, app, enabled):
+        from api.services import pipeline_engine
+        from api.services.perplexity_client import PerplexityClient
+
+        response = MagicMock()
+        response.json.return_value = {
+            "choices": [{"message": {"content": "{}"}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+        }
+
+        def fake_l1(entity_id, tenant_id, previous_data=None):
+            with patch("api.services.perplexity_client.requests.post", return_value=response):
+                PerplexityClient(api_key="k").query("sys", "user", model="sonar")
+            return {"enrichment_cost_usd": 0}
+
+        with patch("api.services.l1_enricher.enrich_l1", side_effect=fake_l1):
+            pipeline_engine._process_entity("l1", "c1", "t1")
+
+        breakdown = tracing.snapshot()["breakdown"]["stage.l1"]
+        assert breakdown["count"] == 1
+        assert "llm.perplexity" in breakdown["spans"]
+        llm, root = tracing.recent_spans()
+        assert llm.attributes["model"] == "sonar"
+        assert root.attributes["entity_id"] == "c1"
+
+
+class TestProfilingRoutes:
+    def test_non_super_admin_forbidden(self, client, seed_user_with_role):
+        headers = auth_header(client, email="user@test.com")
+        assert client.get("/api/admin/profiling", headers=headers).status_code == 403
+
+    def test_toggle_summary_and_export(self, client, seed_companies_contacts):
+        headers = auth_header(client)
+        try:
+            resp = client.post(
+                "/api/admin/profiling",
+                json={"enabled": True, "reset": True},
+                headers=headers,
+            )
+            assert resp.get_json() == {"enabled": True, "pid": os.getpid()}
+            with tracing.span("stage.l1"):
+                pass
+
+            body = client.get("/api/admin/profiling", headers=headers).get_json()
+            assert body["enabled"] is True
+            assert body["spans"]["stage.l1"]["count"] == 1
+
+            export = client.get(
+                "/api/admin/profiling/export?limit=1", headers=headers
+            ).get_json()
+            spans = export["resourceSpans"][0]["scopeSpans"][0]["spans"]
+            assert [s["name"] for s in spans] == ["stage.l1"]
+        finally:
+            tracing.set_enabled(False)
+            tracing.reset()
@@ -0,0 +1,247 @@
+"""Tests for keyframe + delta storage of strategy versions (version_store)."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.models import StrategyDocument, StrategyVersion
+from api.services import version_store
+from api.services.version_service import create_version, get_version, list_versions
+from api.services.version_store import (
+    apply_delta,
+    compact_versions,
+    delete_versions,
+    make_delta,
+)
+
+SECTIONS = ["Executive Summary", "ICP", "Personas", "Channels", "Messaging"]
+
+
+def _doc_text(rev):
+    lines = ["# Strategy"]
+    for i, name in enumerate(SECTIONS):
+        lines.append("## {}".format(name))
+        for j in range(8):
+            marker = rev if i == rev % len(SECTIONS) and j == 3 else 0
+            lines.append("Paragraph {} of {} (rev {}).".format(j, name, marker))
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture
+def strategy_doc(db, seed_tenant):
+    doc = StrategyDocument(
+        tenant_id=seed_tenant.id, content=_doc_text(0), status="draft", version=1
+    )
+    db.session.add(doc)
+    db.session.commit()
+    return doc
+
+
+def _create(doc, text):
+    return create_version(
+        document_id=doc.id, content=text, author_type="user", description="save"
+    )
+
+
+def _rows(doc):
+    return (
+        StrategyVersion.query.filter_by(document_id=doc.id)
+        .order_by(StrategyVersion.version)
+        .all()
+    )
+
+
+class TestDeltaCodec:
+    def test_roundtrip(self):
+        rng = random.Random(7)
+        base = "".join("line {}\n".format(rng.randint(0, 50)) for _ in range(60))
+        for _ in range(20):
+            lines = base.splitlines(keepends=True)
+            for _ in range(rng.randint(0, 6)):
+                pos = rng.randrange(len(lines))
+                if rng.random() < 0.5:
+                    lines[pos] = "edited {}\n".format(rng.random())
+                else:
+                    del lines[pos]
+            text = "".join(lines) + (
+                "tail without newline" if rng.random() < 0.5 else ""
+            )
+            assert apply_delta(base, make_delta(base, text)) == text
+
+    def test_empty_texts(self):
+        assert apply_delta("", make_delta("", "new")) == "new"
+        assert apply_delta("old\n", make_delta("old\n", "")) == ""
+
+
+class TestPacking:
+    def test_keyframe_then_deltas(self, db, strategy_doc):
+        texts = [_doc_text(rev) for rev in range(1, 6)]
+        created = [_create(strategy_doc, text) for text in texts]
+
+        rows = _rows(strategy_doc)
+        assert [r.storage for r in rows] == ["keyframe"] + ["delta"] * 4
+        assert all(r.base_id == rows[0].id for r in rows[1:])
+        assert all(r.content_text is None for r in rows)
+        assert all(len(r.payload) < len(texts[0]) / 4 for r in rows[1:])
+        for result, text in zip(created, texts):
+            assert get_version(result["id"])["content"] == text
+
+    def test_keyframe_interval(self, db, strategy_doc, monkeypatch):
+        monkeypatch.setattr(version_store, "KEYFRAME_INTERVAL", 2)
+        for rev in range(1, 7):
+            _create(strategy_doc, _doc_text(rev))
+        assert [r.storage for r in _rows(strategy_doc)] == [
+            "keyframe",
+            "delta",
+            "delta",
+            "keyframe",
+            "delta",
+            "delta",
+        ]
+
+    def test_rewrite_becomes_keyframe(self, db, strategy_doc):
+        _create(strategy_doc, _doc_text(1))
+        rewrite = "".join("Completely new line {}\n".format(i) for i in range(40))
+        result = _create(strategy_doc, rewrite)
+        assert [r.storage for r in _rows(strategy_doc)] == ["keyframe", "keyframe"]
+        assert get_version(result["id"])["content"] == rewrite
+
+    def test_list_versions_skips_content(self, db, strategy_doc):
+        from sqlalchemy import event
+
+        for rev in range(1, 4):
+            _create(strategy_doc, _doc_text(rev))
+        statements = []
+
+        def _capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", _capture)
+        try:
+            listed = list_versions(strategy_doc.id)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _capture)
+
+        assert [v["version_number"] for v in listed] == [3, 2, 1]
+        selects = [s for s in statements if "FROM strategy_versions" in s]
+        assert selects
+        assert not any("payload" in s or ".content AS" in s for s in selects)
+
+    def test_legacy_full_rows_still_read(self, db, strategy_doc):
+        snap = StrategyVersion(
+            document_id=strategy_doc.id,
+            tenant_id=strategy_doc.tenant_id,
+            version=1,
+            content="plain",
+        )
+        db.session.add(snap)
+        db.session.commit()
+        assert snap.storage == "full"
+        assert get_version(snap.id)["content"] == "plain"
+
+
+@pytest.fixture
+def enforce_fks(db):
+    """Enforce foreign keys in SQLite, as PostgreSQL does."""
+    db.session.commit()
+    db.session.execute(db.text("PRAGMA foreign_keys=ON"))
+    yield
+    db.session.rollback()
+    db.session.execute(db.text("PRAGMA foreign_keys=OFF"))
+
+
+class TestDeleteVersions:
+    def test_deleting_keyframe_rebases_dependents(self, db, strategy_doc):
+        texts = [_doc_text(rev) for rev in range(1, 5)]
+        for text in texts:
+            _create(strategy_doc, text)
+        rows = _rows(strategy_doc)
+
+        assert delete_versions(rows[:2]) == 2
+        db.session.commit()
+
+        rows = _rows(strategy_doc)
+        assert [r.storage for r in rows] == ["keyframe", "delta"]
+        assert rows[1].base_id == rows[0].id
+        assert [r.content for r in rows] == texts[2:]
+
+    def test_deleting_delta_keeps_others(self, db, strategy_doc):
+        texts = [_doc_text(rev) for rev in range(1, 4)]
+        for text in texts:
+            _create(strategy_doc, text)
+        delete_versions([_rows(strategy_doc)[1]])
+        db.session.commit()
+        assert [r.content for r in _rows(strategy_doc)] == [texts[0], texts[2]]
+
+    def test_keyframe_and_its_deltas_deleted_together(
+        self, db, strategy_doc, enforce_fks
+    ):
+        texts = [_doc_text(rev) for rev in range(1, 6)]
+        for version, text in enumerate(texts, start=1):
+            # The keyframe gets the lowest primary key, which is the order
+            # a plain session.delete would remove the rows in
+            snap = StrategyVersion(
+                id="00000000-0000-0000-0000-{:012d}".format(version),
+                document_id=strategy_doc.id,
+                tenant_id=strategy_doc.tenant_id,
+                version=version,
+            )
+            db.session.add(version_store.pack(snap, text))
+            db.session.commit()
+        rows = _rows(strategy_doc)
+        assert [r.storage for r in rows[:3]] == ["keyframe", "delta", "delta"]
+        assert db.session.execute(db.text("PRAGMA foreign_keys")).scalar() == 1
+
+        assert delete_versions(rows[:3]) == 3
+        db.session.commit()
+
+        rows = _rows(strategy_doc)
+        assert [r.storage for r in rows] == ["keyframe", "delta"]
+        assert [r.content for r in rows] == texts[3:]
+
+
+class TestCompaction:
+    def _legacy(self, db, doc, count, age_days):
+        created = datetime.now(timezone.utc) - timedelta(days=age_days)
+        texts = []
+        for rev in range(1, count + 1):
+            text = _doc_text(rev)
+            texts.append(text)
+            db.session.add(
+                StrategyVersion(
+                    document_id=doc.id,
+                    tenant_id=doc.tenant_id,
+                    version=rev,
+                    content=text,
+                    created_at=created + timedelta(minutes=rev),
+                )
+            )
+        db.session.commit()
+        return texts
+
+    def test_compacts_old_full_rows(self, db, strategy_doc):
+        texts = self._legacy(db, strategy_doc, 4, age_days=30)
+
+        stats = compact_versions(older_than_days=7)
+
+        assert stats["documents"] == 1
+        assert stats["versions"] == 4
+        assert stats["bytes_after"] < stats["bytes_before"] / 3
+        rows = _rows(strategy_doc)
+        assert [r.storage for r in rows] == ["keyframe", "delta", "delta", "delta"]
+        assert [r.content for r in rows] == texts
+        assert all(r.content_hash for r in rows)
+
+    def test_recent_rows_untouched(self, db, strategy_doc):
+        self._legacy(db, strategy_doc, 2, age_days=1)
+        assert compact_versions(older_than_days=7)["versions"] == 0
+        assert {r.storage for r in _rows(strategy_doc)} == {"full"}
+
+    def test_maybe_compact_is_rate_limited(self, db, monkeypatch):
+        calls = []
+        monkeypatch.setattr(version_store, "_last_compaction", 0.0)
+        monkeypatch.setattr(version_store, "compact_versions", lambda: calls.append(1))
+        version_store.maybe_compact_versions()
+        version_store.maybe_compact_versions()
+        assert calls == [1]
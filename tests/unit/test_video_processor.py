@@ -6,6 +6,7 @@ All external dependencies (ffmpeg, Whisper API, yt-dlp) are mocked.
 import json
 import os
 import tempfile
+import threading
 from unittest.mock import MagicMock, mock_open, patch
 
 import pytest
@@ -453,3 +454,242 @@ class TestCaching:
         with tempfile.TemporaryDirectory() as cache_dir:
             loaded = _load_from_cache("nonexistent_hash", cache_dir)
             assert loaded is None
+
+
+class TestKeyframeDedupe:
+    def test_dhash_pixels(self):
+        from api.services.multimodal.video_processor import _dhash_pixels
+
+        # Each row: decreasing brightness -> all bits set
+        pixels = [9, 8, 7, 6, 5, 4, 3, 2, 1] * 8
+        assert _dhash_pixels(pixels, 9) == (1 << 64) - 1
+        assert _dhash_pixels(list(reversed(pixels)), 9) == 0
+
+    def test_near_identical_frames_dropped(self, tmp_path):
+        from api.services.multimodal.video_processor import (
+            KeyframeInfo,
+            dedupe_keyframes,
+        )
+
+        frames = []
+        for i, phash in enumerate([0b0, 0b11, 1 << 40 | 0xFFFF, None]):
+            path = tmp_path / "kf{}.jpg".format(i)
+            path.write_bytes(b"jpg")
+            frames.append(
+                KeyframeInfo(timestamp_seconds=i, file_path=str(path), phash=phash)
+            )
+
+        with patch(
+            "api.services.multimodal.video_processor.frame_hash", return_value=None
+        ):
+            kept, dropped = dedupe_keyframes(frames)
+
+        assert [kf.timestamp_seconds for kf in kept] == [0, 2, 3]
+        assert dropped == 1
+        assert not os.path.exists(frames[1].file_path)
+
+
+class _FakeVisionClient:
+    def __init__(self, replies=None):
+        self.replies = replies
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def query(self, system_prompt, user_prompt, model=None, max_tokens=1024):
+        images = [b for b in user_prompt if b["type"] == "image"]
+        labels = [
+            b["text"]
+            for b in user_prompt
+            if b["type"] == "text" and "Frame" in b["text"]
+        ]
+        with self.lock:
+            self.batches.append(labels)
+        text = (
+            self.replies(labels)
+            if self.replies
+            else json.dumps(["desc " + label for label in labels])
+        )
+        return MagicMock(
+            content=text, input_tokens=1600 * len(images), output_tokens=50
+        )
+
+
+class _CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+        return 0.0
+
+
+@pytest.fixture
+def fake_frames():
+    from api.services.multimodal.image_processor import ImagePayload
+    from api.services.multimodal.video_processor import KeyframeInfo
+
+    payload = ImagePayload(
+        base64_data="aGk=",
+        media_type="image/jpeg",
+        width=10,
+        height=10,
+        original_size_bytes=2,
+    )
+    with patch(
+        "api.services.multimodal.image_processor.prepare_image_from_path",
+        return_value=payload,
+    ):
+        yield [
+            KeyframeInfo(timestamp_seconds=10.0 * i, file_path="/f{}.jpg".format(i))
+            for i in range(10)
+        ]
+
+
+class TestDescribeKeyframes:
+    def test_batched_concurrent_calls(self, fake_frames):
+        from api.services.multimodal.video_processor import describe_keyframes
+
+        client = _FakeVisionClient()
+        limiter = _CountingLimiter()
+        usage = describe_keyframes(
+            fake_frames, client, frames_per_call=4, max_workers=3, rate_limiter=limiter
+        )
+
+        assert sorted(len(b) for b in client.batches) == [2, 4, 4]
+        assert limiter.acquired == 3
+        assert usage["calls"] == 3
+        assert usage["input_tokens"] == 1600 * 10
+        assert fake_frames[0].description == "desc Frame 1 at 00:00"
+        assert fake_frames[9].description == "desc Frame 2 at 01:30"
+
+    def test_unmatched_reply_falls_back_to_single_frames(self, fake_frames):
+        from api.services.multimodal.video_processor import describe_keyframes
+
+        client = _FakeVisionClient(
+            replies=lambda labels: (
+                "Sorry, here is one description." if len(labels) > 1 else "A slide"
+            )
+        )
+        usage = describe_keyframes(
+            fake_frames[:3], client, frames_per_call=3, rate_limiter=_CountingLimiter()
+        )
+
+        assert usage["calls"] == 4
+        assert [kf.description for kf in fake_frames[:3]] == ["A slide"] * 3
+
+
+    def test_api_errors_counted_as_failed_frames(self, fake_frames):
+        from api.services.multimodal.video_processor import describe_keyframes
+
+        client = _FakeVisionClient()
+        client.query = MagicMock(side_effect=RuntimeError("overloaded"))
+        usage = describe_keyframes(
+            fake_frames[:3], client, frames_per_call=3, rate_limiter=_CountingLimiter()
+        )
+
+        assert usage["calls"] == 0
+        assert usage["failed_frames"] == 3
+        assert [kf.description for kf in fake_frames[:3]] == [""] * 3
+
+
+class TestPipelinedProcessing:
+    def test_branches_run_concurrently(self):
+        from api.services.multimodal.video_processor import (
+            KeyframeInfo,
+            TranscriptSegment,
+            VideoMetadata,
+            process_video,
+        )
+
+        meta = VideoMetadata(duration_seconds=60, has_audio=True, file_hash="h")
+        barrier = threading.Barrier(2, timeout=5)
+
+        def _audio(path):
+            barrier.wait()
+            return "/tmp/missing-audio.wav"
+
+        def _keyframes(path):
+            barrier.wait()
+            return [KeyframeInfo(timestamp_seconds=5, file_path="/kf.jpg", phash=1)]
+
+        def _describe(keyframes, client, query):
+            keyframes[0].description = "Pricing slide"
+            return {"calls": 1, "input_tokens": 1600, "output_tokens": 20}
+
+        vp = "api.services.multimodal.video_processor"
+        with (
+            patch(vp + ".check_ffmpeg", return_value=True),
+            patch(vp + ".get_video_metadata", return_value=meta),
+            patch(vp + "._load_from_cache", return_value=None),
+            patch(vp + "._save_to_cache"),
+            patch(vp + ".extract_audio", side_effect=_audio),
+            patch(
+                vp + ".transcribe_audio",
+                return_value=[TranscriptSegment(text="Welcome")],
+            ),
+            patch(vp + ".extract_keyframes", side_effect=_keyframes),
+            patch(vp + ".describe_keyframes", side_effect=_describe),
+        ):
+            result = process_video("/fake/video.mp4", describe_frames=True)
+
+        assert result.error is None
+        assert result.transcript_text == "Welcome"
+        assert result.vision_calls == 1
+        assert "[00:05] Pricing slide" in result.visual_summary
+        assert {
+            "metadata",
+            "audio_extract",
+            "transcribe",
+            "keyframes",
+            "dedupe",
+            "describe",
+            "total",
+        } <= set(result.timings)
+
+    def _run(self, extract_keyframes, describe):
+        from api.services.multimodal.video_processor import (
+            VideoMetadata,
+            process_video,
+        )
+
+        meta = VideoMetadata(duration_seconds=60, has_audio=False, file_hash="h")
+        vp = "api.services.multimodal.video_processor"
+        with (
+            patch(vp + ".check_ffmpeg", return_value=True),
+            patch(vp + ".get_video_metadata", return_value=meta),
+            patch(vp + "._load_from_cache", return_value=None),
+            patch(vp + "._save_to_cache") as save,
+            patch(vp + ".extract_keyframes", side_effect=extract_keyframes),
+            patch(vp + ".describe_keyframes", side_effect=describe),
+        ):
+            result = process_video("/fake/video.mp4", describe_frames=True)
+        return result, save
+
+    def test_failed_branch_sets_error_and_skips_cache(self):
+        def _boom(path):
+            raise RuntimeError("ffmpeg crashed")
+
+        result, save = self._run(_boom, None)
+
+        assert result.error == "visual processing failed: ffmpeg crashed"
+        save.assert_not_called()
+
+    def test_undescribed_keyframes_not_cached(self):
+        from api.services.multimodal.video_processor import KeyframeInfo
+
+        def _keyframes(path):
+            return [KeyframeInfo(timestamp_seconds=5, file_path="/kf.jpg", phash=1)]
+
+        def _describe(keyframes, client, query):
+            return {
+                "calls": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "failed_frames": 1,
+            }
+
+        result, save = self._run(_keyframes, _describe)
+
+        assert result.error is None
+        assert result.undescribed_keyframes == 1
+        save.assert_not_called()